@@ -37,6 +37,7 @@ CODEX_DIR = REPO_ROOT / "tools" / "codex"
 PROMPT_ZIPS_DIR = CODEX_DIR / "prompt_zips"
 PROMPTS_ROOT = CODEX_DIR / "prompts"
 RUNS_ROOT = CODEX_DIR / "runs"
+RUN_CATALOG_PATH = RUNS_ROOT / "run_catalog.json"
 
 HEADER_SCAN_LINES = 40
 DOC_WORKERS: tuple[str, ...] = CODEX_IDS[:-1]
@@ -71,17 +72,30 @@ def _parse_workers_subset(raw: str | None) -> list[str]:
     return deduped
 
 
+def _catalog_run_ids() -> list[str] | None:
+    # The factory run catalog also lists runs whose folders are gone; it never
+    # holds dispatch runs, so it adds to the runs folder listing, not replaces it.
+    try:
+        payload = json.loads(RUN_CATALOG_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    runs = payload.get("runs") if isinstance(payload, dict) else None
+    if not isinstance(runs, dict):
+        return None
+    return sorted(str(run_id) for run_id in runs)
+
+
 def _collect_existing_run_ids(day_prefix: str) -> list[str]:
     found: set[str] = set()
     roots = [RUNS_ROOT, PROMPTS_ROOT, PROMPT_ZIPS_DIR]
 
     for root in roots:
-        if not root.exists():
-            continue
-        if root == PROMPT_ZIPS_DIR:
-            entries = [item.stem for item in root.glob("*.zip") if item.is_file()]
-        else:
-            entries = [item.name for item in root.iterdir()]
+        entries: list[str] = list(_catalog_run_ids() or []) if root == RUNS_ROOT else []
+        if root.exists():
+            if root == PROMPT_ZIPS_DIR:
+                entries.extend(item.stem for item in root.glob("*.zip") if item.is_file())
+            else:
+                entries.extend(item.name for item in root.iterdir())
 
         for name in entries:
             is_compatible = bool(RUN_ID_NEW_RE.fullmatch(name) or RUN_ID_OLD_RE.fullmatch(name))
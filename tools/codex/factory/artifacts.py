@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import lzma
+import os
+import shutil
+import stat
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+from .common import RUNS_DIR, ensure_dir, iso_utc
+
+STORE_DIR = RUNS_DIR / "_store"
+MANIFEST_REL = "attestations/artifacts.json"
+SKIP_PREFIXES = ("attestations/", "locks/")
+CODEC_SUFFIXES = {"none": "", "lzma": ".xz", "zlib": ".zz"}
+DEFAULT_COMPRESS_THRESHOLD = 65536
+_CHUNK = 1 << 20
+
+
+def blobs_dir() -> Path:
+    return STORE_DIR / "blobs"
+
+
+def blob_path(sha256: str, codec: str = "none") -> Path:
+    return blobs_dir() / sha256[:2] / f"{sha256}{CODEC_SUFFIXES[codec]}"
+
+
+def find_blob(sha256: str) -> tuple[Path, str] | None:
+    for codec in CODEC_SUFFIXES:
+        candidate = blob_path(sha256, codec)
+        if candidate.exists():
+            return candidate, codec
+    return None
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_many(paths: list[Path], *, workers: int | None = None) -> list[str]:
+    # hashlib drops the GIL on large updates, so chunked hashing scales across threads.
+    if len(paths) < 2:
+        return [hash_file(path) for path in paths]
+    pool_size = max(1, min(workers or min(8, os.cpu_count() or 1), len(paths)))
+    with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="hash") as pool:
+        return list(pool.map(hash_file, paths))
+
+
+def _temp_for(target: Path) -> Path:
+    return target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _protect(path: Path) -> None:
+    # Read-only blobs make stray in-place writers fail loudly instead of
+    # corrupting a restored run that links the blob. Windows shares the attribute
+    # across links and would then refuse to replace them, so skip it there.
+    if os.name != "nt":
+        os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+
+def _same_inode(left: Path, right: Path) -> bool:
+    try:
+        a = os.stat(left)
+        b = os.stat(right)
+    except FileNotFoundError:
+        return False
+    return (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino)
+
+
+def _compressor(codec: str):
+    if codec == "lzma":
+        return lzma.LZMACompressor(preset=6)
+    if codec == "zlib":
+        return zlib.compressobj(6)
+    raise ValueError(f"unknown artifact codec: {codec!r}")
+
+
+def _decompressor(codec: str):
+    if codec == "lzma":
+        return lzma.LZMADecompressor()
+    if codec == "zlib":
+        return zlib.decompressobj()
+    raise ValueError(f"unknown artifact codec: {codec!r}")
+
+
+def iter_blob_chunks(sha256: str) -> Iterator[bytes]:
+    found = find_blob(sha256)
+    if found is None:
+        raise FileNotFoundError(f"artifact blob missing: {sha256}")
+    path, codec = found
+    with path.open("rb") as handle:
+        if codec == "none":
+            yield from iter(lambda: handle.read(_CHUNK), b"")
+            return
+        decoder = _decompressor(codec)
+        for chunk in iter(lambda: handle.read(_CHUNK), b""):
+            data = decoder.decompress(chunk)
+            if data:
+                yield data
+        tail = decoder.flush() if codec == "zlib" else b""
+        if tail:
+            yield tail
+
+
+def read_blob(sha256: str) -> bytes:
+    return b"".join(iter_blob_chunks(sha256))
+
+
+def _copy_hashed(source: Path, target: Path) -> str:
+    digest = hashlib.sha256()
+    with source.open("rb") as reader, target.open("wb") as writer:
+        for chunk in iter(lambda: reader.read(_CHUNK), b""):
+            digest.update(chunk)
+            writer.write(chunk)
+    return digest.hexdigest()
+
+
+def put_file(source: Path, sha256: str | None = None) -> tuple[str, Path]:
+    # Stores the file's content once under its sha256 and returns the blob path.
+    # The blob is always a copy: linking the live run file would let any writer
+    # that does not detach first rewrite the blob, and every run that shares it.
+    digest = sha256 or hash_file(source)
+    found = find_blob(digest)
+    if found is not None:
+        return digest, found[0]
+    raw = blob_path(digest)
+    ensure_dir(raw.parent)
+    temp = _temp_for(raw)
+    try:
+        if _copy_hashed(source, temp) != digest:
+            raise ValueError(f"run file changed while sealing: {source.as_posix()}")
+        os.replace(temp, raw)
+    except (OSError, ValueError):
+        temp.unlink(missing_ok=True)
+        raise
+    _protect(raw)
+    return digest, raw
+
+
+def _materialize_raw(sha256: str) -> Path:
+    raw = blob_path(sha256)
+    if raw.exists():
+        return raw
+    ensure_dir(raw.parent)
+    temp = _temp_for(raw)
+    digest = hashlib.sha256()
+    with temp.open("wb") as handle:
+        for chunk in iter_blob_chunks(sha256):
+            digest.update(chunk)
+            handle.write(chunk)
+    if digest.hexdigest() != sha256:
+        temp.unlink(missing_ok=True)
+        raise ValueError(f"artifact blob corrupt: {sha256}")
+    os.replace(temp, raw)
+    _protect(raw)
+    for codec in ("lzma", "zlib"):
+        blob_path(sha256, codec).unlink(missing_ok=True)
+    return raw
+
+
+def compress_blob(sha256: str, codec: str) -> int:
+    # Replaces a raw blob by its compressed form; returns bytes saved (0 if not worth it).
+    raw = blob_path(sha256)
+    target = blob_path(sha256, codec)
+    if codec == "none" or not raw.exists():
+        return 0
+    encoder = _compressor(codec)
+    temp = _temp_for(target)
+    with raw.open("rb") as source, temp.open("wb") as handle:
+        for chunk in iter(lambda: source.read(_CHUNK), b""):
+            handle.write(encoder.compress(chunk))
+        handle.write(encoder.flush())
+    original = raw.stat().st_size
+    packed = temp.stat().st_size
+    if packed >= original:
+        temp.unlink()
+        return 0
+    os.replace(temp, target)
+    _protect(target)
+    os.chmod(raw, stat.S_IWUSR | stat.S_IRUSR)
+    raw.unlink()
+    return original - packed
+
+
+def _link_into_place(blob: Path, target: Path) -> bool:
+    temp = _temp_for(target)
+    try:
+        os.link(blob, temp)
+    except OSError:
+        return False
+    os.replace(temp, target)
+    return True
+
+
+def manifest_path(run_id: str) -> Path:
+    return RUNS_DIR / run_id / MANIFEST_REL
+
+
+def load_manifest(run_id: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(manifest_path(run_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"schema_version": 1, "run_id": run_id, "archived": False, "files": {}}
+    if not isinstance(payload, dict) or not isinstance(payload.get("files"), dict):
+        return {"schema_version": 1, "run_id": run_id, "archived": False, "files": {}}
+    return payload
+
+
+def _write_manifest(run_id: str, manifest: Mapping[str, Any]) -> Path:
+    target = manifest_path(run_id)
+    ensure_dir(target.parent)
+    temp = _temp_for(target)
+    temp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
+    os.replace(temp, target)
+    return target
+
+
+def is_run_file(rel: str) -> bool:
+    # One filter for what belongs to a run's bundle, shared by sealing and the
+    # unsealed attestation pass: attestations and locks are bookkeeping, and
+    # dot-prefixed .tmp files are in-flight atomic writes.
+    name = rel.rsplit("/", 1)[-1]
+    return not (rel.startswith(SKIP_PREFIXES) or name.startswith(".") and name.endswith(".tmp"))
+
+
+def iter_run_files(run_root: Path) -> list[tuple[str, Path]]:
+    files: list[tuple[str, Path]] = []
+    for root, _dirs, names in os.walk(run_root):
+        for name in names:
+            path = Path(root) / name
+            rel = path.relative_to(run_root).as_posix()
+            if is_run_file(rel):
+                files.append((rel, path))
+    files.sort()
+    return files
+
+
+def seal_run(run_id: str) -> dict[str, Any]:
+    # Copies every run file into the store; the run folder keeps its own files.
+    # A file whose (size, mtime_ns, inode) match the last seal, and which was not
+    # modified after that seal began, keeps its recorded hash and is not re-read.
+    run_root = RUNS_DIR / run_id
+    previous = load_manifest(run_id)
+    if previous.get("archived"):
+        raise ValueError(f"run {run_id} is archived; restore it before sealing")
+    known = dict(previous.get("files", {}))
+    cutoff = int(previous.get("started_ns", 0))
+    started_ns = time.time_ns()
+    files: dict[str, dict[str, Any]] = {}
+    pending: list[tuple[str, Path, str]] = []
+    for rel, path in iter_run_files(run_root):
+        info = path.stat()
+        files[rel] = {"size": info.st_size, "mtime_ns": info.st_mtime_ns, "inode": info.st_ino}
+        entry = known.get(rel)
+        sha256 = ""
+        if (
+            isinstance(entry, Mapping)
+            and info.st_mtime_ns < cutoff
+            and all(entry.get(key) == value for key, value in files[rel].items())
+            and find_blob(str(entry.get("sha256", ""))) is not None
+        ):
+            sha256 = str(entry["sha256"])
+        pending.append((rel, path, sha256))
+    to_hash = [path for _rel, path, sha256 in pending if not sha256]
+    digests = iter(hash_many(to_hash))
+    for rel, path, sha256 in pending:
+        sha256 = sha256 or next(digests)
+        put_file(path, sha256)
+        files[rel] = {"sha256": sha256, **files[rel]}
+    manifest = {
+        "schema_version": 1,
+        "run_id": run_id,
+        "archived": False,
+        "sealed_at": iso_utc(),
+        "started_ns": started_ns,
+        "files": dict(sorted(files.items())),
+    }
+    _write_manifest(run_id, manifest)
+    return {"status": "PASS", "run_id": run_id, "files": len(files), "hashed": len(to_hash), "manifest": manifest_path(run_id).as_posix()}
+
+
+def archive_run(run_id: str) -> dict[str, Any]:
+    # Drops run-directory copies that are safely held by the store, leaving the
+    # manifest as the only reference.
+    manifest = load_manifest(run_id)
+    run_root = RUNS_DIR / run_id
+    removed = 0
+    freed = 0
+    for rel, entry in manifest.get("files", {}).items():
+        path = run_root / rel
+        sha256 = str(entry.get("sha256", ""))
+        if not path.exists() or find_blob(sha256) is None:
+            continue
+        if not _same_inode(path, blob_path(sha256)) and hash_file(path) != sha256:
+            continue
+        if not _same_inode(path, blob_path(sha256)):
+            freed += path.stat().st_size
+        path.unlink()
+        removed += 1
+    manifest["archived"] = True
+    manifest["archived_at"] = iso_utc()
+    _write_manifest(run_id, manifest)
+    return {"status": "PASS", "run_id": run_id, "removed": removed, "freed_bytes": freed}
+
+
+def restore_run(run_id: str, *, hardlink: bool = False) -> dict[str, Any]:
+    # hardlink=True links restored files to their (read-only) blobs instead of
+    # copying them; only use it for archived runs that nothing writes to again.
+    manifest = load_manifest(run_id)
+    run_root = RUNS_DIR / run_id
+    restored = 0
+    missing: list[str] = []
+    for rel, entry in manifest.get("files", {}).items():
+        path = run_root / rel
+        if path.exists():
+            continue
+        sha256 = str(entry.get("sha256", ""))
+        if find_blob(sha256) is None:
+            missing.append(rel)
+            continue
+        raw = _materialize_raw(sha256)
+        ensure_dir(path.parent)
+        if not (hardlink and _link_into_place(raw, path)):
+            shutil.copyfile(raw, path)
+        restored += 1
+    manifest["archived"] = False
+    manifest.pop("archived_at", None)
+    _write_manifest(run_id, manifest)
+    return {"status": "PASS" if not missing else "BLOCKED", "run_id": run_id, "restored": restored, "missing": missing}
+
+
+def referenced_blobs() -> dict[str, list[str]]:
+    refs: dict[str, list[str]] = {}
+    if not RUNS_DIR.exists():
+        return refs
+    for manifest_file in sorted(RUNS_DIR.glob(f"*/{MANIFEST_REL}")):
+        run_id = manifest_file.parents[1].name
+        for entry in load_manifest(run_id).get("files", {}).values():
+            refs.setdefault(str(entry.get("sha256", "")), []).append(run_id)
+    return refs
+
+
+def _iter_blobs() -> Iterator[tuple[str, str, Path]]:
+    root = blobs_dir()
+    if not root.exists():
+        return
+    by_suffix = {suffix: codec for codec, suffix in CODEC_SUFFIXES.items() if suffix}
+    for shard in sorted(root.iterdir()):
+        if not shard.is_dir():
+            continue
+        for blob in sorted(shard.iterdir()):
+            if blob.name.startswith("."):
+                continue
+            codec = by_suffix.get(blob.suffix, "none")
+            sha256 = blob.name[: -len(blob.suffix)] if codec != "none" else blob.name
+            yield sha256, codec, blob
+
+
+def gc(*, dry_run: bool = False, codec: str = "lzma", compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> dict[str, Any]:
+    # Unreferenced blobs are deleted. Referenced blobs that no restored run links
+    # are compressed once they reach the size threshold.
+    refs = referenced_blobs()
+    removed: list[str] = []
+    reclaimed = 0
+    compressed = 0
+    saved = 0
+    for sha256, blob_codec, blob in list(_iter_blobs()):
+        info = blob.stat()
+        if sha256 not in refs:
+            removed.append(sha256)
+            reclaimed += info.st_size
+            if not dry_run:
+                os.chmod(blob, stat.S_IWUSR | stat.S_IRUSR)
+                blob.unlink()
+            continue
+        if blob_codec == "none" and codec != "none" and info.st_nlink == 1 and info.st_size >= compress_threshold:
+            compressed += 1
+            if not dry_run:
+                saved += compress_blob(sha256, codec)
+    return {
+        "status": "PASS",
+        "dry_run": bool(dry_run),
+        "referenced": len(refs),
+        "removed": len(removed),
+        "reclaimed_bytes": reclaimed,
+        "compressed": compressed,
+        "compressed_saved_bytes": saved,
+        "removed_blobs": removed,
+    }
@@ -1,21 +1,76 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import time
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Mapping
 
-from .common import RUNS_DIR, stable_sha256_bytes
+from .artifacts import hash_file, hash_many, iter_run_files, load_manifest, seal_run
+from .common import RUNS_DIR
+
+INDEX_REL = "attestations/bundles.index.json"
+MERKLE_REL = "attestations/merkle.json"
 
 
 def _hash_file(path: Path) -> str:
-    return stable_sha256_bytes(path.read_bytes())
+    return hash_file(path)
+
+
+def _leaf_hash(sha256: str, rel: str) -> bytes:
+    return hashlib.sha256(b"\x00" + f"{sha256}  {rel}".encode("utf-8")).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _merkle_levels(entries: Iterable[tuple[str, str]]) -> list[list[bytes]]:
+    # Leaves are the manifest lines in path order; an odd node is carried up
+    # unchanged rather than duplicated, so no two manifests share a root.
+    level = [_leaf_hash(sha256, rel) for sha256, rel in sorted(entries, key=lambda item: item[1])]
+    levels = [level]
+    while len(level) > 1:
+        level = [_node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+        levels.append(level)
+    return levels
+
+
+def merkle_root(entries: Iterable[tuple[str, str]]) -> str:
+    levels = _merkle_levels(entries)
+    if not levels[0]:
+        return hashlib.sha256(b"").hexdigest()
+    return levels[-1][0].hex()
+
 
+def merkle_proof(entries: Iterable[tuple[str, str]], rel: str) -> list[dict[str, str]]:
+    ordered = sorted(entries, key=lambda item: item[1])
+    index = next((i for i, (_sha, path) in enumerate(ordered) if path == rel), None)
+    if index is None:
+        raise KeyError(rel)
+    proof: list[dict[str, str]] = []
+    for level in _merkle_levels(ordered)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"side": "left" if sibling < index else "right", "hash": level[sibling].hex()})
+        index //= 2
+    return proof
 
-def _iter_files(root: Path) -> list[Path]:
-    if not root.exists():
-        return []
-    files = [path for path in root.rglob("*") if path.is_file()]
-    files.sort(key=lambda item: item.as_posix().lower())
-    return files
+
+def verify_merkle_proof(sha256: str, rel: str, proof: Iterable[Mapping[str, str]], root: str) -> bool:
+    node = _leaf_hash(sha256, rel)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = _node_hash(sibling, node) if step["side"] == "left" else _node_hash(node, sibling)
+    return node.hex() == root
+
+
+def load_merkle(run_id: str) -> dict[str, Any]:
+    try:
+        payload = json.loads((RUNS_DIR / run_id / MERKLE_REL).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
 
 
 def _render_manifest(entries: Iterable[tuple[str, str]]) -> str:
@@ -29,15 +84,67 @@ def _write_manifest(path: Path, entries: Iterable[tuple[str, str]]) -> Path:
     return path
 
 
-def write_bundle_attestation(run_id: str) -> Path:
+def _load_index(run_root: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads((run_root / INDEX_REL).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) and isinstance(payload.get("files"), dict) else {}
+
+
+def _write_json(path: Path, payload: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
+
+
+def _hash_run_files(run_root: Path, *, workers: int | None) -> list[tuple[str, str]]:
+    # A file keeps its previous digest while (size, mtime_ns, inode) are unchanged.
+    # Entries modified at or after the previous pass began are rehashed anyway,
+    # since a same-size rewrite within the clock tick would otherwise go unseen.
+    previous = _load_index(run_root)
+    known = previous.get("files", {})
+    cutoff = int(previous.get("started_ns", 0))
+    started_ns = time.time_ns()
+    stats: dict[str, dict[str, Any]] = {}
+    digests: dict[str, str] = {}
+    pending: list[tuple[str, Path]] = []
+    for rel, path in iter_run_files(run_root):
+        info = path.stat()
+        stats[rel] = {"size": info.st_size, "mtime_ns": info.st_mtime_ns, "inode": info.st_ino}
+        entry = known.get(rel)
+        if (
+            isinstance(entry, Mapping)
+            and info.st_mtime_ns < cutoff
+            and all(entry.get(key) == value for key, value in stats[rel].items())
+        ):
+            digests[rel] = str(entry["sha256"])
+        else:
+            pending.append((rel, path))
+    for (rel, _path), digest in zip(pending, hash_many([path for _rel, path in pending], workers=workers)):
+        digests[rel] = digest
+    files = {rel: {"sha256": digests[rel], **stats[rel]} for rel in sorted(stats)}
+    _write_json(run_root / INDEX_REL, {"schema_version": 1, "started_ns": started_ns, "files": files})
+    return [(digests[rel], rel) for rel in sorted(stats)]
+
+
+def write_bundle_attestation(
+    run_id: str,
+    *,
+    seal: bool = False,
+    workers: int | None = None,
+) -> Path:
     run_root = RUNS_DIR / run_id
-    entries: list[tuple[str, str]] = []
-    for file_path in _iter_files(run_root):
-        rel = file_path.relative_to(run_root).as_posix()
-        if rel.startswith("attestations/"):
-            continue
-        entries.append((_hash_file(file_path), rel))
     target = run_root / "attestations" / "bundles.sha256"
+    if seal:
+        # Sealing hashes each file into the artifact store; attest from those hashes.
+        seal_run(run_id)
+        files = load_manifest(run_id)["files"]
+        entries = [(str(entry["sha256"]), rel) for rel, entry in files.items()]
+    elif run_root.exists():
+        entries = _hash_run_files(run_root, workers=workers)
+    else:
+        entries = []
+    _write_json(run_root / MERKLE_REL, {"algorithm": "sha256", "leaves": len(entries), "root": merkle_root(entries)})
     return _write_manifest(target, entries)
 
 
@@ -54,24 +161,32 @@ def write_ledger_attestation(run_id: str, *, ledger_path: Path | None = None) ->
     return _write_manifest(target, entries)
 
 
-def write_report_attestation(run_id: str, *, report_path: Path | None = None) -> Path:
+def write_report_attestation(run_id: str, *, report_path: Path | None = None, sealed: bool = False) -> Path:
     run_root = RUNS_DIR / run_id
     actual_report = report_path or (run_root / "Z_integrator" / "FINAL_REPORT.txt")
     entries: list[tuple[str, str]] = []
     if actual_report.exists():
         rel = actual_report.relative_to(run_root).as_posix()
-        entries.append((_hash_file(actual_report), rel))
+        stored = load_manifest(run_id)["files"].get(rel) if sealed else None
+        entries.append((str(stored["sha256"]) if stored else _hash_file(actual_report), rel))
     target = run_root / "attestations" / "report.sha256"
     return _write_manifest(target, entries)
 
 
-def write_all_attestations(run_id: str, *, report_path: Path | None = None, ledger_path: Path | None = None) -> dict[str, str]:
-    bundle = write_bundle_attestation(run_id)
+def write_all_attestations(
+    run_id: str,
+    *,
+    report_path: Path | None = None,
+    ledger_path: Path | None = None,
+    seal: bool = False,
+) -> dict[str, str]:
+    bundle = write_bundle_attestation(run_id, seal=seal)
     ledger = write_ledger_attestation(run_id, ledger_path=ledger_path)
-    report = write_report_attestation(run_id, report_path=report_path)
+    report = write_report_attestation(run_id, report_path=report_path, sealed=seal)
     return {
         "bundles": bundle.as_posix(),
         "ledger": ledger.as_posix(),
         "report": report.as_posix(),
+        "merkle_root": str(load_merkle(run_id).get("root", "")),
     }
 
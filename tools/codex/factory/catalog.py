@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Mapping
+
+from .common import INTEGRATOR, RUNS_DIR, ensure_dir, iso_utc, read_json, run_workers
+from .locks import FileLock, LockAcquisitionError
+
+CATALOG_PATH = RUNS_DIR / "run_catalog.json"
+CATALOG_LOCK_PATH = RUNS_DIR / "run_catalog.lock"
+CATALOG_SCHEMA_VERSION = 1
+RECORD_FIELDS = (
+    "run_id",
+    "kind",
+    "base_ref",
+    "created_at",
+    "updated_at",
+    "phase",
+    "status",
+    "gate_verdict",
+    "workers",
+    "artifacts",
+    "report",
+    "path",
+)
+
+
+def _empty_catalog() -> dict[str, Any]:
+    return {"schema_version": CATALOG_SCHEMA_VERSION, "updated_at": "", "runs": {}}
+
+
+def load_catalog(*, path: Path | None = None) -> dict[str, Any]:
+    target = path or CATALOG_PATH
+    try:
+        payload = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _empty_catalog()
+    if not isinstance(payload, dict) or not isinstance(payload.get("runs"), dict):
+        return _empty_catalog()
+    return payload
+
+
+def _write_catalog(target: Path, catalog: Mapping[str, Any]) -> None:
+    # Readers never take the lock, so the file is always swapped in whole.
+    ensure_dir(target.parent)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp.write_text(json.dumps(catalog, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
+    os.replace(temp, target)
+
+
+def _locked(path: Path | None) -> FileLock:
+    lock_path = CATALOG_LOCK_PATH if path is None else path.with_name(path.name + ".lock")
+    return FileLock(
+        path=lock_path,
+        owner="catalog.update",
+        metadata={"catalog": lock_path.name},
+        wait_seconds=5.0,
+        heartbeat=False,
+    )
+
+
+def _merge(record: Mapping[str, Any], changes: Mapping[str, Any]) -> dict[str, Any]:
+    merged = dict(record)
+    for key, value in changes.items():
+        if key == "workers" and isinstance(value, Mapping):
+            workers = dict(merged.get("workers", {}))
+            workers.update({str(name): str(status) for name, status in value.items()})
+            merged["workers"] = dict(sorted(workers.items()))
+        elif value is not None:
+            merged[key] = value
+    return merged
+
+
+def update_run(run_id: str, changes: Mapping[str, Any], *, path: Path | None = None) -> dict[str, Any]:
+    target = path or CATALOG_PATH
+    now = iso_utc()
+    try:
+        with _locked(path):
+            catalog = load_catalog(path=target)
+            runs = catalog.setdefault("runs", {})
+            record = runs.get(run_id) or {
+                "run_id": run_id,
+                "kind": run_id.split("_", 1)[0] if "_" in run_id else "",
+                "base_ref": "",
+                "created_at": now,
+                "phase": "",
+                "status": "PENDING",
+                "gate_verdict": "",
+                "workers": {},
+                "artifacts": {"files": 0, "bytes": 0},
+                "report": "",
+                "path": (RUNS_DIR / run_id).as_posix(),
+            }
+            record = _merge(record, changes)
+            record["updated_at"] = now
+            runs[run_id] = {key: record[key] for key in RECORD_FIELDS if key in record}
+            catalog["updated_at"] = now
+            _write_catalog(target, catalog)
+    except LockAcquisitionError as exc:
+        raise TimeoutError(f"run catalog lock timeout: {exc}") from exc
+    return runs[run_id]
+
+
+def get_run(run_id: str, *, path: Path | None = None) -> dict[str, Any] | None:
+    record = load_catalog(path=path)["runs"].get(run_id)
+    return dict(record) if isinstance(record, Mapping) else None
+
+
+def list_runs(
+    *,
+    status: str | None = None,
+    kind: str | None = None,
+    gate: str | None = None,
+    since: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    path: Path | None = None,
+) -> dict[str, Any]:
+    records = [dict(item) for item in load_catalog(path=path)["runs"].values() if isinstance(item, Mapping)]
+    if status:
+        records = [item for item in records if str(item.get("status", "")).upper() == status.upper()]
+    if kind:
+        records = [item for item in records if str(item.get("kind", "")) == kind]
+    if gate:
+        records = [item for item in records if str(item.get("gate_verdict", "")).upper() == gate.upper()]
+    if since:
+        records = [item for item in records if str(item.get("updated_at", "")) >= since]
+    # Newest first; run ids break ties so paging is stable.
+    records.sort(key=lambda item: (str(item.get("updated_at", "")), str(item.get("run_id", ""))), reverse=True)
+    start = max(0, int(offset))
+    page = records[start : start + max(1, int(limit))]
+    return {
+        "total": len(records),
+        "offset": start,
+        "limit": max(1, int(limit)),
+        "runs": page,
+        "next_offset": start + len(page) if start + len(page) < len(records) else None,
+    }
+
+
+def artifact_stats(run_id: str) -> dict[str, int]:
+    files = 0
+    size = 0
+    for root, _dirs, names in os.walk(RUNS_DIR / run_id):
+        for name in names:
+            try:
+                size += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+            files += 1
+    return {"files": files, "bytes": size}
+
+
+def _status_of(path: Path) -> str:
+    try:
+        return str(read_json(path).get("status", "")).upper()
+    except (OSError, ValueError, AttributeError):
+        return ""
+
+
+def scan_run_dir(run_id: str) -> dict[str, Any]:
+    # Backfill for runs created before the catalog existed.
+    run_dir = RUNS_DIR / run_id
+    manifest: dict[str, Any] = {}
+    try:
+        manifest = dict(read_json(run_dir / "RUN_MANIFEST.json"))
+    except (OSError, ValueError, TypeError):
+        manifest = {}
+    gate = ""
+    try:
+        gate = str(read_json(run_dir / "VERIFY_MEANINGFUL_GATE.json").get("verdict", "")).upper()
+    except (OSError, ValueError, AttributeError):
+        gate = ""
+    workers = {worker: _status_of(run_dir / worker / "STATUS.json") for worker in run_workers(run_id) if (run_dir / worker).is_dir()}
+    report = run_dir / INTEGRATOR / "FINAL_REPORT.txt"
+    integrator_status = _status_of(run_dir / INTEGRATOR / "STATUS.json")
+    return {
+        "kind": str(manifest.get("kind", "")) or None,
+        "base_ref": str(manifest.get("base_ref", "")) or None,
+        "created_at": str(manifest.get("created_at", "")) or None,
+        "phase": "integrate" if integrator_status else ("init" if manifest else ""),
+        "status": integrator_status or str(manifest.get("status", "")) or "PENDING",
+        "gate_verdict": gate,
+        "workers": {name: status for name, status in workers.items() if status},
+        "artifacts": artifact_stats(run_id),
+        "report": report.as_posix() if report.exists() else "",
+        "path": run_dir.as_posix(),
+    }
+
+
+def rebuild_catalog(*, path: Path | None = None) -> dict[str, Any]:
+    rebuilt: list[str] = []
+    if RUNS_DIR.exists():
+        for entry in sorted(RUNS_DIR.iterdir(), key=lambda item: item.name):
+            if not entry.is_dir() or entry.name.startswith(("_", ".")) or entry.name == "locks":
+                continue
+            update_run(entry.name, scan_run_dir(entry.name), path=path)
+            rebuilt.append(entry.name)
+    return {"status": "PASS", "rebuilt": len(rebuilt), "run_ids": rebuilt, "catalog": (path or CATALOG_PATH).as_posix()}
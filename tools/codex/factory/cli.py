@@ -3,51 +3,77 @@ from __future__ import annotations
 import argparse
 import json
 import subprocess
+import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
 if __package__ in {None, ""}:
-    import sys
-
     ROOT = Path(__file__).resolve().parents[1]
     if str(ROOT) not in sys.path:
         sys.path.insert(0, str(ROOT))
 
-    from factory.common import INTEGRATOR, RUNS_DIR, WORKERS, ensure_dir, stable_sha256_text, write_json
-    from factory.config import load_factory_config
-    from factory.contracts import load_registry, scaffold_all_bundles, validate_run
+    from factory.artifacts import archive_run, gc, restore_run, seal_run
+    from factory.catalog import get_run, list_runs, rebuild_catalog, update_run
+    from factory.common import INTEGRATOR, RUNS_DIR, WORKERS, ensure_dir, run_workers, stable_sha256_text, validate_worker_id, worker_ids, write_json
+    from factory.config import config_snapshot, config_trace, enable_config_trace
+    from factory.contracts import load_registry, scaffold_all_bundles, validate_bundle, validate_run
     from factory.doctor import run_doctor
+    from factory.follow import follow_run
     from factory.integrator import integrate_run
     from factory.ledger import append_event, query_events, query_runs, replay_ledger, verify_ledger_signature
+    from factory.metrics import export_metrics
+    from factory.overlap import detect_worker_scope_violations, index_worker_overlaps
+    from factory.pipeline import SKIPPED, StageHandler, StageNode, StageResult, build_stage_graph, run_stage_graph, stage_results, wait_for_done_marker
     from factory.preflight import run_preflight
     from factory.run_id import next_run_identity
     from factory.schemas import contracts_check, validate_payload
+    from factory.sharding import assign_scope_locks
     from factory.smoke import run_smoke
     from factory.status_eval import BLOCKED, PASS, evaluate_status, make_check, status_exit_code
+    from factory.transport import AgentServer, LocalSubprocessTransport, TransportError, default_prompt, pack_bundle, run_transport, transport_for
+    from factory.tracing import current_span_id, export_chrome_trace, start_span, trace_span
     from factory.version import get_version
     from factory.worktrees import create_worktrees, open_worktrees, sync_worktrees, verify_worktrees
 else:
-    from .common import INTEGRATOR, RUNS_DIR, WORKERS, ensure_dir, stable_sha256_text, write_json
-    from .config import load_factory_config
-    from .contracts import load_registry, scaffold_all_bundles, validate_run
+    from .artifacts import archive_run, gc, restore_run, seal_run
+    from .catalog import get_run, list_runs, rebuild_catalog, update_run
+    from .common import INTEGRATOR, RUNS_DIR, WORKERS, ensure_dir, run_workers, stable_sha256_text, validate_worker_id, worker_ids, write_json
+    from .config import config_snapshot, config_trace, enable_config_trace
+    from .contracts import load_registry, scaffold_all_bundles, validate_bundle, validate_run
     from .doctor import run_doctor
+    from .follow import follow_run
     from .integrator import integrate_run
     from .ledger import append_event, query_events, query_runs, replay_ledger, verify_ledger_signature
+    from .metrics import export_metrics
+    from .overlap import detect_worker_scope_violations, index_worker_overlaps
+    from .pipeline import SKIPPED, StageHandler, StageNode, StageResult, build_stage_graph, run_stage_graph, stage_results, wait_for_done_marker
     from .preflight import run_preflight
     from .run_id import next_run_identity
     from .schemas import contracts_check, validate_payload
+    from .sharding import assign_scope_locks
     from .smoke import run_smoke
     from .status_eval import BLOCKED, PASS, evaluate_status, make_check, status_exit_code
+    from .transport import AgentServer, LocalSubprocessTransport, TransportError, default_prompt, pack_bundle, run_transport, transport_for
+    from .tracing import current_span_id, export_chrome_trace, start_span, trace_span
     from .version import get_version
     from .worktrees import create_worktrees, open_worktrees, sync_worktrees, verify_worktrees
 
 
-def _parse_workers(raw: str | None) -> list[str]:
-    if raw is None or not raw.strip():
-        return list(WORKERS)
-    parsed = [item.strip() for item in raw.split(",") if item.strip()]
-    return parsed or list(WORKERS)
+def _parse_workers(raw: str | None, *, run_id: str | None = None, count: int | None = None) -> list[str]:
+    parsed = [validate_worker_id(item) for item in (raw or "").split(",") if item.strip()]
+    if parsed:
+        if len(set(parsed)) != len(parsed):
+            raise ValueError(f"duplicate worker ids: {raw}")
+        return parsed
+    if count is not None:
+        return worker_ids(count)
+    return run_workers(run_id) if run_id else list(WORKERS)
+
+
+def _parse_targets(raw: str | None) -> list[str]:
+    return [item.strip() for item in (raw or "").split(",") if item.strip()]
 
 
 def _emit(payload: dict[str, Any], json_out: str | None = None) -> None:
@@ -65,14 +91,23 @@ def _status_from_payload(payload: dict[str, Any], *, fallback: str = BLOCKED) ->
 
 
 def _load_runtime_config(args: argparse.Namespace, *, cli_overrides: dict[str, Any] | None = None) -> dict[str, Any]:
-    return load_factory_config(
-        config_path=args.config,
-        cli_overrides=cli_overrides or {},
-        strict=True,
-    )
+    snapshot = config_snapshot(config_path=args.config, cli_overrides=cli_overrides or {}, strict=True)
+    args.config_snapshot = snapshot
+    if snapshot.errors:
+        joined = "\n".join(snapshot.errors)
+        raise ValueError(f"factory config invalid:\n{joined}")
+    return snapshot.as_dict()
 
 
-def _init_run(kind: str, explicit_run_id: str | None, *, base_ref: str, config: dict[str, Any]) -> dict[str, Any]:
+def _init_run(
+    kind: str,
+    explicit_run_id: str | None,
+    *,
+    base_ref: str,
+    config: dict[str, Any],
+    workers: list[str] | None = None,
+) -> dict[str, Any]:
+    started = time.perf_counter()
     identity = None
     run_id = explicit_run_id
     if run_id is None:
@@ -89,7 +124,7 @@ def _init_run(kind: str, explicit_run_id: str | None, *, base_ref: str, config:
         "base_ref": base_ref,
         "base_ref_hash": identity.base_ref_hash if identity else "",
         "status": "PENDING",
-        "workers": list(WORKERS),
+        "workers": list(workers or WORKERS),
         "integrator": INTEGRATOR,
         "created_at": identity.stamp if identity else "",
         "paths": {
@@ -122,8 +157,8 @@ def _init_run(kind: str, explicit_run_id: str | None, *, base_ref: str, config:
             "run_id": run_id,
             "event_type": "RUN_START",
             "actor": INTEGRATOR,
-            "parent_event_id": "",
-            "duration_ms": 0,
+            "parent_event_id": current_span_id(),
+            "duration_ms": int((time.perf_counter() - started) * 1000),
             "file_counts": {},
             "hashes": {"manifest_sha256": stable_sha256_text(json.dumps(manifest, sort_keys=True))},
             "rc": status_exit_code(evaluation.status),
@@ -137,6 +172,18 @@ def _init_run(kind: str, explicit_run_id: str | None, *, base_ref: str, config:
         }
     )
 
+    update_run(
+        run_id,
+        {
+            "kind": kind,
+            "base_ref": base_ref,
+            "created_at": manifest.get("created_at", "") or None,
+            "phase": "init",
+            "status": "PENDING" if evaluation.status == PASS else evaluation.status,
+            "path": run_dir.as_posix(),
+        },
+    )
+
     return {
         "status": evaluation.status,
         "run_id": run_id,
@@ -146,6 +193,14 @@ def _init_run(kind: str, explicit_run_id: str | None, *, base_ref: str, config:
     }
 
 
+def _traced_preflight(run_id: str) -> dict[str, Any]:
+    with trace_span("preflight", run_id=run_id, event_type="PREFLIGHT", details={"kind": "factory"}) as span:
+        payload = run_preflight(run_id)
+        status = _status_from_payload(payload)
+        span.set(rc=status_exit_code(status), details={"status": status}, file_counts={"checks": len(payload.get("checks", []))})
+    return {**payload, "status": status}
+
+
 def _launch_run(
     *,
     run_id: str | None,
@@ -154,54 +209,76 @@ def _launch_run(
     dry_run: bool,
     include_preflight: bool,
     config: dict[str, Any],
+    shard_targets: list[str] | None = None,
 ) -> dict[str, Any]:
-    init_result = _init_run("factory", run_id, base_ref=base_ref, config=config)
-    chosen_run_id = str(init_result["run_id"])
-
-    preflight = run_preflight(chosen_run_id) if include_preflight else {"status": PASS, "checks": [], "run_id": chosen_run_id}
-    worktrees = create_worktrees(
-        chosen_run_id,
-        workers=workers,
-        base_ref=base_ref,
-        dry_run=dry_run,
-    )
-    bundles = scaffold_all_bundles(chosen_run_id, workers=workers)
-
-    required_checks = [
-        make_check("init_run", rc=0 if _status_from_payload(init_result) == PASS else 2, required=True, actor=INTEGRATOR),
-        make_check("preflight", rc=0 if _status_from_payload(preflight) == PASS else 2, required=True, actor=INTEGRATOR),
-        make_check("worktrees_create", rc=0 if _status_from_payload(worktrees) == PASS else 2, required=True, actor=INTEGRATOR),
-        make_check("bundle_scaffold", rc=0, required=True, actor=INTEGRATOR),
-    ]
-
-    evaluation = evaluate_status(
-        required_checks=required_checks,
-        blockers=[],
-        schema_errors=[],
-        internal_errors=[],
-    )
-
-    append_event(
-        {
-            "schema_version": 1,
-            "run_id": chosen_run_id,
-            "event_type": "WORKTREE_CREATE",
-            "actor": INTEGRATOR,
-            "parent_event_id": "",
-            "duration_ms": 0,
-            "file_counts": {"workers": len(workers)},
-            "hashes": {},
-            "rc": status_exit_code(evaluation.status),
-            "details": {
-                "kind": "factory",
-                "status": evaluation.status,
-                "run_id": chosen_run_id,
-                "dry_run": bool(dry_run),
-                "workers": workers,
-                "worktrees_blocked": int(worktrees.get("blocked", 0)),
-            },
-        }
-    )
+    span = start_span("launch", run_id=run_id or "", event_type="LAUNCH_RESULT", details={"kind": "factory"})
+    try:
+        init_result = _init_run("factory", run_id, base_ref=base_ref, config=config, workers=workers)
+        chosen_run_id = str(init_result["run_id"])
+        # A generated run id is only known once the run is initialised.
+        span.run_id = chosen_run_id
+
+        preflight = _traced_preflight(chosen_run_id) if include_preflight else {"status": PASS, "checks": [], "run_id": chosen_run_id}
+        with trace_span("worktree_create", run_id=chosen_run_id, event_type="WORKTREE_CREATE", details={"kind": "factory"}) as worktree_span:
+            worktrees = create_worktrees(
+                chosen_run_id,
+                workers=workers,
+                base_ref=base_ref,
+                dry_run=dry_run,
+            )
+            worktree_span.set(
+                rc=status_exit_code(_status_from_payload(worktrees)),
+                details={
+                    "status": _status_from_payload(worktrees),
+                    "run_id": chosen_run_id,
+                    "dry_run": bool(dry_run),
+                    "workers": workers,
+                    "worktrees_blocked": int(worktrees.get("blocked", 0)),
+                },
+                file_counts={"workers": len(workers)},
+            )
+        bundles = scaffold_all_bundles(chosen_run_id, workers=workers)
+        # Shard targets replace the scaffold's placeholder scope locks with
+        # disjoint, size-balanced path ownership per worker.
+        sharding = assign_scope_locks(chosen_run_id, workers, shard_targets) if shard_targets else None
+
+        required_checks = [
+            make_check("init_run", rc=0 if _status_from_payload(init_result) == PASS else 2, required=True, actor=INTEGRATOR),
+            make_check("preflight", rc=0 if _status_from_payload(preflight) == PASS else 2, required=True, actor=INTEGRATOR),
+            make_check("worktrees_create", rc=0 if _status_from_payload(worktrees) == PASS else 2, required=True, actor=INTEGRATOR),
+            make_check("bundle_scaffold", rc=0, required=True, actor=INTEGRATOR),
+        ]
+        if sharding is not None:
+            required_checks.append(
+                make_check(
+                    "scope_sharding",
+                    rc=0 if _status_from_payload(sharding) == PASS else 2,
+                    required=True,
+                    detail=str(sharding.get("detail", "")),
+                    actor=INTEGRATOR,
+                )
+            )
+
+        evaluation = evaluate_status(
+            required_checks=required_checks,
+            blockers=[],
+            schema_errors=[],
+            internal_errors=[],
+        )
+        span.set(
+            rc=status_exit_code(evaluation.status),
+            details={"status": evaluation.status, "run_id": chosen_run_id, "dry_run": bool(dry_run), "workers": workers},
+            file_counts={"workers": len(workers)},
+        )
+        update_run(
+            chosen_run_id,
+            {"phase": "launch", "status": "RUNNING" if evaluation.status == PASS else evaluation.status, "workers": {worker: "PENDING" for worker in workers}},
+        )
+    except Exception as exc:
+        span.set(rc=1, details={"status": "FAIL", "error": str(exc)})
+        raise
+    finally:
+        span.finish()
 
     return {
         "status": evaluation.status,
@@ -210,6 +287,7 @@ def _launch_run(
         "preflight": preflight,
         "worktrees": worktrees,
         "bundles": bundles,
+        **({"sharding": sharding} if sharding is not None else {}),
         "required_checks": [dict(item) for item in evaluation.required_checks],
     }
 
@@ -233,6 +311,14 @@ def cmd_doctor(args: argparse.Namespace) -> int:
     return status_exit_code(_status_from_payload(payload))
 
 
+def cmd_metrics(args: argparse.Namespace) -> int:
+    payload = export_metrics(out_dir=Path(args.out_dir) if args.out_dir else None, reset=args.reset)
+    if args.summary_only:
+        payload = {key: value for key, value in payload.items() if key != "metrics"}
+    _emit(payload, args.json_out)
+    return status_exit_code(_status_from_payload(payload))
+
+
 def cmd_init_run(args: argparse.Namespace) -> int:
     config = _load_runtime_config(args, cli_overrides={})
     payload = _init_run(args.kind, args.run_id, base_ref=args.base_ref, config=config)
@@ -247,7 +333,7 @@ def cmd_preflight(args: argparse.Namespace) -> int:
 
 
 def cmd_worktrees(args: argparse.Namespace) -> int:
-    workers = _parse_workers(args.workers)
+    workers = _parse_workers(args.workers, run_id=args.run_id)
     if args.action == "create":
         payload = create_worktrees(args.run_id, workers=workers, base_ref=args.base_ref, dry_run=args.dry_run)
     elif args.action == "verify":
@@ -263,7 +349,7 @@ def cmd_worktrees(args: argparse.Namespace) -> int:
 
 
 def cmd_bundle_init(args: argparse.Namespace) -> int:
-    workers = _parse_workers(args.workers)
+    workers = _parse_workers(args.workers, run_id=args.run_id)
     payload = scaffold_all_bundles(args.run_id, workers=workers)
     payload["status"] = PASS
     _emit(payload, args.json_out)
@@ -271,14 +357,15 @@ def cmd_bundle_init(args: argparse.Namespace) -> int:
 
 
 def cmd_bundle_validate(args: argparse.Namespace) -> int:
-    workers = _parse_workers(args.workers)
+    workers = _parse_workers(args.workers, run_id=args.run_id)
     payload = validate_run(args.run_id, workers=workers)
+    update_run(args.run_id, {"workers": {str(item.get("worker", "")): str(item.get("status", BLOCKED)) for item in payload["results"] if item.get("worker") in workers}})
     _emit(payload, args.json_out)
     return status_exit_code(_status_from_payload(payload))
 
 
 def cmd_integrate(args: argparse.Namespace) -> int:
-    workers = _parse_workers(args.workers)
+    workers = _parse_workers(args.workers, run_id=args.run_id)
     run_overrides: dict[str, Any] = {}
     if args.strict_collision_mode is not None:
         run_overrides["strict_collision_mode"] = bool(args.strict_collision_mode)
@@ -288,7 +375,7 @@ def cmd_integrate(args: argparse.Namespace) -> int:
         args,
         cli_overrides={"run": run_overrides} if run_overrides else {},
     )
-    payload = integrate_run(args.run_id, workers=workers, config=config)
+    payload = integrate_run(args.run_id, workers=workers, config=config, full=args.full)
     _emit(payload, args.json_out)
     return status_exit_code(_status_from_payload(payload))
 
@@ -297,18 +384,163 @@ def cmd_launch(args: argparse.Namespace) -> int:
     config = _load_runtime_config(args, cli_overrides={"run": {"base_ref": args.base_ref}})
     payload = _launch_run(
         run_id=args.run_id,
-        workers=_parse_workers(args.workers),
+        workers=_parse_workers(args.workers, count=args.worker_count),
         base_ref=args.base_ref,
         dry_run=args.dry_run,
         include_preflight=True,
         config=config,
+        shard_targets=_parse_targets(args.shard_targets),
     )
     _emit(payload, args.json_out)
     return status_exit_code(_status_from_payload(payload))
 
 
+def _oneshot_handlers(
+    run_id: str,
+    *,
+    workers: list[str],
+    base_ref: str,
+    dry_run: bool,
+    config: dict[str, Any],
+    shard_targets: list[str] | None = None,
+) -> dict[str, StageHandler]:
+    pipeline_cfg = dict(config.get("pipeline", {}))
+
+    def _preflight(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        return _traced_preflight(run_id)
+
+    def _launch(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        return _launch_run(
+            run_id=run_id,
+            workers=workers,
+            base_ref=base_ref,
+            dry_run=dry_run,
+            include_preflight=False,
+            config=config,
+            shard_targets=shard_targets,
+        )
+
+    def _worker_done(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        if dry_run or not bool(pipeline_cfg.get("require_done_marker", False)):
+            return {"status": PASS, "worker": node.worker, "detail": "DONE.marker not required"}
+        return wait_for_done_marker(
+            run_id,
+            node.worker,
+            timeout_seconds=float(pipeline_cfg.get("done_timeout_seconds", 7200)),
+            poll_seconds=float(pipeline_cfg.get("poll_seconds", 0.5)),
+        )
+
+    def _bundle_validate(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        with trace_span(
+            "bundle_validate",
+            run_id=run_id,
+            actor=node.worker,
+            event_type="BUNDLE_VALIDATED",
+            details={"kind": "factory", "worker": node.worker},
+        ) as span:
+            payload = validate_bundle(run_id, node.worker)
+            status = _status_from_payload(payload)
+            span.set(rc=status_exit_code(status), details={"status": status}, file_counts={"errors": len(payload.get("errors", []))})
+        update_run(run_id, {"workers": {node.worker: status}})
+        return payload
+
+    def _integrator_validate(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        return validate_bundle(run_id, INTEGRATOR)
+
+    def _scope_check(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        # Violations are findings for the merge step, not a reason to stop the graph.
+        violations = detect_worker_scope_violations(run_id, node.worker)
+        return {"status": PASS, "worker": node.worker, "violations": violations, "blocked": len(violations)}
+
+    def _overlap_index(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        return {"status": PASS, "index": index_worker_overlaps(run_id, node.worker)}
+
+    def _integrate(node: StageNode, results: Mapping[str, StageResult]) -> dict[str, Any]:
+        precomputed = {
+            "validations": {item.worker: item.payload for item in stage_results(results, "bundle_validate")},
+            "overlap_indexes": {item.worker: item.payload["index"] for item in stage_results(results, "overlap_index")},
+            "scope_violations": {item.worker: item.payload["violations"] for item in stage_results(results, "scope_check")},
+        }
+        return integrate_run(run_id, workers=workers, config=config, precomputed=precomputed)
+
+    return {
+        "preflight": _preflight,
+        "launch": _launch,
+        "worker_done": _worker_done,
+        "bundle_validate": _bundle_validate,
+        "integrator_validate": _integrator_validate,
+        "scope_check": _scope_check,
+        "overlap_index": _overlap_index,
+        "integrate": _integrate,
+    }
+
+
+def _bundle_validate_summary(run_id: str, results: Mapping[str, StageResult]) -> dict[str, Any] | None:
+    ran = [item for item in stage_results(results, "bundle_validate") + stage_results(results, "integrator_validate") if item.status != SKIPPED]
+    if not ran:
+        return None
+    entries = [item.payload for item in ran]
+    blocked = [entry for entry in entries if entry.get("status") != PASS]
+    return {
+        "run_id": run_id,
+        "status": PASS if not blocked else BLOCKED,
+        "results": entries,
+        "blocked": len(blocked),
+    }
+
+
+def _oneshot_summary(run_id: str, workers: list[str], results: Mapping[str, StageResult]) -> dict[str, Any]:
+    stage_payloads: dict[str, dict[str, Any]] = {}
+    stage_checks: list[dict[str, Any]] = []
+    blockers: list[str] = []
+    for name, label in (("preflight", "preflight"), ("launch", "launch")):
+        ran = [item for item in stage_results(results, name) if item.status != SKIPPED]
+        if not ran:
+            continue
+        stage_payloads[name] = ran[0].payload
+        stage_checks.append(make_check(name, rc=0 if ran[0].status == PASS else 2, required=True, actor=INTEGRATOR))
+        if ran[0].status != PASS:
+            blockers.append(f"{label} blocked")
+    pending_workers = [item.worker for item in stage_results(results, "worker_done") if item.status not in {PASS, SKIPPED}]
+    if pending_workers:
+        stage_checks.append(
+            make_check("worker_done", rc=2, required=True, detail=f"pending={','.join(pending_workers)}", actor=INTEGRATOR)
+        )
+        blockers.append("worker DONE markers missing")
+    validation_summary = _bundle_validate_summary(run_id, results)
+    if validation_summary is not None:
+        stage_payloads["bundle_validate"] = validation_summary
+        stage_checks.append(
+            make_check("bundle_validate", rc=0 if validation_summary["status"] == PASS else 2, required=True, actor=INTEGRATOR)
+        )
+        if validation_summary["status"] != PASS:
+            blockers.append("bundle validation blocked")
+
+    integrate_results = [item for item in stage_results(results, "integrate") if item.status != SKIPPED]
+    integrate_payload = integrate_results[0].payload if integrate_results else None
+    if integrate_payload is not None:
+        stage_payloads["integrate"] = integrate_payload
+        stage_checks.append(
+            make_check("integrate", rc=0 if _status_from_payload(integrate_payload) == PASS else 2, required=True, actor=INTEGRATOR)
+        )
+
+    evaluation = evaluate_status(required_checks=stage_checks, blockers=blockers, schema_errors=[], internal_errors=[])
+    final_report = str(integrate_payload.get("report", "")) if integrate_payload is not None else ""
+
+    return {
+        "status": evaluation.status,
+        "run_id": run_id,
+        "stages": stage_payloads,
+        "pipeline": {"nodes": [results[key].as_dict() for key in sorted(results)]},
+        "summary": {
+            "final_report": final_report,
+            "required_checks": [dict(item) for item in evaluation.required_checks],
+        },
+    }
+
+
 def cmd_oneshot(args: argparse.Namespace) -> int:
-    workers = _parse_workers(args.workers)
+    workers = _parse_workers(args.workers, run_id=args.run_id, count=args.worker_count)
     run_overrides: dict[str, Any] = {"base_ref": args.base_ref}
     if args.strict_collision_mode is not None:
         run_overrides["strict_collision_mode"] = bool(args.strict_collision_mode)
@@ -319,143 +551,41 @@ def cmd_oneshot(args: argparse.Namespace) -> int:
         cli_overrides={"run": run_overrides},
     )
     run_id = args.run_id or next_run_identity("factory", base_ref=args.base_ref).run_id
+    pipeline_cfg = dict(config.get("pipeline", {}))
 
-    stage_payloads: dict[str, dict[str, Any]] = {}
-    stage_checks: list[dict[str, Any]] = []
-
-    preflight_payload = run_preflight(run_id)
-    append_event(
-        {
-            "schema_version": 1,
-            "run_id": run_id,
-            "event_type": "PREFLIGHT",
-            "actor": INTEGRATOR,
-            "parent_event_id": "",
-            "duration_ms": 0,
-            "file_counts": {"checks": len(preflight_payload.get("checks", []))},
-            "hashes": {},
-            "rc": status_exit_code(_status_from_payload(preflight_payload)),
-            "details": {"status": _status_from_payload(preflight_payload), "kind": "factory"},
-        }
-    )
-    stage_payloads["preflight"] = preflight_payload
-    stage_checks.append(make_check("preflight", rc=0 if _status_from_payload(preflight_payload) == PASS else 2, required=True, actor=INTEGRATOR))
-    if _status_from_payload(preflight_payload) != PASS:
-        evaluation = evaluate_status(required_checks=stage_checks, blockers=["preflight blocked"], schema_errors=[], internal_errors=[])
-        payload = {
-            "status": evaluation.status,
-            "run_id": run_id,
-            "stages": stage_payloads,
-            "summary": {
-                "final_report": "",
-                "required_checks": [dict(item) for item in evaluation.required_checks],
-            },
-        }
-        _emit(payload, args.json_out)
-        return evaluation.exit_code
-
-    launch_payload = _launch_run(
-        run_id=run_id,
+    nodes = build_stage_graph(dict(pipeline_cfg.get("stages", {})), workers)
+    handlers = _oneshot_handlers(
+        run_id,
         workers=workers,
         base_ref=args.base_ref,
         dry_run=args.dry_run,
-        include_preflight=False,
         config=config,
+        shard_targets=_parse_targets(args.shard_targets),
     )
-    stage_payloads["launch"] = launch_payload
-    stage_checks.append(make_check("launch", rc=0 if _status_from_payload(launch_payload) == PASS else 2, required=True, actor=INTEGRATOR))
-    if _status_from_payload(launch_payload) != PASS:
-        evaluation = evaluate_status(required_checks=stage_checks, blockers=["launch blocked"], schema_errors=[], internal_errors=[])
-        payload = {
-            "status": evaluation.status,
-            "run_id": run_id,
-            "stages": stage_payloads,
-            "summary": {
-                "final_report": "",
-                "required_checks": [dict(item) for item in evaluation.required_checks],
-            },
-        }
-        _emit(payload, args.json_out)
-        return evaluation.exit_code
-
-    validate_payload_result = validate_run(run_id, workers=workers)
-    append_event(
-        {
-            "schema_version": 1,
-            "run_id": run_id,
-            "event_type": "BUNDLE_VALIDATED",
-            "actor": INTEGRATOR,
-            "parent_event_id": "",
-            "duration_ms": 0,
-            "file_counts": {"workers": len(workers)},
-            "hashes": {},
-            "rc": status_exit_code(_status_from_payload(validate_payload_result)),
-            "details": {"status": _status_from_payload(validate_payload_result), "kind": "factory"},
-        }
-    )
-    stage_payloads["bundle_validate"] = validate_payload_result
-    stage_checks.append(
-        make_check(
-            "bundle_validate",
-            rc=0 if _status_from_payload(validate_payload_result) == PASS else 2,
-            required=True,
-            actor=INTEGRATOR,
+    with trace_span("oneshot", run_id=run_id, event_type="ONESHOT_SUMMARY", details={"kind": "factory"}) as span:
+        results = run_stage_graph(
+            run_id,
+            nodes,
+            handlers,
+            max_parallel=int(pipeline_cfg.get("max_parallel", 4)),
+            waiting_stages=("worker_done",),
         )
-    )
-    if _status_from_payload(validate_payload_result) != PASS:
-        evaluation = evaluate_status(required_checks=stage_checks, blockers=["bundle validation blocked"], schema_errors=[], internal_errors=[])
-        payload = {
-            "status": evaluation.status,
-            "run_id": run_id,
-            "stages": stage_payloads,
-            "summary": {
-                "final_report": "",
-                "required_checks": [dict(item) for item in evaluation.required_checks],
-            },
-        }
-        _emit(payload, args.json_out)
-        return evaluation.exit_code
-
-    integrate_payload = integrate_run(run_id, workers=workers, config=config)
-    stage_payloads["integrate"] = integrate_payload
-    stage_checks.append(make_check("integrate", rc=0 if _status_from_payload(integrate_payload) == PASS else 2, required=True, actor=INTEGRATOR))
-
-    evaluation = evaluate_status(required_checks=stage_checks, blockers=[], schema_errors=[], internal_errors=[])
-    final_report = str(integrate_payload.get("report", ""))
-
-    append_event(
-        {
-            "schema_version": 1,
-            "run_id": run_id,
-            "event_type": "ONESHOT_SUMMARY",
-            "actor": INTEGRATOR,
-            "parent_event_id": "",
-            "duration_ms": 0,
-            "file_counts": {"workers": len(workers)},
-            "hashes": {"summary_sha256": stable_sha256_text(json.dumps(stage_payloads, sort_keys=True))},
-            "rc": evaluation.exit_code,
-            "details": {
-                "kind": "factory",
-                "status": evaluation.status,
+        payload = _oneshot_summary(run_id, workers, results)
+        span.set(
+            rc=status_exit_code(payload["status"]),
+            details={
+                "status": payload["status"],
                 "run_id": run_id,
                 "workers": workers,
-                "final_report": final_report,
+                "final_report": payload["summary"]["final_report"],
                 "dry_run": bool(args.dry_run),
             },
-        }
-    )
-
-    payload = {
-        "status": evaluation.status,
-        "run_id": run_id,
-        "stages": stage_payloads,
-        "summary": {
-            "final_report": final_report,
-            "required_checks": [dict(item) for item in evaluation.required_checks],
-        },
-    }
+            file_counts={"workers": len(workers)},
+            hashes={"summary_sha256": stable_sha256_text(json.dumps(payload["stages"], sort_keys=True))},
+        )
+    update_run(run_id, {"phase": "oneshot", "status": payload["status"]})
     _emit(payload, args.json_out)
-    return evaluation.exit_code
+    return status_exit_code(payload["status"])
 
 
 def cmd_ledger(args: argparse.Namespace) -> int:
@@ -489,6 +619,24 @@ def cmd_ledger_replay(args: argparse.Namespace) -> int:
     return status_exit_code(_status_from_payload(payload, fallback=PASS))
 
 
+def cmd_trace(args: argparse.Namespace) -> int:
+    trace = export_chrome_trace(args.run_id)
+    count = int(trace["otherData"]["events"])
+    target = Path(args.out) if args.out else RUNS_DIR / args.run_id / "logs" / "trace.json"
+    if count:
+        write_json(target, trace)
+    payload = {
+        "status": PASS if count else BLOCKED,
+        "run_id": args.run_id,
+        "path": target.as_posix() if count else "",
+        "events": count,
+        "spans": len([item for item in trace["traceEvents"] if item.get("ph") == "X"]),
+        "detail": "" if count else "no ledger events for run",
+    }
+    _emit(payload, args.json_out)
+    return status_exit_code(payload["status"])
+
+
 def cmd_self_test(args: argparse.Namespace) -> int:
     payload = run_smoke(args.run_id)
     _emit(payload, args.json_out)
@@ -526,8 +674,15 @@ def cmd_open_report(args: argparse.Namespace) -> int:
     return status_exit_code(_status_from_payload(payload, fallback=PASS))
 
 
+def _catalog_run_dir(run_id: str) -> tuple[Path, dict[str, Any] | None]:
+    record = get_run(run_id)
+    if record is not None and record.get("path"):
+        return Path(str(record["path"])), record
+    return RUNS_DIR / run_id, None
+
+
 def cmd_open_run(args: argparse.Namespace) -> int:
-    run_dir = RUNS_DIR / args.run_id
+    run_dir, _record = _catalog_run_dir(args.run_id)
     if not run_dir.exists():
         payload = {"status": BLOCKED, "detail": f"run folder does not exist: {run_dir.as_posix()}"}
         _emit(payload, args.json_out)
@@ -548,7 +703,11 @@ def cmd_open_run(args: argparse.Namespace) -> int:
 
 
 def cmd_print_report(args: argparse.Namespace) -> int:
-    report = RUNS_DIR / args.run_id / INTEGRATOR / "FINAL_REPORT.txt"
+    record = get_run(args.run_id)
+    if record is not None and record.get("report"):
+        report = Path(str(record["report"]))
+    else:
+        report = RUNS_DIR / args.run_id / INTEGRATOR / "FINAL_REPORT.txt"
     if not report.exists():
         payload = {"status": BLOCKED, "detail": f"report missing: {report.as_posix()}", "report": report.as_posix()}
         _emit(payload, args.json_out)
@@ -556,12 +715,14 @@ def cmd_print_report(args: argparse.Namespace) -> int:
     lines = report.read_text(encoding="utf-8").splitlines()
     summary = [line for line in lines if line.startswith("- Final status:") or line.startswith("- Worker bundles processed:")]
     payload = {"status": PASS, "report": report.as_posix(), "summary": summary}
+    if record is not None:
+        payload["catalog"] = record
     _emit(payload, args.json_out)
     return 0
 
 
 def cmd_watch(args: argparse.Namespace) -> int:
-    run_dir = RUNS_DIR / args.run_id
+    run_dir, record = _catalog_run_dir(args.run_id)
     if not run_dir.exists():
         payload = {
             "status": BLOCKED,
@@ -571,6 +732,12 @@ def cmd_watch(args: argparse.Namespace) -> int:
         _emit(payload, args.json_out)
         return status_exit_code(payload["status"])
 
+    if args.follow:
+        final: dict[str, Any] = {"status": BLOCKED}
+        for final in follow_run(args.run_id, run_dir, offset=args.offset, timeout_seconds=args.timeout_seconds or None):
+            print(json.dumps(final, sort_keys=True), flush=True)
+        return status_exit_code(_status_from_payload(final))
+
     z_status_path = run_dir / INTEGRATOR / "STATUS.json"
     gate_path = run_dir / "VERIFY_MEANINGFUL_GATE.json"
     integrator_status = BLOCKED
@@ -625,11 +792,169 @@ def cmd_watch(args: argparse.Namespace) -> int:
             "exists": gate_path.exists(),
             "payload": gate_payload,
         },
+        "catalog": record or {},
     }
     _emit(payload, args.json_out)
     return status_exit_code(_status_from_payload(payload))
 
 
+def cmd_runs(args: argparse.Namespace) -> int:
+    if args.action == "rebuild":
+        payload = rebuild_catalog()
+        _emit(payload, args.json_out)
+        return 0
+    if args.action == "show":
+        if not args.run_id:
+            payload = {"status": BLOCKED, "detail": "--run-id is required for runs show"}
+            _emit(payload, args.json_out)
+            return status_exit_code(payload["status"])
+        record = get_run(args.run_id)
+        payload = {"status": PASS if record else BLOCKED, "run_id": args.run_id, "run": record or {}}
+        if record is None:
+            payload["detail"] = "run not in catalog (try: runs rebuild)"
+        _emit(payload, args.json_out)
+        return status_exit_code(payload["status"])
+    listing = list_runs(
+        status=args.status,
+        kind=args.kind,
+        gate=args.gate,
+        since=args.since,
+        limit=args.limit,
+        offset=args.offset,
+    )
+    _emit({"status": PASS, **listing}, args.json_out)
+    return 0
+
+
+def cmd_store(args: argparse.Namespace) -> int:
+    store_cfg = dict(_load_runtime_config(args).get("artifacts", {}))
+    if args.action == "gc":
+        payload = gc(
+            dry_run=args.dry_run,
+            codec=str(store_cfg.get("codec", "lzma")),
+            compress_threshold=int(store_cfg.get("compress_threshold_bytes", 65536)),
+        )
+        _emit(payload, args.json_out)
+        return 0
+    if not args.run_id:
+        payload = {"status": BLOCKED, "detail": f"--run-id is required for store {args.action}"}
+        _emit(payload, args.json_out)
+        return status_exit_code(payload["status"])
+    if not (RUNS_DIR / args.run_id).is_dir():
+        payload = {"status": BLOCKED, "run_id": args.run_id, "detail": "run folder not found"}
+        _emit(payload, args.json_out)
+        return status_exit_code(payload["status"])
+    if args.action == "seal":
+        payload = seal_run(args.run_id)
+    elif args.action == "archive":
+        payload = archive_run(args.run_id)
+    else:
+        payload = restore_run(args.run_id, hardlink=bool(store_cfg.get("hardlink", False)))
+    _emit(payload, args.json_out)
+    return status_exit_code(_status_from_payload(payload))
+
+
+def _transport_config(args: argparse.Namespace) -> dict[str, Any]:
+    overrides: dict[str, Any] = {}
+    if args.kind:
+        overrides["kind"] = args.kind
+    if args.agent:
+        overrides["default_agent"] = args.agent
+    return _load_runtime_config(args, cli_overrides={"transport": overrides} if overrides else {})
+
+
+def _worker_prompts(prompt_dir: str | None, workers: list[str]) -> dict[str, str]:
+    if not prompt_dir:
+        return {}
+    prompts: dict[str, str] = {}
+    for worker in workers:
+        path = Path(prompt_dir) / f"{worker}.md"
+        if path.is_file():
+            prompts[worker] = path.read_text(encoding="utf-8")
+    return prompts
+
+
+def cmd_transport(args: argparse.Namespace) -> int:
+    workers = _parse_workers(args.workers, run_id=args.run_id)
+    config = _transport_config(args)
+    transport_cfg = dict(config.get("transport", {}))
+    poll_seconds = float(transport_cfg.get("poll_seconds", 1.0))
+    timeout_seconds = float(args.timeout_seconds if args.timeout_seconds is not None else transport_cfg.get("timeout_seconds", 7200))
+    try:
+        transports = {worker: transport_for(config, worker) for worker in workers}
+    except TransportError as exc:
+        payload = {"status": BLOCKED, "run_id": args.run_id, "detail": str(exc)}
+        _emit(payload, args.json_out)
+        return status_exit_code(payload["status"])
+    prompts = _worker_prompts(args.prompt_dir, workers)
+
+    if args.action == "run":
+        payload = run_transport(
+            args.run_id,
+            workers,
+            transports,
+            prompts=prompts,
+            poll_seconds=poll_seconds,
+            timeout_seconds=timeout_seconds or None,
+        )
+        update_run(args.run_id, {"workers": {item["worker"]: item["status"] for item in payload["workers"]}})
+        _emit(payload, args.json_out)
+        return status_exit_code(payload["status"])
+
+    if args.action == "watch":
+        # One JSON object per line as states change, for piping into other tools.
+        for worker in workers:
+            for event in transports[worker].watch(args.run_id, worker, poll_seconds=poll_seconds, timeout_seconds=timeout_seconds or None):
+                print(json.dumps(event, sort_keys=True), flush=True)
+        return 0
+
+    results: list[dict[str, Any]] = []
+    for worker in workers:
+        transport = transports[worker]
+        try:
+            if args.action == "dispatch":
+                seed, seed_sha256 = pack_bundle(RUNS_DIR / args.run_id / worker)
+                prompt = prompts.get(worker) or default_prompt(args.run_id, worker)
+                result = transport.dispatch(args.run_id, worker, prompt, seed=seed, seed_sha256=seed_sha256)
+            elif args.action == "status":
+                result = transport.status(args.run_id, worker)
+            elif args.action == "cancel":
+                result = transport.cancel(args.run_id, worker)
+            else:
+                result = transport.fetch_bundle(args.run_id, worker)
+            results.append({"status": PASS, **result})
+        except TransportError as exc:
+            results.append({"status": BLOCKED, "worker": worker, "detail": str(exc)})
+    payload = {
+        "status": PASS if all(item["status"] == PASS for item in results) else BLOCKED,
+        "run_id": args.run_id,
+        "action": args.action,
+        "workers": results,
+    }
+    _emit(payload, args.json_out)
+    return status_exit_code(payload["status"])
+
+
+def cmd_agent(args: argparse.Namespace) -> int:
+    config = _load_runtime_config(args)
+    command = list(dict(config.get("transport", {})).get("command", []))
+    work_root = Path(args.work_root) if args.work_root else RUNS_DIR / "_agent"
+    try:
+        server = AgentServer(LocalSubprocessTransport(command, work_root=work_root), host=args.host, port=args.port)
+    except (TransportError, OSError) as exc:
+        _emit({"status": BLOCKED, "detail": str(exc)}, args.json_out)
+        return 2
+    _emit({"status": PASS, "address": server.address, "work_root": work_root.as_posix()}, args.json_out)
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="python -m tools.codex.factory",
@@ -639,6 +964,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--version", action="version", version=f"%(prog)s {get_version()}")
     parser.add_argument("--json-out", help="Optional path to write machine-readable output JSON")
     parser.add_argument("--config", help="Optional factory config file path")
+    parser.add_argument("--config-trace", action="store_true", help="Print resolved config values, their sources and resolution timing to stderr")
     sub = parser.add_subparsers(dest="command", required=True)
 
     contracts = sub.add_parser("contracts-check", help="Validate factory contracts and schema registry")
@@ -647,6 +973,12 @@ def build_parser() -> argparse.ArgumentParser:
     doctor = sub.add_parser("doctor", help="Check local factory setup and contracts")
     doctor.set_defaults(func=cmd_doctor)
 
+    metrics = sub.add_parser("metrics", help="Aggregate ledger throughput/latency into Prometheus text and JSON")
+    metrics.add_argument("--out-dir", help="Output folder (default: runs/_metrics)")
+    metrics.add_argument("--reset", action="store_true", help="Ignore the persisted cursor and rescan everything")
+    metrics.add_argument("--summary-only", action="store_true", help="Omit the metrics body from stdout")
+    metrics.set_defaults(func=cmd_metrics)
+
     init_run = sub.add_parser("init-run", help="Create deterministic run folder and manifest")
     init_run.add_argument("--run-id", help="Optional explicit run id")
     init_run.add_argument("--kind", default="factory", help="Run type prefix")
@@ -680,18 +1012,23 @@ def build_parser() -> argparse.ArgumentParser:
     integrate.add_argument("--workers", help="Comma-separated worker IDs")
     integrate.add_argument("--strict-collision-mode", action="store_true", default=None)
     integrate.add_argument("--allow-identical-patch-overlap", action="store_true", default=None)
+    integrate.add_argument("--full", action="store_true", help="Ignore the per-worker integration cache and recompute every worker")
     integrate.set_defaults(func=cmd_integrate)
 
     launch = sub.add_parser("launch", help="One-command preflight + run init + worktree + bundle scaffold")
     launch.add_argument("--run-id", help="Optional run id")
     launch.add_argument("--workers", help="Comma-separated worker IDs")
+    launch.add_argument("--worker-count", type=int, help="Generate N worker IDs (A_worker, B_worker, ...) instead of --workers")
+    launch.add_argument("--shard-targets", help="Comma-separated repo paths to split into disjoint per-worker scope locks")
     launch.add_argument("--base-ref", default="HEAD")
     launch.add_argument("--dry-run", action="store_true")
     launch.set_defaults(func=cmd_launch)
 
-    oneshot = sub.add_parser("oneshot", help="Run preflight -> launch -> bundle-validate -> integrate -> summary")
+    oneshot = sub.add_parser("oneshot", help="Run the configured stage graph (preflight -> launch -> per-worker checks -> integrate)")
     oneshot.add_argument("--run-id", help="Optional explicit run id")
     oneshot.add_argument("--workers", help="Comma-separated worker IDs")
+    oneshot.add_argument("--worker-count", type=int, help="Generate N worker IDs (A_worker, B_worker, ...) instead of --workers")
+    oneshot.add_argument("--shard-targets", help="Comma-separated repo paths to split into disjoint per-worker scope locks")
     oneshot.add_argument("--base-ref", default="HEAD")
     oneshot.add_argument("--dry-run", action="store_true")
     oneshot.add_argument("--strict-collision-mode", action="store_true", default=None)
@@ -714,6 +1051,44 @@ def build_parser() -> argparse.ArgumentParser:
     ledger_replay.add_argument("--run-id")
     ledger_replay.set_defaults(func=cmd_ledger_replay)
 
+    trace = sub.add_parser("trace", help="Export a run's ledger spans as Chrome/Perfetto trace JSON")
+    trace.add_argument("--run-id", required=True)
+    trace.add_argument("--out", help="Trace output path (default: runs/<run_id>/logs/trace.json)")
+    trace.set_defaults(func=cmd_trace)
+
+    runs = sub.add_parser("runs", help="Query the run catalog")
+    runs.add_argument("action", choices=["list", "show", "rebuild"])
+    runs.add_argument("--run-id")
+    runs.add_argument("--status")
+    runs.add_argument("--kind")
+    runs.add_argument("--gate", help="Filter by meaningful gate verdict")
+    runs.add_argument("--since", help="ISO8601 lower bound for updated_at")
+    runs.add_argument("--limit", type=int, default=50)
+    runs.add_argument("--offset", type=int, default=0)
+    runs.set_defaults(func=cmd_runs)
+
+    store = sub.add_parser("store", help="Content-addressed artifact store: seal/archive/restore runs, gc blobs")
+    store.add_argument("action", choices=["seal", "archive", "restore", "gc"])
+    store.add_argument("--run-id")
+    store.add_argument("--dry-run", action="store_true", help="gc: report without deleting or compressing")
+    store.set_defaults(func=cmd_store)
+
+    transport = sub.add_parser("transport", help="Dispatch workers through a transport and fetch their bundles")
+    transport.add_argument("action", choices=["run", "dispatch", "status", "watch", "fetch", "cancel"])
+    transport.add_argument("--run-id", required=True)
+    transport.add_argument("--workers", help="Comma-separated worker IDs")
+    transport.add_argument("--kind", choices=["local", "socket"], help="Override transport.kind")
+    transport.add_argument("--agent", help="Agent host:port for every worker (overrides transport.default_agent)")
+    transport.add_argument("--prompt-dir", help="Directory with <worker>.md prompts (default: generated from SCOPE_LOCK)")
+    transport.add_argument("--timeout-seconds", type=float, help="Per-worker wait limit for run/watch (0 = none)")
+    transport.set_defaults(func=cmd_transport)
+
+    agent = sub.add_parser("agent", help="Serve the remote worker agent protocol on this machine")
+    agent.add_argument("--host", default="127.0.0.1")
+    agent.add_argument("--port", type=int, default=0, help="0 picks a free port (printed on start)")
+    agent.add_argument("--work-root", help="Where worker bundles are staged (default: runs/_agent)")
+    agent.set_defaults(func=cmd_agent)
+
     self_test = sub.add_parser("self-test", help="Run deterministic factory smoke test")
     self_test.add_argument("--run-id", help="Optional run id")
     self_test.set_defaults(func=cmd_self_test)
@@ -734,6 +1109,9 @@ def build_parser() -> argparse.ArgumentParser:
 
     watch = sub.add_parser("watch", help="Summarize run status including meaningful gate verdict")
     watch.add_argument("--run-id", required=True)
+    watch.add_argument("--follow", action="store_true", help="Stream state transitions as JSON lines until the run ends")
+    watch.add_argument("--offset", type=int, default=0, help="Ledger byte offset to resume --follow from")
+    watch.add_argument("--timeout-seconds", type=float, default=0.0, help="Stop --follow after this long (0 = none)")
     watch.set_defaults(func=cmd_watch)
 
     return parser
@@ -742,7 +1120,14 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
-    return int(args.func(args))
+    if not args.config_trace:
+        return int(args.func(args))
+    enable_config_trace()
+    try:
+        return int(args.func(args))
+    finally:
+        snapshot = getattr(args, "config_snapshot", None) or config_snapshot(config_path=args.config, strict=False)
+        print(json.dumps(config_trace(snapshot), indent=2, sort_keys=True, default=list), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -4,10 +4,18 @@ import datetime as dt
 import hashlib
 import json
 import os
+import re
+import shutil
+import string
 import subprocess
 from pathlib import Path
 from typing import Any, Iterable, Mapping, Sequence
 
+try:  # pragma: no cover - import path depends on launcher
+    from shared.procexec import run_process
+except Exception:  # pragma: no cover - package mode fallback
+    from tools.codex.shared.procexec import run_process
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 CODEX_DIR = REPO_ROOT / "tools" / "codex"
 RUNS_DIR = CODEX_DIR / "runs"
@@ -18,10 +26,39 @@ TEMPLATES_DIR = CODEX_DIR / "templates" / "factory"
 
 WORKERS: tuple[str, ...] = ("A_worker", "B_worker", "C_worker", "D_worker")
 INTEGRATOR = "Z_integrator"
+WORKER_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
 DEFAULT_BRANCH_PREFIX = "codex/factory"
 UTC = dt.timezone.utc
 
 
+def worker_ids(count: int) -> list[str]:
+    # A_worker..Y_worker keep the historical naming (Z is the integrator's
+    # letter); larger runs continue as W25_worker, W26_worker, ...
+    if count < 1:
+        raise ValueError(f"worker count must be >= 1 (got {count})")
+    letters = string.ascii_uppercase[:25]
+    return [f"{letters[index]}_worker" if index < len(letters) else f"W{index:02d}_worker" for index in range(count)]
+
+
+def validate_worker_id(worker: str) -> str:
+    value = str(worker).strip()
+    if not WORKER_ID_RE.fullmatch(value) or value == INTEGRATOR:
+        raise ValueError(f"invalid worker id: {worker!r}")
+    return value
+
+
+def run_workers(run_id: str) -> list[str]:
+    # The run manifest is the source of truth for a run's worker set.
+    try:
+        payload = json.loads((RUNS_DIR / run_id / "RUN_MANIFEST.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return list(WORKERS)
+    workers = payload.get("workers") if isinstance(payload, dict) else None
+    if not isinstance(workers, list) or not workers:
+        return list(WORKERS)
+    return [str(worker) for worker in workers]
+
+
 def now_utc() -> dt.datetime:
     return dt.datetime.now(UTC)
 
@@ -45,8 +82,26 @@ def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def detach_hardlink(path: Path, *, keep_content: bool = False) -> None:
+    # Runs restored with artifacts.hardlink are links into the artifact store; give
+    # the path its own inode before writing so the shared blob is never modified.
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return
+    if info.st_nlink <= 1:
+        return
+    if keep_content:
+        temp = path.with_name(f".{path.name}.{os.getpid()}.detach")
+        shutil.copyfile(path, temp)
+        os.replace(temp, path)
+    else:
+        path.unlink()
+
+
 def write_text(path: Path, text: str) -> None:
     ensure_dir(path.parent)
+    detach_hardlink(path)
     path.write_text(text, encoding="utf-8", newline="\n")
 
 
@@ -56,6 +111,7 @@ def read_json(path: Path) -> Any:
 
 def write_json(path: Path, payload: Any) -> None:
     ensure_dir(path.parent)
+    detach_hardlink(path)
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
 
 
@@ -95,26 +151,25 @@ def run_command(
     timeout: int = 600,
 ) -> dict[str, Any]:
     run_cwd = cwd or REPO_ROOT
-    proc = subprocess.run(
-        list(command),
-        cwd=str(run_cwd),
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        check=False,
-    )
+    result = run_process(command, cwd=run_cwd, timeout=timeout)
+    if result.timed_out:
+        raise subprocess.TimeoutExpired(list(command), timeout, output=result.stdout, stderr=result.stderr)
+    if result.exception is not None:
+        raise result.exception
     return {
         "cmd": list(command),
         "cwd": str(run_cwd),
-        "rc": proc.returncode,
-        "stdout": proc.stdout,
-        "stderr": proc.stderr,
-        "combined": f"{proc.stdout}{proc.stderr}",
+        "rc": result.rc,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "combined": result.combined,
+        "duration_ms": result.duration_ms,
     }
 
 
 def append_log(path: Path, line: str) -> None:
     ensure_dir(path.parent)
+    detach_hardlink(path, keep_content=True)
     with path.open("a", encoding="utf-8", newline="\n") as handle:
         handle.write(line + "\n")
 
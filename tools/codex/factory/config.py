@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
+import time
 from copy import deepcopy
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Mapping
 
 from .common import FACTORY_DIR, REPO_ROOT, ensure_dir, read_json, write_json
@@ -80,6 +85,37 @@ def default_factory_config() -> dict[str, Any]:
             "enable_quarantine": False,
             "enable_ledger_compaction": False,
         },
+        "artifacts": {
+            "enabled": False,
+            "hardlink": False,
+            "codec": "lzma",
+            "compress_threshold_bytes": 65536,
+        },
+        "transport": {
+            "kind": "local",
+            "command": [],
+            "agents": {},
+            "default_agent": "",
+            "poll_seconds": 1.0,
+            "timeout_seconds": 7200,
+            "connect_timeout_seconds": 10,
+        },
+        "pipeline": {
+            "max_parallel": 4,
+            "require_done_marker": False,
+            "done_timeout_seconds": 7200,
+            "poll_seconds": 0.5,
+            "stages": {
+                "preflight": {"scope": "run", "depends_on": []},
+                "launch": {"scope": "run", "depends_on": ["preflight"]},
+                "worker_done": {"scope": "worker", "depends_on": ["launch"]},
+                "bundle_validate": {"scope": "worker", "depends_on": ["worker_done"]},
+                "scope_check": {"scope": "worker", "depends_on": ["bundle_validate"]},
+                "overlap_index": {"scope": "worker", "depends_on": ["bundle_validate"]},
+                "integrator_validate": {"scope": "run", "depends_on": ["launch"]},
+                "integrate": {"scope": "run", "depends_on": ["integrator_validate", "overlap_index", "scope_check"]},
+            },
+        },
     }
 
 
@@ -164,36 +200,189 @@ def validate_config(payload: Mapping[str, Any]) -> list[str]:
     return validate_payload("factory_config", dict(payload))
 
 
-def load_factory_config(
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _flatten(payload: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in payload.items():
+        dotted = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, Mapping) and value:
+            flat.update(_flatten(value, dotted))
+        else:
+            flat[dotted] = value
+    return flat
+
+
+def _env_keys(env: Mapping[str, str]) -> dict[str, str]:
+    return {
+        key: env[key]
+        for key in sorted(env)
+        if key.startswith(ENV_PREFIX)
+        and key not in IGNORED_ENV_KEYS
+        and not any(key.startswith(prefix) for prefix in IGNORED_ENV_PREFIXES)
+    }
+
+
+def _fingerprint(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    values: Mapping[str, Any]
+    errors: tuple[str, ...]
+    layers: tuple[tuple[str, frozenset[str]], ...]
+    file_sha256: str
+    file_stat: tuple[int, int]
+    loaded_ns: int
+    resolve_ms: float
+    _plain: dict[str, Any] = field(repr=False, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return deepcopy(self._plain)
+
+
+# One snapshot per (config path, env overlay, cli overrides, strictness); the
+# file is re-read only when its stat changes, and re-validated only when its
+# content hash does.
+_SNAPSHOTS: dict[str, ConfigSnapshot] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+_TRACE: list[dict[str, Any]] | None = None
+
+
+def clear_config_cache() -> None:
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOTS.clear()
+
+
+def enable_config_trace() -> None:
+    global _TRACE
+    _TRACE = []
+
+
+def _file_stat(path: Path) -> tuple[int, int]:
+    try:
+        info = path.stat()
+    except OSError:
+        return (-1, -1)
+    return (info.st_mtime_ns, info.st_size)
+
+
+def _build_snapshot(
+    resolved_path: Path,
+    env_keys: Mapping[str, str],
+    cli_payload: Mapping[str, Any],
     *,
-    config_path: str | None = None,
-    env: Mapping[str, str] | None = None,
-    cli_overrides: Mapping[str, Any] | None = None,
-    strict: bool = True,
-) -> dict[str, Any]:
+    strict: bool,
+    raw: bytes | None,
+    file_stat: tuple[int, int],
+    started: float,
+) -> ConfigSnapshot:
+    loaded_ns = time.time_ns()
     defaults = default_factory_config()
-    resolved_path = resolve_config_path(config_path)
-    file_payload = load_config_file(resolved_path)
-    env_payload = _env_to_config(env or os.environ)
-    cli_payload = dict(cli_overrides or {})
+    file_payload = load_config_file(resolved_path) if raw is not None else {}
+    env_payload = _env_to_config(env_keys)
 
     merged = _deep_merge(defaults, file_payload)
     merged = _deep_merge(merged, env_payload)
-    merged = _deep_merge(merged, cli_payload)
+    merged = _deep_merge(merged, dict(cli_payload))
+
+    layers: list[tuple[str, frozenset[str]]] = [
+        ("default", frozenset(_flatten(defaults))),
+        (f"file:{resolved_path.as_posix()}", frozenset(_flatten(file_payload))),
+    ]
+    for env_key in env_keys:
+        layers.append((f"env:{env_key}", frozenset(_flatten(_env_to_config({env_key: env_keys[env_key]})))))
+    layers.append(("cli", frozenset(_flatten(dict(cli_payload)))))
 
     meta = {
         "config_path": resolved_path.as_posix(),
-        "config_exists": resolved_path.exists(),
+        "config_exists": raw is not None,
         "env_prefix": ENV_PREFIX,
         "strict": bool(strict),
     }
     merged["_meta"] = meta
     errors = validate_config(merged)
-    if errors and strict:
-        joined = "\n".join(errors)
-        raise ValueError(f"factory config invalid:\n{joined}")
     merged["_validation_errors"] = errors
-    return merged
+    return ConfigSnapshot(
+        values=_freeze(merged),
+        errors=tuple(errors),
+        layers=tuple(layers),
+        file_sha256=hashlib.sha256(raw).hexdigest() if raw is not None else "",
+        file_stat=file_stat,
+        loaded_ns=loaded_ns,
+        resolve_ms=round((time.perf_counter() - started) * 1000.0, 3),
+        _plain=merged,
+    )
+
+
+def config_snapshot(
+    *,
+    config_path: str | None = None,
+    env: Mapping[str, str] | None = None,
+    cli_overrides: Mapping[str, Any] | None = None,
+    strict: bool = True,
+) -> ConfigSnapshot:
+    started = time.perf_counter()
+    resolved_path = resolve_config_path(config_path)
+    env_keys = _env_keys(env if env is not None else os.environ)
+    cli_payload = dict(cli_overrides or {})
+    key = _fingerprint([resolved_path.as_posix(), REPO_ROOT.as_posix(), env_keys, cli_payload, bool(strict)])
+    file_stat = _file_stat(resolved_path)
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(key)
+    outcome = "miss"
+    snapshot = None
+    if cached is not None and cached.file_stat == file_stat and file_stat[0] < cached.loaded_ns:
+        snapshot, outcome = cached, "hit"
+    else:
+        # Stat changed (or is too recent to trust): compare content before rebuilding.
+        raw = resolved_path.read_bytes() if resolved_path.exists() else None
+        digest = hashlib.sha256(raw).hexdigest() if raw is not None else ""
+        if cached is not None and cached.file_sha256 == digest and (raw is not None) == bool(cached.file_sha256):
+            snapshot, outcome = replace(cached, file_stat=file_stat, loaded_ns=time.time_ns()), "hit"
+        else:
+            snapshot = _build_snapshot(
+                resolved_path,
+                env_keys,
+                cli_payload,
+                strict=strict,
+                raw=raw,
+                file_stat=file_stat,
+                started=started,
+            )
+        with _SNAPSHOT_LOCK:
+            _SNAPSHOTS[key] = snapshot
+    if _TRACE is not None:
+        _TRACE.append(
+            {
+                "config_path": resolved_path.as_posix(),
+                "cache": outcome,
+                "lookup_ms": round((time.perf_counter() - started) * 1000.0, 3),
+                "resolve_ms": snapshot.resolve_ms,
+            }
+        )
+    return snapshot
+
+
+def load_factory_config(
+    *,
+    config_path: str | None = None,
+    env: Mapping[str, str] | None = None,
+    cli_overrides: Mapping[str, Any] | None = None,
+    strict: bool = True,
+) -> dict[str, Any]:
+    snapshot = config_snapshot(config_path=config_path, env=env, cli_overrides=cli_overrides, strict=strict)
+    if snapshot.errors and strict:
+        joined = "\n".join(snapshot.errors)
+        raise ValueError(f"factory config invalid:\n{joined}")
+    return snapshot.as_dict()
 
 
 def write_default_config(path: str | None = None) -> Path:
@@ -202,3 +391,27 @@ def write_default_config(path: str | None = None) -> Path:
     if not target.exists():
         write_json(target, default_factory_config())
     return target
+
+
+def config_trace(snapshot: ConfigSnapshot) -> dict[str, Any]:
+    values = _flatten({key: value for key, value in snapshot._plain.items() if not key.startswith("_")})
+    return {
+        "config_path": snapshot._plain["_meta"]["config_path"],
+        "file_sha256": snapshot.file_sha256,
+        "resolve_ms": snapshot.resolve_ms,
+        "resolutions": list(_TRACE or []),
+        "values": {key: {"value": values[key], "source": _source_of(snapshot.layers, key)} for key in sorted(values)},
+    }
+
+
+def _source_of(layers: tuple[tuple[str, frozenset[str]], ...], dotted: str) -> str:
+    # The last layer that set the key, or replaced one of its parents outright, wins.
+    ancestors = {dotted}
+    cursor = dotted
+    while "." in cursor:
+        cursor = cursor.rpartition(".")[0]
+        ancestors.add(cursor)
+    for name, keys in reversed(layers):
+        if ancestors & keys:
+            return name
+    return "default"
@@ -3,8 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from .common import CONTRACTS_DIR, INTEGRATOR, RUNS_DIR, WORKERS, ensure_dir, read_json, write_json, write_text
-from .config import load_factory_config
+from .common import CONTRACTS_DIR, INTEGRATOR, RUNS_DIR, ensure_dir, read_json, run_workers, write_json, write_text
+from .config import config_snapshot
 from .schemas import validate_payload
 
 WORKER_REQUIRED_FILES: tuple[str, ...] = (
@@ -214,7 +214,7 @@ def scaffold_integrator_bundle(run_id: str) -> dict[str, Any]:
 
 
 def scaffold_all_bundles(run_id: str, workers: list[str] | None = None) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     result = {
         "run_id": run_id,
         "workers": [],
@@ -227,7 +227,7 @@ def scaffold_all_bundles(run_id: str, workers: list[str] | None = None) -> dict[
 
 def validate_bundle_shape(run_id: str, worker: str) -> list[str]:
     target = bundle_dir(run_id, worker)
-    cfg = load_factory_config(strict=False)
+    cfg = config_snapshot(strict=False).values
     worker_files = cfg.get("workers", {}).get("required_worker_files", list(WORKER_REQUIRED_FILES))
     integrator_files = cfg.get("workers", {}).get("required_integrator_files", list(INTEGRATOR_REQUIRED_FILES))
     required = tuple(worker_files) if worker != INTEGRATOR else tuple(integrator_files)
@@ -285,7 +285,7 @@ def validate_bundle(run_id: str, worker: str) -> dict[str, Any]:
 
 
 def validate_run(run_id: str, workers: list[str] | None = None) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     results = [validate_bundle(run_id, worker) for worker in chosen]
     results.append(validate_bundle(run_id, INTEGRATOR))
     blocked = [entry for entry in results if entry["status"] != "PASS"]
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from . import ledger
+from .common import INTEGRATOR, run_workers
+from .status_eval import BLOCKED, PASS, PENDING
+
+# Ledger events that mark a state transition worth streaming, keyed to the
+# transition name emitted on the wire.
+TRANSITIONS = {
+    "LAUNCH_RESULT": "launch_result",
+    "WORKER_DISPATCH": "worker_dispatched",
+    "WORKER_BUNDLE_DISCOVERED": "bundle_discovered",
+    "BUNDLE_VALIDATED": "bundle_validated",
+    "OVERLAP_CHECK": "overlap_result",
+    "SCOPE_CHECK": "scope_result",
+    "INTEGRATION_RESULT": "integration_result",
+    "RUN_END": "run_end",
+    "ONESHOT_SUMMARY": "oneshot_summary",
+}
+# A oneshot blocked before integration (preflight, worktrees, launch) writes its
+# summary without ever reaching RUN_END, so either one ends the stream.
+TERMINAL_TRANSITIONS = {"run_end", "oneshot_summary"}
+# The integrator writes its final STATUS.json a moment before RUN_END; a
+# non-pending status only ends the stream on its own once it has been left
+# untouched this long, so a live integration still reports its RUN_END.
+STATUS_SETTLE_SECONDS = 5.0
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class LedgerTail:
+    # Reads only the bytes appended since the last call, one line at a time; a
+    # partial trailing line stays unread until its newline lands.
+    def __init__(self, path: Path, *, offset: int = 0) -> None:
+        self.path = path
+        self.offset = max(0, int(offset))
+
+    def events(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        # Yields (offset just past the event's line, event). The cursor advances per
+        # complete line, so memory stays bounded by the longest line and a consumer
+        # that stops early resumes at the first line it did not see.
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < self.offset:
+            # Truncated or replaced; start over.
+            self.offset = 0
+        if size == self.offset:
+            return
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            for raw in iter(handle.readline, b""):
+                if not raw.endswith(b"\n"):
+                    return
+                self.offset += len(raw)
+                try:
+                    item = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(item, dict):
+                    yield self.offset, item
+
+    def read(self) -> list[dict[str, Any]]:
+        return [event for _offset, event in self.events()]
+
+
+class _PollNotifier:
+    # Portable fallback: compare a stat signature, backing off while nothing moves.
+    def __init__(self, *, min_interval: float = 0.05, max_interval: float = 1.0) -> None:
+        self.dirs: list[Path] = []
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._interval = min_interval
+        self._signature: tuple = ()
+
+    def watch(self, paths: list[Path]) -> None:
+        self.dirs = list(paths)
+        if not self._signature:
+            self._signature = self._snapshot()
+
+    def _snapshot(self) -> tuple:
+        items: list[tuple[str, int, int]] = []
+        for directory in self.dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                items.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return tuple(sorted(items))
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            current = self._snapshot()
+            if current != self._signature:
+                self._signature = current
+                self._interval = self.min_interval
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+            self._interval = min(self.max_interval, self._interval * 2)
+
+    def close(self) -> None:
+        return None
+
+
+class _InotifyNotifier:
+    # Linux: block in select() on an inotify fd, so an idle follower costs nothing.
+    def __init__(self, libc: ctypes.CDLL) -> None:
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[str] = set()
+
+    def watch(self, paths: list[Path]) -> None:
+        for path in paths:
+            key = str(path)
+            if key in self._watched or not path.is_dir():
+                continue
+            if self._libc.inotify_add_watch(self.fd, os.fsencode(key), WATCH_MASK) >= 0:
+                self._watched.add(key)
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def make_notifier() -> _InotifyNotifier | _PollNotifier:
+    if sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            return _InotifyNotifier(libc)
+        except (OSError, AttributeError):
+            pass
+    return _PollNotifier()
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _transition(event: dict[str, Any]) -> dict[str, Any]:
+    details = event.get("details", {}) if isinstance(event.get("details"), dict) else {}
+    return {
+        "type": TRANSITIONS[str(event.get("event_type", ""))],
+        "ts_utc": str(event.get("ts_utc", "")),
+        "actor": str(event.get("actor", "")),
+        "status": str(details.get("status", "")).upper(),
+        "rc": int(event.get("rc", 0) or 0),
+        "event_id": str(event.get("event_id", "")),
+    }
+
+
+def follow_run(
+    run_id: str,
+    run_dir: Path,
+    *,
+    ledger_path: Path | None = None,
+    offset: int = 0,
+    timeout_seconds: float | None = None,
+    heartbeat_seconds: float = 30.0,
+    notifier: _InotifyNotifier | _PollNotifier | None = None,
+) -> Iterator[dict[str, Any]]:
+    # Streams transitions until RUN_END or ONESHOT_SUMMARY for the run, a settled
+    # integrator STATUS.json, or the timeout. Existing ledger history from
+    # `offset` is replayed first, so a finished run returns immediately.
+    path = ledger_path or ledger.LEDGER_PATH
+    tail = LedgerTail(path, offset=offset)
+    notify = notifier or make_notifier()
+    done_workers: set[str] = set()
+    file_state: dict[str, str] = {}
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+
+    def _files() -> Iterator[dict[str, Any]]:
+        for worker in run_workers(run_id):
+            if worker not in done_workers and (run_dir / worker / "DONE.marker").exists():
+                done_workers.add(worker)
+                yield {"type": "worker_done", "actor": worker, "status": PASS}
+        z_status = _read_json(run_dir / INTEGRATOR / "STATUS.json")
+        if z_status is not None:
+            status = str(z_status.get("status", "")).upper()
+            if file_state.get("integrator") != status:
+                file_state["integrator"] = status
+                yield {"type": "integrator_status", "actor": INTEGRATOR, "status": status}
+        gate = _read_json(run_dir / "VERIFY_MEANINGFUL_GATE.json")
+        if gate is not None:
+            verdict = str(gate.get("verdict", BLOCKED)).upper()
+            if file_state.get("gate") != verdict:
+                file_state["gate"] = verdict
+                yield {
+                    "type": "gate_verdict",
+                    "actor": INTEGRATOR,
+                    "status": verdict,
+                    "fail_modes": list(gate.get("fail_modes", [])) if isinstance(gate.get("fail_modes"), list) else [],
+                }
+
+    try:
+        while True:
+            notify.watch([path.parent, run_dir, run_dir / INTEGRATOR, *(run_dir / worker for worker in run_workers(run_id))])
+            yield from ({"run_id": run_id} | item for item in _files())
+            for line_end, event in tail.events():
+                if str(event.get("run_id", "")) != run_id or str(event.get("event_type", "")) not in TRANSITIONS:
+                    continue
+                # The offset just past this event's line: resuming there replays nothing
+                # and skips nothing that followed it.
+                item = {"run_id": run_id, "ledger_offset": line_end} | _transition(event)
+                yield item
+                if item["type"] in TERMINAL_TRANSITIONS:
+                    # Pick up the gate/status files written just before the end.
+                    yield from ({"run_id": run_id} | extra for extra in _files())
+                    yield {"run_id": run_id, "type": "terminal", "status": item["status"] or BLOCKED, "ledger_offset": line_end}
+                    return
+            wait = heartbeat_seconds
+            z_status = file_state.get("integrator", PENDING)
+            if z_status not in {"", PENDING}:
+                # Nothing in the ledger ended the run; fall back to the integrator's
+                # own verdict once the file has settled.
+                try:
+                    age = time.time() - (run_dir / INTEGRATOR / "STATUS.json").stat().st_mtime
+                except OSError:
+                    age = 0.0
+                if age >= STATUS_SETTLE_SECONDS:
+                    yield {"run_id": run_id, "type": "terminal", "status": z_status, "ledger_offset": tail.offset}
+                    return
+                wait = min(wait, STATUS_SETTLE_SECONDS - age)
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    yield {"run_id": run_id, "type": "timeout", "status": BLOCKED, "ledger_offset": tail.offset}
+                    return
+            notify.wait(wait)
+    finally:
+        notify.close()
@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+from .common import detach_hardlink
+
 
 class WritePolicyError(PermissionError):
     pass
@@ -13,6 +15,16 @@ def _resolve(path: Path) -> Path:
     return path.expanduser().resolve(strict=False)
 
 
+def _unchanged(path: Path, text: str) -> bool:
+    encoded = text.encode("utf-8")
+    try:
+        if path.stat().st_size != len(encoded):
+            return False
+        return path.read_bytes() == encoded
+    except OSError:
+        return False
+
+
 class WriteGuard:
     def __init__(self, allowed_root: Path):
         self._allowed_root = _resolve(allowed_root)
@@ -38,6 +50,11 @@ class WriteGuard:
 
     def write_text(self, target: Path, text: str) -> Path:
         resolved = self.ensure_parent(target)
+        if _unchanged(resolved, text):
+            # Leave identical outputs untouched so their mtimes (and the
+            # incremental attestation digests keyed on them) stay valid.
+            return resolved
+        detach_hardlink(resolved)
         resolved.write_text(text, encoding="utf-8", newline="\n")
         return resolved
 
@@ -47,6 +64,7 @@ class WriteGuard:
 
     def append_line(self, target: Path, line: str) -> Path:
         resolved = self.ensure_parent(target)
+        detach_hardlink(resolved, keep_content=True)
         with resolved.open("a", encoding="utf-8", newline="\n") as handle:
             handle.write(str(line) + "\n")
         return resolved
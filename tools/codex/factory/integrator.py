@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Iterable, Mapping
 
+from .artifacts import hash_many
 from .attestations import write_all_attestations
-from .common import INTEGRATOR, RUNS_DIR, WORKERS, iso_utc, read_json, read_text, stable_sha256_text
-from .config import load_factory_config
+from .catalog import artifact_stats, update_run
+from .common import INTEGRATOR, RUNS_DIR, iso_utc, read_json, read_text, run_workers, stable_sha256_text
+from .config import config_snapshot, load_factory_config
 from .contracts import bundle_dir, scaffold_integrator_bundle, validate_bundle
 from .fs_guard import WriteGuard, WritePolicyError
 from .ledger import append_event, verify_ledger_signature
-from .overlap import detect_file_overlaps, detect_scope_violations
+from .overlap import (
+    detect_file_overlaps,
+    detect_scope_violations,
+    detect_worker_scope_violations,
+    index_worker_overlaps,
+    merge_overlap_indexes,
+    merge_scope_violations,
+)
 from .schemas import validate_payload
 from .status_eval import BLOCKED, FAIL, PASS, evaluate_status, make_check, status_exit_code
+from .tracing import current_span_id, trace_span
+from .version import get_version
 
 try:  # pragma: no cover - import path depends on launcher mode
     from verify.meaningful_gate import BLOCKED as GATE_BLOCKED
@@ -27,15 +41,90 @@ except Exception:  # pragma: no cover - package mode fallback
     from tools.codex.verify.meaningful_gate import run_meaningful_gate
 
 
-def _collect_worker_inputs(run_id: str, workers: list[str]) -> list[dict[str, Any]]:
+CACHE_REL = "INTEGRATION_CACHE.json"
+CACHE_VERSION = 1
+
+
+def _cache_context() -> str:
+    # Per-worker results also depend on the required-file config and the factory
+    # version; a change to either invalidates every cached worker.
+    workers_cfg = config_snapshot(strict=False).as_dict().get("workers", {})
+    return stable_sha256_text(json.dumps({"version": get_version(), "workers": workers_cfg}, sort_keys=True))
+
+
+def bundle_digest(run_id: str, worker: str) -> str:
+    root = bundle_dir(run_id, worker)
+    if not root.is_dir():
+        return ""
+    files = sorted(path for path in root.rglob("*") if path.is_file())
+    digests = hash_many(files)
+    return stable_sha256_text("\n".join(f"{digest}  {path.relative_to(root).as_posix()}" for path, digest in zip(files, digests)))
+
+
+def _load_cache(run_id: str, context: str) -> dict[str, Any]:
+    try:
+        payload = read_json(bundle_dir(run_id, INTEGRATOR) / CACHE_REL)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION or payload.get("context") != context:
+        return {}
+    workers = payload.get("workers", {})
+    return dict(workers) if isinstance(workers, dict) else {}
+
+
+def _worker_results(run_id: str, worker: str) -> dict[str, Any]:
+    return {
+        "validation": validate_bundle(run_id, worker),
+        "overlap_index": index_worker_overlaps(run_id, worker),
+        "scope_violations": detect_worker_scope_violations(run_id, worker),
+    }
+
+
+def _incremental_inputs(
+    run_id: str,
+    chosen: list[str],
+    *,
+    full: bool,
+    known: Mapping[str, Mapping[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any], dict[str, Any]]:
+    # Reuses cached per-worker results when the bundle digest is unchanged and
+    # recomputes the rest; the merged reports come out of the same merge path
+    # either way, so outputs match a full integration.
+    context = _cache_context()
+    cached = {} if full else _load_cache(run_id, context)
+    digests = {worker: bundle_digest(run_id, worker) for worker in chosen}
+    reused = [worker for worker in chosen if digests[worker] and dict(cached.get(worker, {})).get("digest") == digests[worker]]
+    stale = [worker for worker in chosen if worker not in reused]
+    entries: dict[str, dict[str, Any]] = {worker: dict(cached[worker]) for worker in reused}
+    sections = {"validation": "validations", "overlap_index": "overlap_indexes", "scope_violations": "scope_violations"}
+    for worker in stale:
+        if all(worker in dict(known.get(source, {})) for source in sections.values()):
+            entries[worker] = {"digest": digests[worker], **{key: known[source][worker] for key, source in sections.items()}}
+    missing = [worker for worker in stale if worker not in entries]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing)), thread_name_prefix="integrate") as pool:
+            for worker, results in zip(missing, pool.map(lambda item: _worker_results(run_id, item), missing)):
+                entries[worker] = {"digest": digests[worker], **results}
+    precomputed = {source: {worker: entries[worker][key] for worker in chosen} for key, source in sections.items()}
+    cache = {"version": CACHE_VERSION, "context": context, "workers": {worker: entries[worker] for worker in sorted(entries)}}
+    return precomputed, cache, {"full": bool(full), "reused": reused, "recomputed": stale}
+
+
+def _collect_worker_inputs(
+    run_id: str,
+    workers: list[str],
+    validations: Mapping[str, Mapping[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    known = validations or {}
     collected: list[dict[str, Any]] = []
     for worker in workers:
         root = bundle_dir(run_id, worker)
+        validation = known.get(worker)
         record = {
             "worker": worker,
             "bundle": root.as_posix(),
             "status": "MISSING",
-            "validation": validate_bundle(run_id, worker),
+            "validation": dict(validation) if validation is not None else validate_bundle(run_id, worker),
             "files_changed": [],
             "summary": "",
             "diff": "",
@@ -341,12 +430,54 @@ def integrate_run(
     *,
     config: Mapping[str, Any] | None = None,
     extra_writes: Iterable[Mapping[str, Any]] | None = None,
+    precomputed: Mapping[str, Mapping[str, Any]] | None = None,
+    full: bool = False,
 ) -> dict[str, Any]:
-    chosen = list(workers or WORKERS)
+    chosen = list(workers or run_workers(run_id))
+    with trace_span("integrate", run_id=run_id, event_type="INTEGRATION_RESULT", details={"kind": "factory", "workers": chosen}) as span:
+        result = _integrate_run(run_id, chosen, config=config, extra_writes=extra_writes, precomputed=precomputed, full=full)
+        span.set(
+            rc=status_exit_code(str(result.get("status", BLOCKED))),
+            details={
+                "status": result.get("status", BLOCKED),
+                "report": result.get("report", ""),
+                "reused_workers": len(dict(result.get("incremental", {})).get("reused", [])),
+            },
+            file_counts={"workers": len(chosen)},
+        )
+    gate = result.get("meaningful_gate") or {}
+    update_run(
+        run_id,
+        {
+            "phase": "integrate",
+            "status": str(result.get("status", BLOCKED)),
+            "gate_verdict": str(gate.get("verdict", "")).upper() if isinstance(gate, Mapping) else "",
+            "report": str(result.get("report", "")),
+            "artifacts": artifact_stats(run_id),
+        },
+    )
+    return result
+
+
+def _integrate_run(
+    run_id: str,
+    chosen: list[str],
+    *,
+    config: Mapping[str, Any] | None,
+    extra_writes: Iterable[Mapping[str, Any]] | None,
+    precomputed: Mapping[str, Mapping[str, Any]] | None,
+    full: bool = False,
+) -> dict[str, Any]:
+    # precomputed: per-worker results from the oneshot stage graph ("validations",
+    # "overlap_indexes", "scope_violations"); used instead of recomputing for any
+    # worker the integration cache does not cover.
+    clock = time.perf_counter()
+    early = dict(precomputed or {})
     cfg = dict(config or load_factory_config(strict=False))
     run_cfg = dict(cfg.get("run", {})) if isinstance(cfg.get("run"), Mapping) else {}
     strict_mode = bool(run_cfg.get("strict_collision_mode", True))
     allow_identical_patch_overlap = bool(run_cfg.get("allow_identical_patch_overlap", False))
+    artifacts_cfg = dict(cfg.get("artifacts", {})) if isinstance(cfg.get("artifacts"), Mapping) else {}
     started_at = iso_utc()
     scaffold_integrator_bundle(run_id)
 
@@ -363,7 +494,7 @@ def integrate_run(
                 "run_id": run_id,
                 "event_type": "INTEGRATE_START",
                 "actor": INTEGRATOR,
-                "parent_event_id": "",
+                "parent_event_id": current_span_id(),
                 "duration_ms": 0,
                 "file_counts": {},
                 "hashes": {},
@@ -372,14 +503,42 @@ def integrate_run(
             }
         )
         guard.append_line(run_log, f"[start] run_id={run_id}")
-        collected = _collect_worker_inputs(run_id, chosen)
-        overlap_report = detect_file_overlaps(
-            run_id,
-            workers=chosen,
-            strict_mode=strict_mode,
-            allow_identical_patch_overlap=allow_identical_patch_overlap,
-        )
-        scope_report = detect_scope_violations(run_id, workers=chosen)
+        cached_inputs, cache_payload, incremental = _incremental_inputs(run_id, chosen, full=full, known=early)
+        early_validations = cached_inputs["validations"]
+        early_overlap = cached_inputs["overlap_indexes"]
+        early_scope = cached_inputs["scope_violations"]
+        guard.append_line(run_log, f"[inputs] reused={len(incremental['reused'])} recomputed={len(incremental['recomputed'])} full={bool(full)}")
+        collected = _collect_worker_inputs(run_id, chosen, early_validations)
+        with trace_span("overlap_detection", run_id=run_id, event_type="OVERLAP_CHECK", details={"kind": "factory"}) as span:
+            if all(worker in early_overlap for worker in chosen):
+                overlap_report = merge_overlap_indexes(
+                    run_id,
+                    [dict(early_overlap[worker]) for worker in chosen],
+                    strict_mode=strict_mode,
+                    allow_identical_patch_overlap=allow_identical_patch_overlap,
+                )
+            else:
+                overlap_report = detect_file_overlaps(
+                    run_id,
+                    workers=chosen,
+                    strict_mode=strict_mode,
+                    allow_identical_patch_overlap=allow_identical_patch_overlap,
+                )
+            span.set(
+                rc=0 if overlap_report.get("status") == PASS else 2,
+                details={"status": overlap_report.get("status", BLOCKED), "precomputed": all(worker in early_overlap for worker in chosen)},
+                file_counts={"overlaps": len(overlap_report.get("overlaps", [])), "blocked": int(overlap_report.get("blocked", 0))},
+            )
+        with trace_span("scope_detection", run_id=run_id, event_type="SCOPE_CHECK", details={"kind": "factory"}) as span:
+            if all(worker in early_scope for worker in chosen):
+                scope_report = merge_scope_violations(run_id, [list(early_scope[worker]) for worker in chosen])
+            else:
+                scope_report = detect_scope_violations(run_id, workers=chosen)
+            span.set(
+                rc=0 if scope_report.get("status") == PASS else 2,
+                details={"status": scope_report.get("status", BLOCKED)},
+                file_counts={"violations": len(scope_report.get("violations", []))},
+            )
         merged_files = _merge_files_changed(run_id, collected)
         merged_patch = _merge_patch(collected)
 
@@ -647,9 +806,14 @@ def integrate_run(
         guard.write_json(z_dir / "LOGS" / "INDEX.json", _build_log_index(run_id, status_exit_code(final_status)))
         guard.write_text(z_dir / "FINAL_REPORT.txt", final_report)
 
+        guard.write_json(z_dir / CACHE_REL, cache_payload)
         guard.append_line(run_log, f"[done] final_status={final_status}")
 
-        attestations = write_all_attestations(run_id, report_path=z_dir / "FINAL_REPORT.txt")
+        attestations = write_all_attestations(
+            run_id,
+            report_path=z_dir / "FINAL_REPORT.txt",
+            seal=bool(artifacts_cfg.get("enabled", False)),
+        )
         ledger_sig = verify_ledger_signature()
         final_report = _render_final_report(
             run_id,
@@ -667,7 +831,11 @@ def integrate_run(
         )
         guard.write_text(z_dir / "FINAL_REPORT.txt", final_report)
         report_hash = stable_sha256_text(final_report)
-        attestations = write_all_attestations(run_id, report_path=z_dir / "FINAL_REPORT.txt")
+        attestations = write_all_attestations(
+            run_id,
+            report_path=z_dir / "FINAL_REPORT.txt",
+            seal=bool(artifacts_cfg.get("enabled", False)),
+        )
 
         report_hash = stable_sha256_text(final_report)
         append_event(
@@ -677,7 +845,7 @@ def integrate_run(
                 "run_id": run_id,
                 "event_type": "REPORT_WRITTEN",
                 "actor": INTEGRATOR,
-                "parent_event_id": "",
+                "parent_event_id": current_span_id(),
                 "duration_ms": 0,
                 "file_counts": {"workers": len(chosen), "merged_files": len(merged_files.get("changes", []))},
                 "hashes": {"final_report_sha256": report_hash},
@@ -704,8 +872,8 @@ def integrate_run(
                 "run_id": run_id,
                 "event_type": "RUN_END",
                 "actor": INTEGRATOR,
-                "parent_event_id": "",
-                "duration_ms": 0,
+                "parent_event_id": current_span_id(),
+                "duration_ms": int((time.perf_counter() - clock) * 1000),
                 "file_counts": {"workers": len(chosen)},
                 "hashes": {"final_report_sha256": report_hash},
                 "rc": status_exit_code(final_status),
@@ -725,6 +893,7 @@ def integrate_run(
             "report": (z_dir / "FINAL_REPORT.txt").as_posix(),
             "attestations": attestations,
             "meaningful_gate": gate_payload,
+            "incremental": incremental,
         }
     except Exception as exc:  # pragma: no cover - integration fallback path
         ended_at = iso_utc()
@@ -779,8 +948,8 @@ def integrate_run(
                 "run_id": run_id,
                 "event_type": "RUN_END",
                 "actor": INTEGRATOR,
-                "parent_event_id": "",
-                "duration_ms": 0,
+                "parent_event_id": current_span_id(),
+                "duration_ms": int((time.perf_counter() - clock) * 1000),
                 "file_counts": {},
                 "hashes": {},
                 "rc": evaluation.exit_code,
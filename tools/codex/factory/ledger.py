@@ -2,13 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import json
-import os
-import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Iterable, Mapping
 
 from .common import INTEGRATOR, RUNS_DIR, ensure_dir, iso_utc
+from .locks import FileLock, LockAcquisitionError
 from .schemas import validate_payload
 from .status_eval import BLOCKED, PASS, status_exit_code
 
@@ -21,6 +20,7 @@ EVENT_TYPES = {
     "PREFLIGHT",
     "WORKTREE_CREATE",
     "LAUNCH_RESULT",
+    "WORKER_DISPATCH",
     "WORKER_BUNDLE_DISCOVERED",
     "BUNDLE_VALIDATED",
     "OVERLAP_CHECK",
@@ -31,6 +31,8 @@ EVENT_TYPES = {
     "RUN_END",
     "RUN_STATE",
     "ONESHOT_SUMMARY",
+    "STAGE_START",
+    "STAGE_END",
 }
 
 
@@ -115,26 +117,21 @@ def _write_signature(ledger_path: Path, signature_path: Path) -> None:
 
 @contextmanager
 def _acquire_ledger_lock(lock_path: Path, *, timeout_seconds: float = 5.0):
-    ensure_dir(lock_path.parent)
-    start = time.monotonic()
-    while True:
-        try:
-            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        except FileExistsError:
-            if (time.monotonic() - start) >= timeout_seconds:
-                raise TimeoutError(f"ledger lock timeout: {lock_path.as_posix()}")
-            time.sleep(0.05)
-            continue
-        try:
-            os.write(fd, f"{os.getpid()} {iso_utc()}\n".encode("utf-8"))
-        finally:
-            os.close(fd)
-        break
+    lock = FileLock(
+        path=lock_path,
+        owner="ledger.append",
+        metadata={"ledger": lock_path.name},
+        wait_seconds=timeout_seconds,
+        heartbeat=False,
+    )
+    try:
+        lock.acquire()
+    except LockAcquisitionError as exc:
+        raise TimeoutError(f"ledger lock timeout: {lock_path.as_posix()}") from exc
     try:
         yield
     finally:
-        if lock_path.exists():
-            lock_path.unlink()
+        lock.release()
 
 
 def append_event(
@@ -1,48 +1,327 @@
 from __future__ import annotations
 
+import ctypes
+import errno
 import json
 import os
-from dataclasses import dataclass
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from .common import RUNS_DIR, ensure_dir, iso_utc
 
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_LEASE_SECONDS = 30.0
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+_POLL_SECONDS = 0.05
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
 
 class LockAcquisitionError(RuntimeError):
     pass
 
 
+def _hostname() -> str:
+    return socket.gethostname()
+
+
+def _boot_id() -> str:
+    try:
+        return BOOT_ID_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def _pid_alive_windows(pid: int) -> bool:
+    # A process that exited with code 259 reads as alive; its lease still expires.
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return ctypes.get_last_error() == _ERROR_ACCESS_DENIED  # type: ignore[attr-defined]
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == _STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        # os.kill(pid, 0) is no probe on Windows: signal 0 is CTRL_C_EVENT and
+        # would interrupt the holder's console process group.
+        return _pid_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _read_record(path: Path) -> dict[str, Any] | None:
+    try:
+        raw = path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not raw:
+        return None
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def lease_stale_reason(record: dict[str, Any] | None, *, now: float | None = None) -> str:
+    # Unparseable records (legacy or foreign lock files) are never reclaimed automatically.
+    if record is None:
+        return ""
+    current = time.time() if now is None else now
+    expires_at = float(record.get("lease_expires_at", 0) or 0)
+    if expires_at and current >= expires_at:
+        return "lease expired"
+    host = str(record.get("host", ""))
+    if host and host == _hostname():
+        boot_id = str(record.get("boot_id", ""))
+        local_boot = _boot_id()
+        if boot_id and local_boot and boot_id != local_boot:
+            return "owner host rebooted"
+        if not _pid_alive(int(record.get("pid", 0) or 0)):
+            return "owner process is dead"
+    return ""
+
+
+def _same_file(fd: int, path: Path) -> bool:
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino)
+
+
+def _try_flock(fd: int) -> bool:
+    if fcntl is None:  # pragma: no cover - Windows
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError as exc:
+        if exc.errno in {errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK}:
+            return False
+        raise
+    return True
+
+
+def _wait_flock(fd: int, timeout_seconds: float) -> bool:
+    # flock has no timeout, so the blocking call runs on a helper thread against a
+    # duplicated descriptor; if we give up first, the helper drops the lock as soon
+    # as it gets it.
+    if fcntl is None:  # pragma: no cover - Windows
+        time.sleep(min(_POLL_SECONDS, max(0.0, timeout_seconds)))
+        return False
+    waiter_fd = os.dup(fd)
+    done = threading.Event()
+    state = {"abandoned": False, "acquired": False}
+    guard = threading.Lock()
+
+    def _block() -> None:
+        try:
+            fcntl.flock(waiter_fd, fcntl.LOCK_EX)
+            with guard:
+                if state["abandoned"]:
+                    fcntl.flock(waiter_fd, fcntl.LOCK_UN)
+                else:
+                    state["acquired"] = True
+        except OSError:
+            pass
+        finally:
+            os.close(waiter_fd)
+            done.set()
+
+    threading.Thread(target=_block, name="lease-lock-wait", daemon=True).start()
+    done.wait(max(0.0, timeout_seconds))
+    with guard:
+        if not state["acquired"]:
+            state["abandoned"] = True
+            return False
+    # The lock belongs to the open file description, so the original fd now holds it.
+    return True
+
+
+# Lease lock: the holder keeps an exclusive flock on the lock file and refreshes
+# the lease expiry from a heartbeat thread. Contenders reclaim the lock when the
+# holder died (flock released and pid gone), the host rebooted, or the lease
+# expired without a heartbeat.
 @dataclass
 class FileLock:
     path: Path
     owner: str
     metadata: dict[str, Any]
     acquired: bool = False
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
+    wait_seconds: float = 0.0
+    heartbeat: bool = True
+    reclaimed: str = ""
+    _fd: int | None = field(default=None, init=False, repr=False)
+    _stop: threading.Event | None = field(default=None, init=False, repr=False)
+    _heartbeat_thread: threading.Thread | None = field(default=None, init=False, repr=False)
 
-    def acquire(self) -> "FileLock":
-        ensure_dir(self.path.parent)
-        payload = {
+    def _record(self) -> dict[str, Any]:
+        now = time.time()
+        return {
             "owner": self.owner,
             "pid": os.getpid(),
+            "host": _hostname(),
+            "boot_id": _boot_id(),
             "ts_utc": iso_utc(),
+            "heartbeat_at": now,
+            "lease_seconds": float(self.lease_seconds),
+            "lease_expires_at": now + float(self.lease_seconds),
             "metadata": dict(self.metadata),
         }
+
+    def _encode(self) -> bytes:
+        return (json.dumps(self._record(), sort_keys=True) + "\n").encode("utf-8")
+
+    def _try_create(self) -> int | None:
+        # Write and lock a private temp file, then hard-link it into place so the
+        # lock file never becomes visible without its record and flock.
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        fd = os.open(str(temp_path), os.O_CREAT | os.O_TRUNC | os.O_RDWR, 0o644)
+        try:
+            os.write(fd, self._encode())
+            _try_flock(fd)
+            try:
+                os.link(str(temp_path), str(self.path))
+            except FileExistsError:
+                os.close(fd)
+                return None
+            except OSError:  # pragma: no cover - filesystems without hard links
+                os.close(fd)
+                try:
+                    fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o644)
+                except FileExistsError:
+                    return None
+                os.write(fd, self._encode())
+                _try_flock(fd)
+            return fd
+        finally:
+            try:
+                temp_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _contend(self, deadline: float) -> None:
+        # Existing lock file: reclaim it if stale, else wait or raise.
         try:
-            fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        except FileExistsError as exc:
-            raise LockAcquisitionError(f"lock already held: {self.path.as_posix()}") from exc
+            fd = os.open(str(self.path), os.O_RDWR)
+        except FileNotFoundError:
+            return
         try:
-            os.write(fd, (json.dumps(payload, sort_keys=True) + "\n").encode("utf-8"))
+            if _try_flock(fd):
+                if not _same_file(fd, self.path):
+                    return
+                reason = lease_stale_reason(_read_record(self.path))
+                if reason:
+                    # We hold the stale inode's flock, so competing reclaimers wait on us.
+                    os.unlink(self.path)
+                    self.reclaimed = reason
+                    return
+                record = _read_record(self.path)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LockAcquisitionError(f"lock already held: {self.path.as_posix()}")
+                # Holder is alive elsewhere (other host, legacy lock file or no flock
+                # support): wait for its lease to lapse rather than spinning.
+                lease_left = float((record or {}).get("lease_expires_at", 0) or 0) - time.time()
+                time.sleep(max(_POLL_SECONDS, min(remaining, lease_left)))
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not _wait_flock(fd, remaining):
+                raise LockAcquisitionError(f"lock already held: {self.path.as_posix()}")
+            # The holder released; its file is gone or about to be replaced.
         finally:
             os.close(fd)
+
+    def acquire(self) -> "FileLock":
+        ensure_dir(self.path.parent)
+        deadline = time.monotonic() + max(0.0, float(self.wait_seconds))
+        while True:
+            fd = self._try_create()
+            if fd is not None:
+                break
+            self._contend(deadline)
+        self._fd = fd
         self.acquired = True
+        if self.heartbeat and self.lease_seconds > 0:
+            self._start_heartbeat()
         return self
 
+    def _start_heartbeat(self) -> None:
+        stop = threading.Event()
+        interval = max(_POLL_SECONDS, float(self.lease_seconds) / 3.0)
+
+        def _beat() -> None:
+            while not stop.wait(interval):
+                self.refresh()
+
+        self._stop = stop
+        self._heartbeat_thread = threading.Thread(target=_beat, name=f"lease-heartbeat:{self.path.name}", daemon=True)
+        self._heartbeat_thread.start()
+
+    def refresh(self) -> None:
+        fd = self._fd
+        if fd is None or not self.acquired:
+            return
+        payload = self._encode()
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, payload)
+            os.ftruncate(fd, len(payload))
+        except OSError:
+            pass
+
     def release(self) -> None:
         if not self.acquired:
             return
-        if self.path.exists():
+        if self._stop is not None:
+            self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+        self._stop = None
+        self._heartbeat_thread = None
+        fd = self._fd
+        self._fd = None
+        if fd is not None:
+            try:
+                # Only remove the file if it is still ours (it may have been reclaimed).
+                if _same_file(fd, self.path):
+                    self.path.unlink()
+            finally:
+                os.close(fd)
+        elif self.path.exists():
             self.path.unlink()
         self.acquired = False
 
@@ -66,14 +345,19 @@ def worker_lock_path(run_id: str, worker: str) -> Path:
     return run_locks_dir(run_id) / f"{worker}.lock"
 
 
-def acquire_run_lock(run_id: str, *, owner: str) -> FileLock:
-    return FileLock(path=run_lock_path(run_id), owner=owner, metadata={"run_id": run_id}).acquire()
+def acquire_run_lock(run_id: str, *, owner: str, wait_seconds: float = 0.0) -> FileLock:
+    return FileLock(
+        path=run_lock_path(run_id),
+        owner=owner,
+        metadata={"run_id": run_id},
+        wait_seconds=wait_seconds,
+    ).acquire()
 
 
-def acquire_worker_lock(run_id: str, worker: str, *, owner: str) -> FileLock:
+def acquire_worker_lock(run_id: str, worker: str, *, owner: str, wait_seconds: float = 0.0) -> FileLock:
     return FileLock(
         path=worker_lock_path(run_id, worker),
         owner=owner,
         metadata={"run_id": run_id, "worker": worker},
+        wait_seconds=wait_seconds,
     ).acquire()
-
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from . import ledger
+from .common import INTEGRATOR, RUNS_DIR, WORKER_ID_RE, ensure_dir, iso_utc
+from .follow import LedgerTail
+from .locks import FileLock, LockAcquisitionError
+from .status_eval import BLOCKED, PASS
+
+METRICS_DIR = RUNS_DIR / "_metrics"
+CURSOR_NAME = "CURSOR.json"
+PROM_NAME = "factory_metrics.prom"
+JSON_NAME = "factory_metrics.json"
+STATE_VERSION = 1
+QUANTILES = (0.5, 0.95, 0.99)
+# Log-spaced duration buckets, eight per doubling: quantiles come out within
+# ~9% of the exact value while the state stays a few hundred ints per series.
+BUCKET_BASE = 2 ** (1 / 8)
+HEAD_BYTES = 4096
+SUCCESS = {PASS, "WARN"}
+
+
+def _bucket(duration_us: int) -> int:
+    if duration_us <= 1:
+        return 0
+    return max(0, math.ceil(math.log(duration_us, BUCKET_BASE) - 1e-9))
+
+
+def _empty_series() -> dict[str, Any]:
+    return {"count": 0, "success": 0, "sum_us": 0, "max_us": 0, "buckets": {}}
+
+
+def _observe(series: dict[str, Any], duration_us: int, ok: bool) -> None:
+    series["count"] += 1
+    series["success"] += int(ok)
+    series["sum_us"] += duration_us
+    series["max_us"] = max(series["max_us"], duration_us)
+    key = str(_bucket(duration_us))
+    series["buckets"][key] = series["buckets"].get(key, 0) + 1
+
+
+def quantile_ms(series: Mapping[str, Any], q: float) -> float:
+    total = int(series.get("count", 0))
+    if total <= 0:
+        return 0.0
+    rank = max(1, math.ceil(q * total))
+    seen = 0
+    for key in sorted(series["buckets"], key=int):
+        seen += series["buckets"][key]
+        if seen >= rank:
+            upper = BUCKET_BASE ** int(key) if int(key) else 1.0
+            return round(min(upper, float(series["max_us"])) / 1000.0, 3)
+    return round(series["max_us"] / 1000.0, 3)
+
+
+def _empty_state() -> dict[str, Any]:
+    return {
+        "schema_version": STATE_VERSION,
+        "ledger": {"offset": 0, "head_sha256": ""},
+        "stages": {},
+        "workers": {},
+        "runs": {},
+        "overlap": {"checks": 0, "blocked": 0, "blocked_files": 0},
+        "txn": {},
+    }
+
+
+def _head_sha(path: Path, length: int) -> str:
+    try:
+        with path.open("rb") as handle:
+            return hashlib.sha256(handle.read(length)).hexdigest()
+    except OSError:
+        return ""
+
+
+def _event_ok(event: Mapping[str, Any], details: Mapping[str, Any]) -> bool:
+    status = str(details.get("status", "")).upper()
+    if status:
+        return status in SUCCESS
+    return int(event.get("rc", 0) or 0) == 0
+
+
+def _stage_name(event: Mapping[str, Any], details: Mapping[str, Any]) -> str:
+    if details.get("stage"):
+        return str(details["stage"])
+    trace = details.get("trace")
+    if isinstance(trace, Mapping) and trace.get("span"):
+        return str(trace["span"])
+    return str(event.get("event_type", "")).lower()
+
+
+def _duration_us(event: Mapping[str, Any], details: Mapping[str, Any]) -> int:
+    trace = details.get("trace")
+    if isinstance(trace, Mapping) and trace.get("duration_us") is not None:
+        return max(0, int(trace["duration_us"]))
+    return max(0, int(event.get("duration_ms", 0) or 0)) * 1000
+
+
+def apply_event(state: dict[str, Any], event: Mapping[str, Any]) -> None:
+    details = event.get("details") if isinstance(event.get("details"), Mapping) else {}
+    run_id = str(event.get("run_id", ""))
+    if run_id and run_id not in state["runs"]:
+        state["runs"][run_id] = str(event.get("ts_utc", ""))[:10]
+    event_type = str(event.get("event_type", ""))
+    if event_type == "OVERLAP_CHECK":
+        state["overlap"]["checks"] += 1
+        state["overlap"]["blocked"] += int(str(details.get("status", "")).upper() not in SUCCESS)
+        counts = event.get("file_counts") if isinstance(event.get("file_counts"), Mapping) else {}
+        state["overlap"]["blocked_files"] += int(counts.get("blocked", 0) or 0)
+    # Only span events carry a measured duration.
+    if not isinstance(details.get("trace"), Mapping) and event_type not in {"STAGE_END", "RUN_END"}:
+        return
+    ok = _event_ok(event, details)
+    duration = _duration_us(event, details)
+    _observe(state["stages"].setdefault(_stage_name(event, details), _empty_series()), duration, ok)
+    worker = str(details.get("worker") or event.get("actor", ""))
+    if worker and worker != INTEGRATOR and WORKER_ID_RE.fullmatch(worker):
+        _observe(state["workers"].setdefault(worker, _empty_series()), duration, ok)
+
+
+def _txn_counts(path: Path) -> dict[str, Any] | None:
+    # txn_runtime STATUS.json: a failed dispatch records its error_class and a
+    # recoverable one is followed by a retry_decision entry.
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    timeline = payload.get("timeline") if isinstance(payload, dict) else None
+    if not isinstance(timeline, list):
+        return None
+    failures: dict[str, int] = {}
+    retries: dict[str, int] = {}
+    for item in timeline:
+        if not isinstance(item, dict) or not item.get("error_class"):
+            continue
+        error_class = str(item["error_class"])
+        if item.get("stage") == "dispatch":
+            failures[error_class] = failures.get(error_class, 0) + 1
+        elif item.get("stage") == "retry_decision":
+            retries[error_class] = retries.get(error_class, 0) + 1
+    return {"failures": failures, "retries": retries}
+
+
+def _scan_txn(state: dict[str, Any], runs_dir: Path) -> int:
+    # Re-read only STATUS.json files whose size or mtime moved since the cursor.
+    changed = 0
+    try:
+        entries = sorted(os.scandir(runs_dir), key=lambda entry: entry.name)
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.is_dir() or entry.name.startswith(("_", ".")) or entry.name == "locks":
+            continue
+        path = Path(entry.path) / "STATUS.json"
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        known = state["txn"].get(entry.name)
+        if known is not None and known.get("stamp") == stamp:
+            continue
+        counts = _txn_counts(path)
+        if counts is None:
+            continue
+        state["txn"][entry.name] = {"stamp": stamp, **counts}
+        changed += 1
+    return changed
+
+
+def _totals(state: Mapping[str, Any]) -> dict[str, dict[str, int]]:
+    failures: dict[str, int] = {}
+    retries: dict[str, int] = {}
+    for record in state["txn"].values():
+        for key, value in record.get("failures", {}).items():
+            failures[key] = failures.get(key, 0) + int(value)
+        for key, value in record.get("retries", {}).items():
+            retries[key] = retries.get(key, 0) + int(value)
+    return {"failures": failures, "retries": retries}
+
+
+def _series_summary(series: Mapping[str, Any]) -> dict[str, Any]:
+    count = int(series["count"])
+    return {
+        "count": count,
+        "success": int(series["success"]),
+        "success_rate": round(series["success"] / count, 4) if count else 0.0,
+        "sum_ms": round(series["sum_us"] / 1000.0, 3),
+        "max_ms": round(series["max_us"] / 1000.0, 3),
+        **{f"p{int(q * 100)}_ms": quantile_ms(series, q) for q in QUANTILES},
+    }
+
+
+def summarize(state: Mapping[str, Any]) -> dict[str, Any]:
+    per_day: dict[str, int] = {}
+    for day in state["runs"].values():
+        if day:
+            per_day[day] = per_day.get(day, 0) + 1
+    txn = _totals(state)
+    overlap = state["overlap"]
+    return {
+        "ledger_offset": int(state["ledger"]["offset"]),
+        "stages": {name: _series_summary(series) for name, series in sorted(state["stages"].items())},
+        "workers": {name: _series_summary(series) for name, series in sorted(state["workers"].items())},
+        "runs_total": len(state["runs"]),
+        "runs_per_day": dict(sorted(per_day.items())),
+        "retries": {
+            error_class: {
+                "failures": txn["failures"].get(error_class, 0),
+                "retries": txn["retries"].get(error_class, 0),
+                "retry_rate": round(txn["retries"].get(error_class, 0) / txn["failures"][error_class], 4) if txn["failures"].get(error_class) else 0.0,
+            }
+            for error_class in sorted(set(txn["failures"]) | set(txn["retries"]))
+        },
+        "overlap": {
+            "checks": int(overlap["checks"]),
+            "blocked": int(overlap["blocked"]),
+            "blocked_files": int(overlap["blocked_files"]),
+            "blocker_rate": round(overlap["blocked"] / overlap["checks"], 4) if overlap["checks"] else 0.0,
+        },
+    }
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(summary: Mapping[str, Any]) -> str:
+    lines: list[str] = []
+
+    def _family(name: str, kind: str, help_text: str, samples: Iterable[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, value in samples:
+            lines.append(f"{name}{suffix} {value:g}")
+
+    for scope, label in (("stages", "stage"), ("workers", "worker")):
+        items = summary[scope]
+        prefix = f"factory_{label}"
+        _family(
+            f"{prefix}_duration_ms",
+            "summary",
+            f"Span duration per {label} in milliseconds.",
+            [
+                sample
+                for name, item in items.items()
+                for sample in (
+                    *((f'{{{label}="{_label(name)}",quantile="{q:g}"}}', item[f"p{int(q * 100)}_ms"]) for q in QUANTILES),
+                    (f'_sum{{{label}="{_label(name)}"}}', item["sum_ms"]),
+                    (f'_count{{{label}="{_label(name)}"}}', item["count"]),
+                )
+            ],
+        )
+        _family(
+            f"{prefix}_success_total",
+            "counter",
+            f"Spans per {label} that ended PASS or WARN.",
+            [(f'{{{label}="{_label(name)}"}}', item["success"]) for name, item in items.items()],
+        )
+        _family(
+            f"{prefix}_success_ratio",
+            "gauge",
+            f"Share of spans per {label} that ended PASS or WARN.",
+            [(f'{{{label}="{_label(name)}"}}', item["success_rate"]) for name, item in items.items()],
+        )
+    _family("factory_runs_total", "counter", "Distinct run ids seen in the ledger.", [("", summary["runs_total"])])
+    _family(
+        "factory_runs_per_day",
+        "gauge",
+        "Runs first seen on each UTC day.",
+        [(f'{{day="{_label(day)}"}}', count) for day, count in summary["runs_per_day"].items()],
+    )
+    retries = summary["retries"]
+    _family(
+        "factory_txn_dispatch_failures_total",
+        "counter",
+        "Failed txn_runtime dispatch attempts by error_class.",
+        [(f'{{error_class="{_label(name)}"}}', item["failures"]) for name, item in retries.items()],
+    )
+    _family(
+        "factory_txn_retries_total",
+        "counter",
+        "Outer retries scheduled by txn_runtime by error_class.",
+        [(f'{{error_class="{_label(name)}"}}', item["retries"]) for name, item in retries.items()],
+    )
+    _family(
+        "factory_txn_retry_ratio",
+        "gauge",
+        "Retries per failed dispatch by error_class.",
+        [(f'{{error_class="{_label(name)}"}}', item["retry_rate"]) for name, item in retries.items()],
+    )
+    overlap = summary["overlap"]
+    _family("factory_overlap_checks_total", "counter", "Overlap checks run.", [("", overlap["checks"])])
+    _family("factory_overlap_blocked_total", "counter", "Overlap checks that blocked integration.", [("", overlap["blocked"])])
+    _family("factory_overlap_blocker_ratio", "gauge", "Share of overlap checks that blocked.", [("", overlap["blocker_rate"])])
+    _family("factory_metrics_ledger_offset_bytes", "gauge", "Ledger bytes consumed by the metrics cursor.", [("", summary["ledger_offset"])])
+    return "\n".join(lines) + "\n"
+
+
+def _replace(target: Path, text: str) -> None:
+    # Scrapers read these files without locking, so swap them in whole.
+    ensure_dir(target.parent)
+    temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp.write_text(text, encoding="utf-8", newline="\n")
+    os.replace(temp, target)
+
+
+def load_state(out_dir: Path) -> dict[str, Any]:
+    try:
+        state = json.loads((out_dir / CURSOR_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _empty_state()
+    if not isinstance(state, dict) or state.get("schema_version") != STATE_VERSION:
+        return _empty_state()
+    return state
+
+
+def export_metrics(
+    *,
+    out_dir: Path | None = None,
+    ledger_path: Path | None = None,
+    runs_dir: Path | None = None,
+    reset: bool = False,
+) -> dict[str, Any]:
+    target = out_dir or METRICS_DIR
+    source = ledger_path or ledger.LEDGER_PATH
+    lock = FileLock(path=target / "metrics.lock", owner="metrics.export", metadata={}, wait_seconds=1.0, heartbeat=False)
+    try:
+        lock.acquire()
+    except LockAcquisitionError:
+        return {"status": BLOCKED, "detail": "another metrics export holds the lock", "out_dir": target.as_posix()}
+    try:
+        state = _empty_state() if reset else load_state(target)
+        cursor = state["ledger"]
+        offset = int(cursor.get("offset", 0))
+        if offset and _head_sha(source, min(offset, HEAD_BYTES)) != cursor.get("head_sha256"):
+            # The ledger was rewritten underneath the cursor; start over.
+            state = _empty_state()
+            cursor = state["ledger"]
+            offset = 0
+        tail = LedgerTail(source, offset=offset)
+        events_read = 0
+        for _offset, event in tail.events():
+            apply_event(state, event)
+            events_read += 1
+        cursor["offset"] = tail.offset
+        cursor["head_sha256"] = _head_sha(source, min(tail.offset, HEAD_BYTES)) if tail.offset else ""
+        txn_changed = _scan_txn(state, runs_dir or RUNS_DIR)
+        summary = summarize(state)
+        summary["generated_at"] = iso_utc()
+        _replace(target / CURSOR_NAME, json.dumps(state, sort_keys=True) + "\n")
+        _replace(target / JSON_NAME, json.dumps(summary, indent=2, sort_keys=True) + "\n")
+        _replace(target / PROM_NAME, render_prometheus(summary))
+    finally:
+        lock.release()
+    return {
+        "status": PASS,
+        "out_dir": target.as_posix(),
+        "events_read": events_read,
+        "ledger_offset": cursor["offset"],
+        "txn_runs_rescanned": txn_changed,
+        "metrics": summary,
+    }
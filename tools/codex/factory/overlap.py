@@ -6,7 +6,7 @@ import re
 from collections import defaultdict
 from typing import Any
 
-from .common import WORKERS, read_json
+from .common import read_json, run_workers
 from .contracts import bundle_dir
 from .path_guard import PathGuardError, PathIssue, canonical_path_key, detect_scope_violations_for_paths, normalize_rel_path
 
@@ -74,47 +74,67 @@ def _extract_patch_paths(diff_text: str) -> list[str]:
     return sorted(paths)
 
 
-def detect_file_overlaps(
+def index_worker_overlaps(run_id: str, worker: str) -> dict[str, Any]:
+    declared: list[dict[str, Any]] = []
+    invalid_paths: list[dict[str, Any]] = []
+    hidden_overlaps: list[dict[str, Any]] = []
+    declared_paths: set[str] = set()
+    for entry in _load_worker_changes(run_id, worker):
+        raw_path = str(entry.get("path", "")).strip()
+        if not raw_path:
+            continue
+        try:
+            path = normalize_rel_path(raw_path)
+        except PathGuardError as exc:
+            invalid_paths.append({"worker": worker, "path": raw_path, "reason": str(exc)})
+            continue
+        declared_paths.add(path)
+        declared.append({"path": path, "entry": entry})
+
+    diff_text = _load_worker_diff(run_id, worker)
+    patch_paths = _extract_patch_paths(diff_text)
+    for patch_path in patch_paths:
+        if patch_path not in declared_paths:
+            hidden_overlaps.append(
+                {
+                    "worker": worker,
+                    "path": patch_path,
+                    "reason": "path present in DIFF.patch but missing from FILES_CHANGED",
+                }
+            )
+    return {
+        "worker": worker,
+        "declared": declared,
+        "invalid_paths": invalid_paths,
+        "hidden_overlaps": hidden_overlaps,
+        "patch_paths": patch_paths,
+        "patch_hash": hashlib.sha256(diff_text.encode("utf-8")).hexdigest() if diff_text else "",
+        "scope_lock": _load_scope_lock(run_id, worker),
+    }
+
+
+def merge_overlap_indexes(
     run_id: str,
-    workers: list[str] | None = None,
+    indexes: list[dict[str, Any]],
     *,
     strict_mode: bool = True,
     allow_identical_patch_overlap: bool = False,
 ) -> dict[str, Any]:
-    chosen = list(workers or WORKERS)
     owners: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    scope_locks = {worker: _load_scope_lock(run_id, worker) for worker in chosen}
+    scope_locks: dict[str, Any] = {}
     hidden_overlaps: list[dict[str, Any]] = []
     invalid_paths: list[dict[str, Any]] = []
     patch_hashes: dict[str, str] = {}
 
-    for worker in chosen:
-        changes = _load_worker_changes(run_id, worker)
-        declared_paths: set[str] = set()
-        for entry in changes:
-            raw_path = str(entry.get("path", "")).strip()
-            if not raw_path:
-                continue
-            try:
-                path = normalize_rel_path(raw_path)
-            except PathGuardError as exc:
-                invalid_paths.append({"worker": worker, "path": raw_path, "reason": str(exc)})
-                continue
-            declared_paths.add(path)
-            owners[path].append({"worker": worker, "entry": entry})
-
-        diff_text = _load_worker_diff(run_id, worker)
-        patch_hashes[worker] = hashlib.sha256(diff_text.encode("utf-8")).hexdigest() if diff_text else ""
-        patch_paths = _extract_patch_paths(diff_text)
-        for patch_path in patch_paths:
-            if patch_path not in declared_paths:
-                hidden_overlaps.append(
-                    {
-                        "worker": worker,
-                        "path": patch_path,
-                        "reason": "path present in DIFF.patch but missing from FILES_CHANGED",
-                    }
-                )
+    for index in indexes:
+        worker = str(index["worker"])
+        scope_locks[worker] = index.get("scope_lock", {})
+        for item in index.get("declared", []):
+            owners[item["path"]].append({"worker": worker, "entry": item["entry"]})
+        invalid_paths.extend(index.get("invalid_paths", []))
+        hidden_overlaps.extend(index.get("hidden_overlaps", []))
+        patch_hashes[worker] = str(index.get("patch_hash", ""))
+        for patch_path in index.get("patch_paths", []):
             owners[patch_path].append({"worker": worker, "entry": {"path": patch_path, "source": "DIFF.patch"}})
 
     overlaps: list[dict[str, Any]] = []
@@ -175,39 +195,56 @@ def detect_file_overlaps(
     }
 
 
-def detect_scope_violations(run_id: str, workers: list[str] | None = None) -> dict[str, Any]:
-    chosen = list(workers or WORKERS)
-    violations: list[dict[str, Any]] = []
+def detect_file_overlaps(
+    run_id: str,
+    workers: list[str] | None = None,
+    *,
+    strict_mode: bool = True,
+    allow_identical_patch_overlap: bool = False,
+) -> dict[str, Any]:
+    chosen = list(workers or run_workers(run_id))
+    return merge_overlap_indexes(
+        run_id,
+        [index_worker_overlaps(run_id, worker) for worker in chosen],
+        strict_mode=strict_mode,
+        allow_identical_patch_overlap=allow_identical_patch_overlap,
+    )
+
 
-    for worker in chosen:
-        lock = _load_scope_lock(run_id, worker)
-        allowed = list(lock.get("allowed_globs", []))
-        blocked_globs = list(lock.get("blocked_globs", []))
-        entries = _load_worker_changes(run_id, worker)
-        paths = [str(change.get("path", "")) for change in entries if str(change.get("path", "")).strip()]
-        scoped_violations = detect_scope_violations_for_paths(
-            worker=worker,
-            paths=paths,
-            allow_globs=allowed,
-            deny_globs=blocked_globs,
-            enforce_protected=True,
+def detect_worker_scope_violations(run_id: str, worker: str) -> list[dict[str, Any]]:
+    lock = _load_scope_lock(run_id, worker)
+    allowed = list(lock.get("allowed_globs", []))
+    blocked_globs = list(lock.get("blocked_globs", []))
+    entries = _load_worker_changes(run_id, worker)
+    paths = [str(change.get("path", "")) for change in entries if str(change.get("path", "")).strip()]
+    scoped_violations = detect_scope_violations_for_paths(
+        worker=worker,
+        paths=paths,
+        allow_globs=allowed,
+        deny_globs=blocked_globs,
+        enforce_protected=True,
+    )
+    violations: list[dict[str, Any]] = []
+    for item in scoped_violations:
+        rule = "allowed_globs"
+        detail = item.reason
+        if "denylist" in item.reason:
+            rule = "blocked_globs"
+        if "protected" in item.reason:
+            rule = "protected_paths"
+        violations.append(
+            {
+                "worker": worker,
+                "path": item.path,
+                "rule": rule,
+                "detail": detail,
+            }
         )
-        for item in scoped_violations:
-            rule = "allowed_globs"
-            detail = item.reason
-            if "denylist" in item.reason:
-                rule = "blocked_globs"
-            if "protected" in item.reason:
-                rule = "protected_paths"
-            violations.append(
-                {
-                    "worker": worker,
-                    "path": item.path,
-                    "rule": rule,
-                    "detail": detail,
-                }
-            )
+    return violations
 
+
+def merge_scope_violations(run_id: str, per_worker: list[list[dict[str, Any]]]) -> dict[str, Any]:
+    violations = [item for chunk in per_worker for item in chunk]
     violations.sort(key=lambda item: (str(item.get("path", "")), str(item.get("worker", "")), str(item.get("rule", ""))))
     return {
         "run_id": run_id,
@@ -215,3 +252,8 @@ def detect_scope_violations(run_id: str, workers: list[str] | None = None) -> di
         "violations": violations,
         "blocked": len(violations),
     }
+
+
+def detect_scope_violations(run_id: str, workers: list[str] | None = None) -> dict[str, Any]:
+    chosen = list(workers or run_workers(run_id))
+    return merge_scope_violations(run_id, [detect_worker_scope_violations(run_id, worker) for worker in chosen])
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Collection, Mapping
+
+from .common import INTEGRATOR, iso_utc
+from .contracts import bundle_dir
+from .ledger import append_event
+from .status_eval import BLOCKED, FAIL, PASS, WARN, status_exit_code
+from .tracing import current_span_id, trace_span
+
+RUN_SCOPE = "run"
+WORKER_SCOPE = "worker"
+STAGE_SCOPES = (RUN_SCOPE, WORKER_SCOPE)
+SKIPPED = "SKIPPED"
+RUNNING = "RUNNING"
+
+
+@dataclass(frozen=True)
+class StageNode:
+    node_id: str
+    stage: str
+    worker: str
+    depends_on: tuple[str, ...]
+
+    @property
+    def actor(self) -> str:
+        return self.worker or INTEGRATOR
+
+
+@dataclass
+class StageResult:
+    node_id: str
+    stage: str
+    worker: str
+    status: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    started_at: str = ""
+    ended_at: str = ""
+    duration_ms: int = 0
+    detail: str = ""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "node": self.node_id,
+            "stage": self.stage,
+            "worker": self.worker,
+            "status": self.status,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "duration_ms": self.duration_ms,
+            "detail": self.detail,
+        }
+
+
+StageHandler = Callable[[StageNode, Mapping[str, StageResult]], Mapping[str, Any]]
+
+
+def node_id(stage: str, worker: str = "") -> str:
+    return f"{stage}:{worker}" if worker else stage
+
+
+def build_stage_graph(stages: Mapping[str, Mapping[str, Any]], workers: list[str]) -> dict[str, StageNode]:
+    # Worker-scoped stages expand to one node per worker. A worker-scoped
+    # dependency of a worker-scoped stage binds to the same worker; a run-scoped
+    # stage depending on a worker-scoped stage waits for every worker.
+    scopes: dict[str, str] = {}
+    for name, spec in stages.items():
+        scope = str(spec.get("scope", RUN_SCOPE))
+        if scope not in STAGE_SCOPES:
+            raise ValueError(f"pipeline stage {name!r} has unknown scope {scope!r}")
+        scopes[name] = scope
+    nodes: dict[str, StageNode] = {}
+    for name in sorted(stages):
+        deps = [str(item) for item in stages[name].get("depends_on", [])]
+        for dep in deps:
+            if dep not in scopes:
+                raise ValueError(f"pipeline stage {name!r} depends on unknown stage {dep!r}")
+        owners = workers if scopes[name] == WORKER_SCOPE else [""]
+        for worker in owners:
+            resolved: list[str] = []
+            for dep in deps:
+                if scopes[dep] == RUN_SCOPE:
+                    resolved.append(node_id(dep))
+                elif worker:
+                    resolved.append(node_id(dep, worker))
+                else:
+                    resolved.extend(node_id(dep, item) for item in workers)
+            nodes[node_id(name, worker)] = StageNode(
+                node_id=node_id(name, worker),
+                stage=name,
+                worker=worker,
+                depends_on=tuple(sorted(set(resolved))),
+            )
+    _assert_acyclic(nodes)
+    return nodes
+
+
+def _assert_acyclic(nodes: Mapping[str, StageNode]) -> None:
+    remaining = {key: set(node.depends_on) for key, node in nodes.items()}
+    while remaining:
+        ready = [key for key, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"pipeline stage graph has a cycle: {', '.join(sorted(remaining))}")
+        for key in ready:
+            del remaining[key]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _stage_rc(status: str) -> int:
+    return 0 if status in {PASS, WARN, SKIPPED, RUNNING} else status_exit_code(status)
+
+
+def _stage_details(node: StageNode, *, status: str, detail: str = "") -> dict[str, Any]:
+    return {
+        "kind": "factory",
+        "status": status,
+        "stage": node.stage,
+        "node": node.node_id,
+        "worker": node.worker,
+        "depends_on": list(node.depends_on),
+        "detail": detail,
+    }
+
+
+def _run_node(run_id: str, node: StageNode, handler: StageHandler, results: Mapping[str, StageResult]) -> StageResult:
+    # The node span closes as STAGE_END; handler spans nest under it.
+    with trace_span(f"stage:{node.node_id}", run_id=run_id, actor=node.actor, event_type="STAGE_END") as span:
+        started_at = iso_utc()
+        append_event(
+            {
+                "schema_version": 1,
+                "run_id": run_id,
+                "event_type": "STAGE_START",
+                "actor": node.actor,
+                "parent_event_id": current_span_id(),
+                "duration_ms": 0,
+                "file_counts": {},
+                "hashes": {},
+                "rc": _stage_rc(RUNNING),
+                "details": _stage_details(node, status=RUNNING),
+            }
+        )
+        try:
+            payload = dict(handler(node, results))
+            status = str(payload.get("status", BLOCKED)).upper()
+            detail = str(payload.get("detail", "") or "")
+        except Exception as exc:
+            payload = {"status": FAIL, "error": str(exc)}
+            status = FAIL
+            detail = str(exc)
+        status = status if status in {PASS, BLOCKED, FAIL, WARN} else BLOCKED
+        span.set(rc=_stage_rc(status), details=_stage_details(node, status=status, detail=detail))
+    return StageResult(
+        node_id=node.node_id,
+        stage=node.stage,
+        worker=node.worker,
+        status=status,
+        payload=payload,
+        started_at=started_at,
+        ended_at=iso_utc(),
+        duration_ms=span.duration_us // 1000,
+        detail=detail,
+    )
+
+
+def run_stage_graph(
+    run_id: str,
+    nodes: Mapping[str, StageNode],
+    handlers: Mapping[str, StageHandler],
+    *,
+    max_parallel: int = 4,
+    waiting_stages: Collection[str] = (),
+) -> dict[str, StageResult]:
+    # Nodes of waiting_stages mostly sleep (e.g. polling for DONE markers), so they
+    # get their own threads: a slow wait never holds a max_parallel slot that an
+    # already-finished worker's next stage needs.
+    missing = sorted({node.stage for node in nodes.values() if node.stage not in handlers})
+    if missing:
+        raise ValueError(f"no handler registered for pipeline stages: {', '.join(missing)}")
+
+    results: dict[str, StageResult] = {}
+    pending = dict(nodes)
+    running: dict[Future[StageResult], str] = {}
+    waiting = {key for key, node in nodes.items() if node.stage in waiting_stages}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_parallel)), thread_name_prefix="factory-stage") as pool, ThreadPoolExecutor(
+        max_workers=max(1, len(waiting)), thread_name_prefix="factory-wait"
+    ) as waiters:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for key in sorted(pending):
+                    node = pending[key]
+                    if not all(dep in results for dep in node.depends_on):
+                        continue
+                    upstream = [dep for dep in node.depends_on if results[dep].status not in {PASS, WARN}]
+                    del pending[key]
+                    progressed = True
+                    if upstream:
+                        results[key] = StageResult(
+                            node_id=key,
+                            stage=node.stage,
+                            worker=node.worker,
+                            status=SKIPPED,
+                            detail=f"upstream not passing: {', '.join(upstream)}",
+                        )
+                        continue
+                    # Each node runs in a copy of the caller's context so its span nests under the caller's.
+                    executor = waiters if key in waiting else pool
+                    future = executor.submit(contextvars.copy_context().run, _run_node, run_id, node, handlers[node.stage], dict(results))
+                    running[future] = key
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                results[key] = future.result()
+    return results
+
+
+def stage_results(results: Mapping[str, StageResult], stage: str) -> list[StageResult]:
+    return [results[key] for key in sorted(results) if results[key].stage == stage]
+
+
+def done_marker_path(run_id: str, worker: str) -> Path:
+    return bundle_dir(run_id, worker) / "DONE.marker"
+
+
+def wait_for_done_marker(run_id: str, worker: str, *, timeout_seconds: float, poll_seconds: float) -> dict[str, Any]:
+    marker = done_marker_path(run_id, worker)
+    token = f"DONE {run_id} {worker}"
+    start = time.monotonic()
+    deadline = start + max(0.0, float(timeout_seconds))
+    while True:
+        try:
+            if token in marker.read_text(encoding="utf-8"):
+                return {
+                    "status": PASS,
+                    "worker": worker,
+                    "marker": marker.as_posix(),
+                    "waited_ms": int((time.monotonic() - start) * 1000),
+                }
+        except OSError:
+            pass
+        if time.monotonic() >= deadline:
+            return {
+                "status": BLOCKED,
+                "worker": worker,
+                "marker": marker.as_posix(),
+                "detail": f"DONE.marker timeout after {int(timeout_seconds)}s",
+            }
+        time.sleep(max(0.05, float(poll_seconds)))
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import heapq
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from .common import REPO_ROOT, run_process, write_json
+from .contracts import bundle_dir
+from .path_guard import PathGuardError, canonical_path_key, is_protected_path, normalize_rel_path
+
+# One unit of weight per file plus one per BYTES_PER_UNIT of content, so a shard
+# of many tiny files and a shard of a few large ones come out comparable.
+BYTES_PER_UNIT = 4096
+
+
+@dataclass
+class _Dir:
+    path: str
+    files: list[tuple[str, int]] = field(default_factory=list)
+    children: dict[str, "_Dir"] = field(default_factory=dict)
+    weight: int = 0
+    count: int = 0
+    size: int = 0
+
+
+@dataclass(frozen=True)
+class _Unit:
+    weight: int
+    globs: tuple[str, ...]
+    files: int
+    size: int
+    node: _Dir | None = None
+
+
+def file_weight(size: int) -> int:
+    return 1 + max(0, int(size)) // BYTES_PER_UNIT
+
+
+def _escape_glob(path: str) -> str:
+    # fnmatch has no backslash escape; bracket the metacharacters instead.
+    return "".join(f"[{char}]" if char in "*?[" else char for char in path)
+
+
+def collect_target_files(targets: Iterable[str], *, repo_root: Path | None = None) -> list[tuple[str, int]]:
+    # Tracked and untracked-but-not-ignored files under the targets; falls back
+    # to a walk when the tree is not a git checkout.
+    root = repo_root or REPO_ROOT
+    prefixes = [normalize_rel_path(item, casefold_windows=False) for item in targets if str(item).strip()]
+    listed = run_process(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *prefixes], cwd=root)
+    if listed.rc == 0 and not listed.error:
+        rel_paths = [item for item in listed.stdout.split("\0") if item]
+    else:
+        rel_paths = []
+        for prefix in prefixes or ["."]:
+            start = root / prefix
+            if start.is_file():
+                rel_paths.append(prefix)
+                continue
+            for current, dirs, names in os.walk(start):
+                dirs[:] = sorted(item for item in dirs if item != ".git")
+                rel_paths.extend((Path(current) / name).relative_to(root).as_posix() for name in sorted(names))
+    files: list[tuple[str, int]] = []
+    for rel in sorted(set(rel_paths)):
+        try:
+            size = (root / rel).stat().st_size
+        except OSError:
+            continue
+        files.append((rel, size))
+    return files
+
+
+def _build_tree(files: Iterable[tuple[str, int]]) -> _Dir:
+    root = _Dir(path="")
+    for rel, size in files:
+        key = canonical_path_key(rel)
+        if is_protected_path(key):
+            continue
+        parts = key.split("/")
+        node = root
+        for part in parts[:-1]:
+            child_path = f"{node.path}/{part}" if node.path else part
+            node = node.children.setdefault(part, _Dir(path=child_path))
+        node.files.append((key, size))
+
+    def _total(node: _Dir) -> None:
+        for child in node.children.values():
+            _total(child)
+        node.count = len(node.files) + sum(child.count for child in node.children.values())
+        node.size = sum(size for _key, size in node.files) + sum(child.size for child in node.children.values())
+        node.weight = sum(file_weight(size) for _key, size in node.files) + sum(child.weight for child in node.children.values())
+
+    _total(root)
+    return root
+
+
+def _dir_unit(node: _Dir) -> _Unit:
+    glob = f"{_escape_glob(node.path)}/**" if node.path else "**"
+    return _Unit(weight=node.weight, globs=(glob,), files=node.count, size=node.size, node=node)
+
+
+def _file_unit(key: str, size: int) -> _Unit:
+    return _Unit(weight=file_weight(size), globs=(_escape_glob(key),), files=1, size=size)
+
+
+def _split(unit: _Unit) -> list[_Unit]:
+    node = unit.node
+    assert node is not None
+    parts = [_dir_unit(child) for _name, child in sorted(node.children.items())]
+    parts.extend(_file_unit(key, size) for key, size in sorted(node.files))
+    return parts
+
+
+def partition_units(files: Iterable[tuple[str, int]], count: int) -> list[_Unit]:
+    # Split the heaviest directory into its subdirectories and direct files until
+    # there are enough units and none is heavier than one shard's fair share.
+    root = _build_tree(files)
+    if root.count == 0:
+        return []
+    units = [_dir_unit(root)]
+    target = max(1, -(-root.weight // max(1, count)))
+    while True:
+        splittable = [unit for unit in units if unit.node is not None and unit.files > 1]
+        if not splittable:
+            break
+        heaviest = max(splittable, key=lambda unit: (unit.weight, unit.globs))
+        if len(units) >= count and heaviest.weight <= target:
+            break
+        units.remove(heaviest)
+        units.extend(_split(heaviest))
+    return units
+
+
+def shard_paths(files: Iterable[tuple[str, int]], count: int) -> list[dict[str, Any]]:
+    # Longest-processing-time assignment: heaviest unit first, onto the lightest shard.
+    units = partition_units(files, count)
+    shards: list[dict[str, Any]] = [{"allowed_globs": [], "files": 0, "bytes": 0, "weight": 0} for _ in range(count)]
+    heap = [(0, index) for index in range(count)]
+    for unit in sorted(units, key=lambda item: (-item.weight, item.globs)):
+        load, index = heapq.heappop(heap)
+        shard = shards[index]
+        shard["allowed_globs"].extend(unit.globs)
+        shard["files"] += unit.files
+        shard["bytes"] += unit.size
+        shard["weight"] += unit.weight
+        heapq.heappush(heap, (load + unit.weight, index))
+    for shard in shards:
+        shard["allowed_globs"].sort()
+    return shards
+
+
+def assign_scope_locks(
+    run_id: str,
+    workers: list[str],
+    targets: Iterable[str],
+    *,
+    repo_root: Path | None = None,
+) -> dict[str, Any]:
+    try:
+        files = collect_target_files(targets, repo_root=repo_root)
+    except PathGuardError as exc:
+        return {"status": "BLOCKED", "run_id": run_id, "detail": str(exc), "workers": {}}
+    shards = shard_paths(files, len(workers))
+    assigned: dict[str, Any] = {}
+    for worker, shard in zip(workers, shards):
+        assigned[worker] = {key: shard[key] for key in ("files", "bytes", "weight")} | {"globs": len(shard["allowed_globs"])}
+        if not shard["allowed_globs"]:
+            # An empty allowlist would mean "anything"; keep the scaffold lock.
+            continue
+        write_json(
+            bundle_dir(run_id, worker) / "SCOPE_LOCK.json",
+            {
+                "schema_version": 1,
+                "run_id": run_id,
+                "worker_id": worker,
+                "allowed_globs": shard["allowed_globs"],
+                "blocked_globs": [],
+                "allow_shared_paths": [],
+            },
+        )
+    empty = [worker for worker, shard in zip(workers, shards) if not shard["allowed_globs"]]
+    return {
+        "status": "PASS" if files and not empty else "BLOCKED",
+        "run_id": run_id,
+        "files": len(files),
+        "workers": assigned,
+        "empty_workers": empty,
+        "detail": "" if files and not empty else ("no files under targets" if not files else "more workers than shardable units"),
+    }
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+# Synthetic load benchmark for the factory pipeline stages.
+#
+#   python tools/codex/factory/tests/bench_factory.py --workers 8 --files-per-worker 500 --out bench.json
+#   python tools/codex/factory/tests/bench_factory.py --preset small --compare baseline.json
+#
+# Each run seeds an isolated RUNS_DIR, times every stage over --repeat rounds
+# (median reported) and records the tracemalloc peak per stage.
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import attestations, common, contracts, ledger  # noqa: E402
+from factory.integrator import integrate_run  # noqa: E402
+from factory.overlap import detect_file_overlaps, detect_scope_violations  # noqa: E402
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
+
+BENCH_SCHEMA_VERSION = 1
+PRESETS = {
+    "tiny": {"workers": 2, "files_per_worker": 5, "overlap_ratio": 0.2, "patch_lines": 4, "ledger_events": 20},
+    "small": {"workers": 4, "files_per_worker": 100, "overlap_ratio": 0.05, "patch_lines": 20, "ledger_events": 1000},
+    "large": {"workers": 12, "files_per_worker": 1000, "overlap_ratio": 0.02, "patch_lines": 40, "ledger_events": 20000},
+}
+
+
+@dataclass(frozen=True)
+class LoadSpec:
+    workers: int = 4
+    files_per_worker: int = 100
+    overlap_ratio: float = 0.05
+    patch_lines: int = 20
+    ledger_events: int = 1000
+    seed: int = 7
+
+
+def _file_diff(path: str, lines: int, token: str) -> str:
+    body = "".join(f"+{token} line {index}\n" for index in range(lines))
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        "new file mode 100644\n"
+        "--- /dev/null\n"
+        f"+++ b/{path}\n"
+        f"@@ -0,0 +1,{lines} @@\n"
+        f"{body}"
+    )
+
+
+def _worker_paths(spec: LoadSpec, index: int, rng: random.Random) -> list[str]:
+    # Each worker owns apps/w<index>/...; a share of its files is borrowed from the
+    # next worker's tree so overlap detection has real collisions to report.
+    own = [f"apps/w{index}/pkg_{item % 16}/file_{item}.ts" for item in range(spec.files_per_worker)]
+    shared = int(round(spec.files_per_worker * spec.overlap_ratio))
+    if spec.workers > 1 and shared:
+        neighbour = (index + 1) % spec.workers
+        for slot in rng.sample(range(spec.files_per_worker), shared):
+            own[slot] = f"apps/w{neighbour}/pkg_{slot % 16}/file_{slot}.ts"
+    return own
+
+
+def seed_run(run_id: str, spec: LoadSpec) -> list[str]:
+    rng = random.Random(spec.seed)
+    workers = common.worker_ids(spec.workers)
+    for index, worker in enumerate(workers):
+        contracts.scaffold_worker_bundle(run_id, worker)
+        root = contracts.bundle_dir(run_id, worker)
+        paths = _worker_paths(spec, index, rng)
+        changes = [
+            {"path": path, "change_type": "added", "reason": "synthetic load", "sha256": f"{index:04d}{item:08d}"}
+            for item, path in enumerate(paths)
+        ]
+        common.write_json(
+            root / "STATUS.json",
+            {
+                "schema_version": 1,
+                "run_id": run_id,
+                "worker_id": worker,
+                "status": "PASS",
+                "noop": False,
+                "noop_reason": "",
+                "noop_ack": "",
+                "started_at": "2026-02-18T00:00:00+00:00",
+                "ended_at": "2026-02-18T00:00:00+00:00",
+                "required_checks": [{"name": "bundle_ready", "status": "PASS"}],
+                "optional_checks": [],
+                "errors": [],
+                "warnings": [],
+                "artifacts": ["SUMMARY.md", "FILES_CHANGED.json", "DIFF.patch"],
+            },
+        )
+        common.write_json(
+            root / "FILES_CHANGED.json",
+            {"schema_version": 1, "run_id": run_id, "owner": worker, "changes": changes, "noop": False, "noop_reason": "", "noop_ack": ""},
+        )
+        common.write_json(
+            root / "SCOPE_LOCK.json",
+            {
+                "schema_version": 1,
+                "run_id": run_id,
+                "worker_id": worker,
+                "allowed_globs": [f"apps/w{index}/**"],
+                "blocked_globs": [],
+                "allow_shared_paths": [],
+            },
+        )
+        common.write_text(root / "DIFF.patch", "".join(_file_diff(path, spec.patch_lines, worker) for path in paths))
+        # Materialize the files too, so the meaningful gate sees real git mutations.
+        for path in paths:
+            common.write_text(common.REPO_ROOT / path, "".join(f"{worker} line {line}\n" for line in range(spec.patch_lines)))
+        common.write_text(root / "SUMMARY.md", f"# {worker}\n\n- synthetic load\n")
+        (root / "DONE.marker").write_text(f"DONE {run_id} {worker}", encoding="utf-8")
+    contracts.scaffold_integrator_bundle(run_id)
+    return workers
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    # Timed rounds run with tracemalloc off (its hooks slow allocation-heavy code
+    # unevenly); one extra traced round measures peak memory.
+    timings: list[float] = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "rounds": len(timings),
+    }
+
+
+def run_benchmark(spec: LoadSpec, *, repeat: int = 3) -> dict[str, Any]:
+    run_id = "bench_20260218_000001"
+    stages: dict[str, Any] = {}
+    with isolated_factory_env():
+        started = time.perf_counter()
+        workers = seed_run(run_id, spec)
+        seed_seconds = time.perf_counter() - started
+
+        events = max(1, spec.ledger_events)
+        append = _measure(
+            lambda: [
+                ledger.append_event({"run_id": run_id, "event_type": "RUN_STATE", "actor": workers[item % len(workers)], "details": {"seq": item}})
+                for item in range(events)
+            ],
+            1,
+        )
+        append["per_event_us"] = round(append["median_ms"] * 1000 / events, 2)
+        stages["append_event"] = append
+        stages["detect_file_overlaps"] = _measure(lambda: detect_file_overlaps(run_id, workers=workers), repeat)
+        stages["detect_scope_violations"] = _measure(lambda: detect_scope_violations(run_id, workers=workers), repeat)
+        result: dict[str, Any] = {}
+        stages["integrate_run_full"] = _measure(lambda: result.update(integrate_run(run_id, workers=workers, full=True)), repeat)
+        stages["integrate_run_incremental"] = _measure(lambda: integrate_run(run_id, workers=workers), repeat)
+        stages["write_all_attestations"] = _measure(lambda: attestations.write_all_attestations(run_id), repeat)
+        overlaps = detect_file_overlaps(run_id, workers=workers)
+
+    return {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "spec": asdict(spec),
+        "repeat": repeat,
+        "seed_seconds": round(seed_seconds, 3),
+        "integrate_status": result.get("status", ""),
+        "overlaps": len(overlaps.get("overlaps", [])),
+        "stages": stages,
+        "env": _environment(),
+    }
+
+
+def _environment() -> dict[str, Any]:
+    proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(ROOT), capture_output=True, text=True, check=False)
+    env: dict[str, Any] = {
+        "commit": proc.stdout.strip() if proc.returncode == 0 else "",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ts_utc": common.iso_utc(),
+    }
+    try:
+        import resource
+
+        env["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+    return env
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], *, threshold: float = 0.2) -> dict[str, Any]:
+    # A stage regresses when its median is more than `threshold` slower than the baseline.
+    rows: dict[str, Any] = {}
+    regressions: list[str] = []
+    for name, stage in current["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before or not before.get("median_ms"):
+            continue
+        ratio = stage["median_ms"] / before["median_ms"]
+        rows[name] = {"baseline_ms": before["median_ms"], "current_ms": stage["median_ms"], "ratio": round(ratio, 3)}
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return {
+        "status": "BLOCKED" if regressions else "PASS",
+        "spec_matches": current.get("spec") == baseline.get("spec"),
+        "threshold": threshold,
+        "stages": rows,
+        "regressions": regressions,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic factory load benchmark")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="Start from a named load profile")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--files-per-worker", type=int)
+    parser.add_argument("--overlap-ratio", type=float, help="Share of each worker's files also touched by the next worker")
+    parser.add_argument("--patch-lines", type=int, help="Added lines per file in DIFF.patch")
+    parser.add_argument("--ledger-events", type=int, help="Events appended for the append_event stage")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="Write the JSON result here")
+    parser.add_argument("--compare", help="Baseline result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown before a stage counts as a regression")
+    args = parser.parse_args(argv)
+
+    values = dict(PRESETS.get(args.preset or "", {}))
+    for key in ("workers", "files_per_worker", "overlap_ratio", "patch_lines", "ledger_events"):
+        if getattr(args, key) is not None:
+            values[key] = getattr(args, key)
+    spec = LoadSpec(**values, seed=args.seed)
+    payload = run_benchmark(spec, repeat=args.repeat)
+    if args.compare:
+        payload["comparison"] = compare(payload, json.loads(Path(args.compare).read_text(encoding="utf-8")), threshold=args.threshold)
+    if args.out:
+        common.write_json(Path(args.out), payload)
+    print(json.dumps(payload, indent=2, sort_keys=True))
+    return 1 if payload.get("comparison", {}).get("status") == "BLOCKED" else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
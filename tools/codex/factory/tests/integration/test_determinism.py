@@ -3,12 +3,13 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from factory import common, contracts  # noqa: E402
+from factory import common, contracts, integrator  # noqa: E402
 from factory.integrator import integrate_run  # noqa: E402
 from factory.normalize_artifacts import normalize_file, normalize_report_text  # noqa: E402
 from factory.tests.test_support import isolated_factory_env, make_change, write_worker_bundle  # noqa: E402
@@ -49,6 +50,30 @@ class DeterminismIntegrationTests(unittest.TestCase):
             report_b = normalize_file(Path(result_b["report"]))
             self.assertEqual(report_a, report_b)
 
+    def test_incremental_reintegration_matches_full(self) -> None:
+        run_id = "determinism_20260218_000004"
+        outputs = ("FINAL_REPORT.txt", "MERGE_PLAN.md", "FILES_CHANGED.json", "DIFF.patch", integrator.CACHE_REL)
+        with isolated_factory_env():
+            self._seed(run_id)
+            first = integrate_run(run_id, workers=list(common.WORKERS))
+            self.assertEqual(list(common.WORKERS), first["incremental"]["recomputed"])
+
+            write_worker_bundle(run_id=run_id, worker="C_worker", changes=[make_change("tools/determinism/c2.py", sha256="c2")])
+            calls: list[str] = []
+            original = integrator._worker_results
+            with patch.object(integrator, "_worker_results", side_effect=lambda rid, worker: calls.append(worker) or original(rid, worker)):
+                incremental = integrate_run(run_id, workers=list(common.WORKERS))
+            self.assertEqual(["C_worker"], calls)
+            self.assertEqual(["A_worker", "B_worker", "D_worker"], incremental["incremental"]["reused"])
+            z_dir = contracts.bundle_dir(run_id, common.INTEGRATOR)
+            incremental_outputs = {name: (z_dir / name).read_bytes() for name in outputs}
+
+            full = integrate_run(run_id, workers=list(common.WORKERS), full=True)
+            self.assertEqual([], full["incremental"]["reused"])
+            self.assertEqual(incremental["status"], full["status"])
+            for name in outputs:
+                self.assertEqual(incremental_outputs[name], (z_dir / name).read_bytes(), name)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import artifacts, attestations, cli  # noqa: E402
+from factory.common import write_text  # noqa: E402
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
+
+
+def _seed(runs_dir: Path, run_id: str, files: dict[str, str]) -> Path:
+    run_root = runs_dir / run_id
+    for rel, text in files.items():
+        target = run_root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    return run_root
+
+
+class ArtifactStoreTests(unittest.TestCase):
+    def test_identical_files_share_one_blob_but_not_the_run_files(self) -> None:
+        with isolated_factory_env() as env:
+            shared = "diff --git a/x b/x\n" * 50
+            first = _seed(env["runs_dir"], "factory_20260218_000001", {"A_worker/DIFF.patch": shared, "A_worker/NOTES.md": "one\n"})
+            second = _seed(env["runs_dir"], "factory_20260218_000002", {"A_worker/DIFF.patch": shared, "A_worker/NOTES.md": "two\n"})
+
+            artifacts.seal_run("factory_20260218_000001")
+            result = artifacts.seal_run("factory_20260218_000002")
+
+            self.assertEqual(2, result["files"])
+            self.assertEqual(3, len(list(artifacts.blobs_dir().glob("*/*"))))
+            for run_root in (first, second):
+                self.assertEqual(1, os.stat(run_root / "A_worker" / "DIFF.patch").st_nlink)
+
+            # A writer that does not detach links only changes its own run.
+            with (second / "A_worker" / "DIFF.patch").open("w", encoding="utf-8") as handle:
+                handle.write("rewritten\n")
+            self.assertEqual(shared, (first / "A_worker" / "DIFF.patch").read_text(encoding="utf-8"))
+            sha = artifacts.load_manifest("factory_20260218_000001")["files"]["A_worker/DIFF.patch"]["sha256"]
+            self.assertEqual(shared, artifacts.read_blob(sha).decode("utf-8"))
+            artifacts.seal_run("factory_20260218_000002")
+            self.assertEqual(shared, artifacts.read_blob(sha).decode("utf-8"))
+
+    def test_reseal_skips_unchanged_and_rehashes_rewritten_files(self) -> None:
+        with isolated_factory_env() as env:
+            run_id = "factory_20260218_000003"
+            run_root = _seed(env["runs_dir"], run_id, {"Z_integrator/FINAL_REPORT.txt": "v1\n", "RUN_MANIFEST.json": "{}\n"})
+            artifacts.seal_run(run_id)
+            old_sha = artifacts.load_manifest(run_id)["files"]["Z_integrator/FINAL_REPORT.txt"]["sha256"]
+
+            write_text(run_root / "Z_integrator" / "FINAL_REPORT.txt", "v2\n")
+            resealed = artifacts.seal_run(run_id)
+
+            self.assertEqual(1, resealed["hashed"])
+            self.assertEqual("v1\n", artifacts.read_blob(old_sha).decode("utf-8"))
+            new_sha = artifacts.load_manifest(run_id)["files"]["Z_integrator/FINAL_REPORT.txt"]["sha256"]
+            self.assertEqual(artifacts.hash_file(run_root / "Z_integrator" / "FINAL_REPORT.txt"), new_sha)
+
+    def test_archive_restore_round_trip_and_gc(self) -> None:
+        with isolated_factory_env() as env:
+            run_id = "factory_20260218_000004"
+            big = "line of a large log\n" * 4096
+            run_root = _seed(env["runs_dir"], run_id, {"logs/run.log": big, "A_worker/STATUS.json": "{}\n"})
+            _seed(env["runs_dir"], "factory_20260218_000005", {"logs/run.log": "transient\n"})
+            artifacts.seal_run(run_id)
+            artifacts.seal_run("factory_20260218_000005")
+            (env["runs_dir"] / "factory_20260218_000005" / artifacts.MANIFEST_REL).unlink()
+
+            archived = artifacts.archive_run(run_id)
+            self.assertEqual(2, archived["removed"])
+            self.assertFalse((run_root / "logs" / "run.log").exists())
+
+            collected = artifacts.gc(compress_threshold=1024)
+            self.assertEqual(1, collected["removed"])
+            self.assertEqual(1, collected["compressed"])
+            self.assertGreater(collected["compressed_saved_bytes"], 0)
+
+            restored = artifacts.restore_run(run_id)
+            self.assertEqual("PASS", restored["status"])
+            self.assertEqual(big, (run_root / "logs" / "run.log").read_text(encoding="utf-8"))
+
+    def test_sealed_attestation_matches_store_hashes(self) -> None:
+        with isolated_factory_env() as env:
+            run_id = "factory_20260218_000006"
+            run_root = _seed(env["runs_dir"], run_id, {"A_worker/STATUS.json": "{}\n", "Z_integrator/FINAL_REPORT.txt": "ok\n"})
+            attestations.write_all_attestations(run_id, seal=True)
+
+            lines = (run_root / "attestations" / "bundles.sha256").read_text(encoding="utf-8").splitlines()
+            files = artifacts.load_manifest(run_id)["files"]
+            self.assertEqual(sorted(f"{entry['sha256']}  {rel}" for rel, entry in files.items()), sorted(lines))
+            report = (run_root / "attestations" / "report.sha256").read_text(encoding="utf-8")
+            self.assertIn(files["Z_integrator/FINAL_REPORT.txt"]["sha256"], report)
+
+    def test_sealed_and_unsealed_attestations_cover_the_same_files(self) -> None:
+        with isolated_factory_env() as env:
+            run_id = "factory_20260218_000008"
+            run_root = _seed(
+                env["runs_dir"],
+                run_id,
+                {
+                    "A_worker/STATUS.json": "{}\n",
+                    "A_worker/.STATUS.json.1.2.tmp": "partial",
+                    "locks/run.lock": "pid\n",
+                },
+            )
+            target = run_root / "attestations" / "bundles.sha256"
+            attestations.write_bundle_attestation(run_id)
+            unsealed = target.read_text(encoding="utf-8")
+            attestations.write_bundle_attestation(run_id, seal=True)
+            self.assertEqual(unsealed, target.read_text(encoding="utf-8"))
+            self.assertEqual(["A_worker/STATUS.json"], [line.split("  ", 1)[1] for line in unsealed.splitlines()])
+
+    def test_store_cli_gc_dry_run(self) -> None:
+        with isolated_factory_env() as env:
+            _seed(env["runs_dir"], "factory_20260218_000007", {"logs/run.log": "x\n"})
+            artifacts.seal_run("factory_20260218_000007")
+            (env["runs_dir"] / "factory_20260218_000007" / artifacts.MANIFEST_REL).unlink()
+            stream = io.StringIO()
+            with redirect_stdout(stream):
+                rc = cli.main(["store", "gc", "--dry-run"])
+            payload = json.loads(stream.getvalue())
+            self.assertEqual(0, rc)
+            self.assertEqual(1, payload["removed"])
+            self.assertEqual(1, len(list(artifacts.blobs_dir().glob("*/*"))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
@@ -48,6 +49,39 @@ class AttestationTests(unittest.TestCase):
             sorted_lines = sorted(lines, key=lambda item: item.split("  ", 1)[1])
             self.assertEqual(sorted_lines, lines)
 
+    def test_rewrite_rehashes_only_changed_files(self) -> None:
+        run_id = "attest_20260218_000005"
+        with isolated_factory_env():
+            self._seed_run(run_id)
+            attestations.write_bundle_attestation(run_id)
+            first_root = attestations.load_merkle(run_id)["root"]
+
+            report = contracts.bundle_dir(run_id, "Z_integrator") / "FINAL_REPORT.txt"
+            report.write_text("# Final Report\n\n- changed\n", encoding="utf-8")
+            hashed: list[str] = []
+            original = attestations.hash_many
+
+            def _recording(paths, **kwargs):
+                hashed.extend(path.name for path in paths)
+                return original(paths, **kwargs)
+
+            with patch.object(attestations, "hash_many", _recording):
+                path = attestations.write_bundle_attestation(run_id)
+
+            self.assertEqual(["FINAL_REPORT.txt"], hashed)
+            self.assertNotEqual(first_root, attestations.load_merkle(run_id)["root"])
+            self.assertIn(attestations._hash_file(report), path.read_text(encoding="utf-8"))
+
+    def test_merkle_proof_verifies_single_file(self) -> None:
+        entries = [(f"{index:064x}", f"A_worker/file_{index}.txt") for index in range(7)]
+        root = attestations.merkle_root(entries)
+        for sha256, rel in entries:
+            proof = attestations.merkle_proof(entries, rel)
+            self.assertTrue(attestations.verify_merkle_proof(sha256, rel, proof, root))
+        proof = attestations.merkle_proof(entries, "A_worker/file_3.txt")
+        self.assertFalse(attestations.verify_merkle_proof("f" * 64, "A_worker/file_3.txt", proof, root))
+        self.assertEqual(root, attestations.merkle_root(list(reversed(entries))))
+
     def test_report_attestation_empty_when_report_missing(self) -> None:
         run_id = "attest_20260218_000003"
         with isolated_factory_env():
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory.tests import bench_factory  # noqa: E402
+
+STAGES = {
+    "append_event",
+    "detect_file_overlaps",
+    "detect_scope_violations",
+    "integrate_run_full",
+    "integrate_run_incremental",
+    "write_all_attestations",
+}
+
+
+class BenchFactoryTests(unittest.TestCase):
+    def test_tiny_preset_times_every_stage(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            out = Path(temp_dir) / "bench.json"
+            with redirect_stdout(io.StringIO()):
+                code = bench_factory.main(["--preset", "tiny", "--repeat", "1", "--out", str(out)])
+            self.assertEqual(0, code)
+            payload = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual(STAGES, set(payload["stages"]))
+        self.assertEqual(2, payload["spec"]["workers"])
+        self.assertGreater(payload["overlaps"], 0)
+        for stage in payload["stages"].values():
+            self.assertGreaterEqual(stage["median_ms"], 0)
+            self.assertGreater(stage["peak_kib"], 0)
+
+    def test_seeded_run_without_overlap_integrates_clean(self) -> None:
+        payload = bench_factory.run_benchmark(bench_factory.LoadSpec(workers=3, files_per_worker=4, overlap_ratio=0, patch_lines=2, ledger_events=1), repeat=1)
+        self.assertEqual("PASS", payload["integrate_status"])
+        self.assertEqual(0, payload["overlaps"])
+
+    def test_compare_flags_slower_stages(self) -> None:
+        baseline = {"spec": {"workers": 1}, "stages": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}}
+        current = {"spec": {"workers": 1}, "stages": {"a": {"median_ms": 11.0}, "b": {"median_ms": 15.0}, "c": {"median_ms": 1.0}}}
+        result = bench_factory.compare(current, baseline, threshold=0.2)
+        self.assertEqual("BLOCKED", result["status"])
+        self.assertEqual(["b"], result["regressions"])
+        self.assertTrue(result["spec_matches"])
+        self.assertNotIn("c", result["stages"])
+
+
+if __name__ == "__main__":
+    unittest.main()
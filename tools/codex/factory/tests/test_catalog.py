@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import catalog, cli  # noqa: E402
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
+
+
+def _cli(argv: list[str]) -> tuple[int, dict]:
+    stream = io.StringIO()
+    with redirect_stdout(stream):
+        rc = cli.main(argv)
+    return rc, json.loads(stream.getvalue())
+
+
+class RunCatalogTests(unittest.TestCase):
+    def test_update_merges_worker_statuses(self) -> None:
+        with isolated_factory_env():
+            run_id = "factory_20260218_000001"
+            catalog.update_run(run_id, {"phase": "launch", "status": "RUNNING", "workers": {"A_worker": "PENDING", "B_worker": "PENDING"}})
+            record = catalog.update_run(run_id, {"workers": {"A_worker": "PASS"}})
+            self.assertEqual({"A_worker": "PASS", "B_worker": "PENDING"}, record["workers"])
+            self.assertEqual("factory", record["kind"])
+            self.assertEqual("RUNNING", catalog.get_run(run_id)["status"])
+
+    def test_concurrent_updates_are_not_lost(self) -> None:
+        with isolated_factory_env():
+            run_id = "factory_20260218_000002"
+            workers = [f"W{index}_worker" for index in range(8)]
+            threads = [
+                threading.Thread(target=catalog.update_run, args=(run_id, {"workers": {worker: "PASS"}}))
+                for worker in workers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(set(workers), set(catalog.get_run(run_id)["workers"]))
+
+    def test_list_filters_and_pages(self) -> None:
+        with isolated_factory_env():
+            for index in range(5):
+                catalog.update_run(
+                    f"factory_20260218_00001{index}",
+                    {"status": "PASS" if index % 2 == 0 else "BLOCKED", "gate_verdict": "PASS"},
+                )
+            catalog.update_run("smoke_20260218_000020", {"status": "PASS"})
+
+            passed = catalog.list_runs(status="pass", kind="factory")
+            self.assertEqual(3, passed["total"])
+            first = catalog.list_runs(limit=4)
+            second = catalog.list_runs(limit=4, offset=first["next_offset"])
+            self.assertEqual(6, first["total"])
+            self.assertEqual(4, len(first["runs"]))
+            self.assertEqual(2, len(second["runs"]))
+            self.assertIsNone(second["next_offset"])
+            seen = [item["run_id"] for item in first["runs"] + second["runs"]]
+            self.assertEqual(len(seen), len(set(seen)))
+            self.assertEqual(5, catalog.list_runs(gate="PASS")["total"])
+
+    def test_oneshot_is_cataloged_and_listed(self) -> None:
+        run_id = "factory_20260218_000030"
+        with isolated_factory_env() as env:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0, cli.main(["oneshot", "--run-id", run_id, "--base-ref", "HEAD", "--dry-run"]))
+
+            record = catalog.get_run(run_id)
+            self.assertEqual("oneshot", record["phase"])
+            self.assertEqual("PASS", record["status"])
+            self.assertEqual("factory", record["kind"])
+            self.assertEqual({"A_worker", "B_worker", "C_worker", "D_worker"}, set(record["workers"]))
+            self.assertTrue(all(status == "PASS" for status in record["workers"].values()))
+            self.assertTrue(record["gate_verdict"])
+            self.assertGreater(record["artifacts"]["bytes"], 0)
+            self.assertTrue(record["report"].endswith("FINAL_REPORT.txt"))
+
+            rc, listing = _cli(["runs", "list", "--status", "PASS"])
+            self.assertEqual(0, rc)
+            self.assertEqual([run_id], [item["run_id"] for item in listing["runs"]])
+            rc, shown = _cli(["runs", "show", "--run-id", run_id])
+            self.assertEqual(0, rc)
+            self.assertEqual(record, shown["run"])
+            rc, watched = _cli(["watch", "--run-id", run_id])
+            self.assertEqual(run_id, watched["catalog"]["run_id"])
+
+            (env["runs_dir"] / "run_catalog.json").unlink()
+            rc, rebuilt = _cli(["runs", "rebuild"])
+            self.assertEqual(0, rc)
+            self.assertIn(run_id, rebuilt["run_ids"])
+            self.assertEqual("PASS", catalog.get_run(run_id)["status"])
+
+    def test_show_unknown_run_is_blocked(self) -> None:
+        with isolated_factory_env():
+            rc, payload = _cli(["runs", "show", "--run-id", "factory_20260218_000099"])
+            self.assertEqual(2, rc)
+            self.assertEqual("BLOCKED", payload["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
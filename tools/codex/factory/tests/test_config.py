@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import io
 import json
+import os
 import sys
 import tempfile
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 import unittest
 
@@ -10,14 +13,17 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from factory import cli  # noqa: E402
 from factory.config import (  # noqa: E402
     _deep_merge,
+    config_snapshot,
     default_factory_config,
     load_factory_config,
     load_config_file,
     resolve_config_path,
     validate_config,
 )
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
 
 
 class FactoryConfigTests(unittest.TestCase):
@@ -104,6 +110,45 @@ class FactoryConfigTests(unittest.TestCase):
         self.assertEqual(merged_1, merged_2)
         self.assertEqual({"a": {"b": 1, "c": 2}, "x": 1, "y": 3}, merged_1)
 
+    def test_snapshot_is_cached_frozen_and_invalidated(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="config_snapshot_") as temp_dir:
+            path = Path(temp_dir) / "factory.config.json"
+            path.write_text(json.dumps({"run": {"base_ref": "ONE"}}), encoding="utf-8")
+            info = path.stat()
+            os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns - 5_000_000_000))
+            first = config_snapshot(config_path=path.as_posix(), env={}, strict=False)
+            second = config_snapshot(config_path=path.as_posix(), env={}, strict=False)
+            self.assertIs(first, second)
+            with self.assertRaises(TypeError):
+                first.values["run"]["base_ref"] = "mutated"  # type: ignore[index]
+            payload = load_factory_config(config_path=path.as_posix(), env={}, strict=False)
+            payload["run"]["base_ref"] = "mutated"
+            self.assertEqual("ONE", first.values["run"]["base_ref"])
+
+            by_env = config_snapshot(config_path=path.as_posix(), env={"FACTORY_RUN__BASE_REF": "ENV"}, strict=False)
+            self.assertEqual("ENV", by_env.values["run"]["base_ref"])
+
+            path.write_text(json.dumps({"run": {"base_ref": "TWO"}}), encoding="utf-8")
+            third = config_snapshot(config_path=path.as_posix(), env={}, strict=False)
+            self.assertIsNot(first, third)
+            self.assertEqual("TWO", third.values["run"]["base_ref"])
+
+    def test_cli_config_trace_reports_sources(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="config_trace_") as temp_dir:
+            path = Path(temp_dir) / "factory.config.json"
+            path.write_text(json.dumps({"run": {"run_prefix": "from_file"}}), encoding="utf-8")
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            with isolated_factory_env(), redirect_stdout(stdout), redirect_stderr(stderr):
+                cli.main(["--config", path.as_posix(), "--config-trace", "store", "gc", "--dry-run"])
+            trace = json.loads(stderr.getvalue())
+            self.assertEqual("PASS", json.loads(stdout.getvalue())["status"])
+            self.assertEqual("from_file", trace["values"]["run.run_prefix"]["value"])
+            self.assertTrue(trace["values"]["run.run_prefix"]["source"].startswith("file:"))
+            self.assertEqual("default", trace["values"]["run.kind"]["source"])
+            self.assertGreaterEqual(trace["resolve_ms"], 0)
+            self.assertTrue(trace["resolutions"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import cli, common, contracts, follow  # noqa: E402
+from factory.integrator import integrate_run  # noqa: E402
+from factory.status_eval import BLOCKED, status_exit_code  # noqa: E402
+from factory.tests.test_support import isolated_factory_env, make_change, write_worker_bundle  # noqa: E402
+
+
+def _seed(run_id: str) -> None:
+    for index, worker in enumerate(common.WORKERS):
+        write_worker_bundle(run_id=run_id, worker=worker, changes=[make_change(f"apps/f{index}/main.ts", sha256=str(index))])
+    contracts.scaffold_integrator_bundle(run_id)
+
+
+class LedgerTailTests(unittest.TestCase):
+    def test_reads_only_complete_appended_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "ledger.jsonl"
+            tail = follow.LedgerTail(path)
+            self.assertEqual([], tail.read())
+            path.write_bytes(b'{"a": 1}\n{"b": ')
+            self.assertEqual([{"a": 1}], tail.read())
+            self.assertEqual(9, tail.offset)
+            with path.open("ab") as handle:
+                handle.write(b'2}\n')
+            self.assertEqual([{"b": 2}], tail.read())
+            self.assertEqual([], tail.read())
+            path.write_bytes(b'{"c": 3}\n')
+            self.assertEqual([{"c": 3}], tail.read())
+
+
+class FollowRunTests(unittest.TestCase):
+    def _follow_live(self, run_id: str, notifier) -> list[dict]:
+        seen: list[dict] = []
+        started = threading.Event()
+
+        def _consume() -> None:
+            started.set()
+            seen.extend(follow.follow_run(run_id, contracts.run_dir(run_id), timeout_seconds=60, notifier=notifier))
+
+        thread = threading.Thread(target=_consume)
+        thread.start()
+        started.wait()
+        for worker in common.WORKERS:
+            (contracts.bundle_dir(run_id, worker) / "DONE.marker").write_text(f"DONE {run_id} {worker}", encoding="utf-8")
+        integrate_run(run_id, workers=list(common.WORKERS))
+        thread.join(timeout=60)
+        self.assertFalse(thread.is_alive())
+        return seen
+
+    def test_streams_transitions_until_run_end(self) -> None:
+        run_id = "factory_20260218_000081"
+        with isolated_factory_env():
+            _seed(run_id)
+            seen = self._follow_live(run_id, follow.make_notifier())
+            types = [item["type"] for item in seen]
+            self.assertEqual(len(common.WORKERS), types.count("worker_done"))
+            self.assertIn("overlap_result", types)
+            self.assertIn("integrator_status", types)
+            self.assertIn("gate_verdict", types)
+            self.assertEqual("terminal", types[-1])
+            self.assertLess(types.index("overlap_result"), types.index("run_end"))
+
+    def test_poll_fallback_reaches_terminal(self) -> None:
+        run_id = "factory_20260218_000082"
+        with isolated_factory_env():
+            _seed(run_id)
+            seen = self._follow_live(run_id, follow._PollNotifier(max_interval=0.2))
+            self.assertEqual("terminal", seen[-1]["type"])
+
+    def test_cli_follow_on_finished_run_returns_immediately(self) -> None:
+        run_id = "factory_20260218_000083"
+        with isolated_factory_env():
+            _seed(run_id)
+            result = integrate_run(run_id, workers=list(common.WORKERS))
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                code = cli.main(["watch", "--run-id", run_id, "--follow", "--timeout-seconds", "30"])
+            lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+            self.assertEqual("terminal", lines[-1]["type"])
+            self.assertEqual(result["status"], lines[-1]["status"])
+            self.assertEqual(status_exit_code(result["status"]), code)
+
+            # Resuming from the terminal offset sees nothing new and times out.
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                cli.main(["watch", "--run-id", run_id, "--follow", "--offset", str(lines[-1]["ledger_offset"]), "--timeout-seconds", "0.2"])
+            resumed = [json.loads(line) for line in stdout.getvalue().splitlines()]
+            self.assertEqual("timeout", resumed[-1]["type"])
+            self.assertNotIn("run_end", [item["type"] for item in resumed])
+
+    def test_resuming_from_an_event_offset_replays_the_rest(self) -> None:
+        run_id = "factory_20260218_000084"
+        with isolated_factory_env():
+            _seed(run_id)
+            integrate_run(run_id, workers=list(common.WORKERS))
+            run_dir = contracts.run_dir(run_id)
+            streamed = [item for item in follow.follow_run(run_id, run_dir, timeout_seconds=5) if "event_id" in item]
+            self.assertGreater(len(streamed), 2)
+            offsets = [item["ledger_offset"] for item in streamed]
+            self.assertEqual(sorted(set(offsets)), offsets)
+
+            resumed = [item for item in follow.follow_run(run_id, run_dir, offset=offsets[0], timeout_seconds=5) if "event_id" in item]
+            self.assertEqual(streamed[1:], resumed)
+
+    def test_blocked_oneshot_ends_without_run_end(self) -> None:
+        run_id = "factory_20260218_000085"
+        with isolated_factory_env():
+            blocked = {"status": BLOCKED, "run_id": run_id, "detail": "launch refused"}
+            with mock.patch.object(cli, "_launch_run", return_value=blocked), redirect_stdout(io.StringIO()):
+                cli.main(["oneshot", "--run-id", run_id])
+            seen = list(follow.follow_run(run_id, contracts.run_dir(run_id), timeout_seconds=5))
+            types = [item["type"] for item in seen]
+            self.assertNotIn("run_end", types)
+            self.assertIn("oneshot_summary", types)
+            self.assertEqual("terminal", types[-1])
+            self.assertEqual(BLOCKED, seen[-1]["status"])
+
+    def test_settled_integrator_status_ends_without_run_end(self) -> None:
+        run_id = "factory_20260218_000086"
+        with isolated_factory_env():
+            contracts.scaffold_integrator_bundle(run_id)
+            status_path = contracts.run_dir(run_id) / common.INTEGRATOR / "STATUS.json"
+            status_path.write_text(json.dumps({"run_id": run_id, "status": "FAIL"}), encoding="utf-8")
+            settled = time.time() - follow.STATUS_SETTLE_SECONDS - 1
+            os.utime(status_path, (settled, settled))
+            seen = list(follow.follow_run(run_id, contracts.run_dir(run_id), timeout_seconds=5))
+            self.assertEqual("terminal", seen[-1]["type"])
+            self.assertEqual("FAIL", seen[-1]["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
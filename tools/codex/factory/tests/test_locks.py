@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import json
+import os
+import socket
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 import io
 from contextlib import redirect_stdout
 from pathlib import Path
@@ -36,6 +42,102 @@ class LockTests(unittest.TestCase):
             finally:
                 first.release()
 
+    def _write_record(self, lock_path: Path, **overrides: object) -> None:
+        record = {
+            "owner": "crashed",
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "boot_id": locks._boot_id(),
+            "lease_expires_at": time.time() + 60,
+            "metadata": {},
+        }
+        record.update(overrides)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    def test_lock_record_carries_lease_fields(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_record_") as temp_dir:
+            lock_path = Path(temp_dir) / "record.lock"
+            with locks.FileLock(path=lock_path, owner="test", metadata={"k": "v"}) as lock:
+                record = json.loads(lock_path.read_text(encoding="utf-8"))
+                self.assertEqual(os.getpid(), record["pid"])
+                self.assertEqual(socket.gethostname(), record["host"])
+                self.assertIn("boot_id", record)
+                self.assertGreater(record["lease_expires_at"], time.time())
+                self.assertTrue(lock.acquired)
+            self.assertFalse(lock_path.exists())
+
+    def test_stale_lock_of_dead_process_is_reclaimed(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_dead_") as temp_dir:
+            lock_path = Path(temp_dir) / "dead.lock"
+            proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True, check=True)
+            self._write_record(lock_path, pid=int(proc.stdout.strip()))
+            lock = locks.FileLock(path=lock_path, owner="next", metadata={}).acquire()
+            try:
+                self.assertEqual("owner process is dead", lock.reclaimed)
+                self.assertEqual("next", json.loads(lock_path.read_text(encoding="utf-8"))["owner"])
+            finally:
+                lock.release()
+
+    def test_pid_probe_never_signals_on_windows(self) -> None:
+        with patch.object(locks.os, "name", "nt"), patch.object(locks, "_pid_alive_windows", return_value=True) as probe, patch.object(locks.os, "kill") as kill:
+            self.assertTrue(locks._pid_alive(4242))
+        probe.assert_called_once_with(4242)
+        kill.assert_not_called()
+
+    def test_expired_lease_is_reclaimed(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_expired_") as temp_dir:
+            lock_path = Path(temp_dir) / "expired.lock"
+            self._write_record(lock_path, host="other-host", pid=1, lease_expires_at=time.time() - 1)
+            lock = locks.FileLock(path=lock_path, owner="next", metadata={}).acquire()
+            try:
+                self.assertEqual("lease expired", lock.reclaimed)
+            finally:
+                lock.release()
+
+    def test_live_remote_lease_is_not_reclaimed(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_remote_") as temp_dir:
+            lock_path = Path(temp_dir) / "remote.lock"
+            self._write_record(lock_path, host="other-host", pid=1)
+            with self.assertRaises(locks.LockAcquisitionError):
+                locks.FileLock(path=lock_path, owner="next", metadata={}).acquire()
+
+    def test_waiter_acquires_after_holder_releases(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_wait_") as temp_dir:
+            lock_path = Path(temp_dir) / "wait.lock"
+            holder = locks.FileLock(path=lock_path, owner="holder", metadata={}).acquire()
+            timer = threading.Timer(0.2, holder.release)
+            timer.start()
+            try:
+                waiter = locks.FileLock(path=lock_path, owner="waiter", metadata={}, wait_seconds=5.0).acquire()
+                self.assertEqual("waiter", json.loads(lock_path.read_text(encoding="utf-8"))["owner"])
+                self.assertEqual("", waiter.reclaimed)
+                waiter.release()
+            finally:
+                timer.join()
+
+    def test_waiter_times_out_while_holder_alive(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_timeout_") as temp_dir:
+            lock_path = Path(temp_dir) / "timeout.lock"
+            holder = locks.FileLock(path=lock_path, owner="holder", metadata={}).acquire()
+            try:
+                with self.assertRaises(locks.LockAcquisitionError):
+                    locks.FileLock(path=lock_path, owner="waiter", metadata={}, wait_seconds=0.2).acquire()
+            finally:
+                holder.release()
+
+    def test_heartbeat_extends_lease(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="lock_heartbeat_") as temp_dir:
+            lock_path = Path(temp_dir) / "heartbeat.lock"
+            lock = locks.FileLock(path=lock_path, owner="beat", metadata={}, lease_seconds=0.3).acquire()
+            try:
+                first = json.loads(lock_path.read_text(encoding="utf-8"))["lease_expires_at"]
+                time.sleep(0.5)
+                second = json.loads(lock_path.read_text(encoding="utf-8"))["lease_expires_at"]
+                self.assertGreater(second, first)
+            finally:
+                lock.release()
+
     def test_run_lock_helpers(self) -> None:
         with tempfile.TemporaryDirectory(prefix="lock_helpers_") as temp_dir:
             runs_dir = Path(temp_dir) / "runs"
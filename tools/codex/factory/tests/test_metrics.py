@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+import random
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import cli, common, contracts, ledger, metrics  # noqa: E402
+from factory.integrator import integrate_run  # noqa: E402
+from factory.tests.test_support import isolated_factory_env, make_change, write_worker_bundle  # noqa: E402
+
+
+def _seed_and_integrate(run_id: str) -> None:
+    for index, worker in enumerate(common.WORKERS):
+        write_worker_bundle(run_id=run_id, worker=worker, changes=[make_change(f"apps/m{index}/main.ts", sha256=str(index))])
+    contracts.scaffold_integrator_bundle(run_id)
+    integrate_run(run_id, workers=list(common.WORKERS))
+
+
+def _write_txn_status(run_id: str) -> None:
+    timeline = [
+        {"stage": "dispatch", "status": "FAIL", "error_class": "TRANSIENT_NETWORK", "attempt": 1},
+        {"stage": "retry_decision", "status": "RUNNING", "error_class": "TRANSIENT_NETWORK"},
+        {"stage": "dispatch", "status": "FAIL", "error_class": "NON_RECOVERABLE", "attempt": 2},
+    ]
+    common.write_json(common.RUNS_DIR / run_id / "STATUS.json", {"run_id": run_id, "status": "FAIL", "timeline": timeline})
+
+
+class QuantileTests(unittest.TestCase):
+    def test_bucketed_quantiles_track_exact_values(self) -> None:
+        rng = random.Random(3)
+        values = [int(rng.lognormvariate(10, 1.5)) for _ in range(5000)]
+        series = metrics._empty_series()
+        for value in values:
+            metrics._observe(series, value, True)
+        ordered = sorted(values)
+        for q in metrics.QUANTILES:
+            exact = ordered[math.ceil(q * len(ordered)) - 1] / 1000.0
+            self.assertAlmostEqual(exact, metrics.quantile_ms(series, q), delta=exact * 0.1)
+        self.assertEqual(0.0, metrics.quantile_ms(metrics._empty_series(), 0.5))
+
+
+class MetricsExportTests(unittest.TestCase):
+    def test_export_writes_prometheus_and_json(self) -> None:
+        with isolated_factory_env() as env:
+            _seed_and_integrate("factory_20260218_000091")
+            _write_txn_status("txn_20260218_000001")
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(0, cli.main(["metrics", "--summary-only"]))
+            self.assertNotIn("metrics", json.loads(stdout.getvalue()))
+
+            out_dir = env["runs_dir"] / "_metrics"
+            summary = json.loads((out_dir / metrics.JSON_NAME).read_text(encoding="utf-8"))
+            self.assertEqual(1, summary["runs_total"])
+            self.assertIn("overlap_detection", summary["stages"])
+            self.assertEqual({"checks": 1, "blocked": 0, "blocked_files": 0, "blocker_rate": 0.0}, summary["overlap"])
+            self.assertEqual(1.0, summary["retries"]["TRANSIENT_NETWORK"]["retry_rate"])
+            self.assertEqual(0, summary["retries"]["NON_RECOVERABLE"]["retries"])
+
+            prom = (out_dir / metrics.PROM_NAME).read_text(encoding="utf-8")
+            self.assertIn('factory_stage_duration_ms{stage="overlap_detection",quantile="0.99"}', prom)
+            self.assertIn('factory_txn_retries_total{error_class="TRANSIENT_NETWORK"} 1', prom)
+            self.assertIn("# TYPE factory_overlap_blocker_ratio gauge", prom)
+
+    def test_cursor_makes_repeat_exports_incremental(self) -> None:
+        with isolated_factory_env():
+            _seed_and_integrate("factory_20260218_000092")
+            _write_txn_status("txn_20260218_000002")
+            first = metrics.export_metrics()
+            self.assertGreater(first["events_read"], 0)
+            self.assertEqual(1, first["txn_runs_rescanned"])
+
+            second = metrics.export_metrics()
+            self.assertEqual(0, second["events_read"])
+            self.assertEqual(0, second["txn_runs_rescanned"])
+            self.assertEqual(first["metrics"]["stages"], second["metrics"]["stages"])
+
+            _seed_and_integrate("factory_20260218_000093")
+            third = metrics.export_metrics()
+            self.assertGreater(third["events_read"], 0)
+            self.assertEqual(2, third["metrics"]["runs_total"])
+            self.assertEqual(metrics.export_metrics(reset=True)["metrics"]["stages"], third["metrics"]["stages"])
+
+    def test_rewritten_ledger_resets_cursor(self) -> None:
+        with isolated_factory_env():
+            _seed_and_integrate("factory_20260218_000094")
+            metrics.export_metrics()
+            events = ledger.LEDGER_PATH.read_text(encoding="utf-8").splitlines(keepends=True)
+            ledger.LEDGER_PATH.write_text("".join(events[1:]), encoding="utf-8")
+            payload = metrics.export_metrics()
+            self.assertEqual(len(events) - 1, payload["events_read"])
+            self.assertEqual(1, payload["metrics"]["runs_total"])
+
+
+if __name__ == "__main__":
+    unittest.main()
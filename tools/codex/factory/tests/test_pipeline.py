@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import cli, ledger, pipeline  # noqa: E402
+from factory.config import default_factory_config  # noqa: E402
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
+
+WORKERS = ["A_worker", "B_worker"]
+
+
+class StageGraphTests(unittest.TestCase):
+    def test_worker_stages_expand_per_worker(self) -> None:
+        nodes = pipeline.build_stage_graph(default_factory_config()["pipeline"]["stages"], WORKERS)
+        self.assertIn("bundle_validate:A_worker", nodes)
+        self.assertEqual(("worker_done:B_worker",), nodes["bundle_validate:B_worker"].depends_on)
+        self.assertEqual(("launch",), nodes["worker_done:A_worker"].depends_on)
+        integrate_deps = set(nodes["integrate"].depends_on)
+        self.assertIn("overlap_index:A_worker", integrate_deps)
+        self.assertIn("scope_check:B_worker", integrate_deps)
+        self.assertIn("integrator_validate", integrate_deps)
+
+    def test_cycle_is_rejected(self) -> None:
+        stages = {
+            "a": {"scope": "run", "depends_on": ["b"]},
+            "b": {"scope": "run", "depends_on": ["a"]},
+        }
+        with self.assertRaises(ValueError):
+            pipeline.build_stage_graph(stages, WORKERS)
+
+    def test_unknown_dependency_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            pipeline.build_stage_graph({"a": {"scope": "run", "depends_on": ["missing"]}}, WORKERS)
+
+    def test_fast_worker_proceeds_while_slow_worker_waits(self) -> None:
+        stages = {
+            "done": {"scope": "worker", "depends_on": []},
+            "check": {"scope": "worker", "depends_on": ["done"]},
+            "merge": {"scope": "run", "depends_on": ["check"]},
+        }
+        release_slow = threading.Event()
+        order: list[str] = []
+
+        def _done(node, results):
+            if node.worker == "B_worker":
+                release_slow.wait(5)
+            return {"status": "PASS"}
+
+        def _check(node, results):
+            order.append(node.node_id)
+            if node.worker == "A_worker":
+                release_slow.set()
+            return {"status": "PASS"}
+
+        def _merge(node, results):
+            order.append(node.node_id)
+            return {"status": "PASS"}
+
+        with isolated_factory_env():
+            nodes = pipeline.build_stage_graph(stages, WORKERS)
+            results = pipeline.run_stage_graph(
+                "pipeline_overlap_20260218_000001",
+                nodes,
+                {"done": _done, "check": _check, "merge": _merge},
+                max_parallel=4,
+            )
+        self.assertEqual(["check:A_worker", "check:B_worker", "merge"], order)
+        self.assertTrue(all(item.status == "PASS" for item in results.values()))
+
+    def test_waiting_stage_does_not_hold_a_parallel_slot(self) -> None:
+        stages = {
+            "done": {"scope": "worker", "depends_on": []},
+            "check": {"scope": "worker", "depends_on": ["done"]},
+        }
+        release_slow = threading.Event()
+        released: list[bool] = []
+
+        def _done(node, results):
+            if node.worker == "B_worker":
+                released.append(release_slow.wait(2))
+            return {"status": "PASS"}
+
+        def _check(node, results):
+            if node.worker == "A_worker":
+                release_slow.set()
+            return {"status": "PASS"}
+
+        with isolated_factory_env():
+            nodes = pipeline.build_stage_graph(stages, WORKERS)
+            results = pipeline.run_stage_graph(
+                "pipeline_wait_20260218_000003",
+                nodes,
+                {"done": _done, "check": _check},
+                max_parallel=1,
+                waiting_stages=("done",),
+            )
+        self.assertEqual([True], released)
+        self.assertTrue(all(item.status == "PASS" for item in results.values()))
+
+    def test_blocked_node_skips_dependents(self) -> None:
+        stages = {
+            "check": {"scope": "worker", "depends_on": []},
+            "merge": {"scope": "run", "depends_on": ["check"]},
+        }
+
+        def _check(node, results):
+            return {"status": "BLOCKED" if node.worker == "B_worker" else "PASS"}
+
+        with isolated_factory_env() as env:
+            run_id = "pipeline_skip_20260218_000002"
+            nodes = pipeline.build_stage_graph(stages, WORKERS)
+            results = pipeline.run_stage_graph(run_id, nodes, {"check": _check, "merge": lambda node, results: {"status": "PASS"}})
+            self.assertEqual(pipeline.SKIPPED, results["merge"].status)
+            self.assertIn("check:B_worker", results["merge"].detail)
+
+            events = ledger.read_events(path=env["runs_dir"] / "factory_ledger.jsonl")
+            ends = [item for item in events if item["event_type"] == "STAGE_END"]
+            self.assertEqual({"check:A_worker", "check:B_worker"}, {item["details"]["node"] for item in ends})
+            self.assertEqual(2, len([item for item in events if item["event_type"] == "STAGE_START"]))
+
+    def test_oneshot_records_stage_nodes(self) -> None:
+        run_id = "pipeline_oneshot_20260218_000003"
+        with isolated_factory_env() as env:
+            stream = io.StringIO()
+            with redirect_stdout(stream):
+                rc = cli.main(["oneshot", "--run-id", run_id, "--base-ref", "HEAD", "--dry-run"])
+            self.assertEqual(0, rc)
+            payload = json.loads(stream.getvalue())
+            statuses = {item["node"]: item["status"] for item in payload["pipeline"]["nodes"]}
+            self.assertEqual("PASS", statuses["integrate"])
+            self.assertEqual("PASS", statuses["overlap_index:D_worker"])
+            self.assertEqual("PASS", payload["stages"]["bundle_validate"]["status"])
+
+            events = ledger.read_events(path=env["runs_dir"] / "factory_ledger.jsonl")
+            ended = {item["details"]["node"] for item in events if item["event_type"] == "STAGE_END"}
+            self.assertIn("integrate", ended)
+            self.assertIn("bundle_validate:A_worker", ended)
+
+
+if __name__ == "__main__":
+    unittest.main()
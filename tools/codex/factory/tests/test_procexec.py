@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from shared.procexec import ProcessCall, ProcessExecutor  # noqa: E402
+
+_SLEEP = [sys.executable, "-c", "import time; time.sleep(0.4)"]
+
+
+class ProcessExecutorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = ProcessExecutor(max_concurrency=2)
+
+    def tearDown(self) -> None:
+        self.executor.close()
+
+    def test_run_many_is_concurrent_and_bounded(self) -> None:
+        started = time.perf_counter()
+        results = self.executor.run_many([ProcessCall(cmd=_SLEEP) for _ in range(4)])
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertLess(elapsed, 1.5)
+        stats = self.executor.stats()
+        self.assertEqual(4, stats["calls"])
+        self.assertEqual(2, stats["peak_in_flight"])
+        self.assertGreater(stats["queued_ms"], 0)
+        self.assertEqual(4, stats["by_program"][Path(sys.executable).name]["calls"])
+
+    def test_results_keep_call_order_and_capture_output(self) -> None:
+        calls = [ProcessCall(cmd=[sys.executable, "-c", f"import sys; print({index}); sys.exit({index})"]) for index in range(3)]
+        results = self.executor.run_many(calls)
+        self.assertEqual([0, 1, 2], [result.rc for result in results])
+        self.assertEqual(["0\n", "1\n", "2\n"], [result.stdout for result in results])
+
+    def test_streaming_callback_sees_output(self) -> None:
+        seen: list[tuple[str, str]] = []
+        script = "import sys; print('out'); print('err', file=sys.stderr)"
+        result = self.executor.run([sys.executable, "-c", script], on_output=lambda name, text: seen.append((name, text)))
+        self.assertEqual("out\n", result.stdout)
+        self.assertEqual("err\n", result.stderr)
+        self.assertEqual({"stdout", "stderr"}, {name for name, _text in seen})
+
+    def test_timeout_and_missing_command(self) -> None:
+        timed = self.executor.run([sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.3)
+        self.assertTrue(timed.timed_out)
+        self.assertEqual(124, timed.rc)
+        self.assertLess(timed.duration_ms, 3000)
+
+        missing = self.executor.run(["definitely-not-a-command-xyz"])
+        self.assertEqual(127, missing.rc)
+        self.assertIsInstance(missing.exception, FileNotFoundError)
+        stats = self.executor.stats()
+        self.assertEqual(1, stats["timed_out"])
+        self.assertEqual(1, stats["errors"])
+
+    def test_timeout_drains_output_from_a_lingering_grandchild(self) -> None:
+        # The grandchild inherits the pipes and writes after its parent is killed;
+        # that output still lands within the drain grace.
+        late = "import time; time.sleep(0.5); print('late', flush=True)"
+        script = f"import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', {late!r}]); time.sleep(5)"
+        timed = self.executor.run([sys.executable, "-c", script], timeout=0.3)
+        self.assertTrue(timed.timed_out)
+        self.assertEqual("late\n", timed.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
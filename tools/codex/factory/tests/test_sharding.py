@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import cli, common, contracts, sharding  # noqa: E402
+from factory.integrator import integrate_run  # noqa: E402
+from factory.overlap import detect_file_overlaps, detect_scope_violations  # noqa: E402
+from factory.path_guard import detect_scope_violations_for_paths  # noqa: E402
+from factory.tests.test_support import isolated_factory_env, make_change, write_worker_bundle  # noqa: E402
+
+
+def _synthetic_tree(seed: int = 7) -> list[tuple[str, int]]:
+    rng = random.Random(seed)
+    files: list[tuple[str, int]] = []
+    for top in ("apps", "tools", "docs", "Packages"):
+        for sub in range(rng.randint(2, 5)):
+            for index in range(rng.randint(1, 40)):
+                files.append((f"{top}/mod_{sub}/file_{index}.py", rng.randint(0, 60_000)))
+    files.append(("README.md", 1200))
+    files.append(("apps/[weird]*name?.ts", 10))
+    return files
+
+
+def _owners(path: str, shards: list[dict]) -> list[int]:
+    return [
+        index
+        for index, shard in enumerate(shards)
+        if shard["allowed_globs"]
+        and not detect_scope_violations_for_paths(worker=str(index), paths=[path], allow_globs=shard["allowed_globs"], deny_globs=[])
+    ]
+
+
+class ShardingTests(unittest.TestCase):
+    def test_every_file_has_exactly_one_owner(self) -> None:
+        files = _synthetic_tree()
+        for count in (1, 3, 6, 11):
+            shards = sharding.shard_paths(files, count)
+            self.assertEqual(count, len(shards))
+            self.assertEqual(len(files), sum(shard["files"] for shard in shards))
+            for path, _size in files:
+                self.assertEqual(1, len(_owners(path, shards)), f"{path} with {count} shards")
+
+    def test_shards_are_weight_balanced(self) -> None:
+        files = _synthetic_tree(seed=11)
+        shards = sharding.shard_paths(files, 6)
+        weights = [shard["weight"] for shard in shards]
+        heaviest_file = max(sharding.file_weight(size) for _path, size in files)
+        # LPT bound: no shard exceeds the mean by more than one unit's weight.
+        self.assertLessEqual(max(weights), sum(weights) / len(weights) + heaviest_file)
+
+    def test_worker_ids_scale_past_the_alphabet(self) -> None:
+        ids = common.worker_ids(30)
+        self.assertEqual("A_worker", ids[0])
+        self.assertEqual("Y_worker", ids[24])
+        self.assertEqual("W25_worker", ids[25])
+        self.assertNotIn(common.INTEGRATOR, ids)
+        self.assertEqual(30, len(set(ids)))
+        with self.assertRaises(ValueError):
+            common.validate_worker_id("../escape")
+
+    def test_assign_scope_locks_writes_disjoint_locks(self) -> None:
+        run_id = "factory_20260218_000041"
+        with isolated_factory_env() as env:
+            for index in range(12):
+                target = env["repo_root"] / "apps" / f"pkg_{index % 4}" / f"m{index}.ts"
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text("x" * (index * 1000), encoding="utf-8")
+            workers = common.worker_ids(4)
+            contracts.scaffold_all_bundles(run_id, workers=workers)
+
+            result = sharding.assign_scope_locks(run_id, workers, ["apps"])
+
+            self.assertEqual("PASS", result["status"])
+            self.assertEqual(12, result["files"])
+            locks = {
+                worker: json.loads((contracts.bundle_dir(run_id, worker) / "SCOPE_LOCK.json").read_text(encoding="utf-8"))
+                for worker in workers
+            }
+            shards = [{"allowed_globs": locks[worker]["allowed_globs"]} for worker in workers]
+            for index in range(12):
+                self.assertEqual(1, len(_owners(f"apps/pkg_{index % 4}/m{index}.ts", shards)))
+
+    def test_six_worker_run_integrates_and_detects_overlap(self) -> None:
+        run_id = "factory_20260218_000042"
+        with isolated_factory_env():
+            workers = common.worker_ids(6)
+            for index, worker in enumerate(workers):
+                write_worker_bundle(
+                    run_id=run_id,
+                    worker=worker,
+                    changes=[make_change(f"apps/shard_{index}/main.ts", sha256=str(index))],
+                    allowed_globs=[f"apps/shard_{index}/**"],
+                )
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0, cli.main(["init-run", "--kind", "factory", "--run-id", run_id]))
+            manifest = json.loads((common.RUNS_DIR / run_id / "RUN_MANIFEST.json").read_text(encoding="utf-8"))
+            manifest["workers"] = workers
+            (common.RUNS_DIR / run_id / "RUN_MANIFEST.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+            self.assertEqual(workers, common.run_workers(run_id))
+            self.assertEqual("PASS", detect_scope_violations(run_id)["status"])
+            self.assertEqual("PASS", detect_file_overlaps(run_id)["status"])
+            payload = integrate_run(run_id)
+            self.assertEqual("PASS", payload["status"], payload)
+
+            write_worker_bundle(
+                run_id=run_id,
+                worker=workers[5],
+                changes=[make_change("apps/shard_0/main.ts", sha256="x")],
+                allowed_globs=["apps/**"],
+            )
+            overlaps = detect_file_overlaps(run_id)
+            self.assertEqual("BLOCKED", overlaps["status"])
+            self.assertEqual([workers[0], workers[5]], overlaps["overlaps"][0]["workers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
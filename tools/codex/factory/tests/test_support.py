@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Any, Iterable, Iterator
 from unittest.mock import patch
 
-from factory import attestations, cli, common, config, contracts, diffing, doctor, integrator, ledger, locks, preflight, schemas, worktrees
+from factory import artifacts, attestations, catalog, cli, common, config, contracts, diffing, doctor, integrator, ledger, locks, metrics, preflight, schemas, sharding, worktrees
 
 _REAL_REPO_ROOT = common.REPO_ROOT
 _REAL_SCHEMA_DIR = _REAL_REPO_ROOT / "tools" / "codex" / "schemas"
@@ -106,6 +106,14 @@ def isolated_factory_env() -> Iterator[dict[str, Path]]:
             stack.enter_context(patch.object(attestations, "RUNS_DIR", runs_dir))
             stack.enter_context(patch.object(doctor, "REPO_ROOT", repo_root))
             stack.enter_context(patch.object(doctor, "RUNS_DIR", runs_dir))
+            stack.enter_context(patch.object(artifacts, "RUNS_DIR", runs_dir))
+            stack.enter_context(patch.object(artifacts, "STORE_DIR", runs_dir / "_store"))
+            stack.enter_context(patch.object(catalog, "RUNS_DIR", runs_dir))
+            stack.enter_context(patch.object(catalog, "CATALOG_PATH", runs_dir / "run_catalog.json"))
+            stack.enter_context(patch.object(catalog, "CATALOG_LOCK_PATH", runs_dir / "run_catalog.lock"))
+            stack.enter_context(patch.object(sharding, "REPO_ROOT", repo_root))
+            stack.enter_context(patch.object(metrics, "RUNS_DIR", runs_dir))
+            stack.enter_context(patch.object(metrics, "METRICS_DIR", runs_dir / "_metrics"))
 
             yield {
                 "repo_root": repo_root,
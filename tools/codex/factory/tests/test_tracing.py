@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import cli, ledger, tracing  # noqa: E402
+from factory.tests.test_support import isolated_factory_env  # noqa: E402
+
+
+class TracingTests(unittest.TestCase):
+    def test_nested_spans_link_parent_ids_and_record_duration(self) -> None:
+        run_id = "trace_nested_20260218_000001"
+        with isolated_factory_env() as env:
+            with tracing.trace_span("outer", run_id=run_id, event_type="INTEGRATION_RESULT") as outer:
+                with tracing.trace_span("inner", run_id=run_id, event_type="OVERLAP_CHECK") as inner:
+                    self.assertEqual(inner.span_id, tracing.current_span_id())
+                    time.sleep(0.02)
+                self.assertEqual(outer.span_id, tracing.current_span_id())
+            self.assertEqual("", tracing.current_span_id())
+
+            events = {item["event_type"]: item for item in ledger.read_events(path=env["runs_dir"] / "factory_ledger.jsonl")}
+            self.assertEqual(inner.span_id, events["OVERLAP_CHECK"]["event_id"])
+            self.assertEqual(outer.span_id, events["OVERLAP_CHECK"]["parent_event_id"])
+            self.assertEqual("", events["INTEGRATION_RESULT"]["parent_event_id"])
+            self.assertGreaterEqual(events["OVERLAP_CHECK"]["duration_ms"], 20)
+            self.assertGreaterEqual(events["INTEGRATION_RESULT"]["duration_ms"], events["OVERLAP_CHECK"]["duration_ms"])
+            self.assertEqual("inner", events["OVERLAP_CHECK"]["details"]["trace"]["span"])
+
+    def test_failing_span_records_error_and_reraises(self) -> None:
+        run_id = "trace_error_20260218_000002"
+        with isolated_factory_env() as env:
+            with self.assertRaises(RuntimeError):
+                with tracing.trace_span("boom", run_id=run_id, event_type="SCOPE_CHECK"):
+                    raise RuntimeError("kaput")
+            events = ledger.read_events(path=env["runs_dir"] / "factory_ledger.jsonl")
+            self.assertEqual(1, events[-1]["rc"])
+            self.assertEqual("FAIL", events[-1]["details"]["status"])
+            self.assertEqual("kaput", events[-1]["details"]["error"])
+
+    def test_oneshot_trace_export(self) -> None:
+        run_id = "trace_oneshot_20260218_000003"
+        with isolated_factory_env() as env:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0, cli.main(["oneshot", "--run-id", run_id, "--base-ref", "HEAD", "--dry-run"]))
+
+            events = [item for item in ledger.read_events(path=env["runs_dir"] / "factory_ledger.jsonl") if item["run_id"] == run_id]
+            by_id = {item["event_id"]: item for item in events}
+            root = [item for item in events if item["event_type"] == "ONESHOT_SUMMARY"]
+            self.assertEqual(1, len(root))
+            self.assertEqual("", root[0]["parent_event_id"])
+            for event_type in ("PREFLIGHT", "WORKTREE_CREATE", "BUNDLE_VALIDATED", "OVERLAP_CHECK", "INTEGRATION_RESULT"):
+                matching = [item for item in events if item["event_type"] == event_type]
+                self.assertTrue(matching, event_type)
+                for item in matching:
+                    self.assertIn("trace", item["details"])
+                    self.assertIn(item["parent_event_id"], by_id, event_type)
+            integration = [item for item in events if item["event_type"] == "INTEGRATION_RESULT"][0]
+            self.assertEqual("STAGE_END", by_id[integration["parent_event_id"]]["event_type"])
+            self.assertEqual(root[0]["event_id"], by_id[integration["parent_event_id"]]["parent_event_id"])
+
+            out = env["runs_dir"] / "trace.json"
+            stream = io.StringIO()
+            with redirect_stdout(stream):
+                rc = cli.main(["trace", "--run-id", run_id, "--out", str(out)])
+            self.assertEqual(0, rc)
+            summary = json.loads(stream.getvalue())
+            self.assertEqual(len(events), summary["events"])
+            trace = json.loads(out.read_text(encoding="utf-8"))
+            complete = [item for item in trace["traceEvents"] if item["ph"] == "X"]
+            self.assertEqual(summary["spans"], len(complete))
+            self.assertIn("oneshot", {item["name"] for item in complete})
+            for item in complete:
+                self.assertGreaterEqual(item["dur"], 0)
+                self.assertIn(item["tid"], {meta["tid"] for meta in trace["traceEvents"] if meta["ph"] == "M"})
+
+    def test_trace_unknown_run_is_blocked(self) -> None:
+        with isolated_factory_env():
+            stream = io.StringIO()
+            with redirect_stdout(stream):
+                rc = cli.main(["trace", "--run-id", "trace_missing_20260218_000004"])
+            self.assertEqual(2, rc)
+            self.assertEqual("BLOCKED", json.loads(stream.getvalue())["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from factory import contracts, ledger, transport  # noqa: E402
+from factory.tests.test_support import isolated_factory_env, make_change, write_worker_bundle  # noqa: E402
+
+# Stand-in worker: appends to SUMMARY.md, tries to widen its own scope lock and
+# writes the DONE marker into the bundle it was given.
+WORKER_SCRIPT = (
+    "import json, os, pathlib\n"
+    "out = pathlib.Path(os.environ['CODEX_BUNDLE_DIR'])\n"
+    "summary = out / 'SUMMARY.md'\n"
+    "summary.write_text(summary.read_text(encoding='utf-8') + '- remote edit\\n', encoding='utf-8')\n"
+    "lock = json.loads((out / 'SCOPE_LOCK.json').read_text(encoding='utf-8'))\n"
+    "lock['allowed_globs'] = ['**']\n"
+    "(out / 'SCOPE_LOCK.json').write_text(json.dumps(lock), encoding='utf-8')\n"
+    "(out / 'DONE.marker').write_text('DONE ' + os.environ['CODEX_RUN_ID'] + ' ' + os.environ['CODEX_WORKER_ID'], encoding='utf-8')\n"
+)
+
+
+def _seed_run(run_id: str, workers: list[str]) -> None:
+    for index, worker in enumerate(workers):
+        write_worker_bundle(
+            run_id=run_id,
+            worker=worker,
+            changes=[make_change(f"apps/t{index}/main.ts", sha256=str(index))],
+            allowed_globs=[f"apps/t{index}/**"],
+        )
+    contracts.scaffold_integrator_bundle(run_id)
+
+
+class BundleArchiveTests(unittest.TestCase):
+    def test_archive_is_deterministic_and_round_trips(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "src"
+            (source / "LOGS").mkdir(parents=True)
+            (source / "STATUS.json").write_text("{}\n", encoding="utf-8")
+            (source / "LOGS" / "INDEX.json").write_text("[]\n", encoding="utf-8")
+            first = transport.pack_bundle(source)
+            (source / "STATUS.json").touch()
+            second = transport.pack_bundle(source)
+            self.assertEqual(first, second)
+
+            files = transport.unpack_bundle(first[0], first[1], Path(temp_dir) / "out")
+            self.assertEqual(["LOGS/INDEX.json", "STATUS.json"], files)
+            with self.assertRaises(transport.TransportError):
+                transport.unpack_bundle(first[0], "0" * 64, Path(temp_dir) / "out")
+
+    def test_traversal_members_are_rejected(self) -> None:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            info = tarfile.TarInfo("../escape.txt")
+            info.size = 2
+            archive.addfile(info, io.BytesIO(b"hi"))
+        data = buffer.getvalue()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertRaises(transport.TransportError):
+                transport.unpack_bundle(data, transport.hashlib.sha256(data).hexdigest(), Path(temp_dir) / "out")
+            self.assertFalse((Path(temp_dir) / "escape.txt").exists())
+
+
+class TransportTests(unittest.TestCase):
+    def test_local_transport_round_trip_feeds_validate_run(self) -> None:
+        run_id = "factory_20260218_000061"
+        with isolated_factory_env():
+            workers = ["A_worker", "B_worker"]
+            _seed_run(run_id, workers)
+            local = transport.LocalSubprocessTransport([sys.executable, "-c", WORKER_SCRIPT])
+            payload = transport.run_transport(run_id, workers, {worker: local for worker in workers}, poll_seconds=0.05, timeout_seconds=60)
+
+            self.assertEqual("PASS", payload["status"], payload)
+            summary = (contracts.bundle_dir(run_id, "A_worker") / "SUMMARY.md").read_text(encoding="utf-8")
+            self.assertIn("remote edit", summary)
+            lock = json.loads((contracts.bundle_dir(run_id, "A_worker") / "SCOPE_LOCK.json").read_text(encoding="utf-8"))
+            self.assertEqual(["apps/t0/**"], lock["allowed_globs"])
+            events = [item for item in ledger.query_events(run_id=run_id) if item["event_type"] == "WORKER_BUNDLE_DISCOVERED"]
+            self.assertEqual(2, len(events))
+
+    def test_socket_agent_streams_status_and_returns_hashed_bundle(self) -> None:
+        run_id = "factory_20260218_000062"
+        with isolated_factory_env(), tempfile.TemporaryDirectory() as agent_root:
+            workers = ["A_worker", "B_worker", "C_worker"]
+            _seed_run(run_id, workers)
+            server = transport.AgentServer(
+                transport.LocalSubprocessTransport([sys.executable, "-c", WORKER_SCRIPT], work_root=Path(agent_root)),
+                token="s3cret",
+            ).start()
+            try:
+                remote = transport.SocketAgentTransport(server.address, token="s3cret")
+                seen: list[str] = []
+                payload = transport.run_transport(
+                    run_id,
+                    workers,
+                    {worker: remote for worker in workers},
+                    poll_seconds=0.05,
+                    timeout_seconds=60,
+                    on_event=lambda event: seen.append(event["state"]),
+                )
+                self.assertEqual("PASS", payload["status"], payload)
+                self.assertIn("DONE", seen)
+                receipt = json.loads((contracts.run_dir(run_id) / "_transport" / "B_worker" / "FETCH.json").read_text(encoding="utf-8"))
+                self.assertEqual(receipt["archive_sha256"], transport.pack_bundle(Path(agent_root) / run_id / "B_worker" / "bundle")[1])
+                self.assertTrue((Path(agent_root) / run_id / "B_worker" / "bundle" / "DONE.marker").exists())
+
+                intruder = transport.SocketAgentTransport(server.address, token="wrong")
+                with self.assertRaises(transport.TransportError):
+                    intruder.status(run_id, "A_worker")
+                with self.assertRaises(transport.TransportError):
+                    remote.status(run_id, "../etc")
+            finally:
+                server.close()
+
+    def test_agent_refuses_public_bind_without_token(self) -> None:
+        with tempfile.TemporaryDirectory() as agent_root:
+            local = transport.LocalSubprocessTransport([sys.executable, "-c", WORKER_SCRIPT], work_root=Path(agent_root))
+            with self.assertRaises(transport.TransportError):
+                transport.AgentServer(local, host="0.0.0.0", token="")
+            server = transport.AgentServer(local, host="localhost", token="").start()
+            server.close()
+
+    def test_cancel_stops_running_worker(self) -> None:
+        run_id = "factory_20260218_000063"
+        with isolated_factory_env():
+            _seed_run(run_id, ["A_worker"])
+            local = transport.LocalSubprocessTransport([sys.executable, "-c", "import time; time.sleep(60)"])
+            local.dispatch(run_id, "A_worker", "prompt")
+            self.assertEqual("RUNNING", local.status(run_id, "A_worker")["state"])
+            self.assertEqual("CANCELLED", local.cancel(run_id, "A_worker")["state"])
+            # A fresh transport instance reads the persisted exit record.
+            fresh = transport.LocalSubprocessTransport([sys.executable])
+            self.assertEqual("CANCELLED", fresh.status(run_id, "A_worker")["state"])
+            with self.assertRaises(transport.TransportError):
+                fresh.export_bundle(run_id, "A_worker")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Iterator
+import unittest
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+_SPEC = importlib.util.spec_from_file_location("codex_validation_runner", ROOT / "run.py")
+runner = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(runner)
+
+# Each step script appends "<name> start"/"<name> end" to trace.txt. "wait_for"
+# blocks until another step has started, which only happens if both run at once.
+_STEP_SCRIPT = """
+import sys, time
+from pathlib import Path
+name, wait_for, rc = sys.argv[1], sys.argv[2], int(sys.argv[3])
+trace = Path("trace.txt")
+with trace.open("a") as handle:
+    handle.write(name + " start\\n")
+if wait_for != "-":
+    deadline = time.time() + 5
+    while f"{wait_for} start" not in trace.read_text() and time.time() < deadline:
+        time.sleep(0.01)
+    if f"{wait_for} start" not in trace.read_text():
+        rc = 9
+with trace.open("a") as handle:
+    handle.write(name + " end\\n")
+sys.exit(rc)
+"""
+
+
+def _step(name: str, *, wait_for: str = "-", rc: int = 0, **extra: Any) -> dict[str, Any]:
+    return {"name": name, "cmd": f'"{sys.executable}" step.py {name} {wait_for} {rc}', "required": True, **extra}
+
+
+@contextmanager
+def _runner_env(commands: list[dict[str, Any]]) -> Iterator[Path]:
+    with tempfile.TemporaryDirectory(prefix="validation_runner_") as temp_dir:
+        repo = Path(temp_dir).resolve()
+        codex_dir = repo / "tools" / "codex"
+        codex_dir.mkdir(parents=True)
+        (repo / "step.py").write_text(_STEP_SCRIPT, encoding="utf-8")
+        (repo / "src").mkdir()
+        (repo / "src" / "app.ts").write_text("export const a = 1;\n", encoding="utf-8")
+        (codex_dir / "validation.json").write_text(json.dumps({"guardrails": {"commands": commands}}), encoding="utf-8")
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(runner, "REPO_ROOT", repo))
+            stack.enter_context(patch.object(runner, "CODEX_DIR", codex_dir))
+            stack.enter_context(patch.object(runner, "RUNS_DIR", codex_dir / "runs"))
+            stack.enter_context(patch.object(runner, "CACHE_DIR", codex_dir / "runs" / "_cache" / "validation"))
+            yield repo
+
+
+def _run(repo: Path, run_id: str, *extra: str) -> tuple[int, dict[str, Any]]:
+    with redirect_stdout(io.StringIO()):
+        rc = runner.main(["--run-id", run_id, *extra])
+    status = json.loads((repo / "tools" / "codex" / "runs" / run_id / "Z_integrator" / "STATUS.json").read_text(encoding="utf-8"))
+    return rc, status
+
+
+class ValidationRunnerTests(unittest.TestCase):
+    def test_independent_steps_run_concurrently(self) -> None:
+        with _runner_env([_step("first", wait_for="second"), _step("second", wait_for="first")]) as repo:
+            rc, status = _run(repo, "val_parallel", "--jobs", "2")
+        self.assertEqual(0, rc)
+        self.assertEqual(["first", "second"], [item["name"] for item in status["results"]])
+        self.assertEqual(2, status["jobs"])
+
+    def test_dependent_step_waits_and_is_skipped_after_failure(self) -> None:
+        commands = [
+            _step("compile", rc=3),
+            _step("unit", depends_on=["compile"]),
+            _step("lint"),
+        ]
+        with _runner_env(commands) as repo:
+            rc, status = _run(repo, "val_skip", "--jobs", "3")
+            trace = (repo / "trace.txt").read_text(encoding="utf-8")
+        self.assertEqual(2, rc)
+        results = {item["name"]: item for item in status["results"]}
+        self.assertEqual("FAIL", results["compile"]["status"])
+        self.assertEqual("SKIPPED", results["unit"]["status"])
+        self.assertEqual("PASS", results["lint"]["status"])
+        self.assertNotIn("unit start", trace)
+        self.assertEqual("required step failed: compile (rc=3)", status["blocked_reason"])
+        self.assertEqual(1, status["summary"]["required"]["skipped"])
+
+    def test_unchanged_inputs_hit_the_cache(self) -> None:
+        commands = [_step("typecheck", inputs=["src/**/*.ts"]), _step("status")]
+        with _runner_env(commands) as repo:
+            _, cold = _run(repo, "val_cache_1")
+            rc, warm = _run(repo, "val_cache_2")
+            (repo / "src" / "app.ts").write_text("export const a = 2;\n", encoding="utf-8")
+            _, changed = _run(repo, "val_cache_3")
+            _, disabled = _run(repo, "val_cache_4", "--no-cache")
+            runs = (repo / "trace.txt").read_text(encoding="utf-8").count("typecheck start")
+        self.assertEqual(0, rc)
+        self.assertEqual("miss", cold["results"][0]["cache"])
+        self.assertEqual("hit", warm["results"][0]["cache"])
+        self.assertEqual("off", warm["results"][1]["cache"])
+        self.assertEqual({"enabled": True, "dir": warm["cache"]["dir"], "hits": 1, "misses": 0, "uncached": 1}, warm["cache"])
+        self.assertEqual("miss", changed["results"][0]["cache"])
+        self.assertEqual("off", disabled["results"][0]["cache"])
+        self.assertEqual(3, runs)
+
+    def test_dependency_cycle_blocks(self) -> None:
+        commands = [_step("a", depends_on=["b"]), _step("b", depends_on=["a"])]
+        with _runner_env(commands) as repo:
+            rc, status = _run(repo, "val_cycle")
+        self.assertEqual(2, rc)
+        self.assertIn("cycle", status["blocked_reason"])
+
+
+if __name__ == "__main__":
+    unittest.main()
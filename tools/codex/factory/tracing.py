@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import contextvars
+import datetime as dt
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+from .common import INTEGRATOR
+from .ledger import append_event, query_events
+
+_CURRENT: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("factory_trace_span", default=None)
+
+
+def _new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+# A span times one factory stage. When it finishes it appends one ledger event
+# whose event_id is the span id and whose parent_event_id is the enclosing span,
+# so the ledger itself carries the call tree.
+@dataclass
+class Span:
+    name: str
+    run_id: str
+    actor: str
+    event_type: str
+    span_id: str
+    parent_id: str
+    start_us: int
+    details: dict[str, Any] = field(default_factory=dict)
+    file_counts: dict[str, int] = field(default_factory=dict)
+    hashes: dict[str, str] = field(default_factory=dict)
+    rc: int = 0
+    duration_us: int = 0
+    finished: bool = False
+    _start_ns: int = field(default=0, repr=False)
+    _token: contextvars.Token | None = field(default=None, repr=False)
+
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter_ns() - self._start_ns) // 1_000_000)
+
+    def set(
+        self,
+        *,
+        rc: int | None = None,
+        details: Mapping[str, Any] | None = None,
+        file_counts: Mapping[str, int] | None = None,
+        hashes: Mapping[str, str] | None = None,
+    ) -> "Span":
+        if rc is not None:
+            self.rc = int(rc)
+        self.details.update(details or {})
+        self.file_counts.update(file_counts or {})
+        self.hashes.update(hashes or {})
+        return self
+
+    def finish(self) -> dict[str, Any] | None:
+        if self.finished:
+            return None
+        self.finished = True
+        self.duration_us = max(0, (time.perf_counter_ns() - self._start_ns) // 1000)
+        if self._token is not None:
+            try:
+                _CURRENT.reset(self._token)
+            except ValueError:
+                # Finished from another context; just drop back to the parent.
+                pass
+            self._token = None
+        if not self.event_type or not self.run_id:
+            return None
+        details = dict(self.details)
+        details["trace"] = {
+            "span": self.name,
+            "start_us": self.start_us,
+            "duration_us": self.duration_us,
+            "thread": threading.current_thread().name,
+        }
+        return append_event(
+            {
+                "schema_version": 1,
+                "run_id": self.run_id,
+                "event_type": self.event_type,
+                "actor": self.actor,
+                "event_id": self.span_id,
+                "parent_event_id": self.parent_id,
+                "duration_ms": self.duration_us // 1000,
+                "file_counts": dict(self.file_counts),
+                "hashes": dict(self.hashes),
+                "rc": self.rc,
+                "details": details,
+            }
+        )
+
+
+def current_span() -> Span | None:
+    return _CURRENT.get()
+
+
+def current_span_id() -> str:
+    span = _CURRENT.get()
+    return span.span_id if span is not None else ""
+
+
+def start_span(
+    name: str,
+    *,
+    run_id: str,
+    actor: str = INTEGRATOR,
+    event_type: str = "",
+    details: Mapping[str, Any] | None = None,
+) -> Span:
+    parent = _CURRENT.get()
+    span = Span(
+        name=name,
+        run_id=run_id,
+        actor=actor,
+        event_type=event_type,
+        span_id=_new_span_id(),
+        parent_id=parent.span_id if parent is not None else "",
+        start_us=time.time_ns() // 1000,
+        details=dict(details or {}),
+        _start_ns=time.perf_counter_ns(),
+    )
+    span._token = _CURRENT.set(span)
+    return span
+
+
+@contextmanager
+def trace_span(
+    name: str,
+    *,
+    run_id: str,
+    actor: str = INTEGRATOR,
+    event_type: str = "",
+    details: Mapping[str, Any] | None = None,
+) -> Iterator[Span]:
+    span = start_span(name, run_id=run_id, actor=actor, event_type=event_type, details=details)
+    try:
+        yield span
+    except Exception as exc:
+        span.set(rc=1, details={"status": "FAIL", "error": str(exc)})
+        raise
+    finally:
+        span.finish()
+
+
+def _event_start_us(event: Mapping[str, Any]) -> int:
+    trace = event.get("details", {}).get("trace")
+    if isinstance(trace, Mapping) and trace.get("start_us") is not None:
+        return int(trace["start_us"])
+    try:
+        stamp = dt.datetime.fromisoformat(str(event.get("ts_utc", "")))
+    except ValueError:
+        return 0
+    return int(stamp.timestamp() * 1_000_000)
+
+
+def build_chrome_trace(events: list[Mapping[str, Any]], *, run_id: str) -> dict[str, Any]:
+    threads: dict[str, int] = {}
+    trace_events: list[dict[str, Any]] = [
+        {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": run_id}},
+    ]
+
+    def _tid(name: str) -> int:
+        if name not in threads:
+            threads[name] = len(threads) + 1
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": threads[name], "args": {"name": name}})
+        return threads[name]
+
+    ordered = sorted(events, key=lambda item: (_event_start_us(item), int(item.get("_line", 0))))
+    for event in ordered:
+        details = dict(event.get("details", {}))
+        trace = details.pop("trace", None)
+        args = {
+            "event_id": event.get("event_id", ""),
+            "parent_event_id": event.get("parent_event_id", ""),
+            "actor": event.get("actor", ""),
+            "rc": event.get("rc", 0),
+            "status": details.get("status", ""),
+        }
+        if isinstance(trace, Mapping):
+            trace_events.append(
+                {
+                    "name": str(trace.get("span", event.get("event_type", ""))),
+                    "cat": str(event.get("event_type", "")),
+                    "ph": "X",
+                    "ts": int(trace.get("start_us", 0)),
+                    "dur": int(trace.get("duration_us", int(event.get("duration_ms", 0)) * 1000)),
+                    "pid": 1,
+                    "tid": _tid(str(trace.get("thread", "main"))),
+                    "args": args,
+                }
+            )
+            continue
+        trace_events.append(
+            {
+                "name": str(event.get("event_type", "")),
+                "cat": "ledger",
+                "ph": "i",
+                "s": "t",
+                "ts": _event_start_us(event),
+                "pid": 1,
+                "tid": _tid(str(event.get("actor", "") or "main")),
+                "args": args,
+            }
+        )
+    return {
+        "traceEvents": trace_events,
+        "displayTimeUnit": "ms",
+        "otherData": {"run_id": run_id, "events": len(ordered)},
+    }
+
+
+def export_chrome_trace(run_id: str, *, ledger_path: Path | None = None) -> dict[str, Any]:
+    events = query_events(run_id=run_id, limit=1_000_000, path=ledger_path)
+    return build_chrome_trace(events, run_id=run_id)
@@ -0,0 +1,655 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import hmac
+import io
+import ipaddress
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Mapping, Sequence
+
+from .common import WORKER_ID_RE, ensure_dir, iso_utc, read_json, validate_worker_id, write_json, write_text
+from .contracts import bundle_dir, run_dir, validate_run
+from .ledger import append_event
+from .locks import _pid_alive
+from .path_guard import PathGuardError, normalize_rel_path
+from .worktrees import worktree_path
+
+TOKEN_ENV = "CODEX_AGENT_TOKEN"
+PROTOCOL_VERSION = 1
+MAX_HEADER_BYTES = 1 << 20
+MAX_ARCHIVE_BYTES = 256 << 20
+_COPY_CHUNK = 65536
+# Files the factory owns inside a bundle; a returning worker cannot replace them.
+FACTORY_OWNED_FILES: tuple[str, ...] = ("SCOPE_LOCK.json",)
+
+DISPATCHED = "DISPATCHED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+TERMINAL_STATES = frozenset({DONE, FAILED, CANCELLED})
+
+
+class TransportError(RuntimeError):
+    pass
+
+
+def _checked(run_id: str, worker: str) -> tuple[str, str]:
+    # Both ids become path segments on whichever side receives them.
+    if not WORKER_ID_RE.fullmatch(str(run_id)):
+        raise TransportError(f"invalid run id: {run_id!r}")
+    try:
+        return str(run_id), validate_worker_id(worker)
+    except ValueError as exc:
+        raise TransportError(str(exc)) from exc
+
+
+def _event(run_id: str, worker: str, transport: str, state: str, **extra: Any) -> dict[str, Any]:
+    return {"run_id": run_id, "worker": worker, "transport": transport, "state": state, "ts_utc": iso_utc(), **extra}
+
+
+def pack_bundle(source: Path) -> tuple[bytes, str]:
+    # Deterministic tar.gz (sorted members, zeroed mtimes/owners) so identical
+    # bundles produce identical archive hashes on every machine.
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w", format=tarfile.PAX_FORMAT) as archive:
+            if source.is_dir():
+                for path in sorted(source.rglob("*")):
+                    if path.is_symlink() or not path.is_file():
+                        continue
+                    info = tarfile.TarInfo(path.relative_to(source).as_posix())
+                    info.size = path.stat().st_size
+                    info.mode = 0o644
+                    with path.open("rb") as handle:
+                        archive.addfile(info, handle)
+    data = buffer.getvalue()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def unpack_bundle(data: bytes, sha256: str, target: Path) -> list[str]:
+    actual = hashlib.sha256(data).hexdigest()
+    if not hmac.compare_digest(actual, str(sha256)):
+        raise TransportError(f"bundle archive hash mismatch: expected {sha256}, got {actual}")
+    staging = target.with_name(f".{target.name}.incoming")
+    shutil.rmtree(staging, ignore_errors=True)
+    ensure_dir(staging)
+    names: list[str] = []
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+            for member in archive.getmembers():
+                if not member.isfile():
+                    raise TransportError(f"bundle archive member is not a regular file: {member.name!r}")
+                try:
+                    rel = normalize_rel_path(member.name, casefold_windows=False)
+                except PathGuardError as exc:
+                    raise TransportError(f"bundle archive member rejected: {exc}") from exc
+                destination = staging / rel
+                ensure_dir(destination.parent)
+                source = archive.extractfile(member)
+                assert source is not None
+                with source, destination.open("wb") as handle:
+                    shutil.copyfileobj(source, handle, _COPY_CHUNK)
+                names.append(rel)
+        if target.exists():
+            shutil.rmtree(target)
+        staging.replace(target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return sorted(names)
+
+
+def install_bundle(run_id: str, worker: str, data: bytes, sha256: str) -> dict[str, Any]:
+    # Unpacks a fetched archive over the worker bundle, keeping the factory-owned
+    # files from the local scaffold, and records a receipt for the archive hash.
+    target = bundle_dir(run_id, worker)
+    owned = {name: (target / name).read_bytes() for name in FACTORY_OWNED_FILES if (target / name).is_file()}
+    files = unpack_bundle(data, sha256, target)
+    for name, content in owned.items():
+        (target / name).write_bytes(content)
+    receipt = {
+        "schema_version": 1,
+        "run_id": run_id,
+        "worker": worker,
+        "archive_sha256": sha256,
+        "archive_bytes": len(data),
+        "files": files,
+        "kept_factory_files": sorted(owned),
+        "fetched_at": iso_utc(),
+    }
+    write_json(run_dir(run_id) / "_transport" / worker / "FETCH.json", receipt)
+    return {"status": "PASS", **receipt}
+
+
+class WorkerTransport:
+    # dispatch/status/cancel/export_bundle are per transport; watch and
+    # fetch_bundle are shared. Events are dicts with a "state" in
+    # DISPATCHED/RUNNING/DONE/FAILED/CANCELLED.
+    name = "base"
+
+    def dispatch(self, run_id: str, worker: str, prompt: str, *, seed: bytes | None = None, seed_sha256: str = "") -> dict[str, Any]:
+        raise NotImplementedError
+
+    def status(self, run_id: str, worker: str) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def cancel(self, run_id: str, worker: str) -> dict[str, Any]:
+        raise NotImplementedError
+
+    def export_bundle(self, run_id: str, worker: str) -> tuple[bytes, str]:
+        raise NotImplementedError
+
+    def watch(
+        self,
+        run_id: str,
+        worker: str,
+        *,
+        poll_seconds: float = 1.0,
+        timeout_seconds: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        # Yields on every state change and stops at a terminal state or timeout.
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+        last = ""
+        while True:
+            current = self.status(run_id, worker)
+            state = str(current.get("state", ""))
+            if state != last:
+                last = state
+                yield current
+            if state in TERMINAL_STATES:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                yield {**current, "timed_out": True}
+                return
+            time.sleep(max(0.01, poll_seconds))
+
+    def fetch_bundle(self, run_id: str, worker: str) -> dict[str, Any]:
+        data, sha256 = self.export_bundle(run_id, worker)
+        return install_bundle(run_id, worker, data, sha256)
+
+    def close(self) -> None:
+        return None
+
+
+@dataclass
+class _LocalJob:
+    proc: subprocess.Popen
+    log: BinaryIO
+    cancelled: bool = False
+
+
+class LocalSubprocessTransport(WorkerTransport):
+    # Runs the configured worker command as a child process. The worker writes its
+    # bundle into CODEX_BUNDLE_DIR (seeded with the scaffold); exit code 0 is DONE.
+    # STATE.json/EXIT.json let a later process report on a job it did not start.
+    name = "local"
+
+    def __init__(self, command: Sequence[str], *, work_root: Path | None = None) -> None:
+        if not command:
+            raise TransportError("local transport needs a worker command (transport.command)")
+        self.command = [str(part) for part in command]
+        self.work_root = work_root
+        self._jobs: dict[tuple[str, str], _LocalJob] = {}
+        self._lock = threading.Lock()
+
+    def workdir(self, run_id: str, worker: str) -> Path:
+        if self.work_root is not None:
+            return self.work_root / run_id / worker
+        return run_dir(run_id) / "_transport" / worker
+
+    def _out_dir(self, run_id: str, worker: str) -> Path:
+        return self.workdir(run_id, worker) / "bundle"
+
+    def dispatch(self, run_id: str, worker: str, prompt: str, *, seed: bytes | None = None, seed_sha256: str = "") -> dict[str, Any]:
+        run_id, worker = _checked(run_id, worker)
+        with self._lock:
+            running = self._jobs.get((run_id, worker))
+            if running is not None and running.proc.poll() is None:
+                raise TransportError(f"{worker} is already running for {run_id}")
+        workdir = ensure_dir(self.workdir(run_id, worker))
+        out_dir = self._out_dir(run_id, worker)
+        for stale in ("EXIT.json", "STATE.json"):
+            (workdir / stale).unlink(missing_ok=True)
+        if seed is not None:
+            unpack_bundle(seed, seed_sha256, out_dir)
+        else:
+            shutil.rmtree(out_dir, ignore_errors=True)
+            ensure_dir(out_dir)
+        prompt_path = workdir / "PROMPT.md"
+        write_text(prompt_path, prompt)
+        tree = worktree_path(run_id, worker)
+        cwd = tree if tree.is_dir() else workdir
+        fields = {
+            "run_id": run_id,
+            "worker": worker,
+            "prompt_path": str(prompt_path),
+            "out_dir": str(out_dir),
+            "worktree": str(cwd),
+        }
+        cmd = [part.format(**fields) for part in self.command]
+        env = {
+            **os.environ,
+            "CODEX_RUN_ID": run_id,
+            "CODEX_WORKER_ID": worker,
+            "CODEX_PROMPT_PATH": str(prompt_path),
+            "CODEX_BUNDLE_DIR": str(out_dir),
+        }
+        log = (workdir / "worker.log").open("wb")
+        try:
+            # Long-lived and cancellable, so a plain Popen rather than the shared
+            # run-to-completion executor.
+            proc = subprocess.Popen(cmd, cwd=str(cwd), env=env, stdout=log, stderr=subprocess.STDOUT)
+        except OSError as exc:
+            log.close()
+            raise TransportError(f"failed to start worker command: {exc}") from exc
+        with self._lock:
+            self._jobs[(run_id, worker)] = _LocalJob(proc=proc, log=log)
+        write_json(workdir / "STATE.json", {"pid": proc.pid, "cmd": cmd, "cwd": str(cwd), "started_at": iso_utc()})
+        return _event(run_id, worker, self.name, DISPATCHED, pid=proc.pid)
+
+    def _finish(self, run_id: str, worker: str, job: _LocalJob) -> None:
+        job.log.close()
+        exit_path = self.workdir(run_id, worker) / "EXIT.json"
+        if not exit_path.exists():
+            write_json(exit_path, {"rc": job.proc.returncode, "cancelled": job.cancelled, "ended_at": iso_utc()})
+
+    def status(self, run_id: str, worker: str) -> dict[str, Any]:
+        run_id, worker = _checked(run_id, worker)
+        workdir = self.workdir(run_id, worker)
+        with self._lock:
+            job = self._jobs.get((run_id, worker))
+        if job is not None:
+            rc = job.proc.poll()
+            if rc is None:
+                return _event(run_id, worker, self.name, RUNNING, pid=job.proc.pid)
+            self._finish(run_id, worker, job)
+        exit_path = workdir / "EXIT.json"
+        if exit_path.exists():
+            record = read_json(exit_path)
+            rc = record.get("rc")
+            state = CANCELLED if record.get("cancelled") else DONE if rc == 0 else FAILED
+            return _event(run_id, worker, self.name, state, rc=rc)
+        state_path = workdir / "STATE.json"
+        if not state_path.exists():
+            return _event(run_id, worker, self.name, FAILED, detail="not dispatched")
+        pid = int(read_json(state_path).get("pid", 0) or 0)
+        if _pid_alive(pid):
+            return _event(run_id, worker, self.name, RUNNING, pid=pid)
+        # Started by a process that is gone; the exit code was never recorded.
+        done = (self._out_dir(run_id, worker) / "DONE.marker").exists()
+        return _event(run_id, worker, self.name, DONE if done else FAILED, pid=pid, detail="exit code not recorded")
+
+    def cancel(self, run_id: str, worker: str) -> dict[str, Any]:
+        run_id, worker = _checked(run_id, worker)
+        with self._lock:
+            job = self._jobs.get((run_id, worker))
+        if job is not None:
+            if job.proc.poll() is None:
+                job.cancelled = True
+                job.proc.terminate()
+                try:
+                    job.proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    job.proc.kill()
+                    job.proc.wait()
+            return self.status(run_id, worker)
+        current = self.status(run_id, worker)
+        if current["state"] == RUNNING:
+            try:
+                os.kill(int(current["pid"]), signal.SIGTERM)
+            except OSError:
+                pass
+            write_json(self.workdir(run_id, worker) / "EXIT.json", {"rc": None, "cancelled": True, "ended_at": iso_utc()})
+            return self.status(run_id, worker)
+        return current
+
+    def export_bundle(self, run_id: str, worker: str) -> tuple[bytes, str]:
+        current = self.status(run_id, worker)
+        if current["state"] != DONE:
+            raise TransportError(f"{worker} bundle not ready: state={current['state']}")
+        return pack_bundle(self._out_dir(run_id, worker))
+
+    def close(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.items())
+        for (run_id, worker), job in jobs:
+            if job.proc.poll() is not None and not job.log.closed:
+                self._finish(run_id, worker, job)
+
+
+def _send(stream: BinaryIO, header: Mapping[str, Any], payload: bytes = b"") -> None:
+    body = dict(header)
+    if payload:
+        body["payload_bytes"] = len(payload)
+        body["payload_sha256"] = hashlib.sha256(payload).hexdigest()
+    stream.write(json.dumps(body, sort_keys=True).encode("utf-8") + b"\n")
+    if payload:
+        stream.write(payload)
+    stream.flush()
+
+
+def _receive(stream: BinaryIO) -> tuple[dict[str, Any] | None, bytes]:
+    line = stream.readline(MAX_HEADER_BYTES + 1)
+    if not line:
+        return None, b""
+    if len(line) > MAX_HEADER_BYTES or not line.endswith(b"\n"):
+        raise TransportError("agent message header too large or truncated")
+    header = json.loads(line.decode("utf-8"))
+    if not isinstance(header, dict):
+        raise TransportError("agent message header must be an object")
+    size = int(header.get("payload_bytes", 0) or 0)
+    if size < 0 or size > MAX_ARCHIVE_BYTES:
+        raise TransportError(f"agent payload size out of range: {size}")
+    payload = stream.read(size) if size else b""
+    if len(payload) != size:
+        raise TransportError("agent payload truncated")
+    if size and not hmac.compare_digest(hashlib.sha256(payload).hexdigest(), str(header.get("payload_sha256", ""))):
+        raise TransportError("agent payload hash mismatch")
+    return header, payload
+
+
+class SocketAgentTransport(WorkerTransport):
+    # Client side of the remote-agent protocol: one TCP connection per request,
+    # a JSON header line each way and an optional raw payload (bundle archive).
+    name = "socket"
+
+    def __init__(self, address: str, *, token: str | None = None, connect_timeout: float = 10.0) -> None:
+        host, _, port = str(address).rpartition(":")
+        if not host or not port.isdigit():
+            raise TransportError(f"agent address must be host:port (got {address!r})")
+        self.host = host.strip("[]")
+        self.port = int(port)
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV, "")
+        self.connect_timeout = float(connect_timeout)
+
+    def _connect(self) -> socket.socket:
+        try:
+            return socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        except OSError as exc:
+            raise TransportError(f"agent {self.host}:{self.port} unreachable: {exc}") from exc
+
+    def _open(self, op: str, run_id: str, worker: str, payload: bytes = b"", **fields: Any) -> tuple[socket.socket, BinaryIO]:
+        run_id, worker = _checked(run_id, worker)
+        conn = self._connect()
+        stream = conn.makefile("rwb")
+        header = {"v": PROTOCOL_VERSION, "op": op, "run_id": run_id, "worker": worker, "token": self.token, **fields}
+        _send(stream, header, payload)
+        return conn, stream
+
+    def _request(self, op: str, run_id: str, worker: str, payload: bytes = b"", **fields: Any) -> tuple[dict[str, Any], bytes]:
+        conn, stream = self._open(op, run_id, worker, payload, **fields)
+        with conn, stream:
+            try:
+                reply, body = _receive(stream)
+            except OSError as exc:
+                raise TransportError(f"agent {self.host}:{self.port} failed: {exc}") from exc
+        if reply is None:
+            raise TransportError(f"agent {self.host}:{self.port} closed the connection")
+        if reply.get("error"):
+            raise TransportError(f"agent {self.host}:{self.port}: {reply['error']}")
+        return reply, body
+
+    def dispatch(self, run_id: str, worker: str, prompt: str, *, seed: bytes | None = None, seed_sha256: str = "") -> dict[str, Any]:
+        reply, _ = self._request("dispatch", run_id, worker, seed or b"", prompt=prompt)
+        return {**reply, "transport": self.name}
+
+    def status(self, run_id: str, worker: str) -> dict[str, Any]:
+        reply, _ = self._request("status", run_id, worker)
+        return {**reply, "transport": self.name}
+
+    def cancel(self, run_id: str, worker: str) -> dict[str, Any]:
+        reply, _ = self._request("cancel", run_id, worker)
+        return {**reply, "transport": self.name}
+
+    def watch(
+        self,
+        run_id: str,
+        worker: str,
+        *,
+        poll_seconds: float = 1.0,
+        timeout_seconds: float | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        # The agent pushes one line per state change, so this blocks on the socket
+        # instead of polling.
+        conn, stream = self._open("watch", run_id, worker, poll_seconds=poll_seconds, timeout_seconds=timeout_seconds)
+        conn.settimeout(None)
+        with conn, stream:
+            while True:
+                reply, _ = _receive(stream)
+                if reply is None:
+                    return
+                if reply.get("error"):
+                    raise TransportError(f"agent {self.host}:{self.port}: {reply['error']}")
+                yield {**reply, "transport": self.name}
+
+    def export_bundle(self, run_id: str, worker: str) -> tuple[bytes, str]:
+        reply, body = self._request("fetch", run_id, worker)
+        return body, str(reply.get("payload_sha256", ""))
+
+
+def _is_loopback(host: str) -> bool:
+    if host.strip().lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        agent: AgentServer = self.server.agent  # type: ignore[attr-defined]
+        try:
+            header, payload = _receive(self.rfile)
+            if header is None:
+                return
+            agent.handle(header, payload, lambda reply, body=b"": _send(self.wfile, reply, body))
+        except (TransportError, PathGuardError, ValueError) as exc:
+            _send(self.wfile, {"error": str(exc)})
+        except OSError:
+            return
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class AgentServer:
+    # Remote end of SocketAgentTransport: serves the protocol on top of a local
+    # transport on the agent machine. Also the stand-in server used in tests.
+
+    def __init__(self, transport: WorkerTransport, *, host: str = "127.0.0.1", port: int = 0, token: str | None = None) -> None:
+        self.transport = transport
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV, "")
+        if not self.token and not _is_loopback(host):
+            # Anyone who can reach the port could dispatch, cancel and fetch workers.
+            raise TransportError(f"refusing to serve on {host} without {TOKEN_ENV}; set a token or bind 127.0.0.1")
+        self._server = _ThreadingServer((host, int(port)), _AgentHandler)
+        self._server.agent = self  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def handle(self, header: Mapping[str, Any], payload: bytes, reply: Callable[..., None]) -> None:
+        if self.token and not hmac.compare_digest(str(header.get("token", "")), self.token):
+            raise TransportError("agent token rejected")
+        if int(header.get("v", 0) or 0) != PROTOCOL_VERSION:
+            raise TransportError(f"unsupported protocol version: {header.get('v')!r}")
+        op = str(header.get("op", ""))
+        run_id, worker = _checked(str(header.get("run_id", "")), str(header.get("worker", "")))
+        if op == "dispatch":
+            seed = payload or None
+            reply(self.transport.dispatch(run_id, worker, str(header.get("prompt", "")), seed=seed, seed_sha256=str(header.get("payload_sha256", ""))))
+        elif op == "status":
+            reply(self.transport.status(run_id, worker))
+        elif op == "cancel":
+            reply(self.transport.cancel(run_id, worker))
+        elif op == "watch":
+            timeout = header.get("timeout_seconds")
+            for event in self.transport.watch(
+                run_id,
+                worker,
+                poll_seconds=float(header.get("poll_seconds", 1.0) or 1.0),
+                timeout_seconds=float(timeout) if timeout else None,
+            ):
+                reply(event)
+        elif op == "fetch":
+            data, sha256 = self.transport.export_bundle(run_id, worker)
+            reply({"run_id": run_id, "worker": worker, "archive_sha256": sha256}, data)
+        else:
+            raise TransportError(f"unknown op: {op!r}")
+
+    def start(self) -> "AgentServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="factory-agent", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.transport.close()
+
+
+def transport_for(config: Mapping[str, Any], worker: str) -> WorkerTransport:
+    cfg = dict(config.get("transport", {})) if isinstance(config.get("transport"), Mapping) else {}
+    kind = str(cfg.get("kind", "local"))
+    if kind == "local":
+        return LocalSubprocessTransport(list(cfg.get("command", [])))
+    if kind == "socket":
+        agents = dict(cfg.get("agents", {}))
+        address = str(agents.get(worker) or cfg.get("default_agent", ""))
+        if not address:
+            raise TransportError(f"no agent address configured for {worker}")
+        return SocketAgentTransport(address, connect_timeout=float(cfg.get("connect_timeout_seconds", 10)))
+    raise TransportError(f"unknown transport kind: {kind!r}")
+
+
+def default_prompt(run_id: str, worker: str) -> str:
+    lock_path = bundle_dir(run_id, worker) / "SCOPE_LOCK.json"
+    globs = read_json(lock_path).get("allowed_globs", []) if lock_path.exists() else []
+    lines = [
+        f"RUN_ID: {run_id}",
+        f"CODEX_ID: {worker}",
+        "ALLOWED_GLOBS: " + ", ".join(str(item) for item in globs),
+        "Write the worker bundle (STATUS.json, FILES_CHANGED.json, DIFF.patch, SUMMARY.md, ...) into CODEX_BUNDLE_DIR.",
+        f"When finished, write 'DONE {run_id} {worker}' to DONE.marker in the bundle.",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _ledger(run_id: str, worker: str, event_type: str, *, status: str, detail: str = "", hashes: Mapping[str, str] | None = None, files: int = 0) -> None:
+    append_event(
+        {
+            "schema_version": 1,
+            "ts_utc": iso_utc(),
+            "run_id": run_id,
+            "event_type": event_type,
+            "actor": worker,
+            "duration_ms": 0,
+            "file_counts": {"files": files} if files else {},
+            "hashes": dict(hashes or {}),
+            "rc": 0 if status == "PASS" else 2,
+            "details": {"status": status, "kind": "factory", "worker": worker, "detail": detail},
+        }
+    )
+
+
+def run_worker(
+    transport: WorkerTransport,
+    run_id: str,
+    worker: str,
+    prompt: str,
+    *,
+    poll_seconds: float = 1.0,
+    timeout_seconds: float | None = None,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    # dispatch -> watch -> fetch for one worker; the scaffolded bundle is the seed.
+    seed, seed_sha256 = pack_bundle(bundle_dir(run_id, worker))
+    dispatched = transport.dispatch(run_id, worker, prompt, seed=seed, seed_sha256=seed_sha256)
+    _ledger(run_id, worker, "WORKER_DISPATCH", status="PASS", detail=transport.name)
+    final: dict[str, Any] = dispatched
+    for event in transport.watch(run_id, worker, poll_seconds=poll_seconds, timeout_seconds=timeout_seconds):
+        final = event
+        if on_event is not None:
+            on_event(event)
+    if final.get("timed_out"):
+        transport.cancel(run_id, worker)
+        _ledger(run_id, worker, "WORKER_BUNDLE_DISCOVERED", status="BLOCKED", detail="timed out")
+        return {"status": "BLOCKED", "worker": worker, "state": str(final.get("state", "")), "detail": "timed out"}
+    if final.get("state") != DONE:
+        _ledger(run_id, worker, "WORKER_BUNDLE_DISCOVERED", status="BLOCKED", detail=str(final.get("state", "")))
+        return {"status": "BLOCKED", "worker": worker, "state": str(final.get("state", "")), "detail": str(final.get("detail", ""))}
+    fetched = transport.fetch_bundle(run_id, worker)
+    _ledger(
+        run_id,
+        worker,
+        "WORKER_BUNDLE_DISCOVERED",
+        status="PASS",
+        detail=transport.name,
+        hashes={"archive_sha256": fetched["archive_sha256"]},
+        files=len(fetched["files"]),
+    )
+    return {"status": "PASS", "worker": worker, "state": DONE, "archive_sha256": fetched["archive_sha256"], "files": len(fetched["files"])}
+
+
+def run_transport(
+    run_id: str,
+    workers: list[str],
+    transports: Mapping[str, WorkerTransport],
+    *,
+    prompts: Mapping[str, str] | None = None,
+    poll_seconds: float = 1.0,
+    timeout_seconds: float | None = None,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    # Fans every worker out concurrently, then feeds the fetched bundles to the
+    # regular validate_run path.
+    def _one(worker: str) -> dict[str, Any]:
+        prompt = (prompts or {}).get(worker) or default_prompt(run_id, worker)
+        try:
+            return run_worker(
+                transports[worker],
+                run_id,
+                worker,
+                prompt,
+                poll_seconds=poll_seconds,
+                timeout_seconds=timeout_seconds,
+                on_event=on_event,
+            )
+        except TransportError as exc:
+            _ledger(run_id, worker, "WORKER_BUNDLE_DISCOVERED", status="BLOCKED", detail=str(exc))
+            return {"status": "BLOCKED", "worker": worker, "state": FAILED, "detail": str(exc)}
+
+    with ThreadPoolExecutor(max_workers=max(1, len(workers)), thread_name_prefix="transport") as pool:
+        results = list(pool.map(_one, workers))
+    validation = validate_run(run_id, workers=workers)
+    blocked = [item for item in results if item["status"] != "PASS"]
+    return {
+        "status": "PASS" if not blocked and validation["status"] == "PASS" else "BLOCKED",
+        "run_id": run_id,
+        "workers": results,
+        "validation": validation,
+    }
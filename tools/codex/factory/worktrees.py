@@ -4,13 +4,26 @@ import csv
 import json
 import os
 import shutil
-import subprocess
 import time
 import traceback
 from pathlib import Path
 from typing import Any
 
-from .common import CODEX_DIR, DEFAULT_BRANCH_PREFIX, REPO_ROOT, RUNS_DIR, WORKERS, ensure_dir, write_json
+try:  # pragma: no cover - import path depends on launcher
+    from shared.procexec import ProcessCall, ProcessResult, run_processes
+except Exception:  # pragma: no cover - package mode fallback
+    from tools.codex.shared.procexec import ProcessCall, ProcessResult, run_processes
+
+from .common import (
+    CODEX_DIR,
+    DEFAULT_BRANCH_PREFIX,
+    REPO_ROOT,
+    RUNS_DIR,
+    ensure_dir,
+    run_process,
+    run_workers,
+    write_json,
+)
 from .locks import LockAcquisitionError, acquire_run_lock, acquire_worker_lock
 from .worktree_contract import (
     FIXED_WORKTREE_MODE,
@@ -95,20 +108,8 @@ def _list_code_pids() -> list[int]:
     except Exception:
         pass
 
-    try:
-        proc = subprocess.run(
-            ["tasklist", "/FO", "CSV", "/NH", "/FI", "IMAGENAME eq Code.exe"],
-            cwd=str(REPO_ROOT),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            capture_output=True,
-            check=False,
-        )
-    except Exception:
-        return []
-
-    if proc.returncode != 0:
+    proc = run_process(["tasklist", "/FO", "CSV", "/NH", "/FI", "IMAGENAME eq Code.exe"], cwd=REPO_ROOT)
+    if proc.rc != 0 or proc.error:
         return []
 
     rows = [line for line in proc.stdout.splitlines() if line.strip()]
@@ -144,20 +145,8 @@ def _probe_pid_ownership(pid: int) -> dict[str, Any]:
     except Exception:
         pass
 
-    try:
-        proc = subprocess.run(
-            ["tasklist", "/FO", "CSV", "/NH", "/FI", f"PID eq {int(pid)}"],
-            cwd=str(REPO_ROOT),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            capture_output=True,
-            check=False,
-        )
-    except Exception:
-        return {"exists": False, "is_code": False}
-
-    if proc.returncode != 0:
+    proc = run_process(["tasklist", "/FO", "CSV", "/NH", "/FI", f"PID eq {int(pid)}"], cwd=REPO_ROOT)
+    if proc.rc != 0 or proc.error:
         return {"exists": False, "is_code": False}
 
     rows = [line for line in proc.stdout.splitlines() if line.strip()]
@@ -217,19 +206,8 @@ def _find_code_descendants_cim(wrapper_pid: int) -> list[int]:
         "};"
         "$hits|Sort-Object -Unique|ForEach-Object{Write-Output $_}"
     )
-    try:
-        proc = subprocess.run(
-            ["powershell", "-NoProfile", "-NonInteractive", "-Command", script],
-            cwd=str(REPO_ROOT),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            capture_output=True,
-            check=False,
-        )
-    except Exception:
-        return []
-    if proc.returncode != 0:
+    proc = run_process(["powershell", "-NoProfile", "-NonInteractive", "-Command", script], cwd=REPO_ROOT)
+    if proc.rc != 0 or proc.error:
         return []
     pids: list[int] = []
     for line in proc.stdout.splitlines():
@@ -499,58 +477,51 @@ def branch_name(run_id: str, worker: str, branch_prefix: str = DEFAULT_BRANCH_PR
     return f"{branch_prefix}/{worker}"
 
 
+def _dry_result(args: list[str], cwd: Path | None) -> dict[str, Any]:
+    return {
+        "cmd": args,
+        "cwd": str(cwd or REPO_ROOT),
+        "rc": 0,
+        "stdout": "",
+        "stderr": "",
+        "dry_run": True,
+    }
+
+
+def _result_payload(result: ProcessResult, args: list[str], cwd: Path | None) -> dict[str, Any]:
+    payload = {
+        "cmd": args,
+        "cwd": str(cwd or REPO_ROOT),
+        "rc": result.rc,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "dry_run": False,
+    }
+    if result.exception is None:
+        return payload
+    if isinstance(result.exception, FileNotFoundError):
+        detail = f"command not found: {args[0]} ({result.exception})"
+    else:
+        detail = f"subprocess execution failed: {result.exception!r}"
+        payload["rc"] = 1
+    if _debug_stack_enabled():
+        detail = f"{detail}\n{''.join(traceback.format_exception(result.exception))}"
+    payload["stderr"] = detail
+    return payload
+
+
 def _run(args: list[str], cwd: Path | None = None, dry_run: bool = False) -> dict[str, Any]:
     if dry_run:
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 0,
-            "stdout": "",
-            "stderr": "",
-            "dry_run": True,
-        }
-    try:
-        proc = subprocess.run(
-            args,
-            cwd=str(cwd or REPO_ROOT),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            capture_output=True,
-            check=False,
-        )
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": proc.returncode,
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-            "dry_run": False,
-        }
-    except FileNotFoundError as exc:
-        detail = f"command not found: {args[0]} ({exc})"
-        if _debug_stack_enabled():
-            detail = f"{detail}\n{traceback.format_exc()}"
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 127,
-            "stdout": "",
-            "stderr": detail,
-            "dry_run": False,
-        }
-    except Exception as exc:
-        detail = f"subprocess execution failed: {exc!r}"
-        if _debug_stack_enabled():
-            detail = f"{detail}\n{traceback.format_exc()}"
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 1,
-            "stdout": "",
-            "stderr": detail,
-            "dry_run": False,
-        }
+        return _dry_result(args, cwd)
+    return _result_payload(run_process(args, cwd=cwd or REPO_ROOT), args, cwd)
+
+
+def _run_many(commands: list[list[str]], cwd: Path | None = None, dry_run: bool = False) -> list[dict[str, Any]]:
+    # Independent git queries against one checkout run side by side.
+    if dry_run:
+        return [_dry_result(args, cwd) for args in commands]
+    results = run_processes([ProcessCall(cmd=args, cwd=cwd or REPO_ROOT) for args in commands])
+    return [_result_payload(result, args, cwd) for result, args in zip(results, commands)]
 
 
 def _run_with_wrapper_pid(
@@ -561,99 +532,29 @@ def _run_with_wrapper_pid(
     timeout_seconds: float = 30.0,
 ) -> dict[str, Any]:
     if dry_run:
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 0,
-            "stdout": "",
-            "stderr": "",
-            "dry_run": True,
-            "wrapper_pid": None,
-        }
+        return {**_dry_result(args, cwd), "wrapper_pid": None}
 
-    try:
-        proc = subprocess.Popen(
-            args,
-            cwd=str(cwd or REPO_ROOT),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except FileNotFoundError as exc:
-        detail = f"command not found: {args[0]} ({exc})"
-        if _debug_stack_enabled():
-            detail = f"{detail}\n{traceback.format_exc()}"
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 127,
-            "stdout": "",
-            "stderr": detail,
-            "dry_run": False,
-            "wrapper_pid": None,
-        }
-    except Exception as exc:
-        detail = f"subprocess execution failed: {exc!r}"
-        if _debug_stack_enabled():
-            detail = f"{detail}\n{traceback.format_exc()}"
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 1,
-            "stdout": "",
-            "stderr": detail,
-            "dry_run": False,
-            "wrapper_pid": None,
-        }
-
-    wrapper_pid = int(proc.pid)
-    try:
-        stdout, stderr = proc.communicate(timeout=max(0.5, float(timeout_seconds)))
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": int(proc.returncode),
-            "stdout": stdout or "",
-            "stderr": stderr or "",
-            "dry_run": False,
-            "wrapper_pid": wrapper_pid,
-        }
-    except subprocess.TimeoutExpired:
-        proc.kill()
-        stdout, stderr = proc.communicate()
-        timeout_detail = (stderr or "").strip()
+    result = run_process(args, cwd=cwd or REPO_ROOT, timeout=max(0.5, float(timeout_seconds)))
+    payload = _result_payload(result, args, cwd)
+    payload["wrapper_pid"] = result.pid
+    if result.timed_out:
+        timeout_detail = result.stderr.strip()
         if timeout_detail:
             timeout_detail = f"{timeout_detail}\n"
-        timeout_detail = f"{timeout_detail}code CLI launch timed out"
-        return {
-            "cmd": args,
-            "cwd": str(cwd or REPO_ROOT),
-            "rc": 124,
-            "stdout": stdout or "",
-            "stderr": timeout_detail,
-            "dry_run": False,
-            "wrapper_pid": wrapper_pid,
-        }
+        payload["stderr"] = f"{timeout_detail}code CLI launch timed out"
+    return payload
 
 
 def _resolve_commit(ref: str, *, cwd: Path | None = None, dry_run: bool = False) -> dict[str, Any]:
     if dry_run:
         return {"ref": ref, "rc": 0, "commit": "DRYRUN", "stderr": "", "stdout": ""}
-    proc = subprocess.run(
-        ["git", "rev-parse", ref],
-        cwd=str(cwd or REPO_ROOT),
-        text=True,
-        capture_output=True,
-        check=False,
-    )
+    result = run_process(["git", "rev-parse", ref], cwd=cwd or REPO_ROOT)
     return {
         "ref": ref,
-        "rc": proc.returncode,
-        "commit": proc.stdout.strip(),
-        "stderr": proc.stderr,
-        "stdout": proc.stdout,
+        "rc": result.rc,
+        "commit": result.stdout.strip(),
+        "stderr": result.stderr,
+        "stdout": result.stdout,
     }
 
 
@@ -665,7 +566,7 @@ def create_worktrees(
     branch_prefix: str = DEFAULT_BRANCH_PREFIX,
     dry_run: bool = False,
 ) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     try:
         mode_info = resolve_unified_worktree_mode()
     except ValueError as exc:
@@ -806,7 +707,7 @@ def create_worktrees(
 
 
 def verify_worktrees(run_id: str, *, workers: list[str] | None = None) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     steps: list[dict[str, Any]] = []
     for worker in chosen:
         target = worktree_path(run_id, worker)
@@ -834,7 +735,7 @@ def verify_worktrees(run_id: str, *, workers: list[str] | None = None) -> dict[s
 
 
 def sync_worktrees(run_id: str, *, workers: list[str] | None = None, dry_run: bool = False) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     steps: list[dict[str, Any]] = []
     for worker in chosen:
         target = worktree_path(run_id, worker)
@@ -851,8 +752,7 @@ def sync_worktrees(run_id: str, *, workers: list[str] | None = None, dry_run: bo
             continue
 
         actions = [
-            _run(["git", "fetch", "--all", "--prune"], cwd=target, dry_run=dry_run),
-            _run(["git", "status", "--porcelain=v1"], cwd=target, dry_run=dry_run),
+            *_run_many([["git", "fetch", "--all", "--prune"], ["git", "status", "--porcelain=v1"]], cwd=target, dry_run=dry_run),
             _resolve_commit("HEAD", cwd=target, dry_run=dry_run),
         ]
         blocked = [item for item in actions if item["rc"] != 0]
@@ -877,7 +777,7 @@ def sync_worktrees(run_id: str, *, workers: list[str] | None = None, dry_run: bo
 
 
 def open_worktrees(run_id: str, *, workers: list[str] | None = None, dry_run: bool = False) -> dict[str, Any]:
-    chosen = workers or list(WORKERS)
+    chosen = workers or run_workers(run_id)
     steps: list[dict[str, Any]] = []
     cleanup_result = _cleanup_vscode_sessions(run_id) if not dry_run else {
         "clean_enabled": _env_enabled("HITECH_FACTORY_VSCODE_CLEAN", True),
@@ -2,18 +2,24 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import subprocess
+import threading
 import time
 import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CODEX_DIR = REPO_ROOT / "tools" / "codex"
 RUNS_DIR = CODEX_DIR / "runs"
+CACHE_DIR = RUNS_DIR / "_cache" / "validation"
 INTEGRATOR_DIR = "Z_integrator"
 LOGS_DIR = "LOGS"
+DEFAULT_JOBS = max(1, min(4, os.cpu_count() or 1))
 
 
 def now_ts() -> str:
@@ -72,6 +78,16 @@ def append_steps(
         target.append({"group": group, **entry})
 
 
+def configured_step_names(cfg: Dict[str, Any]) -> List[str]:
+    groups = [
+        (cfg.get("defaults") or {}).get("preflight", []) or [],
+        (cfg.get("guardrails") or {}).get("commands", []) or [],
+        (cfg.get("node") or {}).get("commands", []) or [],
+        (cfg.get("playwright") or {}).get("commands", []) or [],
+    ]
+    return [str(entry.get("name", "unnamed")) for group in groups for entry in group]
+
+
 def collect_steps(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
     steps: List[Dict[str, Any]] = []
     preflight = (cfg.get("defaults") or {}).get("preflight", []) or []
@@ -97,12 +113,21 @@ def result_record(
     *,
     name: str,
     group: str,
-    rc: int,
+    rc: Optional[int],
     required: bool,
     allow_fail: bool,
     cmd: str,
     log_path: Path,
+    cache: str = "off",
+    cache_key: str = "",
+    duration_ms: int = 0,
+    depends_on: Sequence[str] = (),
+    detail: str = "",
 ) -> Dict[str, Any]:
+    if rc is None:
+        status = "SKIPPED"
+    else:
+        status = "PASS" if rc == 0 else "FAIL"
     return {
         "name": name,
         "group": group,
@@ -111,32 +136,273 @@ def result_record(
         "required": required,
         "optional": not required,
         "allow_fail": allow_fail,
-        "status": "PASS" if rc == 0 else "FAIL",
+        "status": status,
         "log": str(log_path),
+        "cache": cache,
+        "cache_key": cache_key,
+        "duration_ms": duration_ms,
+        "depends_on": list(depends_on),
+        "detail": detail,
     }
 
 
+def hash_inputs(repo: Path, patterns: Sequence[str]) -> Tuple[str, int]:
+    # Digest of every file matched by the step's input globs (path + content).
+    files = set()
+    for pattern in patterns:
+        for candidate in repo.glob(pattern):
+            if candidate.is_file():
+                files.add(candidate)
+    digest = hashlib.sha256()
+    for path in sorted(files, key=lambda item: item.relative_to(repo).as_posix()):
+        digest.update(path.relative_to(repo).as_posix().encode("utf-8") + b"\0")
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest(), len(files)
+
+
+def step_cache_key(step: Dict[str, Any], repo: Path) -> Tuple[str, int]:
+    # Only steps that declare their inputs can be cached; anything else always runs.
+    patterns = [str(item) for item in step.get("inputs", []) or []]
+    if not patterns:
+        return "", 0
+    inputs_digest, count = hash_inputs(repo, patterns)
+    seed = json.dumps(
+        {"cmd": str(step.get("cmd", "")).strip(), "inputs": sorted(patterns), "digest": inputs_digest},
+        sort_keys=True,
+    )
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest(), count
+
+
+def load_cache_entry(cache_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+    path = cache_dir / f"{key}.json"
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("key") != key or entry.get("rc") != 0:
+        return None
+    return entry
+
+
+def store_cache_entry(cache_dir: Path, key: str, entry: Dict[str, Any]) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    target = cache_dir / f"{key}.json"
+    temp = cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    temp.write_text(json.dumps(entry, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(temp, target)
+
+
+def resolve_dependencies(steps: Sequence[Dict[str, Any]], known: Sequence[str]) -> Dict[str, List[str]]:
+    # Dependencies on steps whose group was not detected are dropped; names that
+    # appear nowhere in the adapter are an error, as are duplicates and cycles.
+    names = [str(step.get("name", "unnamed")) for step in steps]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise RuntimeError(f"duplicate validation step names: {', '.join(duplicates)}")
+    active = set(names)
+    graph: Dict[str, List[str]] = {}
+    for step, name in zip(steps, names):
+        deps: List[str] = []
+        for dep in step.get("depends_on", []) or []:
+            dep = str(dep)
+            if dep not in known:
+                raise RuntimeError(f"validation step {name!r} depends on unknown step {dep!r}")
+            if dep in active:
+                deps.append(dep)
+        graph[name] = deps
+
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise RuntimeError(f"validation steps have a dependency cycle: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
 def summarize(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
     required = [item for item in results if item.get("required")]
     optional = [item for item in results if not item.get("required")]
+
+    def _counts(items: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+        return {
+            "total": len(items),
+            "passed": len([item for item in items if item.get("rc") == 0]),
+            "failed": len([item for item in items if item.get("rc") not in (0, None)]),
+            "skipped": len([item for item in items if item.get("rc") is None]),
+        }
+
     return {
-        "required": {
-            "total": len(required),
-            "passed": len([item for item in required if item.get("rc") == 0]),
-            "failed": len([item for item in required if item.get("rc") != 0]),
-        },
-        "optional": {
-            "total": len(optional),
-            "passed": len([item for item in optional if item.get("rc") == 0]),
-            "failed": len([item for item in optional if item.get("rc") != 0]),
+        "required": _counts(required),
+        "optional": _counts(optional),
+        "cache": {
+            "hits": len([item for item in results if item.get("cache") == "hit"]),
+            "misses": len([item for item in results if item.get("cache") == "miss"]),
+            "uncached": len([item for item in results if item.get("cache") == "off"]),
         },
     }
 
 
-def main() -> int:
+def render_step_log(step: Dict[str, Any], *, started_at: str, ended_at: str, rc: int, output: str, cache: str) -> str:
+    return (
+        f"# command: {step['cmd']}\n"
+        f"# group: {step['group']}\n"
+        f"# cwd: {REPO_ROOT}\n"
+        f"# required: {is_required(step)}\n"
+        f"# allow_fail: {bool(step.get('allow_fail', False))}\n"
+        f"# started_at: {started_at}\n"
+        f"# ended_at: {ended_at}\n"
+        f"# cache: {cache}\n"
+        f"# rc: {rc}\n\n"
+        f"{output}"
+    )
+
+
+def execute_step(
+    step: Dict[str, Any],
+    *,
+    logs_dir: Path,
+    cache_dir: Path,
+    use_cache: bool,
+    log: Callable[[str], None],
+) -> Dict[str, Any]:
+    name = str(step["name"])
+    cmd = str(step["cmd"])
+    group = str(step["group"])
+    log_file = logs_dir / f"{name}.log.txt"
+    clock = time.perf_counter()
+
+    key, input_count = step_cache_key(step, REPO_ROOT) if use_cache else ("", 0)
+    if key:
+        entry = load_cache_entry(cache_dir, key)
+        if entry is not None:
+            log(f"==> [{group}] {name}: cache hit ({input_count} inputs, key {key[:12]})")
+            write_text(
+                log_file,
+                render_step_log(
+                    step,
+                    started_at=str(entry.get("started_at", "")),
+                    ended_at=str(entry.get("ended_at", "")),
+                    rc=0,
+                    output=str(entry.get("output", "")),
+                    cache=f"hit {key}",
+                ),
+            )
+            return result_record(
+                name=name,
+                group=group,
+                rc=0,
+                required=is_required(step),
+                allow_fail=bool(step.get("allow_fail", False)),
+                cmd=cmd,
+                log_path=log_file,
+                cache="hit",
+                cache_key=key,
+                duration_ms=int((time.perf_counter() - clock) * 1000),
+                depends_on=step.get("depends_on", []) or [],
+                detail=f"cached result from {entry.get('run_id', '')}",
+            )
+
+    log(f"==> [{group}] {name}: {cmd}")
+    started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    rc, output = run_cmd(cmd, REPO_ROOT)
+    ended_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    cache = "miss" if key else "off"
+    write_text(log_file, render_step_log(step, started_at=started_at, ended_at=ended_at, rc=rc, output=output, cache=cache))
+    if key and rc == 0:
+        store_cache_entry(
+            cache_dir,
+            key,
+            {
+                "key": key,
+                "name": name,
+                "cmd": cmd,
+                "rc": rc,
+                "run_id": str(step.get("run_id", "")),
+                "started_at": started_at,
+                "ended_at": ended_at,
+                "output": output,
+            },
+        )
+    log(f"<== [{group}] {name}: rc={rc}")
+    return result_record(
+        name=name,
+        group=group,
+        rc=rc,
+        required=is_required(step),
+        allow_fail=bool(step.get("allow_fail", False)),
+        cmd=cmd,
+        log_path=log_file,
+        cache=cache,
+        cache_key=key,
+        duration_ms=int((time.perf_counter() - clock) * 1000),
+        depends_on=step.get("depends_on", []) or [],
+    )
+
+
+def run_steps(
+    steps: Sequence[Dict[str, Any]],
+    graph: Dict[str, List[str]],
+    *,
+    jobs: int,
+    logs_dir: Path,
+    cache_dir: Path,
+    use_cache: bool,
+    log: Callable[[str], None],
+) -> List[Dict[str, Any]]:
+    # Steps start as soon as their dependencies finish. A step whose required
+    # dependency failed is skipped; failed optional dependencies do not block.
+    by_name = {str(step["name"]): step for step in steps}
+    order = {name: index for index, name in enumerate(by_name)}
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = list(by_name)
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, int(jobs)), thread_name_prefix="validation-step") as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = graph.get(name, [])
+                if not all(dep in results for dep in deps):
+                    continue
+                pending.remove(name)
+                step = by_name[name]
+                failed = [dep for dep in deps if results[dep]["required"] and results[dep]["rc"] != 0]
+                if failed:
+                    log(f"==> [{step['group']}] {name}: skipped (failed dependencies: {', '.join(failed)})")
+                    results[name] = result_record(
+                        name=name,
+                        group=str(step["group"]),
+                        rc=None,
+                        required=is_required(step),
+                        allow_fail=bool(step.get("allow_fail", False)),
+                        cmd=str(step["cmd"]),
+                        log_path=logs_dir / f"{name}.log.txt",
+                        depends_on=step.get("depends_on", []) or [],
+                        detail=f"dependency failed: {', '.join(failed)}",
+                    )
+                    continue
+                future = pool.submit(execute_step, step, logs_dir=logs_dir, cache_dir=cache_dir, use_cache=use_cache, log=log)
+                running[future] = name
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return [results[name] for name in sorted(results, key=lambda item: order[item])]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--run-id", default=f"preflight_{now_ts()}")
-    args = parser.parse_args()
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Maximum validation steps run concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Run every step even if its inputs are unchanged")
+    args = parser.parse_args(argv)
 
     run_id = args.run_id
     run_dir = RUNS_DIR / run_id / INTEGRATOR_DIR
@@ -146,17 +412,21 @@ def main() -> int:
 
     run_log_path = run_dir / "RUN_LOG.txt"
     error_path = run_dir / "ERROR.txt"
+    log_lock = threading.Lock()
 
     def log(message: str) -> None:
-        print(message)
-        with run_log_path.open("a", encoding="utf-8") as handle:
-            handle.write(message + "\n")
+        with log_lock:
+            print(message)
+            with run_log_path.open("a", encoding="utf-8") as handle:
+                handle.write(message + "\n")
 
     status: Dict[str, Any] = {
         "run_id": run_id,
         "repo": str(REPO_ROOT),
         "adapter": None,
         "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "jobs": max(1, int(args.jobs)),
+        "cache": {"enabled": not args.no_cache, "dir": str(CACHE_DIR)},
         "results": [],
         "summary": {},
         "final": "UNKNOWN",
@@ -169,58 +439,35 @@ def main() -> int:
     try:
         adapter_path, cfg = load_adapter()
         status["adapter"] = str(adapter_path)
-        steps = collect_steps(cfg)
+        steps = [
+            {**step, "name": str(step.get("name", "unnamed")), "cmd": str(step.get("cmd", "")).strip(), "group": str(step.get("group", "unknown")), "run_id": run_id}
+            for step in collect_steps(cfg)
+            if str(step.get("cmd", "")).strip()
+        ]
+        graph = resolve_dependencies(steps, configured_step_names(cfg))
 
         log(f"[HITECH-OS] Repo: {REPO_ROOT}")
         log(f"[HITECH-OS] Run : {run_id}")
         log(f"[HITECH-OS] Adapter: {adapter_path}")
         log(f"[HITECH-OS] Output: {run_dir}")
-
-        for step in steps:
-            name = str(step.get("name", "unnamed"))
-            cmd = str(step.get("cmd", "")).strip()
-            group = str(step.get("group", "unknown"))
-            allow_fail = bool(step.get("allow_fail", False))
-            required = is_required(step)
-
-            if not cmd:
-                continue
-
-            log(f"==> [{group}] {name}: {cmd}")
-            started_at = time.strftime("%Y-%m-%d %H:%M:%S")
-            rc, output = run_cmd(cmd, REPO_ROOT)
-            ended_at = time.strftime("%Y-%m-%d %H:%M:%S")
-
-            log_file = logs_dir / f"{name}.log.txt"
-            rendered_log = (
-                f"# command: {cmd}\n"
-                f"# group: {group}\n"
-                f"# cwd: {REPO_ROOT}\n"
-                f"# required: {required}\n"
-                f"# allow_fail: {allow_fail}\n"
-                f"# started_at: {started_at}\n"
-                f"# ended_at: {ended_at}\n"
-                f"# rc: {rc}\n\n"
-                f"{output}"
-            )
-            write_text(log_file, rendered_log)
-
-            status["results"].append(
-                result_record(
-                    name=name,
-                    group=group,
-                    rc=rc,
-                    required=required,
-                    allow_fail=allow_fail,
-                    cmd=cmd,
-                    log_path=log_file,
-                )
-            )
-
-            if rc != 0 and required and status["blocked_reason"] is None:
-                status["blocked_reason"] = f"required step failed: {name} (rc={rc})"
+        log(f"[HITECH-OS] Jobs: {status['jobs']} cache: {'on' if not args.no_cache else 'off'}")
+
+        status["results"] = run_steps(
+            steps,
+            graph,
+            jobs=status["jobs"],
+            logs_dir=logs_dir,
+            cache_dir=CACHE_DIR,
+            use_cache=not args.no_cache,
+            log=log,
+        )
+        for item in status["results"]:
+            if item["rc"] not in (0, None) and item["required"]:
+                status["blocked_reason"] = f"required step failed: {item['name']} (rc={item['rc']})"
+                break
 
         status["summary"] = summarize(status["results"])
+        status["cache"].update(status["summary"]["cache"])
         required_failures = [item for item in status["results"] if item["required"] and item["rc"] != 0]
 
         if required_failures:
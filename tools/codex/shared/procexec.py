@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+CONCURRENCY_ENV = "CODEX_SUBPROCESS_CONCURRENCY"
+TIMEOUT_RC = 124
+NOT_FOUND_RC = 127
+LAUNCH_FAILED_RC = 126
+_READ_CHUNK = 65536
+_DRAIN_GRACE_SECONDS = 1.0
+
+OutputCallback = Callable[[str, str], None]
+
+
+def default_concurrency() -> int:
+    raw = os.environ.get(CONCURRENCY_ENV, "").strip()
+    if raw.isdigit() and int(raw) > 0:
+        return int(raw)
+    return max(2, min(8, (os.cpu_count() or 1) * 2))
+
+
+def _universal_newlines(text: str) -> str:
+    # Same translation subprocess.run(text=True) applies.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@dataclass(frozen=True)
+class ProcessCall:
+    cmd: Sequence[str]
+    cwd: Path | str | None = None
+    timeout: float | None = None
+    env: Mapping[str, str] | None = None
+    on_output: OutputCallback | None = None
+
+
+@dataclass(frozen=True)
+class ProcessResult:
+    cmd: list[str]
+    cwd: str
+    rc: int
+    stdout: str
+    stderr: str
+    duration_ms: int
+    queued_ms: int = 0
+    pid: int | None = None
+    timed_out: bool = False
+    error: str = ""
+    exception: BaseException | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.rc == 0 and not self.timed_out and not self.error
+
+    @property
+    def combined(self) -> str:
+        return f"{self.stdout}{self.stderr}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "cmd": list(self.cmd),
+            "cwd": self.cwd,
+            "rc": self.rc,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "duration_ms": self.duration_ms,
+            "queued_ms": self.queued_ms,
+            "pid": self.pid,
+            "timed_out": self.timed_out,
+            "error": self.error,
+        }
+
+
+class ProcessExecutor:
+    # Runs every child process on one private asyncio loop thread. A semaphore on
+    # that loop caps how many children exist at once across all calling threads,
+    # and synchronous callers simply block on the coroutine's future.
+
+    def __init__(self, *, max_concurrency: int | None = None) -> None:
+        self.max_concurrency = max(1, int(max_concurrency or default_concurrency()))
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = self._empty_stats()
+
+    def _empty_stats(self) -> dict[str, Any]:
+        return {
+            "calls": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "errors": 0,
+            "total_ms": 0,
+            "max_ms": 0,
+            "queued_ms": 0,
+            "peak_in_flight": 0,
+            "by_program": {},
+        }
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_serve, name="procexec-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    def close(self) -> None:
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+            snapshot["by_program"] = {name: dict(item) for name, item in self._stats["by_program"].items()}
+        snapshot["max_concurrency"] = self.max_concurrency
+        snapshot["mean_ms"] = round(snapshot["total_ms"] / snapshot["calls"], 3) if snapshot["calls"] else 0.0
+        return snapshot
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats = self._empty_stats()
+
+    def _record(self, result: ProcessResult) -> None:
+        program = Path(result.cmd[0]).name if result.cmd else ""
+        with self._stats_lock:
+            stats = self._stats
+            stats["calls"] += 1
+            stats["failed"] += 1 if result.rc != 0 else 0
+            stats["timed_out"] += 1 if result.timed_out else 0
+            stats["errors"] += 1 if result.error else 0
+            stats["total_ms"] += result.duration_ms
+            stats["max_ms"] = max(stats["max_ms"], result.duration_ms)
+            stats["queued_ms"] += result.queued_ms
+            per_program = stats["by_program"].setdefault(program, {"calls": 0, "total_ms": 0})
+            per_program["calls"] += 1
+            per_program["total_ms"] += result.duration_ms
+
+    def _enter(self) -> None:
+        with self._stats_lock:
+            self._in_flight += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+
+    def _leave(self) -> None:
+        with self._stats_lock:
+            self._in_flight -= 1
+
+    async def run_async(self, call: ProcessCall) -> ProcessResult:
+        assert self._semaphore is not None
+        cmd = [str(part) for part in call.cmd]
+        cwd = str(call.cwd) if call.cwd is not None else os.getcwd()
+        queued = perf_counter()
+        async with self._semaphore:
+            started = perf_counter()
+            queued_ms = int((started - queued) * 1000)
+            self._enter()
+            try:
+                result = await self._spawn(call, cmd, cwd, started, queued_ms)
+            finally:
+                self._leave()
+        self._record(result)
+        return result
+
+    async def _spawn(self, call: ProcessCall, cmd: list[str], cwd: str, started: float, queued_ms: int) -> ProcessResult:
+        def _failed(rc: int, exc: BaseException) -> ProcessResult:
+            return ProcessResult(
+                cmd=cmd,
+                cwd=cwd,
+                rc=rc,
+                stdout="",
+                stderr="",
+                duration_ms=int((perf_counter() - started) * 1000),
+                queued_ms=queued_ms,
+                error=f"{type(exc).__name__}: {exc}",
+                exception=exc,
+            )
+
+        if not cmd:
+            return _failed(LAUNCH_FAILED_RC, ValueError("empty command"))
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                env=dict(call.env) if call.env is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as exc:
+            return _failed(NOT_FOUND_RC, exc)
+        except (OSError, ValueError) as exc:
+            return _failed(LAUNCH_FAILED_RC, exc)
+
+        captured: dict[str, list[str]] = {"stdout": [], "stderr": []}
+
+        async def _pump(name: str, stream: asyncio.StreamReader) -> None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                chunk = await stream.read(_READ_CHUNK)
+                text = decoder.decode(chunk, final=not chunk)
+                if text:
+                    captured[name].append(text)
+                    if call.on_output is not None:
+                        call.on_output(name, text)
+                if not chunk:
+                    return
+
+        readers = [
+            asyncio.ensure_future(_pump("stdout", proc.stdout)),
+            asyncio.ensure_future(_pump("stderr", proc.stderr)),
+        ]
+        # Only the process wait is bounded by the timeout: wait_for cancels what it
+        # wraps, and cancelling the readers there would drop the tail of the output.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + call.timeout if call.timeout is not None else None
+        timed_out = False
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=call.timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        pending = set(readers)
+        if not timed_out:
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            _done, pending = await asyncio.wait(readers, timeout=remaining)
+            timed_out = bool(pending)
+        if pending:
+            # Grandchildren can keep the pipes open; keep what arrived and move on.
+            _done, pending = await asyncio.wait(pending, timeout=_DRAIN_GRACE_SECONDS)
+            for reader in pending:
+                reader.cancel()
+        return ProcessResult(
+            cmd=cmd,
+            cwd=cwd,
+            rc=TIMEOUT_RC if timed_out else int(proc.returncode or 0),
+            stdout=_universal_newlines("".join(captured["stdout"])),
+            stderr=_universal_newlines("".join(captured["stderr"])),
+            duration_ms=int((perf_counter() - started) * 1000),
+            queued_ms=queued_ms,
+            pid=proc.pid,
+            timed_out=timed_out,
+        )
+
+    def _submit(self, coroutine: Any) -> Any:
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("procexec: blocking call from the executor loop thread")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        cwd: Path | str | None = None,
+        timeout: float | None = None,
+        env: Mapping[str, str] | None = None,
+        on_output: OutputCallback | None = None,
+    ) -> ProcessResult:
+        return self._submit(self.run_async(ProcessCall(cmd=cmd, cwd=cwd, timeout=timeout, env=env, on_output=on_output)))
+
+    def run_many(self, calls: Iterable[ProcessCall]) -> list[ProcessResult]:
+        # Results come back in call order; the semaphore still bounds the fan-out.
+        batch = list(calls)
+        if not batch:
+            return []
+
+        async def _gather() -> list[ProcessResult]:
+            return list(await asyncio.gather(*(self.run_async(call) for call in batch)))
+
+        return self._submit(_gather())
+
+
+_DEFAULT: ProcessExecutor | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_executor() -> ProcessExecutor:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = ProcessExecutor()
+        return _DEFAULT
+
+
+def run_process(
+    cmd: Sequence[str],
+    *,
+    cwd: Path | str | None = None,
+    timeout: float | None = None,
+    env: Mapping[str, str] | None = None,
+    on_output: OutputCallback | None = None,
+) -> ProcessResult:
+    return get_executor().run(cmd, cwd=cwd, timeout=timeout, env=env, on_output=on_output)
+
+
+def run_processes(calls: Iterable[ProcessCall]) -> list[ProcessResult]:
+    return get_executor().run_many(calls)
+
+
+def executor_stats() -> dict[str, Any]:
+    return get_executor().stats()
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import traceback
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from time import perf_counter
 from typing import Sequence
 
+if __package__:
+    from .procexec import run_process
+else:  # executed as a script by the dispatch loop
+    from procexec import run_process
+
 
 @dataclass(frozen=True)
 class SubprocessResult:
@@ -26,24 +30,16 @@ class SubprocessResult:
 def run_command(cmd: Sequence[str], *, cwd: str) -> SubprocessResult:
     start = perf_counter()
     try:
-        proc = subprocess.run(
-            list(cmd),
-            cwd=cwd,
-            shell=False,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-        )
-        duration_ms = int((perf_counter() - start) * 1000)
+        result = run_process(cmd, cwd=cwd)
+        if result.exception is not None:
+            raise result.exception
         return SubprocessResult(
-            rc=int(proc.returncode),
-            stdout=proc.stdout or "",
-            stderr=proc.stderr or "",
+            rc=int(result.rc),
+            stdout=result.stdout,
+            stderr=result.stderr,
             cmd=[str(part) for part in cmd],
             cwd=str(cwd),
-            duration_ms=duration_ms,
+            duration_ms=result.duration_ms,
         )
     except Exception as exc:
         duration_ms = int((perf_counter() - start) * 1000)
@@ -3,14 +3,15 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import subprocess
 from pathlib import Path
 from typing import Any
 
 try:  # pragma: no cover - import path depends on launcher
     from factory.path_guard import PathGuardError, normalize_rel_path
+    from shared.procexec import ProcessCall, ProcessResult, run_process, run_processes
 except Exception:  # pragma: no cover - package mode fallback
     from tools.codex.factory.path_guard import PathGuardError, normalize_rel_path
+    from tools.codex.shared.procexec import ProcessCall, ProcessResult, run_process, run_processes
 
 PASS = "PASS"
 FAIL = "FAIL"
@@ -64,32 +65,45 @@ def _read_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def _detach(path: Path) -> None:
+    # Restored run files may be hardlinks into the factory artifact store; never write through them.
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
 def _write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    _detach(path)
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
 
 
 def _write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    _detach(path)
     path.write_text(text, encoding="utf-8", newline="\n")
 
 
-def _run_git(repo_root: Path, args: list[str]) -> dict[str, Any]:
-    proc = subprocess.run(
-        ["git", *args],
-        cwd=str(repo_root),
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+def _git_payload(result: ProcessResult, args: list[str]) -> dict[str, Any]:
     return {
         "cmd": ["git", *args],
-        "rc": int(proc.returncode),
-        "stdout": proc.stdout or "",
-        "stderr": proc.stderr or "",
+        "rc": int(result.rc),
+        "stdout": result.stdout,
+        "stderr": result.stderr or result.error,
     }
 
 
+def _run_git(repo_root: Path, args: list[str]) -> dict[str, Any]:
+    return _git_payload(run_process(["git", *args], cwd=repo_root), args)
+
+
+def _run_git_many(repo_root: Path, commands: list[list[str]]) -> list[dict[str, Any]]:
+    results = run_processes([ProcessCall(cmd=["git", *args], cwd=repo_root) for args in commands])
+    return [_git_payload(result, args) for result, args in zip(results, commands)]
+
+
 def _parse_git_name_status(text: str) -> dict[str, str]:
     parsed: dict[str, str] = {}
     for raw_line in text.splitlines():
@@ -131,13 +145,19 @@ def _collect_git_mutations(repo_root: Path, base_ref: str) -> tuple[dict[str, st
     details: list[str] = []
     merged: dict[str, str] = {}
 
-    head_ref = _run_git(repo_root, ["rev-parse", "HEAD"])
+    head_ref, base_resolve, status = _run_git_many(
+        repo_root,
+        [
+            ["rev-parse", "HEAD"],
+            ["rev-parse", "--verify", f"{base_ref}^{{commit}}"],
+            ["status", "--porcelain=v1", "--untracked-files=all"],
+        ],
+    )
     if head_ref["rc"] != 0:
         details.append("HEAD is not available.")
         return {}, details
     head = head_ref["stdout"].strip()
 
-    base_resolve = _run_git(repo_root, ["rev-parse", "--verify", f"{base_ref}^{{commit}}"])
     if base_resolve["rc"] != 0:
         details.append(f"base_ref is not resolvable: {base_ref}")
         base = head
@@ -151,7 +171,6 @@ def _collect_git_mutations(repo_root: Path, base_ref: str) -> tuple[dict[str, st
         else:
             details.append("git diff base..head failed.")
 
-    status = _run_git(repo_root, ["status", "--porcelain=v1", "--untracked-files=all"])
     if status["rc"] == 0:
         merged.update(_parse_git_status(status["stdout"]))
     else:
@@ -190,10 +209,15 @@ def _parse_patch_paths(diff_text: str) -> list[str]:
 
 
 def _patch_check(repo_root: Path, patch_path: Path) -> tuple[bool, str]:
-    forward = _run_git(repo_root, ["apply", "--check", "--verbose", patch_path.as_posix()])
+    forward, reverse = _run_git_many(
+        repo_root,
+        [
+            ["apply", "--check", "--verbose", patch_path.as_posix()],
+            ["apply", "--check", "--reverse", "--verbose", patch_path.as_posix()],
+        ],
+    )
     if forward["rc"] == 0:
         return True, "forward"
-    reverse = _run_git(repo_root, ["apply", "--check", "--reverse", "--verbose", patch_path.as_posix()])
     if reverse["rc"] == 0:
         return True, "reverse"
     detail = (forward.get("stderr") or forward.get("stdout") or "").strip()
@@ -55,6 +55,9 @@ DEFAULT_BOUNDARY_CONTRACT_FILES: Tuple[str, ...] = (
 )
 
 
+IMPORT_GRAPH_FILENAME = "import_graph.sqlite"
+
+
 SEVERITIES: Tuple[str, ...] = ("BLOCKER", "ERROR", "WARN", "INFO")
 POLARITIES: Tuple[str, ...] = ("POS", "NEG", "NEU")
 
@@ -123,6 +126,9 @@ class ScanConfig:
     max_file_mb: int = 200
     near_dup_threshold: float = 0.92
     max_near_dup_pairs: int = 8_000
+    section_dups: bool = True
+    section_dup_threshold: float = 0.5
+    max_section_dup_pairs: int = 20_000
     chunk_size: int = 1400
     chunk_overlap: int = 150
     contract_paths: Tuple[str, ...] = DEFAULT_BOUNDARY_CONTRACT_FILES
@@ -133,6 +139,11 @@ class ScanConfig:
     max_docs_for_near_dup: int = 20_000
     max_import_files: int = 80_000
     max_import_edges: int = 500_000
+    tree_depth: int = 2
+    import_graph_path: Optional[Path] = None
+    index_path: Optional[Path] = None
+    index_repo: str = ""
+    workers: int = 0
 
     @property
     def max_file_bytes(self) -> int:
@@ -149,6 +160,14 @@ class ScanConfig:
         max_near_dup_pairs: Optional[int] = None,
         chunk_size: Optional[int] = None,
         chunk_overlap: Optional[int] = None,
+        section_dups: bool = True,
+        section_dup_threshold: Optional[float] = None,
+        max_section_dup_pairs: Optional[int] = None,
+        tree_depth: Optional[int] = None,
+        import_graph: Optional[str] = None,
+        index_path: Optional[str] = None,
+        index_repo: Optional[str] = None,
+        workers: Optional[int] = None,
         show_progress: bool = True,
     ) -> "ScanConfig":
         env_max_file_mb = env_int("MAX_FILE_MB", 200)
@@ -169,22 +188,116 @@ class ScanConfig:
         max_near_dup_pairs_value = (
             max_near_dup_pairs if max_near_dup_pairs is not None else 8_000
         )
+        section_dup_threshold_value = (
+            section_dup_threshold if section_dup_threshold is not None else 0.5
+        )
+        max_section_dup_pairs_value = (
+            max_section_dup_pairs if max_section_dup_pairs is not None else 20_000
+        )
         chunk_size_value = chunk_size if chunk_size is not None else 1400
         chunk_overlap_value = chunk_overlap if chunk_overlap is not None else 150
+        in_path = Path(in_dir).resolve()
+        out_path = Path(out_dir).resolve()
         return ScanConfig(
-            in_dir=Path(in_dir).resolve(),
-            out_dir=Path(out_dir).resolve(),
+            in_dir=in_path,
+            out_dir=out_path,
             include_extensions=include_list,
             exclude_dirs=exclude_list,
             max_file_mb=max(1, max_file_mb_value),
             near_dup_threshold=min(1.0, max(0.1, near_dup_threshold_value)),
             max_near_dup_pairs=max(1, max_near_dup_pairs_value),
+            section_dups=section_dups,
+            section_dup_threshold=min(1.0, max(0.1, section_dup_threshold_value)),
+            max_section_dup_pairs=max(1, max_section_dup_pairs_value),
             chunk_size=max(200, chunk_size_value),
             chunk_overlap=max(0, min(chunk_overlap_value, max(0, chunk_size_value - 1))),
+            tree_depth=max(1, tree_depth if tree_depth is not None else 2),
+            import_graph_path=Path(import_graph).resolve() if import_graph else out_path / IMPORT_GRAPH_FILENAME,
+            index_path=Path(index_path).resolve() if index_path else None,
+            index_repo=index_repo or in_path.name,
+            workers=max(0, workers if workers is not None else 0),
             show_progress=show_progress,
         )
 
 
+@dataclass(frozen=True, slots=True)
+class CoachTemplate:
+    """Coach guidance shared by every finding of one kind.
+
+    Findings hold only a ``coach_id``; output_writer resolves it with
+    ``coach_template`` when rows are serialized.
+    """
+
+    why_it_matters: str
+    how_to_fix: str
+    minimal_bad_example: str
+    minimal_good_example: str
+    next_best_action: str
+
+    def as_row(self) -> Dict[str, str]:
+        return {
+            "why_it_matters": self.why_it_matters,
+            "how_to_fix": self.how_to_fix,
+            "minimal_bad_example": self.minimal_bad_example,
+            "minimal_good_example": self.minimal_good_example,
+            "next_best_action": self.next_best_action,
+        }
+
+
+COACH_FIELDS: Tuple[str, ...] = tuple(item.name for item in dataclasses.fields(CoachTemplate))
+
+_COACH_IDS: Dict[CoachTemplate, int] = {}
+_COACH_TEMPLATES: List[CoachTemplate] = []
+
+
+def intern_coach(
+    why_it_matters: str,
+    how_to_fix: str,
+    minimal_bad_example: str,
+    minimal_good_example: str,
+    next_best_action: str,
+) -> int:
+    """Id of the coach template with this text, registering it on first use."""
+    template = CoachTemplate(
+        why_it_matters=why_it_matters,
+        how_to_fix=how_to_fix,
+        minimal_bad_example=minimal_bad_example,
+        minimal_good_example=minimal_good_example,
+        next_best_action=next_best_action,
+    )
+    coach_id = _COACH_IDS.get(template)
+    if coach_id is None:
+        coach_id = len(_COACH_TEMPLATES)
+        _COACH_TEMPLATES.append(template)
+        _COACH_IDS[template] = coach_id
+    return coach_id
+
+
+def coach_template(coach_id: int) -> CoachTemplate:
+    return _COACH_TEMPLATES[coach_id]
+
+
+class CoachedFinding:
+    """Base for finding records whose coach text lives in the template table.
+
+    Coach ids are local to the process that interned them, so pickling carries
+    the template itself and re-interns it on load (rule extraction returns
+    records from worker processes).
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        values = tuple(getattr(self, item.name) for item in dataclasses.fields(self))
+        return (_restore_finding, (type(self), values, coach_template(self.coach_id)))
+
+
+def _restore_finding(cls: type, values: Tuple[object, ...], template: CoachTemplate) -> CoachedFinding:
+    finding = cls(*values)
+    finding.coach_id = intern_coach(*(getattr(template, name) for name in COACH_FIELDS))
+    return finding
+
+
 @dataclass
 class ExtractionWarning:
     rel_path: str
@@ -231,8 +344,8 @@ class ChunkRecord:
         return max(0, self.offset_end - self.offset_start)
 
 
-@dataclass
-class RuleRecord:
+@dataclass(slots=True)
+class RuleRecord(CoachedFinding):
     """Living rule candidate extracted from docs."""
 
     rule_id: str
@@ -245,15 +358,11 @@ class RuleRecord:
     evidence_snippet: str
     check_id: str
     what_detected: str
-    why_it_matters: str
-    how_to_fix: str
-    minimal_bad_example: str
-    minimal_good_example: str
-    next_best_action: str
+    coach_id: int
 
 
-@dataclass
-class DuplicateRecord:
+@dataclass(slots=True)
+class DuplicateRecord(CoachedFinding):
     """Duplicate pair for exact or near duplicate detection."""
 
     duplicate_id: str
@@ -264,15 +373,30 @@ class DuplicateRecord:
     check_id: str
     severity: str
     what_detected: str
-    why_it_matters: str
-    how_to_fix: str
-    minimal_bad_example: str
-    minimal_good_example: str
-    next_best_action: str
+    coach_id: int
 
 
-@dataclass
-class ContradictionRecord:
+@dataclass(slots=True)
+class SectionDuplicateRecord(CoachedFinding):
+    """Passage shared by two different documents, located by char offsets."""
+
+    section_duplicate_id: str
+    similarity: float
+    doc_a: str
+    a_offset_start: int
+    a_offset_end: int
+    doc_b: str
+    b_offset_start: int
+    b_offset_end: int
+    window_pairs: int
+    check_id: str
+    severity: str
+    what_detected: str
+    coach_id: int
+
+
+@dataclass(slots=True)
+class ContradictionRecord(CoachedFinding):
     """Contradiction candidate derived from extracted rules."""
 
     contradiction_id: str
@@ -287,11 +411,7 @@ class ContradictionRecord:
     confidence: float
     check_id: str
     what_detected: str
-    why_it_matters: str
-    how_to_fix: str
-    minimal_bad_example: str
-    minimal_good_example: str
-    next_best_action: str
+    coach_id: int
 
 
 @dataclass
@@ -302,8 +422,8 @@ class ImportHubRecord:
     total_links: int
 
 
-@dataclass
-class BoundaryViolationRecord:
+@dataclass(slots=True)
+class BoundaryViolationRecord(CoachedFinding):
     violation_id: str
     from_file: str
     to_file: str
@@ -312,11 +432,42 @@ class BoundaryViolationRecord:
     severity: str
     check_id: str
     what_detected: str
-    why_it_matters: str
-    how_to_fix: str
-    minimal_bad_example: str
-    minimal_good_example: str
-    next_best_action: str
+    coach_id: int
+    # Transitive violations only: the import chain, ``from_file -> ... -> to_file``.
+    via: str = ""
+
+
+@dataclass(slots=True)
+class CycleRecord(CoachedFinding):
+    """Import cycle: one strongly connected component of the file import graph."""
+
+    cycle_id: str
+    file_count: int
+    edge_count: int
+    boundaries: str
+    example_cycle: str
+    files: str
+    check_id: str
+    severity: str
+    what_detected: str
+    coach_id: int
+
+
+@dataclass(slots=True)
+class DirectoryNode:
+    """File count, bytes and language mix of one directory, including everything below it."""
+
+    name: str
+    files: int = 0
+    bytes: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+    children: Dict[str, "DirectoryNode"] = field(default_factory=dict)
+    # Names of files directly inside; kept only where the tree summary lists them.
+    file_names: List[str] = field(default_factory=list)
+
+    @property
+    def direct_files(self) -> int:
+        return self.files - sum(child.files for child in self.children.values())
 
 
 @dataclass
@@ -331,6 +482,10 @@ class RepoStructureResult:
     forbidden_edges: List[Tuple[str, str]]
     boundary_violations: List[BoundaryViolationRecord]
     coach_findings: List[Dict[str, str]]
+    transitive_violations: List[BoundaryViolationRecord] = field(default_factory=list)
+    import_cycles: List[CycleRecord] = field(default_factory=list)
+    directory_tree: Optional[DirectoryNode] = None
+    tree_depth: int = 2
 
 
 @dataclass
@@ -345,6 +500,7 @@ class ScanIndex:
     max_file_mb: int
     near_dup_threshold: float
     max_near_dup_pairs: int
+    section_dup_threshold: float
     chunk_size: int
     chunk_overlap: int
     counts: Dict[str, int]
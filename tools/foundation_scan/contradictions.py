@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from itertools import combinations
+from functools import lru_cache
+from itertools import combinations, product
 from typing import DefaultDict, Dict, Iterable, List, Sequence, Set, Tuple
 
-from .config import ContradictionRecord, RuleRecord, stable_sha1_text
+from .config import ContradictionRecord, RuleRecord, intern_coach, stable_sha1_text
 from .doc_rules import keywords_from_rule, lexical_overlap
+from .markers import marker_hits
 
 
 NEGATION_MARKERS: Tuple[str, ...] = (
@@ -30,8 +32,7 @@ AFFIRM_MARKERS: Tuple[str, ...] = (
 
 
 def _contains_markers(text: str, markers: Sequence[str]) -> bool:
-    lowered = text.lower()
-    return any(marker in lowered for marker in markers)
+    return not marker_hits(text).isdisjoint(markers)
 
 
 def _pair_confidence(rule_a: RuleRecord, rule_b: RuleRecord) -> float:
@@ -131,60 +132,66 @@ def _coach_examples(topic: str) -> Tuple[str, str]:
     )
 
 
-def detect_contradictions(
-    rules: Sequence[RuleRecord],
-    max_pairs: int = 10_000,
-) -> List[ContradictionRecord]:
-    by_topic: DefaultDict[str, List[RuleRecord]] = defaultdict(list)
-    for rule in rules:
-        by_topic[rule.topic].append(rule)
+@lru_cache(maxsize=None)
+def _contradiction_coach_id(topic: str) -> int:
+    bad_example, good_example = _coach_examples(topic)
+    return intern_coach(
+        why_it_matters=_coach_why(topic),
+        how_to_fix=_coach_fix(topic),
+        minimal_bad_example=bad_example,
+        minimal_good_example=good_example,
+        next_best_action="Promote one canonical rule and deprecate the conflicting one.",
+    )
 
-    rows: List[ContradictionRecord] = []
-    for topic, topic_rules in sorted(by_topic.items(), key=lambda item: item[0]):
-        if len(topic_rules) < 2:
-            continue
-        topic_rules = sorted(
-            topic_rules,
-            key=lambda row: (row.source_file.lower(), row.rule_id),
-        )
-        for rule_a, rule_b in combinations(topic_rules, 2):
-            if len(rows) >= max_pairs:
-                break
-            if not _is_contradictory(rule_a, rule_b):
-                continue
-            confidence = _pair_confidence(rule_a, rule_b)
-            if confidence < 0.35:
-                continue
-            statement_a = rule_a.statement
-            statement_b = rule_b.statement
-            check_seed = f"{rule_a.rule_id}|{rule_b.rule_id}|{topic}"
-            contradiction_id = f"CON-{stable_sha1_text(check_seed)[:12]}"
-            severity = _severity_for_contradiction(rule_a, rule_b)
-            bad_example, good_example = _coach_examples(topic)
-            rows.append(
-                ContradictionRecord(
-                    contradiction_id=contradiction_id,
-                    topic=topic,
-                    severity=severity,
-                    rule_a_id=rule_a.rule_id,
-                    rule_b_id=rule_b.rule_id,
-                    file_a=rule_a.source_file,
-                    file_b=rule_b.source_file,
-                    statement_a=statement_a,
-                    statement_b=statement_b,
-                    confidence=confidence,
-                    check_id=f"CON-{topic[:3].upper()}-{stable_sha1_text(check_seed)[:8].upper()}",
-                    what_detected="Opposite-polarity rules on the same topic with lexical overlap.",
-                    why_it_matters=_coach_why(topic),
-                    how_to_fix=_coach_fix(topic),
-                    minimal_bad_example=bad_example,
-                    minimal_good_example=good_example,
-                    next_best_action="Promote one canonical rule and deprecate the conflicting one.",
-                )
-            )
+
+def _contradiction_row(rule_a: RuleRecord, rule_b: RuleRecord, confidence: float) -> ContradictionRecord:
+    topic = rule_a.topic
+    check_seed = f"{rule_a.rule_id}|{rule_b.rule_id}|{topic}"
+    contradiction_id = f"CON-{stable_sha1_text(check_seed)[:12]}"
+    return ContradictionRecord(
+        contradiction_id=contradiction_id,
+        topic=topic,
+        severity=_severity_for_contradiction(rule_a, rule_b),
+        rule_a_id=rule_a.rule_id,
+        rule_b_id=rule_b.rule_id,
+        file_a=rule_a.source_file,
+        file_b=rule_b.source_file,
+        statement_a=rule_a.statement,
+        statement_b=rule_b.statement,
+        confidence=confidence,
+        check_id=f"CON-{topic[:3].upper()}-{stable_sha1_text(check_seed)[:8].upper()}",
+        what_detected="Opposite-polarity rules on the same topic with lexical overlap.",
+        coach_id=_contradiction_coach_id(topic),
+    )
+
+
+def _by_topic(rules: Iterable[RuleRecord]) -> Dict[str, List[RuleRecord]]:
+    grouped: DefaultDict[str, List[RuleRecord]] = defaultdict(list)
+    for rule in rules:
+        grouped[rule.topic].append(rule)
+    return {
+        topic: sorted(topic_rules, key=lambda row: (row.source_file.lower(), row.rule_id))
+        for topic, topic_rules in grouped.items()
+    }
+
+
+def _collect(
+    pairs: Iterable[Tuple[RuleRecord, RuleRecord]],
+    rows: List[ContradictionRecord],
+    max_pairs: int,
+) -> None:
+    for rule_a, rule_b in pairs:
         if len(rows) >= max_pairs:
-            break
+            return
+        if not _is_contradictory(rule_a, rule_b):
+            continue
+        confidence = _pair_confidence(rule_a, rule_b)
+        if confidence < 0.35:
+            continue
+        rows.append(_contradiction_row(rule_a, rule_b, confidence))
+
 
+def _sort_rows(rows: List[ContradictionRecord]) -> List[ContradictionRecord]:
     rows.sort(
         key=lambda row: (
             {"BLOCKER": 0, "ERROR": 1, "WARN": 2, "INFO": 3}.get(row.severity, 9),
@@ -196,3 +203,35 @@ def detect_contradictions(
     )
     return rows
 
+
+def detect_contradictions(
+    rules: Sequence[RuleRecord],
+    max_pairs: int = 10_000,
+) -> List[ContradictionRecord]:
+    rows: List[ContradictionRecord] = []
+    for topic, topic_rules in sorted(_by_topic(rules).items(), key=lambda item: item[0]):
+        if len(topic_rules) < 2:
+            continue
+        _collect(combinations(topic_rules, 2), rows, max_pairs)
+        if len(rows) >= max_pairs:
+            break
+    return _sort_rows(rows)
+
+
+def detect_cross_contradictions(
+    rules: Sequence[RuleRecord],
+    others: Sequence[RuleRecord],
+    max_pairs: int = 10_000,
+) -> List[ContradictionRecord]:
+    """Contradictions between ``rules`` and ``others`` only, never within either side.
+
+    Used against rules loaded from other repositories; ``rule_a`` always comes
+    from ``rules``.
+    """
+    other_topics = _by_topic(others)
+    rows: List[ContradictionRecord] = []
+    for topic, topic_rules in sorted(_by_topic(rules).items(), key=lambda item: item[0]):
+        _collect(product(topic_rules, other_topics.get(topic, [])), rows, max_pairs)
+        if len(rows) >= max_pairs:
+            break
+    return _sort_rows(rows)
@@ -0,0 +1,398 @@
+"""Persistent cross-repository signature and rule index for Foundation Scan.
+
+One SQLite file holds, per ``(repo, rel_path)``:
+- document metadata, the normalized text hash and the sorted shingle hash array
+- the document's LSH band keys (one indexed row per band)
+- the living rules extracted from the document
+
+Scans of different repositories share the file. A scan first queries the other
+repositories' documents and rules, then upserts its own documents (skipping
+unchanged ones) and deletes paths that disappeared from its tree.
+
+Usage:
+    python -m tools.foundation_scan.cross_index --index scan_index.sqlite repos
+    python -m tools.foundation_scan.cross_index --index scan_index.sqlite delete --repo A [--path docs/x.md]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from array import array
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import (
+    COACH_FIELDS,
+    ContradictionRecord,
+    DocumentRecord,
+    DuplicateRecord,
+    RuleRecord,
+    coach_template,
+    intern_coach,
+    stable_sha1_text,
+)
+from .contradictions import detect_cross_contradictions
+from .dedupe import (
+    SIGNATURE_BINS,
+    _band_keys,
+    _doc_tokens,
+    _exact_duplicate_row,
+    _hashed_shingles,
+    _jaccard,
+    _lsh_params,
+    _near_duplicate_row,
+    _normalized_text_hash,
+    _one_permutation_signature,
+    _shingles,
+)
+
+
+SCHEMA_VERSION = 1
+# Rules are stored with their coach text: template ids are local to one process.
+RULE_RECORD_FIELDS: Tuple[str, ...] = tuple(field.name for field in fields(RuleRecord) if field.name != "coach_id")
+RULE_FIELDS: Tuple[str, ...] = RULE_RECORD_FIELDS + COACH_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS docs (
+    repo TEXT NOT NULL,
+    rel_path TEXT NOT NULL,
+    text_sha1 TEXT NOT NULL,
+    norm_hash TEXT NOT NULL,
+    rules_sha1 TEXT NOT NULL,
+    char_count INTEGER NOT NULL,
+    shingles BLOB NOT NULL,
+    PRIMARY KEY (repo, rel_path)
+);
+CREATE INDEX IF NOT EXISTS docs_norm_hash ON docs (norm_hash);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    repo TEXT NOT NULL,
+    rel_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_key ON buckets (band, key);
+CREATE INDEX IF NOT EXISTS buckets_doc ON buckets (repo, rel_path);
+CREATE TABLE IF NOT EXISTS rules (
+    repo TEXT NOT NULL,
+    rel_path TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    {rule_columns}
+);
+CREATE INDEX IF NOT EXISTS rules_topic ON rules (topic, repo);
+CREATE INDEX IF NOT EXISTS rules_doc ON rules (repo, rel_path);
+""".format(rule_columns=",\n    ".join(f"r_{name} TEXT NOT NULL" for name in RULE_FIELDS))
+
+
+def qualified_path(repo: str, rel_path: str) -> str:
+    """Name of a document from another repository in scan outputs."""
+    return f"{repo}:{rel_path}"
+
+
+def _pack(hashes: "array[int]") -> bytes:
+    # Stored little-endian so an index file can move between machines.
+    if sys.byteorder == "big":
+        hashes = array("Q", hashes)
+        hashes.byteswap()
+    return hashes.tobytes()
+
+
+def _unpack(blob: bytes) -> "array[int]":
+    hashes = array("Q")
+    hashes.frombytes(blob)
+    if sys.byteorder == "big":
+        hashes.byteswap()
+    return hashes
+
+
+def _rules_digest(rules: Sequence[RuleRecord]) -> str:
+    return stable_sha1_text("|".join(sorted(rule.rule_id for rule in rules)))
+
+
+def _rule_values(rule: RuleRecord) -> List[str]:
+    template = coach_template(rule.coach_id)
+    values = [str(getattr(rule, name)) for name in RULE_RECORD_FIELDS]
+    values.extend(getattr(template, name) for name in COACH_FIELDS)
+    return values
+
+
+class CrossRepoIndex:
+    """On-disk LSH buckets, document metadata and rules shared across scans.
+
+    Banding is fixed when the file is created (from ``threshold``); later scans
+    reuse it so stored bucket keys stay comparable, and verify candidates
+    against their own threshold.
+    """
+
+    def __init__(self, path: Path, threshold: float = 0.92) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=60)
+        self.conn.executescript(SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if not meta:
+            bands, rows = _lsh_params(threshold, SIGNATURE_BINS)
+            meta = {
+                "schema_version": str(SCHEMA_VERSION),
+                "signature_bins": str(SIGNATURE_BINS),
+                "bands": str(bands),
+                "rows_per_band": str(rows),
+            }
+            with self.conn:
+                self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", sorted(meta.items()))
+        if int(meta["schema_version"]) != SCHEMA_VERSION or int(meta["signature_bins"]) != SIGNATURE_BINS:
+            self.conn.close()
+            raise ValueError(
+                f"Index {path.as_posix()} was built with schema {meta['schema_version']} / "
+                f"{meta['signature_bins']} bins; rebuild it with this scanner version."
+            )
+        self.bands = int(meta["bands"])
+        self.rows_per_band = int(meta["rows_per_band"])
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "CrossRepoIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _band_keys(self, hashes: "array[int]") -> List[int]:
+        signature = _one_permutation_signature(hashes, SIGNATURE_BINS)
+        return _band_keys(signature, self.bands, self.rows_per_band)
+
+    # -- maintenance -----------------------------------------------------------------
+
+    def repos(self) -> List[Tuple[str, int, int]]:
+        """``(repo, documents, rules)`` for every repository in the index."""
+        docs = dict(self.conn.execute("SELECT repo, COUNT(*) FROM docs GROUP BY repo"))
+        rules = dict(self.conn.execute("SELECT repo, COUNT(*) FROM rules GROUP BY repo"))
+        return [(repo, docs[repo], rules.get(repo, 0)) for repo in sorted(docs)]
+
+    def _delete(self, repo: str, rel_path: str) -> None:
+        for table in ("docs", "buckets", "rules"):
+            self.conn.execute(f"DELETE FROM {table} WHERE repo = ? AND rel_path = ?", (repo, rel_path))
+
+    def delete_documents(self, repo: str, rel_paths: Optional[Iterable[str]] = None) -> int:
+        """Delete the given paths of ``repo`` (every path when ``rel_paths`` is None)."""
+        with self.conn:
+            if rel_paths is None:
+                targets = [row[0] for row in self.conn.execute("SELECT rel_path FROM docs WHERE repo = ?", (repo,))]
+            else:
+                targets = sorted(set(rel_paths))
+            deleted = 0
+            for rel_path in targets:
+                deleted += self.conn.execute(
+                    "SELECT COUNT(*) FROM docs WHERE repo = ? AND rel_path = ?", (repo, rel_path)
+                ).fetchone()[0]
+                self._delete(repo, rel_path)
+        return deleted
+
+    def upsert_document(self, repo: str, doc: DocumentRecord, rules: Sequence[RuleRecord]) -> bool:
+        """Insert or replace one document; returns False when it was already current."""
+        with self.conn:
+            return self._upsert(repo, doc, rules)
+
+    def _upsert(self, repo: str, doc: DocumentRecord, rules: Sequence[RuleRecord]) -> bool:
+        rules_sha1 = _rules_digest(rules)
+        current = self.conn.execute(
+            "SELECT text_sha1, rules_sha1 FROM docs WHERE repo = ? AND rel_path = ?",
+            (repo, doc.rel_path),
+        ).fetchone()
+        if current == (doc.text_sha1, rules_sha1):
+            return False
+        self._delete(repo, doc.rel_path)
+        hashes = _hashed_shingles(_shingles(_doc_tokens(doc), width=5))
+        self.conn.execute(
+            "INSERT INTO docs (repo, rel_path, text_sha1, norm_hash, rules_sha1, char_count, shingles) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (repo, doc.rel_path, doc.text_sha1, _normalized_text_hash(doc.text), rules_sha1, doc.char_count, _pack(hashes)),
+        )
+        if hashes:
+            self.conn.executemany(
+                "INSERT INTO buckets (band, key, repo, rel_path) VALUES (?, ?, ?, ?)",
+                [(band, key, repo, doc.rel_path) for band, key in enumerate(self._band_keys(hashes))],
+            )
+        placeholders = ", ".join("?" for _ in range(3 + len(RULE_FIELDS)))
+        columns = ", ".join(["repo", "rel_path", "topic"] + [f"r_{name}" for name in RULE_FIELDS])
+        self.conn.executemany(
+            f"INSERT INTO rules ({columns}) VALUES ({placeholders})",
+            [
+                (repo, doc.rel_path, rule.topic, *_rule_values(rule))
+                for rule in rules
+            ],
+        )
+        return True
+
+    def sync_repo(self, repo: str, docs: Sequence[DocumentRecord], rules: Sequence[RuleRecord]) -> Dict[str, int]:
+        """Make the index match one full scan of ``repo`` in a single transaction."""
+        by_doc: Dict[str, List[RuleRecord]] = {}
+        for rule in rules:
+            by_doc.setdefault(rule.source_file, []).append(rule)
+        counts = {"upserted": 0, "unchanged": 0, "deleted": 0}
+        with self.conn:
+            for doc in sorted(docs, key=lambda item: item.rel_path):
+                changed = self._upsert(repo, doc, by_doc.get(doc.rel_path, []))
+                counts["upserted" if changed else "unchanged"] += 1
+            present = {doc.rel_path for doc in docs}
+            stale = [
+                row[0]
+                for row in self.conn.execute("SELECT rel_path FROM docs WHERE repo = ? ORDER BY rel_path", (repo,))
+                if row[0] not in present
+            ]
+            for rel_path in stale:
+                self._delete(repo, rel_path)
+            counts["deleted"] = len(stale)
+        return counts
+
+    # -- queries ---------------------------------------------------------------------
+
+    def _probe(self, rows: Iterator[Tuple[int, int, int]]) -> None:
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe (doc INTEGER, band INTEGER, key INTEGER)")
+        self.conn.execute("DELETE FROM probe")
+        self.conn.executemany("INSERT INTO probe (doc, band, key) VALUES (?, ?, ?)", rows)
+
+    def _probe_values(self, values: Iterable[str]) -> None:
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe_values (value TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM probe_values")
+        self.conn.executemany("INSERT OR IGNORE INTO probe_values (value) VALUES (?)", ((value,) for value in values))
+
+    def find_duplicates(
+        self,
+        repo: str,
+        docs: Sequence[DocumentRecord],
+        threshold: float,
+        max_pairs: int = 8_000,
+    ) -> List[DuplicateRecord]:
+        """Exact and near duplicates between ``docs`` and other repositories' documents.
+
+        ``doc_a`` is always the scanned document; ``doc_b`` is ``repo:rel_path``.
+        """
+        docs_sorted = sorted(docs, key=lambda d: d.rel_path.lower())
+        hashes = [_hashed_shingles(_shingles(_doc_tokens(doc), width=5)) for doc in docs_sorted]
+        norm_hashes = [_normalized_text_hash(doc.text) for doc in docs_sorted]
+        self._probe(
+            (idx, band, key)
+            for idx, doc_hashes in enumerate(hashes)
+            if doc_hashes
+            for band, key in enumerate(self._band_keys(doc_hashes))
+        )
+        candidates = self.conn.execute(
+            "SELECT DISTINCT p.doc, b.repo, b.rel_path FROM probe p "
+            "JOIN buckets b ON b.band = p.band AND b.key = p.key "
+            "WHERE b.repo != ? ORDER BY b.repo, b.rel_path, p.doc",
+            (repo,),
+        ).fetchall()
+        by_norm: Dict[str, List[int]] = {}
+        for idx, norm_hash in enumerate(norm_hashes):
+            by_norm.setdefault(norm_hash, []).append(idx)
+        self._probe_values(by_norm)
+        exact = self.conn.execute(
+            "SELECT repo, rel_path, norm_hash FROM docs WHERE repo != ? AND norm_hash IN "
+            "(SELECT value FROM probe_values) ORDER BY repo, rel_path",
+            (repo,),
+        ).fetchall()
+
+        rows: List[DuplicateRecord] = []
+        exact_pairs = set()
+        for other_repo, other_path, norm_hash in exact:
+            for idx in by_norm[norm_hash]:
+                path = docs_sorted[idx].rel_path
+                other = qualified_path(other_repo, other_path)
+                exact_pairs.add((idx, other_repo, other_path))
+                rows.append(_exact_duplicate_row(path, other, norm_hash, doc_a=path, doc_b=other))
+
+        loaded: Tuple[Optional[Tuple[str, str]], "array[int]"] = (None, array("Q"))
+        for idx, other_repo, other_path in candidates:
+            if (idx, other_repo, other_path) in exact_pairs:
+                continue
+            if loaded[0] != (other_repo, other_path):
+                blob = self.conn.execute(
+                    "SELECT shingles FROM docs WHERE repo = ? AND rel_path = ?", (other_repo, other_path)
+                ).fetchone()[0]
+                loaded = ((other_repo, other_path), _unpack(blob))
+            similarity = _jaccard(hashes[idx], loaded[1], threshold)
+            if similarity >= threshold:
+                rows.append(
+                    _near_duplicate_row(docs_sorted[idx].rel_path, qualified_path(other_repo, other_path), similarity)
+                )
+
+        rows.sort(
+            key=lambda row: (
+                {"exact": 0, "near": 1}.get(row.duplicate_type, 9),
+                -row.similarity,
+                row.doc_a.lower(),
+                row.doc_b.lower(),
+                row.duplicate_id,
+            )
+        )
+        return rows[: max(1, max_pairs)]
+
+    def other_rules(self, repo: str, topics: Iterable[str]) -> List[RuleRecord]:
+        """Rules of every other repository on ``topics``, with qualified source files."""
+        columns = ", ".join(f"r_{name}" for name in RULE_FIELDS)
+        out: List[RuleRecord] = []
+        self._probe_values(topics)
+        for values in self.conn.execute(
+            f"SELECT repo, {columns} FROM rules WHERE repo != ? AND topic IN (SELECT value FROM probe_values) "
+            "ORDER BY repo, rel_path, r_rule_id",
+            (repo,),
+        ):
+            count = len(RULE_RECORD_FIELDS)
+            rule = RuleRecord(
+                **dict(zip(RULE_RECORD_FIELDS, values[1 : 1 + count])),
+                coach_id=intern_coach(*values[1 + count :]),
+            )
+            rule.source_file = qualified_path(values[0], rule.source_file)
+            out.append(rule)
+        return out
+
+    def find_contradictions(
+        self,
+        repo: str,
+        rules: Sequence[RuleRecord],
+        max_pairs: int = 10_000,
+    ) -> List[ContradictionRecord]:
+        """Contradictions between ``rules`` and rules indexed for other repositories."""
+        others = self.other_rules(repo, (rule.topic for rule in rules))
+        return detect_cross_contradictions(rules, others, max_pairs=max_pairs)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="foundation_scan.cross_index",
+        description="Inspect or prune a persistent cross-repository scan index.",
+    )
+    parser.add_argument("--index", dest="index_path", required=True, help="Index file (SQLite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("repos", help="List indexed repositories with document and rule counts")
+    delete = sub.add_parser("delete", help="Delete documents of one repository")
+    delete.add_argument("--repo", required=True, help="Repository name used when it was scanned")
+    delete.add_argument(
+        "--path",
+        dest="paths",
+        action="append",
+        default=None,
+        help="Relative document path to delete (repeatable); omit to delete the whole repo",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    with CrossRepoIndex(Path(args.index_path).resolve()) as index:
+        if args.command == "repos":
+            for repo, doc_count, rule_count in index.repos():
+                print(f"{repo}\tdocs={doc_count}\trules={rule_count}")
+        else:
+            deleted = index.delete_documents(args.repo, args.paths)
+            print(f"Deleted {deleted} document(s) from {args.repo}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
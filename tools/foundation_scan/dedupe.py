@@ -2,22 +2,55 @@
 
 Implements:
 - exact duplicates by normalized text hash
-- near duplicates with shingled MinHash signatures and banding
+- near duplicates with one-permutation MinHash signatures and threshold-tuned
+  LSH banding, verified by exact Jaccard over sorted 64-bit shingle hash arrays
+- section duplicates: the same LSH pipeline over windows of consecutive
+  document chunks, with matching window runs merged into passages
 """
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import math
 import re
-from collections import defaultdict
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import combinations
-from typing import DefaultDict, Dict, Iterable, List, Sequence, Set, Tuple
+from typing import Callable, DefaultDict, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from .config import DocumentRecord, DuplicateRecord, ProgressTracker, stable_sha1_text
+from .config import (
+    ChunkRecord,
+    DocumentRecord,
+    DuplicateRecord,
+    ProgressTracker,
+    SectionDuplicateRecord,
+    deterministic_chunk_sort_key,
+    intern_coach,
+    stable_sha1_text,
+)
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 
 TOKEN_RE = re.compile(r"[a-zA-Z0-9_]+")
+# One-permutation MinHash width, and the share of pairs at exactly the
+# threshold that banding may miss; bands/rows are derived from both.
+SIGNATURE_BINS = 64
+NEAR_DUP_TARGET_FNR = 0.01
+# Section mode: windows with fewer shingles are headings/stubs, not passages; an
+# LSH bucket larger than SECTION_MAX_BUCKET (boilerplate shared by many docs) is
+# only paired within its first members; shingle arrays are rebuilt on demand
+# and at most SECTION_SHINGLE_CACHE of them are kept.
+SECTION_MIN_SHINGLES = 16
+SECTION_MAX_BUCKET = 256
+SECTION_SHINGLE_CACHE = 4_096
 
 
 def _normalize_for_hash(text: str) -> str:
@@ -45,35 +78,127 @@ def _shingles(tokens: Sequence[str], width: int = 5) -> Set[str]:
     return out
 
 
-def _jaccard(a: Set[str], b: Set[str]) -> float:
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(shingle.encode("utf-8", errors="replace"), digest_size=8).digest(),
+        "big",
+    )
+
+
+def _hashed_shingles(shingles: Iterable[str]) -> "array[int]":
+    """Return sorted, de-duplicated unsigned 64-bit shingle hashes.
+
+    One machine word per shingle instead of one joined string object; a 64-bit
+    collision between two distinct shingles is negligible at corpus scale.
+    """
+    return array("Q", sorted({_shingle_hash(item) for item in shingles}))
+
+
+def _intersection_size(a: Sequence[int], b: Sequence[int], need: int = 0) -> int:
+    """Count hashes shared by two sorted unique arrays with a linear merge.
+
+    Gives up as soon as fewer than ``need`` matches remain reachable and returns
+    the partial count, which is then below ``need``.
+    """
+    if np is not None and len(a) + len(b) >= 256:
+        return int(
+            np.intersect1d(
+                np.frombuffer(a, dtype=np.uint64),
+                np.frombuffer(b, dtype=np.uint64),
+                assume_unique=True,
+            ).size
+        )
+    len_a = len(a)
+    len_b = len(b)
+    slack_a = len_a - need
+    slack_b = len_b - need
+    i = j = shared = 0
+    while i < len_a and j < len_b:
+        x = a[i]
+        y = b[j]
+        if x == y:
+            shared += 1
+            i += 1
+            j += 1
+        elif x < y:
+            i += 1
+            if i - shared > slack_a:
+                return shared
+        else:
+            j += 1
+            if j - shared > slack_b:
+                return shared
+    return shared
+
+
+def _jaccard(a: Sequence[int], b: Sequence[int], threshold: float = 0.0) -> float:
+    """Exact Jaccard similarity of two sorted unique hash arrays.
+
+    Values at or above ``threshold`` are exact; pairs that cannot reach it may
+    return any lower value, which lets the merge stop early.
+    """
     if not a and not b:
         return 1.0
     if not a or not b:
         return 0.0
-    inter = len(a & b)
-    union = len(a | b)
+    total = len(a) + len(b)
+    if min(len(a), len(b)) < threshold * max(len(a), len(b)):
+        # |A & B| <= min and |A | B| >= max, so the pair cannot reach threshold.
+        return min(len(a), len(b)) / max(len(a), len(b))
+    need = max(0, math.ceil(threshold * total / (1.0 + threshold) - 1e-9))
+    inter = _intersection_size(a, b, need)
+    union = total - inter
     if union <= 0:
         return 0.0
     return inter / union
 
 
-def _minhash_signature(shingles: Set[str], permutations: int = 48) -> Tuple[int, ...]:
-    """Produce deterministic pseudo-minhash signature with salted sha1 hashes."""
-    if not shingles:
-        return tuple([0] * permutations)
-    sig: List[int] = []
-    sorted_shingles = sorted(shingles)
-    for idx in range(permutations):
-        salt = f"perm:{idx}:"
-        current_min = None
-        for token in sorted_shingles:
-            digest = stable_sha1_text(salt + token)
-            # keep first 8 hex chars to reduce memory.
-            value = int(digest[:8], 16)
-            if current_min is None or value < current_min:
-                current_min = value
-        sig.append(current_min if current_min is not None else 0)
-    return tuple(sig)
+def _one_permutation_signature(hashes: Sequence[int], bins: int = SIGNATURE_BINS) -> Tuple[int, ...]:
+    """One-permutation MinHash over a sorted hash array, with rotation densification.
+
+    The 64-bit hash space is cut into ``bins`` equal ranges; because ``hashes`` is
+    sorted, each bin's minimum is simply its first element, found by bisection.
+    An empty bin borrows the value of the next non-empty bin to its right
+    (circularly), tagged with the distance so borrowed and native values differ.
+    """
+    if not hashes:
+        return tuple([0] * bins)
+    mins: List[Optional[int]] = []
+    for index in range(bins):
+        lower = -(-(index << 64) // bins)
+        upper = -(-((index + 1) << 64) // bins)
+        pos = bisect_left(hashes, lower)
+        mins.append(hashes[pos] if pos < len(hashes) and hashes[pos] < upper else None)
+    signature: List[int] = []
+    for index in range(bins):
+        distance = 0
+        value = mins[index]
+        while value is None:
+            distance += 1
+            value = mins[(index + distance) % bins]
+        signature.append(value | (distance << 64))
+    return tuple(signature)
+
+
+def _lsh_params(
+    threshold: float,
+    bins: int = SIGNATURE_BINS,
+    target_fnr: float = NEAR_DUP_TARGET_FNR,
+) -> Tuple[int, int]:
+    """Pick (bands, rows_per_band) for a similarity threshold.
+
+    A pair with similarity ``s`` is missed with probability ``(1 - s**r) ** b``.
+    Take the widest band (fewest false-positive candidates) whose miss rate at
+    the threshold stays within ``target_fnr``; fall back to one row per band.
+    """
+    best = (bins, 1)
+    for rows in range(1, bins + 1):
+        bands = bins // rows
+        if bands < 1:
+            break
+        if (1.0 - threshold ** rows) ** bands <= target_fnr:
+            best = (bands, rows)
+    return best
 
 
 def _band_signature(
@@ -94,7 +219,7 @@ def _band_signature(
     return out
 
 
-def _coach_duplicate_fields(kind: str, similarity: float) -> Tuple[str, str, str, str, str, str]:
+def _coach_duplicate_fields(kind: str, similarity: float) -> Tuple[str, str, int]:
     if kind == "exact":
         severity = "ERROR"
         what = "Detected exact duplicate documents with identical normalized text hash."
@@ -120,15 +245,34 @@ def _coach_duplicate_fields(kind: str, similarity: float) -> Tuple[str, str, str
     bad = "Bad: duplicate rule docs evolve independently with conflicting edits."
     good = "Good: one canonical rule doc; secondary docs reference it."
     action = "Consolidate duplicates and mark a single owner for the canonical file."
-    return severity, what, why, fix, bad, good, action
+    return severity, what, intern_coach(why, fix, bad, good, action)
+
+
+def _normalized_text_hash(text: str) -> str:
+    return stable_sha1_text(_normalize_for_hash(text))
+
+
+def _exact_duplicate_row(path_a: str, path_b: str, norm_hash: str, doc_a: str, doc_b: str) -> DuplicateRecord:
+    pair_seed = f"exact|{path_a}|{path_b}|{norm_hash}"
+    duplicate_id = f"DUP-{stable_sha1_text(pair_seed)[:12]}"
+    severity, what, coach_id = _coach_duplicate_fields("exact", 1.0)
+    return DuplicateRecord(
+        duplicate_id=duplicate_id,
+        duplicate_type="exact",
+        similarity=1.0,
+        doc_a=doc_a,
+        doc_b=doc_b,
+        check_id=f"DUP-EXACT-{norm_hash[:8].upper()}",
+        severity=severity,
+        what_detected=what,
+        coach_id=coach_id,
+    )
 
 
 def detect_exact_duplicates(docs: Sequence[DocumentRecord]) -> List[DuplicateRecord]:
     hash_buckets: DefaultDict[str, List[DocumentRecord]] = defaultdict(list)
     for doc in docs:
-        normalized = _normalize_for_hash(doc.text)
-        text_hash = stable_sha1_text(normalized)
-        hash_buckets[text_hash].append(doc)
+        hash_buckets[_normalized_text_hash(doc.text)].append(doc)
 
     rows: List[DuplicateRecord] = []
     for norm_hash, bucket in sorted(hash_buckets.items(), key=lambda item: item[0]):
@@ -136,26 +280,13 @@ def detect_exact_duplicates(docs: Sequence[DocumentRecord]) -> List[DuplicateRec
             continue
         bucket = sorted(bucket, key=lambda d: d.rel_path.lower())
         for a, b in combinations(bucket, 2):
-            pair_seed = f"exact|{a.rel_path}|{b.rel_path}|{norm_hash}"
-            duplicate_id = f"DUP-{stable_sha1_text(pair_seed)[:12]}"
-            severity, what, why, fix, bad, good, action = _coach_duplicate_fields(
-                "exact", 1.0
-            )
             rows.append(
-                DuplicateRecord(
-                    duplicate_id=duplicate_id,
-                    duplicate_type="exact",
-                    similarity=1.0,
+                _exact_duplicate_row(
+                    a.rel_path,
+                    b.rel_path,
+                    norm_hash,
                     doc_a=min(a.rel_path, b.rel_path),
                     doc_b=max(a.rel_path, b.rel_path),
-                    check_id=f"DUP-EXACT-{norm_hash[:8].upper()}",
-                    severity=severity,
-                    what_detected=what,
-                    why_it_matters=why,
-                    how_to_fix=fix,
-                    minimal_bad_example=bad,
-                    minimal_good_example=good,
-                    next_best_action=action,
                 )
             )
     rows.sort(
@@ -173,8 +304,107 @@ def detect_exact_duplicates(docs: Sequence[DocumentRecord]) -> List[DuplicateRec
 @dataclass
 class _DocNearDupState:
     doc: DocumentRecord
-    shingles: Set[str]
-    signature: Tuple[int, ...]
+    shingles: "array[int]"
+
+
+def _near_duplicate_row(doc_a: str, doc_b: str, similarity: float) -> DuplicateRecord:
+    pair_seed = f"near|{doc_a}|{doc_b}|{similarity:0.6f}"
+    duplicate_id = f"DUP-{stable_sha1_text(pair_seed)[:12]}"
+    severity, what, coach_id = _coach_duplicate_fields("near", similarity)
+    return DuplicateRecord(
+        duplicate_id=duplicate_id,
+        duplicate_type="near",
+        similarity=round(similarity, 6),
+        doc_a=doc_a,
+        doc_b=doc_b,
+        check_id=f"DUP-NEAR-{stable_sha1_text(doc_a + '|' + doc_b)[:8].upper()}",
+        severity=severity,
+        what_detected=what,
+        coach_id=coach_id,
+    )
+
+
+def _band_keys(signature: Sequence[int], bands: int, rows_per_band: int) -> List[int]:
+    # Signed 64-bit digests of each band, stable across processes and Python
+    # builds so they can be persisted; a rare collision only adds a candidate
+    # that gets verified.
+    keys: List[int] = []
+    for band_index, values in _band_signature(signature, bands, rows_per_band):
+        payload = band_index.to_bytes(2, "big") + b"".join(value.to_bytes(9, "big") for value in values)
+        keys.append(int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+def _iter_band_pairs(
+    band_keys: "array[int]",
+    bands: int,
+    band_index: int,
+    max_bucket: int = 0,
+) -> Iterator[Tuple[int, int]]:
+    """Yield pairs whose *first* colliding band is ``band_index``.
+
+    ``band_keys`` is flat, ``bands`` keys per item. Items are grouped by sorting
+    one band's keys, and a pair seen in an earlier band is skipped by comparing
+    those keys, so no bucket dict or global candidate set is ever held.
+    ``max_bucket`` (0 = unbounded) caps how many members of one bucket are paired.
+    """
+    keys = band_keys[band_index::bands]
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while end < len(order) and keys[order[end]] == keys[order[start]]:
+            end += 1
+        members = order[start:end]
+        if max_bucket:
+            members = sorted(members)[:max_bucket]
+        for a_pos in range(len(members)):
+            a_base = members[a_pos] * bands
+            for b_pos in range(a_pos + 1, len(members)):
+                b_base = members[b_pos] * bands
+                if any(band_keys[a_base + earlier] == band_keys[b_base + earlier] for earlier in range(band_index)):
+                    continue
+                yield members[a_pos], members[b_pos]
+        start = end
+
+
+def _top_similar_pairs(
+    band_keys: "array[int]",
+    bands: int,
+    load: Callable[[int], Sequence[int]],
+    threshold: float,
+    max_pairs: int,
+    skip: Optional[Callable[[int, int], bool]] = None,
+    max_bucket: int = 0,
+    progress: Optional[ProgressTracker] = None,
+) -> List[Tuple[float, int, int]]:
+    """Verify LSH candidates by exact Jaccard and keep the best ``max_pairs``.
+
+    ``load`` returns an item's sorted shingle hash array; returned tuples are
+    ``(similarity, -a_idx, -b_idx)`` with ``a_idx < b_idx``.
+    """
+    # Min-heap of the best max_pairs hits; the root is the weakest kept pair
+    # (lowest similarity, then latest item order), so ties favour earlier items.
+    heap: List[Tuple[float, int, int]] = []
+    limit = max(1, max_pairs)
+    for band_index in range(bands):
+        for a_idx, b_idx in _iter_band_pairs(band_keys, bands, band_index, max_bucket):
+            if skip is not None and skip(a_idx, b_idx):
+                continue
+            bar = threshold if len(heap) < limit else max(threshold, heap[0][0])
+            similarity = _jaccard(load(a_idx), load(b_idx), bar)
+            if similarity < threshold:
+                continue
+            item = (similarity, -a_idx, -b_idx)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        if progress is not None:
+            progress.update()
+    if progress is not None:
+        progress.finish()
+    return heap
 
 
 def detect_near_duplicates(
@@ -183,9 +413,15 @@ def detect_near_duplicates(
     max_pairs: int = 8_000,
     max_docs: int = 20_000,
     progress_enabled: bool = True,
+    target_fnr: float = NEAR_DUP_TARGET_FNR,
 ) -> List[DuplicateRecord]:
-    """Detect near duplicates with bounded candidate generation."""
+    """Detect near duplicates with threshold-tuned LSH and a top-K result heap.
+
+    Every candidate pair is verified; ``max_pairs`` bounds the output to the most
+    similar pairs rather than the first ones found.
+    """
     docs_sorted = sorted(docs, key=lambda d: d.rel_path.lower())[:max_docs]
+    bands, rows_per_band = _lsh_params(threshold, SIGNATURE_BINS, target_fnr)
     progress = ProgressTracker(
         title="near-dup-signature",
         total=max(1, len(docs_sorted)),
@@ -193,91 +429,273 @@ def detect_near_duplicates(
     )
 
     states: List[_DocNearDupState] = []
+    band_keys: "array[int]" = array("q")
     for doc in docs_sorted:
-        tokens = _doc_tokens(doc)
-        shingles = _shingles(tokens, width=5)
-        signature = _minhash_signature(shingles, permutations=48)
-        states.append(_DocNearDupState(doc=doc, shingles=shingles, signature=signature))
+        hashes = _hashed_shingles(_shingles(_doc_tokens(doc), width=5))
+        signature = _one_permutation_signature(hashes, SIGNATURE_BINS)
+        states.append(_DocNearDupState(doc=doc, shingles=hashes))
+        band_keys.extend(_band_keys(signature, bands, rows_per_band))
         progress.update()
     progress.finish()
 
-    bucket_map: DefaultDict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
-    for idx, state in enumerate(states):
-        for band in _band_signature(state.signature, bands=12, rows_per_band=4):
-            bucket_map[band].append(idx)
+    heap = _top_similar_pairs(
+        band_keys,
+        bands,
+        load=lambda idx: states[idx].shingles,
+        threshold=threshold,
+        max_pairs=max_pairs,
+        progress=ProgressTracker(title="near-dup-jaccard", total=bands, enabled=progress_enabled),
+    )
+
+    rows: List[DuplicateRecord] = []
+    for similarity, neg_a, neg_b in heap:
+        path_a = states[-neg_a].doc.rel_path
+        path_b = states[-neg_b].doc.rel_path
+        rows.append(_near_duplicate_row(min(path_a, path_b), max(path_a, path_b), similarity))
 
-    candidate_pairs: Set[Tuple[int, int]] = set()
-    for _, idxs in sorted(bucket_map.items(), key=lambda item: (item[0][0], item[0][1])):
-        if len(idxs) < 2:
+    rows.sort(
+        key=lambda row: (
+            row.duplicate_type,
+            -row.similarity,
+            row.doc_a.lower(),
+            row.doc_b.lower(),
+            row.duplicate_id,
+        )
+    )
+    return rows
+
+
+@dataclass
+class _SectionWindow:
+    """Two consecutive chunks of one document (one chunk for single-chunk docs)."""
+
+    first: ChunkRecord
+    last: ChunkRecord
+    position: int
+
+
+@dataclass
+class _SectionRun:
+    first_a: _SectionWindow
+    first_b: _SectionWindow
+    last_a: _SectionWindow
+    last_b: _SectionWindow
+    window_pairs: int = 0
+    similarity: float = 1.0
+
+
+def _section_windows(chunks: Sequence[ChunkRecord]) -> List[_SectionWindow]:
+    by_doc: DefaultDict[str, List[ChunkRecord]] = defaultdict(list)
+    for chunk in sorted(chunks, key=deterministic_chunk_sort_key):
+        by_doc[chunk.doc_rel_path].append(chunk)
+    windows: List[_SectionWindow] = []
+    for doc_chunks in by_doc.values():
+        pairs = zip(doc_chunks, doc_chunks[1:]) if len(doc_chunks) > 1 else [(doc_chunks[0], doc_chunks[0])]
+        for position, (first, last) in enumerate(pairs):
+            windows.append(_SectionWindow(first=first, last=last, position=position))
+    return windows
+
+
+def _chunk_shingles(chunk: ChunkRecord) -> "array[int]":
+    return _hashed_shingles(_shingles(_tokenize(chunk.text), width=5))
+
+
+def _window_shingles(
+    window: _SectionWindow,
+    first: Optional["array[int]"] = None,
+    last: Optional["array[int]"] = None,
+) -> "array[int]":
+    # Union of the two chunks' arrays; callers pass arrays they already hold so
+    # each chunk is hashed once while walking a document.
+    first = _chunk_shingles(window.first) if first is None else first
+    if window.last is not window.first:
+        last = _chunk_shingles(window.last) if last is None else last
+        first = array("Q", sorted(set(first).union(last)))
+    if len(first) < SECTION_MIN_SHINGLES:
+        return array("Q")
+    return first
+
+
+def _merge_overlapping_runs(runs: Sequence[_SectionRun]) -> List[_SectionRun]:
+    # A misaligned paste can match on two neighbouring diagonals; runs whose
+    # spans overlap in both documents describe the same passage.
+    merged: List[_SectionRun] = []
+    for run in sorted(runs, key=lambda item: (item.first_a.position, item.first_b.position)):
+        previous = merged[-1] if merged else None
+        if (
+            previous is not None
+            and run.first_a.first.offset_start < previous.last_a.last.offset_end
+            and run.first_b.first.offset_start < previous.last_b.last.offset_end
+            and previous.first_b.first.offset_start < run.last_b.last.offset_end
+        ):
+            if run.last_a.last.offset_end > previous.last_a.last.offset_end:
+                previous.last_a = run.last_a
+            if run.first_b.first.offset_start < previous.first_b.first.offset_start:
+                previous.first_b = run.first_b
+            if run.last_b.last.offset_end > previous.last_b.last.offset_end:
+                previous.last_b = run.last_b
+            previous.window_pairs += run.window_pairs
+            previous.similarity = min(previous.similarity, run.similarity)
             continue
-        sorted_idxs = sorted(idxs)
-        for a_pos in range(len(sorted_idxs)):
-            a = sorted_idxs[a_pos]
-            for b_pos in range(a_pos + 1, len(sorted_idxs)):
-                b = sorted_idxs[b_pos]
-                pair = (a, b)
-                if pair in candidate_pairs:
-                    continue
-                candidate_pairs.add(pair)
-                if len(candidate_pairs) >= max_pairs * 8:
-                    break
-            if len(candidate_pairs) >= max_pairs * 8:
-                break
-        if len(candidate_pairs) >= max_pairs * 8:
-            break
+        merged.append(run)
+    return merged
+
+
+@lru_cache(maxsize=None)
+def _section_coach_id() -> int:
+    return intern_coach(
+        why_it_matters=(
+            "Sections pasted into otherwise different documents are edited in one "
+            "place and silently go stale in the other."
+        ),
+        how_to_fix=(
+            "Keep the section in one canonical document and replace the copy with "
+            "a link to it."
+        ),
+        minimal_bad_example="Bad: the same rollback procedure pasted into two runbooks.",
+        minimal_good_example="Good: one runbook owns the procedure; the other links to it.",
+        next_best_action="Pick the canonical copy of the passage and link to it from the other doc.",
+    )
+
+
+def _section_duplicate_row(run: _SectionRun) -> SectionDuplicateRecord:
+    doc_a = run.first_a.first.doc_rel_path
+    doc_b = run.first_b.first.doc_rel_path
+    a_start = run.first_a.first.offset_start
+    a_end = run.last_a.last.offset_end
+    b_start = run.first_b.first.offset_start
+    b_end = run.last_b.last.offset_end
+    similarity = run.similarity
+    span_seed = f"section|{doc_a}|{a_start}|{a_end}|{doc_b}|{b_start}|{b_end}"
+    return SectionDuplicateRecord(
+        section_duplicate_id=f"SDUP-{stable_sha1_text(span_seed)[:12]}",
+        similarity=round(similarity, 6),
+        doc_a=doc_a,
+        a_offset_start=a_start,
+        a_offset_end=a_end,
+        doc_b=doc_b,
+        b_offset_start=b_start,
+        b_offset_end=b_end,
+        window_pairs=run.window_pairs,
+        check_id=f"DUP-SECTION-{stable_sha1_text(doc_a + '|' + doc_b)[:8].upper()}",
+        severity="WARN",
+        what_detected=(
+            f"Detected a copied section ({a_end - a_start} chars in doc_a, "
+            f"{b_end - b_start} in doc_b) with similarity={similarity:0.3f}."
+        ),
+        coach_id=_section_coach_id(),
+    )
 
-    pair_progress = ProgressTracker(
-        title="near-dup-jaccard",
-        total=max(1, min(len(candidate_pairs), max_pairs * 8)),
+
+def detect_section_duplicates(
+    chunks: Sequence[ChunkRecord],
+    threshold: float = 0.5,
+    max_pairs: int = 20_000,
+    skip_doc_pairs: Iterable[Tuple[str, str]] = (),
+    progress_enabled: bool = True,
+    target_fnr: float = NEAR_DUP_TARGET_FNR,
+) -> List[SectionDuplicateRecord]:
+    """Detect passages shared between different documents at chunk granularity.
+
+    The unit is a window of two consecutive chunks: chunk grids of two documents
+    rarely line up with a pasted passage, and the wider window keeps the Jaccard
+    of a long copy above ~0.6 at any misalignment (a single chunk can fall to
+    ~0.4). Windows get the same MinHash/LSH treatment as whole documents; only
+    band keys are kept per window, and shingle arrays are rebuilt on demand
+    through a bounded cache so memory stays flat at millions of chunks.
+    Matching window pairs that continue each other in both documents are merged
+    into one passage whose similarity is that of its weakest window pair. Pairs
+    within one document and document pairs in ``skip_doc_pairs`` are skipped.
+    """
+    all_windows = _section_windows(chunks)
+    bands, rows_per_band = _lsh_params(threshold, SIGNATURE_BINS, target_fnr)
+    progress = ProgressTracker(
+        title="section-dup-signature",
+        total=max(1, len(all_windows)),
         enabled=progress_enabled,
     )
+    windows: List[_SectionWindow] = []
+    band_keys: "array[int]" = array("q")
+    held: Tuple[Optional[ChunkRecord], "array[int]"] = (None, array("Q"))
+    for window in all_windows:
+        last = _chunk_shingles(window.last)
+        first = held[1] if held[0] is window.first else (last if window.first is window.last else None)
+        hashes = _window_shingles(window, first, last)
+        held = (window.last, last)
+        if hashes:
+            windows.append(window)
+            band_keys.extend(_band_keys(_one_permutation_signature(hashes, SIGNATURE_BINS), bands, rows_per_band))
+        progress.update()
+    progress.finish()
 
-    rows: List[DuplicateRecord] = []
-    evaluated = 0
-    for pair in sorted(candidate_pairs):
-        if len(rows) >= max_pairs:
-            break
-        a_idx, b_idx = pair
-        state_a = states[a_idx]
-        state_b = states[b_idx]
-        similarity = _jaccard(state_a.shingles, state_b.shingles)
-        evaluated += 1
-        pair_progress.update()
-        if similarity < threshold:
-            continue
-        doc_a = min(state_a.doc.rel_path, state_b.doc.rel_path)
-        doc_b = max(state_a.doc.rel_path, state_b.doc.rel_path)
-        pair_seed = f"near|{doc_a}|{doc_b}|{similarity:0.6f}"
-        duplicate_id = f"DUP-{stable_sha1_text(pair_seed)[:12]}"
-        severity, what, why, fix, bad, good, action = _coach_duplicate_fields(
-            "near", similarity
-        )
-        rows.append(
-            DuplicateRecord(
-                duplicate_id=duplicate_id,
-                duplicate_type="near",
-                similarity=round(similarity, 6),
-                doc_a=doc_a,
-                doc_b=doc_b,
-                check_id=f"DUP-NEAR-{stable_sha1_text(doc_a + '|' + doc_b)[:8].upper()}",
-                severity=severity,
-                what_detected=what,
-                why_it_matters=why,
-                how_to_fix=fix,
-                minimal_bad_example=bad,
-                minimal_good_example=good,
-                next_best_action=action,
-            )
+    cache: "OrderedDict[int, array[int]]" = OrderedDict()
+
+    def _load(idx: int) -> "array[int]":
+        hashes = cache.get(idx)
+        if hashes is None:
+            hashes = _window_shingles(windows[idx])
+            cache[idx] = hashes
+            if len(cache) > SECTION_SHINGLE_CACHE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(idx)
+        return hashes
+
+    skipped = {(min(a, b), max(a, b)) for a, b in skip_doc_pairs}
+
+    def _skip(a_idx: int, b_idx: int) -> bool:
+        doc_a = windows[a_idx].first.doc_rel_path
+        doc_b = windows[b_idx].first.doc_rel_path
+        return doc_a == doc_b or (min(doc_a, doc_b), max(doc_a, doc_b)) in skipped
+
+    heap = _top_similar_pairs(
+        band_keys,
+        bands,
+        load=_load,
+        threshold=threshold,
+        max_pairs=max_pairs,
+        skip=_skip,
+        max_bucket=SECTION_MAX_BUCKET,
+        progress=ProgressTracker(title="section-dup-jaccard", total=bands, enabled=progress_enabled),
+    )
+
+    # Orient every match as (doc_a < doc_b) and group by document pair.
+    by_doc_pair: DefaultDict[Tuple[str, str], List[Tuple[_SectionWindow, _SectionWindow, float]]] = defaultdict(list)
+    for similarity, neg_a, neg_b in heap:
+        window_a = windows[-neg_a]
+        window_b = windows[-neg_b]
+        if window_b.first.doc_rel_path < window_a.first.doc_rel_path:
+            window_a, window_b = window_b, window_a
+        by_doc_pair[(window_a.first.doc_rel_path, window_b.first.doc_rel_path)].append(
+            (window_a, window_b, similarity)
         )
-    pair_progress.finish()
+
+    rows: List[SectionDuplicateRecord] = []
+    for matches in by_doc_pair.values():
+        matches.sort(key=lambda item: (item[0].position, item[1].position))
+        # Runs keyed by the (a, b) window positions that would extend them diagonally.
+        open_runs: Dict[Tuple[int, int], _SectionRun] = {}
+        runs: List[_SectionRun] = []
+        for window_a, window_b, similarity in matches:
+            run = open_runs.pop((window_a.position, window_b.position), None)
+            if run is None:
+                run = _SectionRun(first_a=window_a, first_b=window_b, last_a=window_a, last_b=window_b)
+                runs.append(run)
+            run.last_a = window_a
+            run.last_b = window_b
+            run.window_pairs += 1
+            run.similarity = min(run.similarity, similarity)
+            open_runs[(window_a.position + 1, window_b.position + 1)] = run
+        rows.extend(_section_duplicate_row(run) for run in _merge_overlapping_runs(runs))
 
     rows.sort(
         key=lambda row: (
-            row.duplicate_type,
             -row.similarity,
             row.doc_a.lower(),
             row.doc_b.lower(),
-            row.duplicate_id,
+            row.a_offset_start,
+            row.b_offset_start,
+            row.section_duplicate_id,
         )
     )
     return rows
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+import os
 import re
+from bisect import bisect_left, bisect_right
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Set, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from .config import ChunkRecord, RuleRecord, stable_sha1_text
+from .config import ChunkRecord, RuleRecord, intern_coach, stable_sha1_text
+from .markers import marker_hits
 
 
 SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
 MULTISPACE_RE = re.compile(r"\s+")
 TOKEN_RE = re.compile(r"[a-zA-Z0-9_]+")
+# Below this much text, worker start-up costs more than it saves.
+PARALLEL_MIN_CHARS = 1_000_000
 
 
 MANDATORY_MARKERS: Tuple[str, ...] = (
@@ -74,6 +81,33 @@ TOPIC_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
 )
 
 
+EXPLICIT_RULE_TAGS: Tuple[str, ...] = (
+    "rule:",
+    "policy:",
+    "forbidden:",
+    "allowed:",
+    "must:",
+    "should:",
+    "prohibido",
+    "obligatorio",
+    "no negociable",
+)
+
+# Every phrase the classifiers above look for; matched in one pass by markers.py.
+ALL_RULE_MARKERS: Tuple[str, ...] = tuple(
+    sorted(
+        set(MANDATORY_MARKERS)
+        | set(SOFT_MARKERS)
+        | set(NEGATIVE_MARKERS)
+        | set(BLOCKER_MARKERS)
+        | set(ERROR_MARKERS)
+        | set(WARN_MARKERS)
+        | set(EXPLICIT_RULE_TAGS)
+        | {key for _, keys in TOPIC_KEYWORDS for key in keys}
+    )
+)
+
+
 @dataclass(frozen=True)
 class RuleHeuristic:
     severity: str
@@ -85,72 +119,48 @@ def _normalize_text(text: str) -> str:
     return MULTISPACE_RE.sub(" ", text.strip())
 
 
-def _iter_sentences(text: str) -> Iterable[str]:
-    for sentence in SENTENCE_SPLIT_RE.split(text):
-        cleaned = _normalize_text(sentence)
-        if not cleaned:
-            continue
-        yield cleaned
-
-
-def _contains_any(text: str, markers: Sequence[str]) -> bool:
-    lowered = text.lower()
-    return any(marker in lowered for marker in markers)
-
-
-def _infer_severity(sentence: str) -> str:
-    lowered = sentence.lower()
-    if any(marker in lowered for marker in BLOCKER_MARKERS):
+def _infer_severity(sentence: str, hits: Optional[FrozenSet[str]] = None) -> str:
+    hits = marker_hits(sentence) if hits is None else hits
+    if not hits.isdisjoint(BLOCKER_MARKERS):
         return "BLOCKER"
-    if any(marker in lowered for marker in ERROR_MARKERS):
+    if not hits.isdisjoint(ERROR_MARKERS):
         return "ERROR"
-    if any(marker in lowered for marker in WARN_MARKERS):
+    if not hits.isdisjoint(WARN_MARKERS):
         return "WARN"
     return "INFO"
 
 
-def _infer_polarity(sentence: str) -> str:
-    lowered = sentence.lower()
-    if any(marker in lowered for marker in NEGATIVE_MARKERS):
+def _infer_polarity(sentence: str, hits: Optional[FrozenSet[str]] = None) -> str:
+    hits = marker_hits(sentence) if hits is None else hits
+    if not hits.isdisjoint(NEGATIVE_MARKERS):
         return "NEG"
-    if any(marker in lowered for marker in MANDATORY_MARKERS):
+    if not hits.isdisjoint(MANDATORY_MARKERS):
         return "POS"
-    if any(marker in lowered for marker in SOFT_MARKERS):
+    if not hits.isdisjoint(SOFT_MARKERS):
         return "POS"
     return "NEU"
 
 
-def _infer_topic(sentence: str) -> str:
-    lowered = sentence.lower()
+def _infer_topic(sentence: str, hits: Optional[FrozenSet[str]] = None) -> str:
+    hits = marker_hits(sentence) if hits is None else hits
     for topic, keys in TOPIC_KEYWORDS:
-        if any(key in lowered for key in keys):
+        if not hits.isdisjoint(keys):
             return topic
     return "general"
 
 
-def _is_rule_candidate(sentence: str) -> bool:
-    lowered = sentence.lower()
-    if len(lowered) < 18:
+def _is_rule_candidate(sentence: str, hits: Optional[FrozenSet[str]] = None) -> bool:
+    if len(sentence.lower()) < 18:
         return False
+    hits = marker_hits(sentence) if hits is None else hits
     has_rule_language = (
-        _contains_any(lowered, MANDATORY_MARKERS)
-        or _contains_any(lowered, SOFT_MARKERS)
-        or _contains_any(lowered, NEGATIVE_MARKERS)
+        not hits.isdisjoint(MANDATORY_MARKERS)
+        or not hits.isdisjoint(SOFT_MARKERS)
+        or not hits.isdisjoint(NEGATIVE_MARKERS)
     )
     if has_rule_language:
         return True
-    explicit_tags = (
-        "rule:",
-        "policy:",
-        "forbidden:",
-        "allowed:",
-        "must:",
-        "should:",
-        "prohibido",
-        "obligatorio",
-        "no negociable",
-    )
-    return any(tag in lowered for tag in explicit_tags)
+    return not hits.isdisjoint(EXPLICIT_RULE_TAGS)
 
 
 def _tokenize(text: str) -> List[str]:
@@ -266,6 +276,18 @@ def _next_best_action(topic: str) -> str:
     return mapping.get(topic, "Convert this statement into one canonical rule row.")
 
 
+@lru_cache(maxsize=None)
+def _rule_coach_id(topic: str, severity: str, polarity: str) -> int:
+    bad_example, good_example = _coach_examples(topic)
+    return intern_coach(
+        why_it_matters=_coach_why(topic, severity),
+        how_to_fix=_coach_fix(topic, polarity),
+        minimal_bad_example=bad_example,
+        minimal_good_example=good_example,
+        next_best_action=_next_best_action(topic),
+    )
+
+
 def _dedupe_candidate_rules(records: List[RuleRecord]) -> List[RuleRecord]:
     seen: Set[str] = set()
     out: List[RuleRecord] = []
@@ -280,44 +302,106 @@ def _dedupe_candidate_rules(records: List[RuleRecord]) -> List[RuleRecord]:
     return out
 
 
-def extract_living_rules(chunks: Sequence[ChunkRecord]) -> List[RuleRecord]:
-    """Extract rule-like sentences from chunked docs with coach contract fields."""
+def _document_text(doc_chunks: Sequence[ChunkRecord]) -> str:
+    # Chunks are exact slices of the document text; stitch the non-overlapping parts.
+    parts: List[str] = []
+    covered = 0
+    for chunk in doc_chunks:
+        if chunk.offset_end > covered:
+            parts.append(chunk.text[max(0, covered - chunk.offset_start) :])
+            covered = chunk.offset_end
+    return "".join(parts)
+
+
+def _iter_sentence_spans(text: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield ``(start offset, end offset, normalized sentence)`` for each sentence in ``text``."""
+    start = 0
+    bounds = [(match.start(), match.end()) for match in SENTENCE_SPLIT_RE.finditer(text)]
+    bounds.append((len(text), len(text)))
+    for end, next_start in bounds:
+        raw = text[start:end]
+        cleaned = _normalize_text(raw)
+        if cleaned:
+            yield start + len(raw) - len(raw.lstrip()), start + len(raw.rstrip()), cleaned
+        start = next_start
+
+
+def _rule_record(chunk: ChunkRecord, sentence: str, hits: FrozenSet[str]) -> RuleRecord:
+    severity = _infer_severity(sentence, hits)
+    polarity = _infer_polarity(sentence, hits)
+    topic = _infer_topic(sentence, hits)
+    statement = _normalize_text(sentence)
+    rule_seed = f"{chunk.doc_rel_path}|{chunk.chunk_id}|{statement}"
+    rule_id = f"R-{stable_sha1_text(rule_seed)[:12]}"
+    check_id = _build_check_id(topic, severity, statement)
+    return RuleRecord(
+        rule_id=rule_id,
+        source_file=chunk.doc_rel_path,
+        chunk_id=chunk.chunk_id,
+        severity=severity,
+        polarity=polarity,
+        topic=topic,
+        statement=statement,
+        evidence_snippet=_compact_snippet(sentence),
+        check_id=check_id,
+        what_detected=f"Detected a {severity.lower()} rule candidate in documentation text.",
+        coach_id=_rule_coach_id(topic, severity, polarity),
+    )
+
+
+def _extract_document_rules(doc_chunks: Sequence[ChunkRecord]) -> List[RuleRecord]:
+    """Segment one document once and attribute each sentence to its owning chunk.
+
+    The owner is the first chunk that fully contains the sentence, which is the
+    chunk a per-chunk scan found it in first, so ``rule_id`` stays stable. A
+    sentence cut by a chunk edge belongs to the last chunk starting at or before it.
+    """
+    doc_chunks = sorted(doc_chunks, key=lambda chunk: chunk.chunk_index)
+    starts = [chunk.offset_start for chunk in doc_chunks]
+    ends = [chunk.offset_end for chunk in doc_chunks]
     rows: List[RuleRecord] = []
+    for offset, offset_end, sentence in _iter_sentence_spans(_document_text(doc_chunks)):
+        hits = marker_hits(sentence)
+        if not _is_rule_candidate(sentence, hits):
+            continue
+        index = bisect_left(ends, offset_end)
+        if index >= len(doc_chunks) or doc_chunks[index].offset_start > offset:
+            index = max(0, bisect_right(starts, offset) - 1)
+        rows.append(_rule_record(doc_chunks[index], sentence, hits))
+    return _dedupe_candidate_rules(rows)
+
+
+def _resolve_workers(workers: int, doc_count: int, total_chars: int) -> int:
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if total_chars < PARALLEL_MIN_CHARS:
+        return 1
+    return max(1, min(workers, doc_count))
+
+
+def extract_living_rules(chunks: Sequence[ChunkRecord], workers: int = 1) -> List[RuleRecord]:
+    """Extract rule-like sentences from chunked docs with coach contract fields.
+
+    Sentences are segmented once per document (chunk overlaps are not scanned
+    twice and chunk edges do not cut sentences). Documents are processed in
+    ``workers`` processes (0 = CPU count); small corpora stay in-process.
+    """
+    by_doc: Dict[str, List[ChunkRecord]] = {}
     for chunk in chunks:
-        for sentence in _iter_sentences(chunk.text):
-            if not _is_rule_candidate(sentence):
-                continue
-            severity = _infer_severity(sentence)
-            polarity = _infer_polarity(sentence)
-            topic = _infer_topic(sentence)
-            statement = _normalize_text(sentence)
-            rule_seed = f"{chunk.doc_rel_path}|{chunk.chunk_id}|{statement}"
-            rule_id = f"R-{stable_sha1_text(rule_seed)[:12]}"
-            check_id = _build_check_id(topic, severity, statement)
-            bad_example, good_example = _coach_examples(topic)
-
-            rows.append(
-                RuleRecord(
-                    rule_id=rule_id,
-                    source_file=chunk.doc_rel_path,
-                    chunk_id=chunk.chunk_id,
-                    severity=severity,
-                    polarity=polarity,
-                    topic=topic,
-                    statement=statement,
-                    evidence_snippet=_compact_snippet(sentence),
-                    check_id=check_id,
-                    what_detected=f"Detected a {severity.lower()} rule candidate in documentation text.",
-                    why_it_matters=_coach_why(topic, severity),
-                    how_to_fix=_coach_fix(topic, polarity),
-                    minimal_bad_example=bad_example,
-                    minimal_good_example=good_example,
-                    next_best_action=_next_best_action(topic),
-                )
-            )
-
-    deduped = _dedupe_candidate_rules(rows)
-    deduped.sort(
+        by_doc.setdefault(chunk.doc_rel_path, []).append(chunk)
+    groups = [by_doc[path] for path in sorted(by_doc)]
+    pool_size = _resolve_workers(workers, len(groups), sum(len(chunk.text) for chunk in chunks))
+
+    rows: List[RuleRecord] = []
+    if pool_size > 1:
+        with ProcessPoolExecutor(max_workers=pool_size) as pool:
+            for doc_rows in pool.map(_extract_document_rules, groups, chunksize=max(1, len(groups) // (pool_size * 4))):
+                rows.extend(doc_rows)
+    else:
+        for group in groups:
+            rows.extend(_extract_document_rules(group))
+
+    rows.sort(
         key=lambda row: (
             {"BLOCKER": 0, "ERROR": 1, "WARN": 2, "INFO": 3}.get(row.severity, 9),
             row.topic,
@@ -325,7 +409,7 @@ def extract_living_rules(chunks: Sequence[ChunkRecord]) -> List[RuleRecord]:
             row.rule_id,
         )
     )
-    return deduped
+    return rows
 
 
 def summarize_rule_topics(rules: Sequence[RuleRecord], top_n: int = 8) -> List[Tuple[str, int]]:
@@ -0,0 +1,283 @@
+"""Persistent incremental import graph for Foundation Scan.
+
+One SQLite file (by default ``<out>/import_graph.sqlite``) holds, per source file:
+- its size, mtime and content hash, and the import specs parsed from it
+- its import edges as resolved by the last scan
+
+``repo_scan.build_import_graph`` reparses only files whose content hash changed
+and rewrites only the edges that changed. The stored edges answer dependency
+queries without rescanning.
+
+Usage:
+    python -m tools.foundation_scan.scan deps --reverse src/runtime/state.ts
+    python -m tools.foundation_scan.scan deps --out nf_scan_out --refresh --in . src/a.ts src/b.ts
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import IMPORT_GRAPH_FILENAME, stable_sha1_text
+
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    rel_path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    specs TEXT NOT NULL,
+    edges_sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source_file TEXT NOT NULL,
+    import_spec TEXT NOT NULL,
+    resolved_file TEXT
+);
+CREATE INDEX IF NOT EXISTS edges_source ON edges (source_file);
+CREATE INDEX IF NOT EXISTS edges_resolved ON edges (resolved_file);
+"""
+
+
+@dataclass(frozen=True)
+class ImportEdge:
+    source_file: str
+    import_spec: str
+    resolved_file: Optional[str]
+    external: bool
+
+
+@dataclass(frozen=True)
+class SourceState:
+    """What a scan knows about one source file without rereading it."""
+
+    size: int
+    mtime_ns: int
+    sha1: str
+    specs: Tuple[str, ...]
+
+
+def _edges_digest(edges: Sequence[ImportEdge]) -> str:
+    return stable_sha1_text("\n".join(f"{edge.import_spec}\t{edge.resolved_file or ''}" for edge in edges))
+
+
+class ImportGraphStore:
+    """Cached per-file import specs and the resolved edge list of one repository."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=60)
+        self.conn.executescript(SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if not meta:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+                )
+        elif int(meta["schema_version"]) != SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(
+                f"Import graph {path.as_posix()} was built with schema {meta['schema_version']}; "
+                "delete it and rescan."
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ImportGraphStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def meta(self, key: str, default: str = "") -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # -- incremental scan ------------------------------------------------------------
+
+    def file_states(self) -> Dict[str, SourceState]:
+        return {
+            rel_path: SourceState(size, mtime_ns, sha1, tuple(json.loads(specs)))
+            for rel_path, size, mtime_ns, sha1, specs in self.conn.execute(
+                "SELECT rel_path, size, mtime_ns, sha1, specs FROM files"
+            )
+        }
+
+    def sync(
+        self,
+        root: Path,
+        states: Dict[str, SourceState],
+        edges: Sequence[ImportEdge],
+        truncated: bool,
+    ) -> Dict[str, int]:
+        """Make the stored graph match one scan, rewriting only files whose state or edges changed."""
+        by_source: Dict[str, List[ImportEdge]] = {}
+        for edge in edges:
+            by_source.setdefault(edge.source_file, []).append(edge)
+        stored = {
+            row[0]: row[1:]
+            for row in self.conn.execute("SELECT rel_path, size, mtime_ns, sha1, edges_sha1 FROM files")
+        }
+        counts = {"updated": 0, "unchanged": 0, "deleted": 0}
+        with self.conn:
+            for rel_path in sorted(set(stored) - set(states)):
+                self.conn.execute("DELETE FROM files WHERE rel_path = ?", (rel_path,))
+                self.conn.execute("DELETE FROM edges WHERE source_file = ?", (rel_path,))
+                counts["deleted"] += 1
+            for rel_path in sorted(states):
+                state = states[rel_path]
+                file_edges = by_source.get(rel_path, [])
+                digest = _edges_digest(file_edges)
+                previous = stored.get(rel_path)
+                if previous == (state.size, state.mtime_ns, state.sha1, digest):
+                    counts["unchanged"] += 1
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (rel_path, size, mtime_ns, sha1, specs, edges_sha1) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (rel_path, state.size, state.mtime_ns, state.sha1, json.dumps(list(state.specs)), digest),
+                )
+                if previous is None or previous[3] != digest:
+                    self.conn.execute("DELETE FROM edges WHERE source_file = ?", (rel_path,))
+                    self.conn.executemany(
+                        "INSERT INTO edges (source_file, import_spec, resolved_file) VALUES (?, ?, ?)",
+                        [(edge.source_file, edge.import_spec, edge.resolved_file) for edge in file_edges],
+                    )
+                counts["updated"] += 1
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("root", root.as_posix()), ("truncated", "1" if truncated else "0")],
+            )
+        return counts
+
+    # -- queries ---------------------------------------------------------------------
+
+    def known_files(self, rel_paths: Iterable[str]) -> List[str]:
+        self._probe_values(rel_paths)
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT rel_path FROM files WHERE rel_path IN (SELECT value FROM probe_values) ORDER BY rel_path"
+            )
+        ]
+
+    def _probe_values(self, values: Iterable[str]) -> None:
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe_values (value TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM probe_values")
+        self.conn.executemany("INSERT OR IGNORE INTO probe_values (value) VALUES (?)", ((value,) for value in values))
+
+    def _closure(self, rel_paths: Iterable[str], follow: str, collect: str) -> List[str]:
+        self._probe_values(rel_paths)
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "WITH RECURSIVE reached(file) AS ("
+                " SELECT value FROM probe_values"
+                f" UNION SELECT edges.{collect} FROM edges JOIN reached ON edges.{follow} = reached.file"
+                f" WHERE edges.{collect} IS NOT NULL"
+                ") SELECT file FROM reached WHERE file NOT IN (SELECT value FROM probe_values) ORDER BY file"
+            )
+        ]
+
+    def dependents(self, rel_paths: Iterable[str]) -> List[str]:
+        """Files that import any of ``rel_paths``, directly or transitively."""
+        return self._closure(rel_paths, follow="resolved_file", collect="source_file")
+
+    def dependencies(self, rel_paths: Iterable[str]) -> List[str]:
+        """Repository files imported by any of ``rel_paths``, directly or transitively."""
+        return self._closure(rel_paths, follow="source_file", collect="resolved_file")
+
+
+def _query_path(value: str, root: Optional[Path]) -> str:
+    """Repo-relative posix form of a path given on the command line."""
+    path = Path(value)
+    if path.is_absolute() and root is not None:
+        try:
+            return path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            return path.as_posix()
+    return PurePosixPath(value.replace("\\", "/")).as_posix()
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="foundation_scan deps",
+        description="Query the persisted import graph for the dependencies or dependents of files.",
+    )
+    parser.add_argument("files", nargs="+", help="Repo-relative source files")
+    parser.add_argument(
+        "--reverse",
+        action="store_true",
+        help="List files that import the given files (transitively) instead of what they import",
+    )
+    parser.add_argument("--out", dest="out_dir", default="nf_scan_out", help="Scan output directory holding the graph")
+    parser.add_argument(
+        "--import-graph",
+        dest="import_graph",
+        default=None,
+        help=f"Import graph file (default: <out>/{IMPORT_GRAPH_FILENAME})",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Incrementally rescan the imports of --in before answering",
+    )
+    parser.add_argument("--in", dest="in_dir", default=".", help="Repo root used by --refresh")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Print one JSON object instead of lines")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    graph_path = Path(args.import_graph or Path(args.out_dir) / IMPORT_GRAPH_FILENAME).resolve()
+    if args.refresh:
+        # Imported here: repo_scan imports this module for the store.
+        from .config import ScanConfig
+        from .repo_scan import build_import_graph
+
+        build_import_graph(
+            ScanConfig.from_inputs(
+                in_dir=args.in_dir,
+                out_dir=args.out_dir,
+                import_graph=str(graph_path),
+                show_progress=False,
+            )
+        )
+    elif not graph_path.exists():
+        print(f"No import graph at {graph_path.as_posix()}; run a scan or pass --refresh.", file=sys.stderr)
+        return 2
+
+    with ImportGraphStore(graph_path) as store:
+        root_value = store.meta("root")
+        root = Path(root_value) if root_value else None
+        files = sorted({_query_path(value, root) for value in args.files})
+        unknown = sorted(set(files) - set(store.known_files(files)))
+        results = store.dependents(files) if args.reverse else store.dependencies(files)
+        truncated = store.meta("truncated") == "1"
+
+    for rel_path in unknown:
+        print(f"Not a scanned source file: {rel_path}", file=sys.stderr)
+    if truncated:
+        print("Import graph was truncated at the edge cap; results may be incomplete.", file=sys.stderr)
+    if args.as_json:
+        payload = {"files": files, "reverse": args.reverse, "results": results, "unknown": unknown}
+        print(json.dumps(payload, indent=2, sort_keys=True))
+    else:
+        for rel_path in results:
+            print(rel_path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
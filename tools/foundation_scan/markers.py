@@ -0,0 +1,89 @@
+"""Multi-pattern marker matching for Foundation Scan.
+
+Rule extraction and contradiction checks test sentences against many short
+marker phrases with substring semantics. ``marker_hits`` runs one Aho-Corasick
+automaton over the lowercased text and returns every marker that occurs, so
+classifiers test set membership instead of rescanning the text per marker.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class MarkerAutomaton:
+    """Aho-Corasick automaton compiled to a full transition table.
+
+    Every state maps each character to its next state directly (failure links
+    are folded in at build time), and each state carries the frozenset of
+    patterns ending there, including those reached through failure links.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: FrozenSet[str] = frozenset(pattern for pattern in patterns if pattern)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[FrozenSet[str]] = [frozenset()]
+        for pattern in sorted(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append(frozenset())
+                    nxt = len(goto) - 1
+                    goto[state][char] = nxt
+                state = nxt
+            outputs[state] = outputs[state] | {pattern}
+
+        # Breadth-first: a state's failure target is always shallower, so its
+        # transitions and outputs are complete when the state is processed.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] | outputs[fail[state]]
+            table = dict(delta[fail[state]])
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0) if state else 0
+                table[char] = nxt
+                queue.append(nxt)
+            delta[state] = table
+        self._delta = delta
+        self._outputs = outputs
+
+    def find(self, lowered: str) -> FrozenSet[str]:
+        """Every pattern occurring in ``lowered`` (already lowercased)."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        hits: FrozenSet[str] = frozenset()
+        for char in lowered:
+            state = delta[state].get(char, 0)
+            found = outputs[state]
+            if found:
+                hits = hits | found
+        return hits
+
+
+@lru_cache(maxsize=1)
+def _automaton() -> MarkerAutomaton:
+    # Imported here: both modules import this one for marker_hits.
+    from . import contradictions, doc_rules
+
+    patterns = set(doc_rules.ALL_RULE_MARKERS)
+    patterns.update(contradictions.NEGATION_MARKERS)
+    patterns.update(contradictions.AFFIRM_MARKERS)
+    return MarkerAutomaton(patterns)
+
+
+@lru_cache(maxsize=65_536)
+def marker_hits(text: str) -> FrozenSet[str]:
+    """Markers from doc_rules and contradictions that occur in ``text``, case-insensitively.
+
+    Cached per text: contradiction checks revisit the same rule statements for
+    every pair they appear in.
+    """
+    return _automaton().find(text.lower())
@@ -5,16 +5,20 @@ from __future__ import annotations
 import csv
 import json
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .config import (
     ContradictionRecord,
+    CycleRecord,
+    DirectoryNode,
     DocumentRecord,
     DuplicateRecord,
     RepoStructureResult,
     RuleRecord,
     ScanConfig,
     ScanIndex,
+    SectionDuplicateRecord,
+    coach_template,
     severity_rank,
     utc_now_iso,
 )
@@ -57,11 +61,7 @@ def _rule_rows(rules: Sequence[RuleRecord]) -> List[Dict[str, object]]:
             "evidence_snippet": row.evidence_snippet,
             "check_id": row.check_id,
             "what_detected": row.what_detected,
-            "why_it_matters": row.why_it_matters,
-            "how_to_fix": row.how_to_fix,
-            "minimal_bad_example": row.minimal_bad_example,
-            "minimal_good_example": row.minimal_good_example,
-            "next_best_action": row.next_best_action,
+            **coach_template(row.coach_id).as_row(),
         }
         for row in sorted_rules
     ]
@@ -88,16 +88,44 @@ def _duplicate_rows(dupes: Sequence[DuplicateRecord]) -> List[Dict[str, object]]
             "check_id": row.check_id,
             "severity": row.severity,
             "what_detected": row.what_detected,
-            "why_it_matters": row.why_it_matters,
-            "how_to_fix": row.how_to_fix,
-            "minimal_bad_example": row.minimal_bad_example,
-            "minimal_good_example": row.minimal_good_example,
-            "next_best_action": row.next_best_action,
+            **coach_template(row.coach_id).as_row(),
         }
         for row in sorted_dupes
     ]
 
 
+def _section_duplicate_rows(rows: Sequence[SectionDuplicateRecord]) -> List[Dict[str, object]]:
+    sorted_rows = sorted(
+        rows,
+        key=lambda row: (
+            -row.similarity,
+            row.doc_a.lower(),
+            row.doc_b.lower(),
+            row.a_offset_start,
+            row.b_offset_start,
+            row.section_duplicate_id,
+        ),
+    )
+    return [
+        {
+            "section_duplicate_id": row.section_duplicate_id,
+            "similarity": f"{row.similarity:0.6f}",
+            "doc_a": row.doc_a,
+            "a_offset_start": row.a_offset_start,
+            "a_offset_end": row.a_offset_end,
+            "doc_b": row.doc_b,
+            "b_offset_start": row.b_offset_start,
+            "b_offset_end": row.b_offset_end,
+            "window_pairs": row.window_pairs,
+            "check_id": row.check_id,
+            "severity": row.severity,
+            "what_detected": row.what_detected,
+            **coach_template(row.coach_id).as_row(),
+        }
+        for row in sorted_rows
+    ]
+
+
 def _contradiction_rows(rows: Sequence[ContradictionRecord]) -> List[Dict[str, object]]:
     sorted_rows = sorted(
         rows,
@@ -123,11 +151,7 @@ def _contradiction_rows(rows: Sequence[ContradictionRecord]) -> List[Dict[str, o
             "confidence": f"{row.confidence:0.6f}",
             "check_id": row.check_id,
             "what_detected": row.what_detected,
-            "why_it_matters": row.why_it_matters,
-            "how_to_fix": row.how_to_fix,
-            "minimal_bad_example": row.minimal_bad_example,
-            "minimal_good_example": row.minimal_good_example,
-            "next_best_action": row.next_best_action,
+            **coach_template(row.coach_id).as_row(),
         }
         for row in sorted_rows
     ]
@@ -175,6 +199,30 @@ def write_duplicates_csv(path: Path, duplicates: Sequence[DuplicateRecord]) -> N
     _write_csv(path, fields, rows)
 
 
+def write_section_duplicates_csv(path: Path, rows: Sequence[SectionDuplicateRecord]) -> None:
+    out_rows = _section_duplicate_rows(rows)
+    fields = [
+        "section_duplicate_id",
+        "similarity",
+        "doc_a",
+        "a_offset_start",
+        "a_offset_end",
+        "doc_b",
+        "b_offset_start",
+        "b_offset_end",
+        "window_pairs",
+        "check_id",
+        "severity",
+        "what_detected",
+        "why_it_matters",
+        "how_to_fix",
+        "minimal_bad_example",
+        "minimal_good_example",
+        "next_best_action",
+    ]
+    _write_csv(path, fields, out_rows)
+
+
 def write_contradictions_csv(path: Path, rows: Sequence[ContradictionRecord]) -> None:
     out_rows = _contradiction_rows(rows)
     fields = [
@@ -199,21 +247,68 @@ def write_contradictions_csv(path: Path, rows: Sequence[ContradictionRecord]) ->
     _write_csv(path, fields, out_rows)
 
 
+def _cycle_rows(rows: Sequence[CycleRecord]) -> List[Dict[str, object]]:
+    return [
+        {
+            "cycle_id": row.cycle_id,
+            "file_count": row.file_count,
+            "edge_count": row.edge_count,
+            "boundaries": row.boundaries,
+            "example_cycle": row.example_cycle,
+            "files": row.files,
+            "check_id": row.check_id,
+            "severity": row.severity,
+            "what_detected": row.what_detected,
+            **coach_template(row.coach_id).as_row(),
+        }
+        for row in sorted(rows, key=lambda row: (-row.file_count, row.files.lower()))
+    ]
+
+
+def write_cycles_csv(path: Path, rows: Sequence[CycleRecord]) -> None:
+    out_rows = _cycle_rows(rows)
+    fields = [
+        "cycle_id",
+        "file_count",
+        "edge_count",
+        "boundaries",
+        "example_cycle",
+        "files",
+        "check_id",
+        "severity",
+        "what_detected",
+        "why_it_matters",
+        "how_to_fix",
+        "minimal_bad_example",
+        "minimal_good_example",
+        "next_best_action",
+    ]
+    _write_csv(path, fields, out_rows)
+
+
 def write_index_json(
     path: Path,
     config: ScanConfig,
     docs: Sequence[DocumentRecord],
     rules: Sequence[RuleRecord],
     duplicates: Sequence[DuplicateRecord],
+    section_duplicates: Sequence[SectionDuplicateRecord],
     contradictions: Sequence[ContradictionRecord],
     extraction_warnings: Sequence[Dict[str, str]],
+    cross_repo_duplicates: Optional[Sequence[DuplicateRecord]] = None,
+    cross_repo_contradictions: Optional[Sequence[ContradictionRecord]] = None,
 ) -> None:
     counts = {
         "docs": len(docs),
         "rules": len(rules),
         "duplicates": len(duplicates),
+        "section_duplicates": len(section_duplicates),
         "contradictions": len(contradictions),
     }
+    if cross_repo_duplicates is not None:
+        counts["cross_repo_duplicates"] = len(cross_repo_duplicates)
+    if cross_repo_contradictions is not None:
+        counts["cross_repo_contradictions"] = len(cross_repo_contradictions)
     index_obj = ScanIndex(
         timestamp_utc=utc_now_iso(),
         repo_root=config.in_dir.as_posix(),
@@ -223,6 +318,7 @@ def write_index_json(
         max_file_mb=config.max_file_mb,
         near_dup_threshold=config.near_dup_threshold,
         max_near_dup_pairs=config.max_near_dup_pairs,
+        section_dup_threshold=config.section_dup_threshold,
         chunk_size=config.chunk_size,
         chunk_overlap=config.chunk_overlap,
         counts=counts,
@@ -240,6 +336,33 @@ def write_index_json(
         handle.write("\n")
 
 
+def _directory_tree_row(node: DirectoryNode, path: str, levels_left: int) -> Dict[str, object]:
+    children = sorted(node.children.items(), key=lambda item: item[0].lower()) if levels_left > 0 else []
+    return {
+        "path": path,
+        "files": node.files,
+        "direct_files": node.direct_files,
+        "bytes": node.bytes,
+        "languages": node.languages,
+        "children": [
+            _directory_tree_row(child, f"{path}/{name}" if path else name, levels_left - 1)
+            for name, child in children
+        ],
+    }
+
+
+def write_directory_tree_json(path: Path, tree: Optional[DirectoryNode], depth: int) -> None:
+    """Directory aggregates down to ``depth`` levels; ``files`` and ``bytes`` include subdirectories."""
+    payload = {
+        "schema_version": 1,
+        "tree_depth": depth,
+        "root": _directory_tree_row(tree or DirectoryNode(name=""), "", depth),
+    }
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
 def _format_topics_markdown(rules: Sequence[RuleRecord]) -> List[str]:
     topic_rows = summarize_rule_topics(rules, top_n=10)
     if not topic_rows:
@@ -263,8 +386,11 @@ def write_report_md(
     docs: Sequence[DocumentRecord],
     rules: Sequence[RuleRecord],
     duplicates: Sequence[DuplicateRecord],
+    section_duplicates: Sequence[SectionDuplicateRecord],
     contradictions: Sequence[ContradictionRecord],
     extraction_warning_rows: Sequence[Dict[str, str]],
+    cross_repo_duplicates: Optional[Sequence[DuplicateRecord]] = None,
+    cross_repo_contradictions: Optional[Sequence[ContradictionRecord]] = None,
 ) -> None:
     lines: List[str] = []
     lines.append("# Foundation Scan Report")
@@ -275,7 +401,12 @@ def write_report_md(
     lines.append(f"- Documents scanned: {len(docs)}")
     lines.append(f"- Living rules extracted: {len(rules)}")
     lines.append(f"- Duplicate pairs: {len(duplicates)}")
+    lines.append(f"- Duplicated sections: {len(section_duplicates)}")
     lines.append(f"- Contradiction candidates: {len(contradictions)}")
+    if cross_repo_duplicates is not None:
+        lines.append(f"- Cross-repo duplicate pairs: {len(cross_repo_duplicates)}")
+    if cross_repo_contradictions is not None:
+        lines.append(f"- Cross-repo contradiction candidates: {len(cross_repo_contradictions)}")
     lines.append("")
     lines.append("## Severity Counts")
     lines.extend(_format_severity_markdown(rules))
@@ -303,6 +434,8 @@ def write_report_md(
         )
     elif duplicates:
         lines.append("- Consolidate duplicate documents into one canonical source of truth.")
+    elif section_duplicates:
+        lines.append("- Move copied sections into one canonical document and link to it.")
     elif rules:
         lines.append("- Promote highest-severity rules into CONTRACT.md and enforce with CI checks.")
     else:
@@ -373,6 +506,27 @@ def write_repo_structure_md(path: Path, result: RepoStructureResult) -> None:
     else:
         lines.append("- Violations: none")
 
+    if result.transitive_violations:
+        lines.append("- Transitive violations (through files outside both boundaries):")
+        for item in result.transitive_violations[:50]:
+            lines.append(f"  - `{item.via}` (`{item.from_boundary}` -> `{item.to_boundary}`)")
+        if len(result.transitive_violations) > 50:
+            lines.append(f"  - ... {len(result.transitive_violations) - 50} more")
+    else:
+        lines.append("- Transitive violations: none")
+
+    lines.append("")
+    lines.append("## Import Cycles")
+    if not result.import_cycles:
+        lines.append("- No import cycles detected.")
+    else:
+        lines.append(f"- Cycles: {len(result.import_cycles)} (all listed in `CYCLES.csv`)")
+        for cycle in result.import_cycles[:20]:
+            spanning = f" across `{cycle.boundaries.replace(';', '`, `')}`" if cycle.boundaries else ""
+            lines.append(f"  - {cycle.file_count} files{spanning}: `{cycle.example_cycle}`")
+        if len(result.import_cycles) > 20:
+            lines.append(f"  - ... {len(result.import_cycles) - 20} more")
+
     lines.append("")
     lines.append("## Coach Findings")
     if not result.coach_findings:
@@ -399,17 +553,24 @@ def write_all_outputs(
     contradictions: Sequence[ContradictionRecord],
     repo_result: RepoStructureResult,
     extraction_warning_rows: Sequence[Dict[str, str]],
+    section_duplicates: Sequence[SectionDuplicateRecord] = (),
+    cross_repo_duplicates: Optional[Sequence[DuplicateRecord]] = None,
+    cross_repo_contradictions: Optional[Sequence[ContradictionRecord]] = None,
 ) -> List[Path]:
     out_dir = ensure_output_dir(config.out_dir)
     rules_csv = out_dir / "RULES.csv"
     duplicates_csv = out_dir / "DUPLICATES.csv"
+    section_duplicates_csv = out_dir / "SECTION_DUPLICATES.csv"
     contradictions_csv = out_dir / "CONTRADICTIONS.csv"
     report_md = out_dir / "REPORT.md"
     repo_structure_md = out_dir / "REPO_STRUCTURE.md"
+    cycles_csv = out_dir / "CYCLES.csv"
+    directory_tree_json = out_dir / "DIRECTORY_TREE.json"
     index_json = out_dir / "INDEX.json"
 
     write_rules_csv(rules_csv, rules)
     write_duplicates_csv(duplicates_csv, duplicates)
+    write_section_duplicates_csv(section_duplicates_csv, section_duplicates)
     write_contradictions_csv(contradictions_csv, contradictions)
     write_report_md(
         report_md,
@@ -417,27 +578,47 @@ def write_all_outputs(
         docs=docs,
         rules=rules,
         duplicates=duplicates,
+        section_duplicates=section_duplicates,
         contradictions=contradictions,
         extraction_warning_rows=extraction_warning_rows,
+        cross_repo_duplicates=cross_repo_duplicates,
+        cross_repo_contradictions=cross_repo_contradictions,
     )
     write_repo_structure_md(repo_structure_md, repo_result)
+    write_cycles_csv(cycles_csv, repo_result.import_cycles)
+    write_directory_tree_json(directory_tree_json, repo_result.directory_tree, repo_result.tree_depth)
     write_index_json(
         index_json,
         config=config,
         docs=docs,
         rules=rules,
         duplicates=duplicates,
+        section_duplicates=section_duplicates,
         contradictions=contradictions,
         extraction_warnings=extraction_warning_rows,
+        cross_repo_duplicates=cross_repo_duplicates,
+        cross_repo_contradictions=cross_repo_contradictions,
     )
 
     files = [
         report_md,
         rules_csv,
         duplicates_csv,
+        section_duplicates_csv,
         contradictions_csv,
         index_json,
         repo_structure_md,
+        cycles_csv,
+        directory_tree_json,
     ]
+    # Cross-repo artifacts exist only for scans that use --index.
+    if cross_repo_duplicates is not None:
+        cross_duplicates_csv = out_dir / "CROSS_REPO_DUPLICATES.csv"
+        write_duplicates_csv(cross_duplicates_csv, cross_repo_duplicates)
+        files.append(cross_duplicates_csv)
+    if cross_repo_contradictions is not None:
+        cross_contradictions_csv = out_dir / "CROSS_REPO_CONTRADICTIONS.csv"
+        write_contradictions_csv(cross_contradictions_csv, cross_repo_contradictions)
+        files.append(cross_contradictions_csv)
     return sorted(files, key=lambda p: p.name.lower())
 
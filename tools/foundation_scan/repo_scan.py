@@ -1,30 +1,39 @@
 """Repository structure scanning for Foundation Scan.
 
 Features:
-- depth-2 tree summary
+- directory aggregate tree (files, bytes, language mix per directory) + tree summary
 - language distribution
 - lightweight import graph for ts/js/py
 - import hubs (inbound/outbound)
-- optional boundary contract parsing + forbidden import violations
+- optional boundary contract parsing + forbidden import violations (direct and transitive)
+- import cycles (strongly connected components of the file import graph)
 """
 
 from __future__ import annotations
 
+import os
+import posixpath
 import re
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import DefaultDict, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .config import (
     BoundaryViolationRecord,
+    CycleRecord,
+    DirectoryNode,
     ImportHubRecord,
     ProgressTracker,
     RepoStructureResult,
     ScanConfig,
+    coach_template,
+    intern_coach,
     safe_rel_path,
+    stable_sha1_bytes,
     stable_sha1_text,
 )
+from .import_graph import ImportEdge, ImportGraphStore, SourceState
 
 
 SOURCE_EXTENSIONS: Tuple[str, ...] = (".ts", ".tsx", ".js", ".jsx", ".py")
@@ -57,13 +66,8 @@ PY_FROM_RE = re.compile(r"^\s*from\s+([a-zA-Z0-9_\.]+)\s+import\s+", flags=re.MU
 CONTRACT_SECTION_BOUNDARIES = "BOUNDARIES"
 CONTRACT_SECTION_FORBIDDEN = "FORBIDDEN_IMPORTS"
 
-
-@dataclass(frozen=True)
-class ImportEdge:
-    source_file: str
-    import_spec: str
-    resolved_file: Optional[str]
-    external: bool
+# Longest import chain spelled out in a transitive violation's `via`.
+MAX_VIA_FILES = 12
 
 
 @dataclass
@@ -78,31 +82,41 @@ def _is_excluded_dir(name: str, config: ScanConfig) -> bool:
     return any(lowered == item.lower() for item in config.exclude_dirs)
 
 
-def _iter_all_files(config: ScanConfig) -> Iterator[Path]:
+def _walk_files(config: ScanConfig) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield ``(rel_dir, entry)`` for every file, depth-first, sorted case-insensitively.
+
+    A directory's files are yielded together, before its subdirectories. Entries
+    come from ``os.scandir`` so file/dir checks reuse the directory listing.
+    """
     root = config.in_dir.resolve()
     out = config.out_dir.resolve()
-    stack: List[Path] = [root]
+    stack: List[Tuple[Path, str]] = [(root, "")]
     while stack:
-        current = stack.pop()
-        try:
-            current.relative_to(out)
+        current, rel_dir = stack.pop()
+        if current == out or out in current.parents:
             continue
-        except Exception:
-            pass
         try:
-            entries = sorted(current.iterdir(), key=lambda p: p.name.lower())
+            with os.scandir(current) as handle:
+                entries = sorted(handle, key=lambda entry: entry.name.lower())
         except Exception:
             continue
-        dirs: List[Path] = []
+        dirs: List[Tuple[Path, str]] = []
         for entry in entries:
-            if entry.is_dir():
-                if _is_excluded_dir(entry.name, config):
-                    continue
-                dirs.append(entry)
-            elif entry.is_file():
-                yield entry
-        for sub in reversed(dirs):
-            stack.append(sub)
+            try:
+                if entry.is_dir():
+                    if _is_excluded_dir(entry.name, config):
+                        continue
+                    dirs.append((Path(entry.path), f"{rel_dir}/{entry.name}" if rel_dir else entry.name))
+                elif entry.is_file():
+                    yield rel_dir, entry
+            except OSError:
+                continue
+        stack.extend(reversed(dirs))
+
+
+def _iter_all_files(config: ScanConfig) -> Iterator[Path]:
+    for _, entry in _walk_files(config):
+        yield Path(entry.path)
 
 
 def _top_level_name(rel_path: str) -> str:
@@ -110,59 +124,96 @@ def _top_level_name(rel_path: str) -> str:
     return parts[0] if parts else rel_path
 
 
-def build_depth2_tree_summary(config: ScanConfig, max_children_per_dir: int = 24) -> List[str]:
-    root = config.in_dir.resolve()
-    top_files: List[str] = []
-    top_dirs: Dict[str, List[str]] = defaultdict(list)
-    second_level: Dict[str, Counter[str]] = defaultdict(Counter)
-
-    for path in _iter_all_files(config):
-        rel = safe_rel_path(path, root)
-        parts = rel.split("/")
-        if len(parts) == 1:
-            top_files.append(parts[0])
-            continue
-        top = parts[0]
-        child = parts[1]
-        top_dirs[top].append(rel)
-        second_level[top][child] += 1
-
+def build_directory_tree(config: ScanConfig, names_depth: int = 2) -> DirectoryNode:
+    """Per-directory file count, bytes and language mix at every depth, in one pass.
+
+    Each file is added to its own directory; the walk yields a directory's files
+    together, so the node lookup happens once per directory. Totals then roll up
+    to the ancestors in one bottom-up pass. File names are kept only for
+    directories shallower than ``names_depth``, the part the summary renders.
+    """
+    root = DirectoryNode(name="")
+    node = root
+    node_dir: Optional[str] = ""
+    keep_names = names_depth > 0
+    for rel_dir, entry in _walk_files(config):
+        if rel_dir != node_dir:
+            node = root
+            parts = rel_dir.split("/")
+            for part in parts:
+                node = node.children.setdefault(part, DirectoryNode(name=part))
+            node_dir = rel_dir
+            keep_names = len(parts) < names_depth
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            size = 0
+        lang = LANGUAGE_BY_EXTENSION.get(os.path.splitext(entry.name)[1].lower(), "Other")
+        node.files += 1
+        node.bytes += size
+        node.languages[lang] = node.languages.get(lang, 0) + 1
+        if keep_names:
+            node.file_names.append(entry.name)
+
+    order = [root]
+    for parent in order:
+        order.extend(parent.children.values())
+    for parent in reversed(order):
+        for child in parent.children.values():
+            parent.files += child.files
+            parent.bytes += child.bytes
+            for lang, count in child.languages.items():
+                parent.languages[lang] = parent.languages.get(lang, 0) + count
+    return root
+
+
+def _render_children(
+    node: DirectoryNode,
+    path: str,
+    level: int,
+    depth: int,
+    max_children_per_dir: int,
+    lines: List[str],
+) -> None:
+    rows = [(name, child.files, child) for name, child in node.children.items()]
+    rows.extend((name, 1, None) for name in node.file_names)
+    rows.sort(key=lambda item: (item[0].lower(), item[1]))
+    indent = "  " * level
+    for name, count, child in rows[:max_children_per_dir]:
+        lines.append(f"{indent}- `{path}/{name}{'/' if child is not None else ''}` ({count})")
+        if child is not None and level + 1 < depth:
+            _render_children(child, f"{path}/{name}", level + 1, depth, max_children_per_dir, lines)
+    if len(rows) > max_children_per_dir:
+        lines.append(f"{indent}- ... ({len(rows) - max_children_per_dir} more)")
+
+
+def render_directory_tree(tree: DirectoryNode, depth: int = 2, max_children_per_dir: int = 24) -> List[str]:
+    """Markdown tree summary down to ``depth`` levels below the repository root."""
     lines: List[str] = []
-    lines.append("## Top-Level Tree (Depth 2)")
+    lines.append(f"## Top-Level Tree (Depth {depth})")
     lines.append("")
-    for file_name in sorted(top_files):
+    for file_name in sorted(tree.file_names):
         lines.append(f"- `{file_name}`")
-    for top in sorted(top_dirs):
-        total_files = len(top_dirs[top])
-        lines.append(f"- `{top}/` ({total_files} files)")
-        child_rows = sorted(second_level[top].items(), key=lambda item: (item[0].lower(), item[1]))
-        for child, count in child_rows[:max_children_per_dir]:
-            suffix = "/" if any(p.startswith(f"{top}/{child}/") for p in top_dirs[top]) else ""
-            lines.append(f"  - `{top}/{child}{suffix}` ({count})")
-        if len(child_rows) > max_children_per_dir:
-            lines.append(f"  - ... ({len(child_rows) - max_children_per_dir} more)")
+    for top in sorted(tree.children):
+        child = tree.children[top]
+        lines.append(f"- `{top}/` ({child.files} files)")
+        if depth > 1:
+            _render_children(child, top, 1, depth, max_children_per_dir, lines)
     lines.append("")
     return lines
 
 
-def detect_languages(config: ScanConfig) -> Dict[str, int]:
-    counter: Counter[str] = Counter()
-    root = config.in_dir.resolve()
-    for path in _iter_all_files(config):
-        ext = path.suffix.lower()
-        lang = LANGUAGE_BY_EXTENSION.get(ext, "Other")
-        counter[lang] += 1
-    return {name: counter[name] for name in sorted(counter)}
-
-
-def _read_text_safe(path: Path) -> str:
-    raw = path.read_bytes()
+def _decode_text(raw: bytes) -> str:
     try:
         return raw.decode("utf-8")
     except UnicodeDecodeError:
         return raw.decode("latin-1", errors="replace")
 
 
+def _read_text_safe(path: Path) -> str:
+    return _decode_text(path.read_bytes())
+
+
 def _extract_import_specs_from_text(path: Path, text: str) -> List[str]:
     ext = path.suffix.lower()
     specs: List[str] = []
@@ -188,118 +239,133 @@ def _build_source_file_map(config: ScanConfig) -> Dict[str, Path]:
     return dict(sorted(out.items(), key=lambda item: item[0].lower()))
 
 
-def _resolve_relative_module(base_path: Path, spec: str) -> Optional[Path]:
-    """Resolve relative ts/js module spec to an existing file path."""
+def _source_state(path: Path, cached: Optional[SourceState]) -> Optional[SourceState]:
+    """Current state of one source file; reparsed only when its content hash changed."""
+    try:
+        stat = path.stat()
+        if cached is not None and (cached.size, cached.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return cached
+        raw = path.read_bytes()
+    except Exception:
+        return None
+    sha1 = stable_sha1_bytes(raw)
+    if cached is not None and cached.sha1 == sha1:
+        specs = cached.specs
+    else:
+        specs = tuple(_extract_import_specs_from_text(path, _decode_text(raw)))
+    return SourceState(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha1=sha1, specs=specs)
+
+
+def _normalize_rel(rel_path: str) -> Optional[str]:
+    """Collapse ``.``/``..`` segments; None when the path leaves the repository."""
+    normalized = posixpath.normpath(rel_path)
+    if normalized == ".." or normalized.startswith("../") or normalized.startswith("/"):
+        return None
+    return "" if normalized == "." else normalized
+
+
+def _resolve_relative_module(source_rel: str, spec: str, rel_paths: Set[str]) -> Optional[str]:
+    """Resolve relative ts/js module spec to a scanned source file."""
     if not spec.startswith("."):
         return None
-    candidate_base = (base_path.parent / spec).resolve()
-    trial_paths: List[Path] = []
-    if candidate_base.suffix:
-        trial_paths.append(candidate_base)
+    base = _normalize_rel(posixpath.join(posixpath.dirname(source_rel), spec))
+    if base is None:
+        return None
+    trial_paths: List[str] = []
+    if base and PurePosixPath(base).suffix:
+        trial_paths.append(base)
     else:
+        prefix = f"{base}/" if base else ""
+        if base:
+            for ext in (".ts", ".tsx", ".js", ".jsx", ".py"):
+                trial_paths.append(f"{base}{ext}")
         for ext in (".ts", ".tsx", ".js", ".jsx", ".py"):
-            trial_paths.append(Path(f"{candidate_base}{ext}"))
-        for ext in (".ts", ".tsx", ".js", ".jsx", ".py"):
-            trial_paths.append(candidate_base / f"index{ext}")
+            trial_paths.append(f"{prefix}index{ext}")
     for candidate in trial_paths:
-        if candidate.exists() and candidate.is_file():
-            return candidate.resolve()
+        if candidate in rel_paths:
+            return candidate
     return None
 
 
-def _resolve_python_module(
-    spec: str,
-    source_rel: str,
-    source_path: Path,
-    rel_to_abs: Dict[str, Path],
-    abs_to_rel: Dict[Path, str],
-) -> Optional[str]:
+def _resolve_python_module(spec: str, source_rel: str, rel_paths: Set[str]) -> Optional[str]:
     # relative module via leading dots in "from .x import y".
     if spec.startswith("."):
-        dot_count = 0
-        for char in spec:
-            if char == ".":
-                dot_count += 1
-            else:
-                break
+        dot_count = len(spec) - len(spec.lstrip("."))
         remainder = spec[dot_count:]
-        parent = source_path.parent
+        parent = posixpath.dirname(source_rel)
         for _ in range(max(0, dot_count - 1)):
-            parent = parent.parent
+            if not parent:
+                return None
+            parent = posixpath.dirname(parent)
         if remainder:
-            rel_candidate = (parent / remainder.replace(".", "/")).resolve()
+            target = _normalize_rel(posixpath.join(parent, remainder.replace(".", "/")))
+        else:
+            target = parent
+        if target is None:
+            return None
+        if target:
+            trial = [PurePosixPath(target).with_suffix(".py").as_posix(), f"{target}/__init__.py"]
         else:
-            rel_candidate = parent.resolve()
-        trial = [rel_candidate.with_suffix(".py"), rel_candidate / "__init__.py"]
+            trial = ["__init__.py"]
         for candidate in trial:
-            rel_candidate_path = abs_to_rel.get(candidate.resolve())
-            if rel_candidate_path:
-                return rel_candidate_path
+            if candidate in rel_paths:
+                return candidate
         return None
 
     # absolute module mapping into repo by module path.
     mod_parts = spec.split(".")
     candidate_rel = "/".join(mod_parts) + ".py"
-    if candidate_rel in rel_to_abs:
+    if candidate_rel in rel_paths:
         return candidate_rel
     candidate_pkg_init = "/".join(mod_parts) + "/__init__.py"
-    if candidate_pkg_init in rel_to_abs:
+    if candidate_pkg_init in rel_paths:
         return candidate_pkg_init
     return None
 
 
-def _resolve_import(
-    source_rel: str,
-    source_path: Path,
-    import_spec: str,
-    rel_to_abs: Dict[str, Path],
-    abs_to_rel: Dict[Path, str],
-) -> Optional[str]:
-    ext = source_path.suffix.lower()
+def _resolve_import(source_rel: str, import_spec: str, rel_paths: Set[str]) -> Optional[str]:
+    """Resolve against the in-memory set of scanned source paths; no filesystem probes."""
+    ext = PurePosixPath(source_rel).suffix.lower()
     if ext in (".ts", ".tsx", ".js", ".jsx"):
-        resolved = _resolve_relative_module(source_path, import_spec)
-        if resolved is None:
-            return None
-        return abs_to_rel.get(resolved.resolve())
+        return _resolve_relative_module(source_rel, import_spec, rel_paths)
     if ext == ".py":
-        return _resolve_python_module(import_spec, source_rel, source_path, rel_to_abs, abs_to_rel)
+        return _resolve_python_module(import_spec, source_rel, rel_paths)
     return None
 
 
 def build_import_graph(config: ScanConfig) -> Tuple[List[ImportEdge], List[ImportHubRecord]]:
     rel_to_abs = _build_source_file_map(config)
-    abs_to_rel = {path.resolve(): rel for rel, path in rel_to_abs.items()}
+    rel_paths = set(rel_to_abs)
     source_rows = sorted(rel_to_abs.items(), key=lambda item: item[0].lower())
     progress = ProgressTracker(
         title="repo-import-scan",
         total=max(1, len(source_rows)),
         enabled=config.show_progress,
     )
+    store = ImportGraphStore(config.import_graph_path) if config.import_graph_path is not None else None
+    cached = store.file_states() if store is not None else {}
+    states: Dict[str, SourceState] = {}
 
     edges: List[ImportEdge] = []
     imports_out_count: Counter[str] = Counter()
     imports_in_count: Counter[str] = Counter()
     total_edges = 0
+    truncated = False
 
     for source_rel, source_path in source_rows:
         if total_edges >= config.max_import_edges:
+            truncated = True
             break
-        try:
-            text = _read_text_safe(source_path)
-        except Exception:
+        state = _source_state(source_path, cached.get(source_rel))
+        if state is None:
             progress.update()
             continue
-        specs = _extract_import_specs_from_text(source_path, text)
-        for spec in specs:
+        states[source_rel] = state
+        for spec in state.specs:
             if total_edges >= config.max_import_edges:
+                truncated = True
                 break
-            resolved = _resolve_import(
-                source_rel=source_rel,
-                source_path=source_path,
-                import_spec=spec,
-                rel_to_abs=rel_to_abs,
-                abs_to_rel=abs_to_rel,
-            )
+            resolved = _resolve_import(source_rel, spec, rel_paths)
             external = resolved is None
             edges.append(
                 ImportEdge(
@@ -315,6 +381,9 @@ def build_import_graph(config: ScanConfig) -> Tuple[List[ImportEdge], List[Impor
             total_edges += 1
         progress.update()
     progress.finish()
+    if store is not None:
+        with store:
+            store.sync(config.in_dir.resolve(), states, edges, truncated)
 
     hubs: List[ImportHubRecord] = []
     all_files = sorted(set(imports_out_count.keys()) | set(imports_in_count.keys()))
@@ -406,18 +475,43 @@ def parse_boundary_contract(config: ScanConfig) -> ParsedContract:
     )
 
 
-def _boundary_for_file(rel_path: str, boundaries: Dict[str, str]) -> Optional[str]:
-    best_name: Optional[str] = None
-    best_len = -1
-    for name, prefix in boundaries.items():
-        normalized_prefix = prefix.strip("/").lower()
-        if not normalized_prefix:
-            continue
-        if rel_path.lower() == normalized_prefix or rel_path.lower().startswith(normalized_prefix + "/"):
-            if len(normalized_prefix) > best_len:
-                best_len = len(normalized_prefix)
-                best_name = name
-    return best_name
+class _TrieNode:
+    __slots__ = ("children", "name")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.name: Optional[str] = None
+
+
+class BoundaryTrie:
+    """Longest-prefix boundary lookup over lowercased path segments.
+
+    A lookup walks the file's path once instead of testing every boundary
+    prefix. On equal prefixes the first boundary in ``boundaries`` wins.
+    """
+
+    def __init__(self, boundaries: Dict[str, str]) -> None:
+        self._root = _TrieNode()
+        for name, prefix in boundaries.items():
+            normalized_prefix = prefix.strip("/").lower()
+            if not normalized_prefix:
+                continue
+            node = self._root
+            for part in normalized_prefix.split("/"):
+                node = node.children.setdefault(part, _TrieNode())
+            if node.name is None:
+                node.name = name
+
+    def lookup(self, rel_path: str) -> Optional[str]:
+        node = self._root
+        best: Optional[str] = None
+        for part in rel_path.lower().split("/"):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.name is not None:
+                best = node.name
+        return best
 
 
 def detect_boundary_violations(
@@ -427,12 +521,26 @@ def detect_boundary_violations(
 ) -> List[BoundaryViolationRecord]:
     forbidden_set = {(a, b) for a, b in forbidden_pairs}
     rows: List[BoundaryViolationRecord] = []
+    coach_id = intern_coach(
+        why_it_matters=(
+            "Forbidden boundary imports increase coupling and can break "
+            "domain isolation required for parallel work."
+        ),
+        how_to_fix=(
+            "Move shared contract into an allowed boundary adapter and import "
+            "through that contract only."
+        ),
+        minimal_bad_example="Bad: ui/ imports runtime/internal implementation directly.",
+        minimal_good_example="Good: ui/ imports runtime public adapter boundary.",
+        next_best_action="Refactor this edge to an allowed boundary dependency.",
+    )
+    trie = BoundaryTrie(boundaries)
 
     for edge in edges:
         if not edge.resolved_file:
             continue
-        from_boundary = _boundary_for_file(edge.source_file, boundaries)
-        to_boundary = _boundary_for_file(edge.resolved_file, boundaries)
+        from_boundary = trie.lookup(edge.source_file)
+        to_boundary = trie.lookup(edge.resolved_file)
         if not from_boundary or not to_boundary:
             continue
         if (from_boundary, to_boundary) not in forbidden_set:
@@ -452,19 +560,249 @@ def detect_boundary_violations(
                     f"Detected forbidden import from boundary `{from_boundary}` "
                     f"to `{to_boundary}`."
                 ),
-                why_it_matters=(
-                    "Forbidden boundary imports increase coupling and can break "
-                    "domain isolation required for parallel work."
-                ),
-                how_to_fix=(
-                    "Move shared contract into an allowed boundary adapter and import "
-                    "through that contract only."
-                ),
-                minimal_bad_example="Bad: ui/ imports runtime/internal implementation directly.",
-                minimal_good_example="Good: ui/ imports runtime public adapter boundary.",
-                next_best_action="Refactor this edge to an allowed boundary dependency.",
+                coach_id=coach_id,
+            )
+        )
+    rows.sort(
+        key=lambda row: (
+            row.from_boundary,
+            row.to_boundary,
+            row.from_file.lower(),
+            row.to_file.lower(),
+        )
+    )
+    return rows
+
+
+@dataclass
+class _FileGraph:
+    """Resolved import edges between repository files, as sorted adjacency lists over file ids."""
+
+    files: List[str]
+    succ: List[List[int]]
+    pred: List[List[int]]
+
+
+def _file_graph(edges: Sequence[ImportEdge]) -> _FileGraph:
+    # Self-imports (e.g. `from . import x` inside a package __init__) are not cycles.
+    pairs = {(edge.source_file, edge.resolved_file) for edge in edges if edge.resolved_file}
+    files = sorted({name for pair in pairs for name in pair})
+    index = {name: idx for idx, name in enumerate(files)}
+    succ: List[List[int]] = [[] for _ in files]
+    pred: List[List[int]] = [[] for _ in files]
+    for source, target in pairs:
+        if source != target:
+            succ[index[source]].append(index[target])
+    for source, targets in enumerate(succ):
+        targets.sort()
+        for target in targets:
+            pred[target].append(source)
+    return _FileGraph(files=files, succ=succ, pred=pred)
+
+
+def _strongly_connected_components(succ: Sequence[Sequence[int]]) -> List[List[int]]:
+    """Tarjan's algorithm with an explicit stack; O(V + E) without recursion limits."""
+    count = len(succ)
+    order = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    for root in range(count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work: List[Tuple[int, int]] = [(root, 0)]
+        while work:
+            node, pos = work[-1]
+            children = succ[node]
+            if pos < len(children):
+                work[-1] = (node, pos + 1)
+                child = children[pos]
+                if order[child] == -1:
+                    order[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, 0))
+                elif on_stack[child] and order[child] < low[node]:
+                    low[node] = order[child]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == order[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _shortest_cycle(start: int, members: Set[int], succ: Sequence[Sequence[int]]) -> List[int]:
+    """Shortest cycle through ``start`` inside one component (BFS, linear in its size)."""
+    parent: Dict[int, int] = {start: -1}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for child in succ[node]:
+            if child == start:
+                path = [node]
+                while parent[path[-1]] != -1:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            if child in members and child not in parent:
+                parent[child] = node
+                queue.append(child)
+    return [start]
+
+
+def detect_import_cycles(
+    edges: Sequence[ImportEdge],
+    boundaries: Optional[Dict[str, str]] = None,
+    graph: Optional[_FileGraph] = None,
+) -> List[CycleRecord]:
+    """One row per import cycle (strongly connected component with 2+ files)."""
+    graph = graph if graph is not None else _file_graph(edges)
+    trie = BoundaryTrie(boundaries or {})
+    coach_id = intern_coach(
+        why_it_matters=(
+            "Files in an import cycle load, test and change together, so none of them "
+            "can be split out or reused on its own."
+        ),
+        how_to_fix=(
+            "Move the shared piece into a lower-level module both sides import, or "
+            "invert one dependency through an interface."
+        ),
+        minimal_bad_example="Bad: a.ts imports b.ts for one helper while b.ts imports a.ts.",
+        minimal_good_example="Good: the helper lives in c.ts, imported by both a.ts and b.ts.",
+        next_best_action="Remove one back edge from `example_cycle`, starting with the one into the most stable file.",
+    )
+    rows: List[CycleRecord] = []
+    for component in _strongly_connected_components(graph.succ):
+        if len(component) < 2:
+            continue
+        members = set(component)
+        start = min(component)
+        names = sorted(graph.files[idx] for idx in component)
+        cycle = [graph.files[idx] for idx in _shortest_cycle(start, members, graph.succ)]
+        edge_count = sum(1 for idx in component for child in graph.succ[idx] if child in members)
+        crossed = sorted({name for name in (trie.lookup(file) for file in names) if name})
+        seed = "|".join(names)
+        what = f"Detected an import cycle of {len(names)} files"
+        if len(crossed) > 1:
+            what += " spanning boundaries " + ", ".join(f"`{name}`" for name in crossed)
+        rows.append(
+            CycleRecord(
+                cycle_id=f"CYC-{stable_sha1_text(seed)[:12]}",
+                file_count=len(names),
+                edge_count=edge_count,
+                boundaries=";".join(crossed),
+                example_cycle=" -> ".join(cycle + [cycle[0]]),
+                files=";".join(names),
+                check_id=f"IMPORT-CYCLE-{stable_sha1_text(seed)[:8].upper()}",
+                severity="ERROR" if len(crossed) > 1 else "WARN",
+                what_detected=what + ".",
+                coach_id=coach_id,
             )
         )
+    rows.sort(key=lambda row: (-row.file_count, row.files.lower()))
+    return rows
+
+
+def detect_transitive_violations(
+    edges: Sequence[ImportEdge],
+    boundaries: Dict[str, str],
+    forbidden_pairs: Sequence[Tuple[str, str]],
+    graph: Optional[_FileGraph] = None,
+) -> List[BoundaryViolationRecord]:
+    """Forbidden boundary pairs reached through files outside both boundaries.
+
+    For each forbidden pair ``A -> B`` one backward BFS from the files of ``B``,
+    never entering ``A`` or ``B``, yields every file that reaches ``B`` and its
+    next hop on a shortest chain. Each file of ``A`` importing such a file is
+    reported once, so the cost is O(V + E) per forbidden pair. Direct ``A -> B``
+    imports are left to ``detect_boundary_violations``.
+    """
+    graph = graph if graph is not None else _file_graph(edges)
+    trie = BoundaryTrie(boundaries)
+    file_boundary = [trie.lookup(name) for name in graph.files]
+    by_boundary: DefaultDict[Optional[str], List[int]] = defaultdict(list)
+    for idx, name in enumerate(file_boundary):
+        by_boundary[name].append(idx)
+    coach_id = intern_coach(
+        why_it_matters=(
+            "Routing a forbidden dependency through intermediate modules keeps the "
+            "coupling while hiding it from direct import checks."
+        ),
+        how_to_fix=(
+            "Cut the chain at its first hop out of the source boundary, or have the "
+            "intermediate module depend on an allowed adapter instead."
+        ),
+        minimal_bad_example="Bad: ui/ imports shared/util.ts, which imports runtime/internal.",
+        minimal_good_example="Good: shared/util.ts depends only on runtime's public adapter.",
+        next_best_action="Break the chain shown in `via` at the edge that leaves the source boundary.",
+    )
+    rows: List[BoundaryViolationRecord] = []
+    for from_boundary, to_boundary in sorted(set(forbidden_pairs)):
+        sources = by_boundary.get(from_boundary, [])
+        targets = by_boundary.get(to_boundary, [])
+        if not sources or not targets or from_boundary == to_boundary:
+            continue
+        next_hop: Dict[int, int] = {}
+        distance: Dict[int, int] = {target: 0 for target in targets}
+        reached: Dict[int, int] = {target: target for target in targets}
+        queue = deque(targets)
+        while queue:
+            node = queue.popleft()
+            for importer in graph.pred[node]:
+                if importer in distance or file_boundary[importer] in (from_boundary, to_boundary):
+                    continue
+                distance[importer] = distance[node] + 1
+                reached[importer] = reached[node]
+                next_hop[importer] = node
+                queue.append(importer)
+        for source in sources:
+            hops = [child for child in graph.succ[source] if child in next_hop]
+            if not hops:
+                continue
+            first = min(hops, key=lambda child: (distance[child], child))
+            chain = [source, first]
+            while chain[-1] in next_hop and len(chain) < MAX_VIA_FILES:
+                chain.append(next_hop[chain[-1]])
+            via = " -> ".join(graph.files[idx] for idx in chain)
+            if chain[-1] in next_hop:
+                via += f" -> ... -> {graph.files[reached[first]]}"
+            from_file = graph.files[source]
+            to_file = graph.files[reached[first]]
+            seed = f"transitive|{from_file}|{to_file}|{from_boundary}|{to_boundary}"
+            rows.append(
+                BoundaryViolationRecord(
+                    violation_id=f"BND-{stable_sha1_text(seed)[:12]}",
+                    from_file=from_file,
+                    to_file=to_file,
+                    from_boundary=from_boundary,
+                    to_boundary=to_boundary,
+                    severity="WARN",
+                    check_id=f"BND-TRANSITIVE-{stable_sha1_text(seed)[:8].upper()}",
+                    what_detected=(
+                        f"Detected forbidden dependency from boundary `{from_boundary}` to "
+                        f"`{to_boundary}` through {distance[first]} intermediate file(s)."
+                    ),
+                    coach_id=coach_id,
+                    via=via,
+                )
+            )
     rows.sort(
         key=lambda row: (
             row.from_boundary,
@@ -524,29 +862,35 @@ def build_suspected_drift_findings(edges: Sequence[ImportEdge]) -> List[Dict[str
 
 
 def scan_repo_structure(config: ScanConfig) -> RepoStructureResult:
-    tree_lines = build_depth2_tree_summary(config)
-    language_counts = detect_languages(config)
+    tree = build_directory_tree(config, names_depth=config.tree_depth)
+    tree_lines = render_directory_tree(tree, depth=config.tree_depth)
+    language_counts = {name: tree.languages[name] for name in sorted(tree.languages)}
     edges, hubs = build_import_graph(config)
     contract = parse_boundary_contract(config)
+    graph = _file_graph(edges)
     violations: List[BoundaryViolationRecord] = []
+    transitive: List[BoundaryViolationRecord] = []
     if contract.boundaries and contract.forbidden_edges:
         violations = detect_boundary_violations(
             edges=edges,
             boundaries=contract.boundaries,
             forbidden_pairs=contract.forbidden_edges,
         )
+        transitive = detect_transitive_violations(
+            edges=edges,
+            boundaries=contract.boundaries,
+            forbidden_pairs=contract.forbidden_edges,
+            graph=graph,
+        )
+    cycles = detect_import_cycles(edges, boundaries=contract.boundaries, graph=graph)
     coach_findings = build_suspected_drift_findings(edges)
-    for row in violations:
+    for row in [*violations, *transitive]:
         coach_findings.append(
             {
                 "check_id": row.check_id,
                 "severity": row.severity,
                 "what_detected": row.what_detected,
-                "why_it_matters": row.why_it_matters,
-                "how_to_fix": row.how_to_fix,
-                "minimal_bad_example": row.minimal_bad_example,
-                "minimal_good_example": row.minimal_good_example,
-                "next_best_action": row.next_best_action,
+                **coach_template(row.coach_id).as_row(),
             }
         )
     coach_findings.sort(
@@ -565,5 +909,9 @@ def scan_repo_structure(config: ScanConfig) -> RepoStructureResult:
         forbidden_edges=contract.forbidden_edges,
         boundary_violations=violations,
         coach_findings=coach_findings,
+        transitive_violations=transitive,
+        import_cycles=cycles,
+        directory_tree=tree,
+        tree_depth=config.tree_depth,
     )
 
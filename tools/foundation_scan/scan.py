@@ -2,6 +2,7 @@
 
 Usage:
     python -m tools.foundation_scan.scan --in . --out nf_scan_out --max-file-mb 200
+    python -m tools.foundation_scan.scan deps --out nf_scan_out --reverse src/runtime/state.ts
 """
 
 from __future__ import annotations
@@ -10,11 +11,20 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import Dict, List, Optional, Sequence
 
-from .config import ProgressTracker, ScanConfig, utc_now_iso
+from .config import (
+    ContradictionRecord,
+    DuplicateRecord,
+    ProgressTracker,
+    ScanConfig,
+    SectionDuplicateRecord,
+    utc_now_iso,
+)
 from .contradictions import detect_contradictions
-from .dedupe import detect_all_duplicates
+from . import import_graph
+from .cross_index import CrossRepoIndex
+from .dedupe import detect_all_duplicates, detect_section_duplicates
 from .doc_ingest import ingest_documents, warning_rows_to_dicts
 from .doc_rules import extract_living_rules
 from .output_writer import write_all_outputs
@@ -69,6 +79,26 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=8000,
         help="Maximum near-duplicate result pairs",
     )
+    parser.add_argument(
+        "--section-dup-threshold",
+        dest="section_dup_threshold",
+        type=float,
+        default=0.5,
+        help="Section duplicate threshold (Jaccard similarity between chunk windows)",
+    )
+    parser.add_argument(
+        "--max-section-dup-pairs",
+        dest="max_section_dup_pairs",
+        type=int,
+        default=20000,
+        help="Maximum matching chunk-window pairs for section duplicates",
+    )
+    parser.add_argument(
+        "--no-section-dups",
+        dest="no_section_dups",
+        action="store_true",
+        help="Skip chunk-level section duplicate detection",
+    )
     parser.add_argument(
         "--chunk-size",
         dest="chunk_size",
@@ -83,6 +113,38 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=150,
         help="Chunk overlap in chars",
     )
+    parser.add_argument(
+        "--tree-depth",
+        dest="tree_depth",
+        type=int,
+        default=2,
+        help="Directory levels listed in REPO_STRUCTURE.md and DIRECTORY_TREE.json",
+    )
+    parser.add_argument(
+        "--import-graph",
+        dest="import_graph",
+        default=None,
+        help="Persistent import graph reused by later scans and `deps` queries (default: <out>/import_graph.sqlite)",
+    )
+    parser.add_argument(
+        "--index",
+        dest="index_path",
+        default=None,
+        help="Persistent cross-repo index (SQLite) to query and update",
+    )
+    parser.add_argument(
+        "--index-repo",
+        dest="index_repo",
+        default=None,
+        help="Repository name in the cross-repo index (default: --in folder name)",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=0,
+        help="Worker processes for per-document rule extraction (0 = CPU count)",
+    )
     parser.add_argument(
         "--no-progress",
         dest="no_progress",
@@ -109,7 +171,7 @@ def run_scan(config: ScanConfig) -> Dict[str, object]:
     stage_progress.update()
 
     _stage("2/6 extract living rules")
-    rules = extract_living_rules(chunks)
+    rules = extract_living_rules(chunks, workers=config.workers)
     stage_progress.update()
 
     _stage("3/6 detect duplicates")
@@ -120,10 +182,34 @@ def run_scan(config: ScanConfig) -> Dict[str, object]:
         max_docs_for_near_dup=config.max_docs_for_near_dup,
         progress_enabled=config.show_progress,
     )
+    section_duplicates: List[SectionDuplicateRecord] = []
+    if config.section_dups:
+        # Whole-document duplicates already cover every passage of those pairs.
+        section_duplicates = detect_section_duplicates(
+            chunks,
+            threshold=config.section_dup_threshold,
+            max_pairs=config.max_section_dup_pairs,
+            skip_doc_pairs=[(row.doc_a, row.doc_b) for row in duplicates],
+            progress_enabled=config.show_progress,
+        )
     stage_progress.update()
 
     _stage("4/6 detect contradiction candidates")
     contradictions = detect_contradictions(rules, max_pairs=10_000)
+    cross_duplicates: Optional[List[DuplicateRecord]] = None
+    cross_contradictions: Optional[List[ContradictionRecord]] = None
+    index_sync: Dict[str, int] = {}
+    if config.index_path is not None:
+        _stage(f"4/6 query cross-repo index as '{config.index_repo}'")
+        with CrossRepoIndex(config.index_path, threshold=config.near_dup_threshold) as index:
+            cross_duplicates = index.find_duplicates(
+                config.index_repo,
+                docs,
+                threshold=config.near_dup_threshold,
+                max_pairs=config.max_near_dup_pairs,
+            )
+            cross_contradictions = index.find_contradictions(config.index_repo, rules, max_pairs=10_000)
+            index_sync = index.sync_repo(config.index_repo, docs, rules)
     stage_progress.update()
 
     _stage("5/6 scan repository structure")
@@ -136,10 +222,15 @@ def run_scan(config: ScanConfig) -> Dict[str, object]:
         docs=docs,
         rules=rules,
         duplicates=duplicates,
+        section_duplicates=section_duplicates,
         contradictions=contradictions,
         repo_result=repo_result,
         extraction_warning_rows=warning_rows,
+        cross_repo_duplicates=cross_duplicates,
+        cross_repo_contradictions=cross_contradictions,
     )
+    if config.import_graph_path is not None:
+        created_files = sorted([*created_files, config.import_graph_path], key=lambda p: p.name.lower())
     stage_progress.update()
     stage_progress.finish()
 
@@ -148,7 +239,11 @@ def run_scan(config: ScanConfig) -> Dict[str, object]:
         "chunks": chunks,
         "rules": rules,
         "duplicates": duplicates,
+        "section_duplicates": section_duplicates,
         "contradictions": contradictions,
+        "cross_repo_duplicates": cross_duplicates,
+        "cross_repo_contradictions": cross_contradictions,
+        "index_sync": index_sync,
         "repo_result": repo_result,
         "warning_rows": warning_rows,
         "created_files": created_files,
@@ -159,6 +254,7 @@ def print_final_report(config: ScanConfig, result: Dict[str, object]) -> None:
     created_files: List[Path] = list(result["created_files"])  # type: ignore[assignment]
     rules_count = len(result["rules"])  # type: ignore[arg-type]
     duplicates_count = len(result["duplicates"])  # type: ignore[arg-type]
+    section_duplicates_count = len(result["section_duplicates"])  # type: ignore[arg-type]
     contradictions_count = len(result["contradictions"])  # type: ignore[arg-type]
     docs_count = len(result["docs"])  # type: ignore[arg-type]
     warning_rows = result["warning_rows"]  # type: ignore[assignment]
@@ -174,8 +270,17 @@ def print_final_report(config: ScanConfig, result: Dict[str, object]) -> None:
     print(f"- Documents scanned: {docs_count}")
     print(f"- Living rules: {rules_count}")
     print(f"- Duplicate pairs: {duplicates_count}")
+    print(f"- Duplicated sections: {section_duplicates_count}")
     print(f"- Contradiction candidates: {contradictions_count}")
     print(f"- Extraction warnings: {len(warning_rows)}")
+    if result.get("cross_repo_duplicates") is not None:
+        sync = result["index_sync"]  # type: ignore[assignment]
+        print(f"- Cross-repo duplicate pairs: {len(result['cross_repo_duplicates'])}")  # type: ignore[arg-type]
+        print(f"- Cross-repo contradiction candidates: {len(result['cross_repo_contradictions'])}")  # type: ignore[arg-type]
+        print(
+            f"- Index {config.index_path.as_posix()} as '{config.index_repo}': "  # type: ignore[union-attr]
+            f"{sync['upserted']} upserted, {sync['unchanged']} unchanged, {sync['deleted']} deleted"
+        )
     print("")
     print("How To Run:")
     print(
@@ -194,6 +299,9 @@ def print_final_report(config: ScanConfig, result: Dict[str, object]) -> None:
 
 
 def main(argv: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["deps"]:
+        return import_graph.main(argv[1:])
     parser = build_arg_parser()
     args = parser.parse_args(argv)
     config = ScanConfig.from_inputs(
@@ -206,6 +314,14 @@ def main(argv: Sequence[str] | None = None) -> int:
         max_near_dup_pairs=args.max_near_dup_pairs,
         chunk_size=args.chunk_size,
         chunk_overlap=args.chunk_overlap,
+        tree_depth=args.tree_depth,
+        import_graph=args.import_graph,
+        section_dups=not args.no_section_dups,
+        section_dup_threshold=args.section_dup_threshold,
+        max_section_dup_pairs=args.max_section_dup_pairs,
+        index_path=args.index_path,
+        index_repo=args.index_repo,
+        workers=args.workers,
         show_progress=not args.no_progress,
     )
 
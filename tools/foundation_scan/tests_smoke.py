@@ -7,9 +7,14 @@ Run:
 
 from __future__ import annotations
 
+import csv
+import io
 import json
+import pickle
+import random
 import sys
 import tempfile
+from contextlib import redirect_stdout
 from pathlib import Path
 from typing import Dict, List
 
@@ -18,7 +23,9 @@ if __package__ is None or __package__ == "":
     repo_root = Path(__file__).resolve().parents[2]
     sys.path.insert(0, str(repo_root))
 
-from tools.foundation_scan.config import ScanConfig  # noqa: E402
+from tools.foundation_scan import cross_index, dedupe, doc_rules, import_graph, markers  # noqa: E402
+from tools.foundation_scan.config import COACH_FIELDS, ChunkRecord, ScanConfig, coach_template, intern_coach  # noqa: E402
+from tools.foundation_scan.doc_ingest import chunk_text  # noqa: E402
 from tools.foundation_scan.scan import run_scan  # noqa: E402
 
 
@@ -26,9 +33,12 @@ REQUIRED_OUTPUTS = (
     "REPORT.md",
     "RULES.csv",
     "DUPLICATES.csv",
+    "SECTION_DUPLICATES.csv",
     "CONTRADICTIONS.csv",
     "INDEX.json",
     "REPO_STRUCTURE.md",
+    "CYCLES.csv",
+    "DIRECTORY_TREE.json",
 )
 
 
@@ -98,11 +108,30 @@ export const internalFeature = () => "runtime-internal";
         root / "src" / "ui" / "view.ts",
         """
 import { internalFeature } from "../runtime/internal";
+import { formatLabel } from "../shared/format";
 
-export const renderView = () => internalFeature();
+export const renderView = () => formatLabel(internalFeature());
 """.strip()
         + "\n",
     )
+    # shared/ is outside every boundary: it forms an import cycle and carries a
+    # transitive ui -> runtime dependency.
+    _write(
+        root / "src" / "shared" / "format.ts",
+        'import { internalFeature } from "../runtime/internal";\nimport { now } from "./clock";\n',
+    )
+    _write(root / "src" / "shared" / "clock.ts", 'import { formatLabel } from "./format";\n')
+
+    # Two otherwise different runbooks sharing one pasted section.
+    rng = random.Random(11)
+    vocab = [f"term{index}" for index in range(400)]
+
+    def _prose(count: int) -> str:
+        return " ".join(rng.choice(vocab) for _ in range(count)) + "\n"
+
+    shared = _prose(260)
+    _write(root / "docs" / "runbook_a.md", "# Runbook A\n\n" + _prose(120) + shared + _prose(90))
+    _write(root / "docs" / "runbook_b.md", "# Runbook B\n\n" + _prose(45) + shared + _prose(150))
 
     # extra doc type extension coverage (.qml).
     _write(
@@ -132,7 +161,15 @@ def _assert_deterministic_key_outputs(
     index_before: Dict[str, object],
     index_after: Dict[str, object],
 ) -> None:
-    compare_exact = ("RULES.csv", "DUPLICATES.csv", "CONTRADICTIONS.csv", "REPO_STRUCTURE.md")
+    compare_exact = (
+        "RULES.csv",
+        "DUPLICATES.csv",
+        "SECTION_DUPLICATES.csv",
+        "CONTRADICTIONS.csv",
+        "REPO_STRUCTURE.md",
+        "CYCLES.csv",
+        "DIRECTORY_TREE.json",
+    )
     for name in compare_exact:
         a = before[name]
         b = after[name]
@@ -171,7 +208,125 @@ def _snapshot_outputs(out_dir: Path) -> Dict[str, str]:
     }
 
 
+def _assert_near_dup_kernels() -> None:
+    base = "entry points must orchestrate only and ui must not import runtime internals " * 3
+    variants = (base, base + "extra tail words here", base.replace("runtime", "core", 1), "a b", "")
+    for left in variants:
+        for right in variants:
+            set_a = dedupe._shingles(dedupe._tokenize(left))
+            set_b = dedupe._shingles(dedupe._tokenize(right))
+            expected = 1.0 if not set_a and not set_b else len(set_a & set_b) / max(1, len(set_a | set_b))
+            actual = dedupe._jaccard(dedupe._hashed_shingles(set_a), dedupe._hashed_shingles(set_b))
+            assert abs(expected - actual) < 1e-12, f"Hashed Jaccard mismatch: {expected} != {actual}"
+            bounded = dedupe._jaccard(dedupe._hashed_shingles(set_a), dedupe._hashed_shingles(set_b), 0.9)
+            assert (bounded >= 0.9) == (expected >= 0.9), "Threshold early exit changed the verdict."
+    for threshold in (0.5, 0.8, 0.92, 0.99):
+        bands, rows = dedupe._lsh_params(threshold)
+        assert bands * rows <= dedupe.SIGNATURE_BINS, "LSH bands exceed signature width."
+        miss_rate = (1.0 - threshold**rows) ** bands
+        assert rows == 1 or miss_rate <= dedupe.NEAR_DUP_TARGET_FNR, f"LSH miss rate too high at {threshold}."
+
+
+def _assert_cross_repo_index(root: Path) -> None:
+    index_path = root / "scan_index.sqlite"
+    shared = "Release builds must be signed by the release owner before publishing artifacts.\n"
+    _write(root / "repo_a" / "docs" / "release.md", "# Release\n\n" + shared)
+    _write(root / "repo_a" / "docs" / "imports.md", "UI must not import runtime internals directly.\n")
+    _write(root / "repo_b" / "docs" / "release_copy.md", "# Release\n\n" + shared)
+    _write(root / "repo_b" / "docs" / "ui.md", "For speed, UI should import runtime internals directly.\n")
+
+    def _scan(repo: str) -> Dict[str, object]:
+        config = ScanConfig.from_inputs(
+            in_dir=str(root / repo),
+            out_dir=str(root / f"out_{repo}"),
+            index_path=str(index_path),
+            show_progress=False,
+        )
+        return run_scan(config)
+
+    _scan("repo_a")
+    result = _scan("repo_b")
+    cross_dupes = [(row.doc_a, row.doc_b, row.duplicate_type) for row in result["cross_repo_duplicates"]]  # type: ignore[union-attr]
+    assert cross_dupes == [("docs/release_copy.md", "repo_a:docs/release.md", "exact")], f"Cross-repo duplicates: {cross_dupes}"
+    cross_files = {(row.file_a, row.file_b) for row in result["cross_repo_contradictions"]}  # type: ignore[union-attr]
+    assert ("docs/ui.md", "repo_a:docs/imports.md") in cross_files, f"Cross-repo contradictions: {cross_files}"
+    assert (root / "out_repo_b" / "CROSS_REPO_DUPLICATES.csv").exists(), "CROSS_REPO_DUPLICATES.csv missing."
+
+    # Rescans upsert nothing; removed files and explicit deletes leave the index.
+    assert _scan("repo_b")["index_sync"] == {"upserted": 0, "unchanged": 2, "deleted": 0}
+    (root / "repo_b" / "docs" / "ui.md").unlink()
+    assert _scan("repo_b")["index_sync"] == {"upserted": 0, "unchanged": 1, "deleted": 1}
+    with cross_index.CrossRepoIndex(index_path) as index:
+        assert index.delete_documents("repo_a", ["docs/release.md"]) == 1
+        assert index.repos() == [("repo_a", 1, 1), ("repo_b", 1, 1)], f"Index repos: {index.repos()}"
+    assert not _scan("repo_b")["cross_repo_duplicates"], "Deleted document still matched."
+
+
+def _assert_import_graph(root: Path, out_dir: Path) -> None:
+    def _dependents(*extra: str) -> List[str]:
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            code = import_graph.main(["--out", str(out_dir), "--reverse", "--json", *extra, "src/runtime/internal.ts"])
+        assert code == 0, "deps query failed."
+        return json.loads(buffer.getvalue())["results"]
+
+    shared = ["src/shared/clock.ts", "src/shared/format.ts"]
+    assert _dependents() == [*shared, "src/ui/view.ts"], f"Dependents from the scan graph: {_dependents()}"
+    _write(root / "src" / "ui" / "panel.ts", 'import { renderView } from "./view";\n')
+    refresh = ("--refresh", "--in", str(root))
+    assert _dependents(*refresh) == [*shared, "src/ui/panel.ts", "src/ui/view.ts"], "New importer missing."
+    _write(root / "src" / "ui" / "view.ts", "export const renderView = () => 1;\n")
+    assert _dependents(*refresh) == shared, "Edited file still listed as a dependent."
+
+
+def _assert_marker_automaton() -> None:
+    automaton = markers.MarkerAutomaton(("he", "she", "his", "hers", "must", "must not", "ui"))
+    for text in ("ushers", "builds must not ship", "she", "", "must", "history of hers"):
+        expected = {pattern for pattern in automaton.patterns if pattern in text}
+        assert automaton.find(text) == expected, f"Automaton hits differ for {text!r}"
+    hits = markers.marker_hits("UI Must NOT import runtime internals.")
+    assert {"ui", "must", "must not", "import", "runtime"} <= hits, f"Unexpected marker hits: {sorted(hits)}"
+
+
+def _assert_rules_span_chunk_edges() -> None:
+    sentence = "Release builds must be signed by the release owner before publishing. "
+    text = sentence * 12
+    chunks = [
+        ChunkRecord(f"CHK-{index}", "docs/release.md", index, start, end, body, str(index))
+        for index, (start, end, body) in enumerate(chunk_text(text, 200, 40))
+    ]
+    rules = doc_rules.extract_living_rules(chunks)
+    statements = [rule.statement for rule in rules]
+    assert statements == [sentence.strip()], f"Expected one whole-sentence rule, got {statements}"
+    assert rules[0].chunk_id == "CHK-0", "Rule should belong to the chunk holding its first sentence."
+
+    # A sentence lying wholly inside a chunk overlap keeps the id of the first chunk holding it.
+    text = "Plain narrative text. " * 7 + "Okay. Keys must rotate daily. " + "Plain narrative text. " * 10
+    chunks = [
+        ChunkRecord(f"CHK-{index}", "docs/keys.md", index, start, end, body, str(index))
+        for index, (start, end, body) in enumerate(chunk_text(text, 200, 40))
+    ]
+    assert chunks[1].offset_start <= text.index("Keys") and text.index("daily.") < chunks[0].offset_end
+    rules = doc_rules.extract_living_rules(chunks)
+    owners = [(rule.statement, rule.chunk_id) for rule in rules]
+    assert owners == [("Keys must rotate daily.", "CHK-0")], f"Overlap sentence attributed to {owners}"
+
+
+def _assert_interned_coach() -> None:
+    chunk = ChunkRecord("CHK-0", "docs/a.md", 0, 0, 40, "Builds must be signed before publishing.", "0")
+    rule = doc_rules.extract_living_rules([chunk])[0]
+    assert not hasattr(rule, "__dict__"), "Finding records should be slotted."
+    text = coach_template(rule.coach_id)
+    assert intern_coach(*(getattr(text, name) for name in COACH_FIELDS)) == rule.coach_id
+    restored = pickle.loads(pickle.dumps(rule))
+    assert restored == rule and coach_template(restored.coach_id) == text, "Pickled rule lost its coach text."
+
+
 def run_smoke() -> None:
+    _assert_marker_automaton()
+    _assert_rules_span_chunk_edges()
+    _assert_interned_coach()
+    _assert_near_dup_kernels()
     with tempfile.TemporaryDirectory(prefix="foundation_scan_smoke_") as temp_dir:
         root = Path(temp_dir).resolve()
         _seed_repo(root)
@@ -200,6 +355,42 @@ def run_smoke() -> None:
         assert "rule_id" in rules_csv, "RULES.csv header missing."
         assert "Coach Findings" in repo_report, "REPO_STRUCTURE.md missing Coach section."
 
+        # The pasted runbook section is reported once, with offsets inside both docs.
+        with (out_dir / "SECTION_DUPLICATES.csv").open(encoding="utf-8", newline="") as handle:
+            sections = list(csv.DictReader(handle))
+        pairs = [(row["doc_a"], row["doc_b"]) for row in sections]
+        assert pairs == [("docs/runbook_a.md", "docs/runbook_b.md")], f"Unexpected section duplicates: {pairs}"
+        row = sections[0]
+        for side in ("a", "b"):
+            text = (root / row[f"doc_{side}"]).read_text(encoding="utf-8")
+            shared = text.split("\n")[3]
+            start = text.index(shared)
+            span_start = int(row[f"{side}_offset_start"])
+            span_end = int(row[f"{side}_offset_end"])
+            covered = min(span_end, start + len(shared)) - max(span_start, start)
+            assert covered >= len(shared) // 2, f"Section span in doc_{side} misses the pasted passage."
+        assert float(row["similarity"]) >= 0.5, "Section similarity below threshold."
+
+        # The shared/ cycle lands in CYCLES.csv; ui reaches runtime through it.
+        with (out_dir / "CYCLES.csv").open(encoding="utf-8", newline="") as handle:
+            cycles = list(csv.DictReader(handle))
+        assert [row["files"] for row in cycles] == ["src/shared/clock.ts;src/shared/format.ts"], f"Cycles: {cycles}"
+        assert (
+            "`src/ui/view.ts -> src/shared/format.ts -> src/runtime/internal.ts` (`ui` -> `runtime`)" in repo_report
+        ), "REPO_STRUCTURE.md missing the transitive ui -> runtime violation."
+
+        # Directory aggregates roll up: src/ counts every file below it, by language too.
+        tree = json.loads((out_dir / "DIRECTORY_TREE.json").read_text(encoding="utf-8"))
+        src = next(node for node in tree["root"]["children"] if node["path"] == "src")
+        src_files = [path for path in (root / "src").rglob("*") if path.is_file()]
+        assert src["files"] == len(src_files), f"src/ aggregate: {src['files']} != {len(src_files)}"
+        assert src["bytes"] == sum(path.stat().st_size for path in src_files), "src/ bytes do not roll up."
+        assert sum(src["languages"].values()) == src["files"], "src/ language mix does not sum to its files."
+        assert {child["path"] for child in src["children"]} >= {"src/shared", "src/ui"}, "src/ children missing."
+
+        _assert_cross_repo_index(root)
+        _assert_import_graph(root, out_dir)
+
 
 def main() -> int:
     try:
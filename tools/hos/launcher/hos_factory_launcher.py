@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
@@ -12,6 +13,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    from tools.codex.shared.procexec import run_process
+except ModuleNotFoundError:  # pragma: no cover - direct script execution
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from tools.codex.shared.procexec import run_process
+
 WORKERS: tuple[str, ...] = ("A_core", "B_tooling", "C_features", "D_validation", "Z_aggregator")
 DEFAULT_FALLBACK_REPO = Path(r"F:\repos\hitech-os")
 DEFAULT_BASE_BRANCH = "main"
@@ -24,12 +31,24 @@ ENV_RUN_ID = "RUN_ID"
 ENV_UPDATE = "HOS_LAUNCHER_UPDATE"
 ENV_BASE_BRANCH = "HOS_LAUNCHER_BASE_BRANCH"
 ENV_CODE_CMD = "HOS_LAUNCHER_CODE_CMD"
+ENV_WORKERS = "HOS_LAUNCHER_WORKERS"
+WORKER_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
 
 
 class LauncherError(RuntimeError):
     pass
 
 
+def _parse_workers(raw: str | None) -> tuple[str, ...]:
+    parsed = tuple(item.strip() for item in str(raw or "").split(",") if item.strip())
+    invalid = [item for item in parsed if not WORKER_ID_RE.fullmatch(item)]
+    if invalid:
+        raise LauncherError(f"Invalid worker ids: {','.join(invalid)}")
+    if len(set(parsed)) != len(parsed):
+        raise LauncherError(f"Duplicate worker ids: {raw}")
+    return parsed or WORKERS
+
+
 @dataclass
 class Summary:
     ok: bool
@@ -91,23 +110,16 @@ def _run_command(
     timeout_seconds: float = 120.0,
 ) -> subprocess.CompletedProcess[str]:
     logger.log("CMD", f"cwd={cwd} :: {' '.join(args)}")
-    try:
-        completed = subprocess.run(
-            args,
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=max(1.0, timeout_seconds),
-        )
-    except FileNotFoundError as exc:
-        raise LauncherError(f"Command not found: {args[0]}") from exc
-    except subprocess.TimeoutExpired as exc:
-        raise LauncherError(f"Command timed out: {' '.join(args)}") from exc
-
-    logger.log("CMD", f"rc={completed.returncode}")
+    result = run_process(args, cwd=cwd, timeout=max(1.0, timeout_seconds))
+    if isinstance(result.exception, FileNotFoundError):
+        raise LauncherError(f"Command not found: {args[0]}") from result.exception
+    if result.exception is not None:
+        raise result.exception
+    if result.timed_out:
+        raise LauncherError(f"Command timed out: {' '.join(args)}")
+    completed = subprocess.CompletedProcess(args, result.rc, result.stdout, result.stderr)
+
+    logger.log("CMD", f"rc={completed.returncode} duration_ms={result.duration_ms}")
     logger.log_process("STDOUT", completed.stdout)
     logger.log_process("STDERR", completed.stderr)
 
@@ -118,19 +130,12 @@ def _run_command(
 
 
 def _git_toplevel(start_dir: Path) -> Path | None:
-    try:
-        completed = subprocess.run(
-            ["git", "-C", str(start_dir), "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=10,
-        )
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+    completed = run_process(["git", "-C", str(start_dir), "rev-parse", "--show-toplevel"], timeout=10)
+    if isinstance(completed.exception, FileNotFoundError) or completed.timed_out:
         return None
-    if completed.returncode != 0:
+    if completed.exception is not None:
+        raise completed.exception
+    if completed.rc != 0:
         return None
     text = completed.stdout.strip()
     if not text:
@@ -280,6 +285,7 @@ def _ensure_worktrees(
     create_missing: bool,
     logger: LauncherLogger,
     warnings: list[str],
+    workers: tuple[str, ...] = WORKERS,
 ) -> dict[str, Path]:
     root = repo_root / WORKTREE_ROOT_REL
     root.mkdir(parents=True, exist_ok=True)
@@ -287,7 +293,7 @@ def _ensure_worktrees(
     base_ref = _resolve_base_ref(repo_root, base_branch, logger=logger)
 
     ensured: dict[str, Path] = {}
-    for worker in WORKERS:
+    for worker in workers:
         expected_path = root / worker
         expected_norm = _normalize_path(expected_path)
         expected_branch = f"{WORKTREE_BRANCH_PREFIX}/{worker}"
@@ -353,7 +359,7 @@ def _write_workspace_files(
     repo_name = repo_root.name
     files: dict[str, Path] = {}
 
-    for worker in WORKERS:
+    for worker in worktrees:
         worktree_path = worktrees[worker]
         target = workspace_root / f"{worker}.code-workspace"
         payload = _workspace_payload(worker, worktree_path, repo_name)
@@ -375,7 +381,7 @@ def _validate_workspace_files(
     logger: LauncherLogger,
 ) -> None:
     workspace_root = repo_root / WORKSPACES_REL
-    for worker in WORKERS:
+    for worker in worktrees:
         expected_workspace = workspace_root / f"{worker}.code-workspace"
         if not expected_workspace.exists():
             raise LauncherError(f"Missing workspace file: {expected_workspace}")
@@ -408,7 +414,7 @@ def _open_vscode_windows(
     logger: LauncherLogger,
 ) -> list[str]:
     opened: list[str] = []
-    for worker in WORKERS:
+    for worker in workspace_files:
         workspace_path = workspace_files[worker]
         completed = _run_command(
             [code_program, "--new-window", "--reuse-window=false", str(workspace_path)],
@@ -452,6 +458,11 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         default=os.environ.get(ENV_CODE_CMD),
         help="Optional VS Code command/path override.",
     )
+    parser.add_argument(
+        "--workers",
+        default=os.environ.get(ENV_WORKERS, ""),
+        help=f"Comma-separated worker ids (default: {','.join(WORKERS)}).",
+    )
     parser.add_argument(
         "--update",
         action="store_true",
@@ -525,8 +536,9 @@ def _run(args: argparse.Namespace) -> Summary:
             create_missing=not args.validate,
             logger=logger,
             warnings=warnings,
+            workers=_parse_workers(args.workers),
         )
-        worktree_summary = {worker: str(worktrees[worker]) for worker in WORKERS}
+        worktree_summary = {worker: str(path) for worker, path in worktrees.items()}
 
         if args.validate:
             _validate_workspace_files(repo_root, worktrees=worktrees, logger=logger)
@@ -15,6 +15,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    from tools.codex.shared.procexec import run_process
+except ModuleNotFoundError:  # pragma: no cover - direct script execution
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from tools.codex.shared.procexec import run_process
+
 WORKERS: tuple[str, ...] = (
     "A_core",
     "B_tooling",
@@ -23,6 +29,9 @@ WORKERS: tuple[str, ...] = (
     "Z_aggregator",
 )
 
+ENV_WORKERS = "HOS_FACTORY_WORKERS"
+WORKER_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
 RUN_ID_OLD_RE = re.compile(r"^\d{8}_\d+$")
 RUN_ID_NEW_RE = re.compile(r"^\d{8}_\d{6}_[A-Z0-9]{4}$")
 
@@ -117,22 +126,22 @@ def _truthy(value: str | None) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _parse_workers(raw: str | None) -> tuple[str, ...]:
+    # Comma-separated worker ids; empty means the default five-worker layout.
+    parsed = tuple(item.strip() for item in str(raw or "").split(",") if item.strip())
+    invalid = [item for item in parsed if not WORKER_ID_RE.fullmatch(item)]
+    if invalid:
+        raise ValueError(f"invalid worker ids: {','.join(invalid)}")
+    if len(set(parsed)) != len(parsed):
+        raise ValueError(f"duplicate worker ids: {raw}")
+    return parsed or WORKERS
+
+
 def _git_toplevel(start_dir: Path) -> Path | None:
     if shutil.which("git") is None:
         return None
-    try:
-        completed = subprocess.run(
-            ["git", "-C", str(start_dir), "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=10,
-        )
-    except (OSError, subprocess.TimeoutExpired):
-        return None
-    if completed.returncode != 0:
+    completed = run_process(["git", "-C", str(start_dir), "rev-parse", "--show-toplevel"], timeout=10)
+    if completed.rc != 0 or completed.error:
         return None
     output = completed.stdout.strip()
     if not output:
@@ -225,8 +234,10 @@ class TxnExecutor:
         dry_run: bool,
         resume_run_id: str | None,
         torture_mode: bool,
+        workers: tuple[str, ...] | None = None,
     ) -> None:
         self.dry_run = bool(dry_run)
+        self.workers: tuple[str, ...] = tuple(workers or WORKERS)
         self.resume_run_id = str(resume_run_id).strip() if resume_run_id else None
         self.torture_mode = bool(torture_mode)
 
@@ -249,8 +260,8 @@ class TxnExecutor:
         self.exit_code = EXIT_SUCCESS
 
         self.timeline: list[dict[str, Any]] = []
-        self.worker_done: dict[str, bool] = {worker: False for worker in WORKERS}
-        self.worker_attempts: dict[str, int] = {worker: 0 for worker in WORKERS}
+        self.worker_done: dict[str, bool] = {worker: False for worker in self.workers}
+        self.worker_attempts: dict[str, int] = {worker: 0 for worker in self.workers}
 
         self.branch_before: dict[str, Any] = {}
         self.branch_after: dict[str, Any] = {}
@@ -311,24 +322,16 @@ class TxnExecutor:
         check: bool = True,
     ) -> subprocess.CompletedProcess[str]:
         self.logger.log(stage, "CMD: " + " ".join(command))
-        try:
-            completed = subprocess.run(
-                command,
-                cwd=str(cwd),
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                check=False,
-                timeout=max(1.0, float(timeout_seconds)),
-            )
-        except subprocess.TimeoutExpired as exc:
-            output_tail = _tail_lines((exc.stdout or "") + "\n" + (exc.stderr or ""))
+        result = run_process(command, cwd=cwd, timeout=max(1.0, float(timeout_seconds)))
+        if result.timed_out:
+            output_tail = _tail_lines(result.stdout + "\n" + result.stderr)
             self._record_command(stage=stage, command=command, cwd=cwd, rc=124, output_tail=output_tail)
-            raise ExecutorFailure(f"command timeout in stage '{stage}'") from exc
-        except OSError as exc:
-            self._record_command(stage=stage, command=command, cwd=cwd, rc=127, output_tail=str(exc))
-            raise ExecutorFailure(f"command launch failed in stage '{stage}': {exc}") from exc
+            raise ExecutorFailure(f"command timeout in stage '{stage}'")
+        if result.exception is not None:
+            self._record_command(stage=stage, command=command, cwd=cwd, rc=127, output_tail=str(result.exception))
+            raise ExecutorFailure(f"command launch failed in stage '{stage}': {result.exception}") from result.exception
+        self.logger.log(stage, f"DURATION_MS={result.duration_ms}")
+        completed = subprocess.CompletedProcess(command, result.rc, result.stdout, result.stderr)
 
         output_tail = _tail_lines(completed.stdout + ("\n" + completed.stderr if completed.stderr else ""))
         self._record_command(stage=stage, command=command, cwd=cwd, rc=completed.returncode, output_tail=output_tail)
@@ -383,7 +386,7 @@ class TxnExecutor:
 
     def _allowed_worktree_dirs(self) -> list[Path]:
         root = self._worktree_root()
-        return [root / worker for worker in WORKERS]
+        return [root / worker for worker in self.workers]
 
     def _collect_worktree_dirs(self) -> list[str]:
         repo_root, _, _, _, _ = self._require_paths()
@@ -488,7 +491,7 @@ class TxnExecutor:
         self.worktree_before = self._collect_worktree_dirs()
         unexpected_before = [path for path in self.worktree_before if path not in allowed]
 
-        if len(self.worktree_before) > len(WORKERS):
+        if len(self.worktree_before) > len(self.workers):
             self.worktree_after = list(self.worktree_before)
             self._write_worktree_guard_report(unexpected_before)
             raise ExecutorFailure("worktree guard failed: more than 5 worktree directories exist")
@@ -527,7 +530,7 @@ class TxnExecutor:
         missing_after = [path for path in sorted(allowed) if path not in self.worktree_after]
         self._write_worktree_guard_report(unexpected_after)
 
-        if len(self.worktree_after) > len(WORKERS):
+        if len(self.worktree_after) > len(self.workers):
             raise ExecutorFailure("worktree guard failed: more than 5 worktree directories exist after ensure")
         if unexpected_after:
             raise ExecutorFailure("worktree guard failed: unexpected worktree directory exists after ensure")
@@ -576,18 +579,18 @@ class TxnExecutor:
         return token in text
 
     def _refresh_done_markers(self) -> None:
-        for worker in WORKERS:
+        for worker in self.workers:
             self.worker_done[worker] = self._done_marker_ok(worker)
 
     def _all_done(self) -> bool:
-        return all(bool(self.worker_done.get(worker, False)) for worker in WORKERS)
+        return all(bool(self.worker_done.get(worker, False)) for worker in self.workers)
 
     def _pending_workers(self) -> list[str]:
-        return [worker for worker in WORKERS if not self.worker_done.get(worker, False)]
+        return [worker for worker in self.workers if not self.worker_done.get(worker, False)]
 
     def _build_prompt_pack_text(self) -> str:
         blocks: list[str] = []
-        for worker in WORKERS:
+        for worker in self.workers:
             blocks.extend(
                 [
                     f"=== {worker} PROMPT ===",
@@ -665,7 +668,7 @@ class TxnExecutor:
             "",
         ]
 
-        for worker in WORKERS:
+        for worker in self.workers:
             lines.append(
                 f"- {worker}: done={str(bool(self.worker_done.get(worker, False))).lower()} attempts={int(self.worker_attempts.get(worker, 0))}"
             )
@@ -714,7 +717,7 @@ class TxnExecutor:
             "--run-id",
             self.run_id,
             "--workers",
-            ",".join(WORKERS),
+            ",".join(self.workers),
             "--timeout-seconds",
             str(timeout_seconds),
             "--poll-seconds",
@@ -732,7 +735,7 @@ class TxnExecutor:
 
     def _run_integrate_and_guardrails(self) -> None:
         repo_root, _, _, _, _ = self._require_paths()
-        workers_csv = ",".join(WORKERS)
+        workers_csv = ",".join(self.workers)
 
         steps = [
             (
@@ -1116,7 +1119,7 @@ class TxnExecutor:
             self._assert_refs_changes_scoped()
             self._assert_branch_guard()
 
-            if len(self.worktree_after) > len(WORKERS):
+            if len(self.worktree_after) > len(self.workers):
                 raise ExecutorFailure("worktree guard failed after execution: more than 5 worktree directories exist")
             if unexpected_after:
                 raise ExecutorFailure("worktree guard failed after execution: unexpected worktree directory exists")
@@ -1157,19 +1160,18 @@ def run_snapshot_gc(*, keep_days: int, keep_count: int) -> int:
     report_root = repo_root / RUNS_ROOT_REL / "_gc"
     report_root.mkdir(parents=True, exist_ok=True)
 
-    try:
-        listed = subprocess.run(
-            ["git", "-C", str(repo_root), "for-each-ref", "--format=%(refname)", f"{SNAPSHOT_REF_PREFIX}"],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=30,
+    listed = run_process(
+        ["git", "-C", str(repo_root), "for-each-ref", "--format=%(refname)", f"{SNAPSHOT_REF_PREFIX}"],
+        cwd=repo_root,
+        timeout=30,
+    )
+    if not listed.ok:
+        # A timed-out or failed listing is partial; keep_count must not be applied to it.
+        detail = listed.error or ("timed out" if listed.timed_out else listed.stderr.strip())
+        print(
+            f"gc failed listing refs (rc={listed.rc}, timed_out={listed.timed_out}): {detail}",
+            file=sys.stderr,
         )
-    except Exception as exc:
-        print(f"gc failed listing refs: {exc}", file=sys.stderr)
         return EXIT_FAILURE
 
     refs = [line.strip() for line in listed.stdout.splitlines() if line.strip()]
@@ -1206,20 +1208,12 @@ def run_snapshot_gc(*, keep_days: int, keep_count: int) -> int:
     failed: list[dict[str, Any]] = []
 
     for ref in delete_refs:
-        proc = subprocess.run(
-            ["git", "-C", str(repo_root), "update-ref", "-d", ref],
-            cwd=str(repo_root),
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=20,
-        )
-        if proc.returncode == 0:
+        # Sequential on purpose: concurrent deletes contend for packed-refs.lock.
+        proc = run_process(["git", "-C", str(repo_root), "update-ref", "-d", ref], cwd=repo_root, timeout=20)
+        if proc.rc == 0:
             deleted.append(ref)
         else:
-            failed.append({"ref": ref, "rc": proc.returncode, "stderr": proc.stderr.strip()})
+            failed.append({"ref": ref, "rc": proc.rc, "stderr": (proc.stderr or proc.error).strip()})
 
     status = PASS_STATE if not failed else FAIL_STATE
     stamp = _now_utc().strftime("%Y%m%d_%H%M%S")
@@ -1273,6 +1267,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--gc", action="store_true", help="Run snapshot reference GC only.")
     parser.add_argument("--keep-days", type=int, default=14, help="GC retention in days.")
     parser.add_argument("--keep-count", type=int, default=20, help="GC retention by latest run count.")
+    parser.add_argument(
+        "--workers",
+        default=os.environ.get(ENV_WORKERS, ""),
+        help=f"Comma-separated worker ids (default: {','.join(WORKERS)}).",
+    )
     return parser
 
 
@@ -1288,6 +1287,7 @@ def main(argv: list[str] | None = None) -> int:
         dry_run=bool(args.dry_run or _truthy(os.environ.get("DRY_RUN"))),
         resume_run_id=str(args.resume_run_id).strip() if args.resume_run_id else None,
         torture_mode=torture_mode,
+        workers=_parse_workers(args.workers),
     )
     rc = executor.execute()
 